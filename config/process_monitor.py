@@ -1,11 +1,13 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-import psutil
+
+from utils.process_snapshot import get_process_snapshot_service
 
 
 class ProcessMonitorThread(QThread):
     """
-    ⚡ Следит за процессом winws.exe/winws2.exe через psutil (быстро!)
-    Шлёт сигнал когда состояние (запущен/остановлен) изменилось.
+    ⚡ Следит за процессом winws.exe/winws2.exe через общий снимок процессов
+    (utils/process_snapshot.py): снимок переиспользуется другими проверками,
+    а сигналы идут только когда набор PID действительно изменился.
     """
     processStatusChanged = pyqtSignal(bool)          # True / False
     processDetailsChanged = pyqtSignal(dict)         # {"winws.exe": [pid, ...], "winws2.exe": [pid, ...]}
@@ -30,70 +32,68 @@ class ProcessMonitorThread(QThread):
 
     def _check_processes_fast(self) -> dict[str, list[int]]:
         """
-        ⚡ Быстрая проверка через psutil (~1-10ms)
+        ⚡ Быстрая проверка через общий снимок процессов
         Возвращает PID'ы найденных процессов winws.exe/winws2.exe.
         """
-        details: dict[str, list[int]] = {}
         try:
-            for proc in psutil.process_iter(['name', 'pid']):
-                try:
-                    proc_name_raw = proc.info.get('name')
-                    if not proc_name_raw:
-                        continue
-                    proc_name = str(proc_name_raw).lower()
-                    if proc_name in self._target_names:
-                        pid = proc.info.get('pid')
-                        if isinstance(pid, int):
-                            details.setdefault(proc_name, []).append(pid)
-                        else:
-                            details.setdefault(proc_name, [])
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-            return details
+            return get_process_snapshot_service().snapshot().pids_by_name(self._target_names)
         except Exception:
             return {}
 
     def _check_process_fast(self) -> bool:
         """
-        ⚡ Быстрая проверка через psutil (~1-10ms)
+        ⚡ Быстрая проверка через общий снимок процессов
         Не блокирует GUI!
         """
         return bool(self._check_processes_fast())
 
+    def _on_details_changed(self, details: dict[str, list[int]]):
+        """
+        Подписка на снимок процессов: вызывается только при изменении набора PID
+        (из потока, сделавшего снимок - сигналы Qt доставляются в GUI очередью).
+        """
+        from log import log
+        is_running = bool(details)
+
+        # Важно: PID может поменяться без смены bool
+        if details != self._cur_details:
+            self._cur_details = details
+            self.processDetailsChanged.emit(details)
+
+        # Если состояние изменилось — отдаём сигнал в GUI
+        if is_running != self._cur_state:
+            self._cur_state = is_running
+            log(f"winws.exe state → {is_running}", level="DEBUG")
+            self.processStatusChanged.emit(is_running)
+
     # ------------------------- ОСНОВНОЙ ЦИКЛ --------------------------
     def run(self):
         from log import log            # импорт здесь, чтобы не было циклических импортов
-        log("Process-monitor thread started (psutil mode)", level="INFO")
-
-        while self._running:
-            try:
-                # 🔄 Сигнализируем о начале проверки
-                self.checkingStarted.emit()
-                
-                # ⚡ Используем быструю проверку через psutil
-                details = self._check_processes_fast()
-                is_running = bool(details)
-                
-                # 🔄 Сигнализируем об окончании проверки
-                self.checkingFinished.emit()
-
-                # Если детали изменились — отдаём сигнал в GUI (важно: PID может поменяться без смены bool)
-                if details != self._cur_details:
-                    self._cur_details = details
-                    self.processDetailsChanged.emit(details)
-
-                # Если состояние изменилось — отдаём сигнал в GUI
-                if is_running != self._cur_state:
-                    self._cur_state = is_running
-                    log(f"winws.exe state → {is_running}", level="DEBUG")
-                    self.processStatusChanged.emit(is_running)
-
-            except Exception as e:
-                from log import log
-                log(f"Ошибка в потоке мониторинга: {e}", level="❌ ERROR")
-                self.checkingFinished.emit()  # На случай ошибки тоже завершаем
-
-            self.msleep(self.interval_ms)            # 5 сек по умолчанию
+        log("Process-monitor thread started (snapshot mode)", level="INFO")
+
+        service = get_process_snapshot_service()
+        token = service.subscribe(self._target_names, self._on_details_changed)
+        # Снимок, сделанный другими проверками за последний интервал, повторно не берём
+        max_age = self.interval_ms / 1000.0
+        try:
+            while self._running:
+                try:
+                    # 🔄 Сигнализируем о начале проверки
+                    self.checkingStarted.emit()
+
+                    # ⚡ Изменения приходят через подписку (_on_details_changed)
+                    service.snapshot(max_age=max_age)
+
+                    # 🔄 Сигнализируем об окончании проверки
+                    self.checkingFinished.emit()
+
+                except Exception as e:
+                    log(f"Ошибка в потоке мониторинга: {e}", level="❌ ERROR")
+                    self.checkingFinished.emit()  # На случай ошибки тоже завершаем
+
+                self.msleep(self.interval_ms)            # 5 сек по умолчанию
+        finally:
+            service.unsubscribe(token)
 
     # ------------------------ СТАНДАРТНЫЙ STOP ------------------------
     def stop(self):
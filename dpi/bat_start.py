@@ -1,6 +1,5 @@
 # dpi/bat_start.py
 import os
-import time
 import subprocess
 import psutil
 from typing import Optional, Callable, Dict, Any, TYPE_CHECKING
@@ -11,6 +10,7 @@ if TYPE_CHECKING:
 
 from log import log
 from utils import run_hidden, get_system_exe, get_system32_path
+from utils.process_wait import EXIT_TIMEOUT, WINWS_PROCESS_NAMES, wait_for_exit, wait_for_start
 
 from dpi.process_health_check import (
     check_process_health,
@@ -131,8 +131,7 @@ class BatDPIStart:
         except Exception as e:
             log(f"Ошибка остановки через Win API: {e}", "⚠ WARNING")
 
-        time.sleep(0.3)
-        ok = not self.check_process_running_wmi(silent=True)
+        ok = wait_for_exit(WINWS_PROCESS_NAMES, timeout=1.0)
         log("Все процессы остановлены" if ok else "winws/winws2 ещё работает",
             "✅ SUCCESS" if ok else "⚠ WARNING")
         return ok
@@ -196,13 +195,9 @@ class BatDPIStart:
                     from dpi.stop import stop_dpi
                     stop_dpi(self.app_instance)
 
-                # Ждём пока процесс действительно остановится (до 5 секунд)
-                max_wait = 10
-                for attempt in range(max_wait):
-                    time.sleep(0.5)
-                    if not self.check_process_running_wmi(silent=True):
-                        log(f"✅ Предыдущий процесс остановлен (попытка {attempt + 1})", "DEBUG")
-                        break
+                # Ждём завершения по дескрипторам процессов (до 5 секунд)
+                if wait_for_exit(WINWS_PROCESS_NAMES, timeout=EXIT_TIMEOUT):
+                    log("✅ Предыдущий процесс остановлен", "DEBUG")
                 else:
                     log("⚠️ Процесс не остановился за 5 секунд, принудительное завершение...", "WARNING")
                     # Принудительное завершение через taskkill
@@ -212,12 +207,9 @@ class BatDPIStart:
                                        capture_output=True, timeout=3)
                         subprocess.run(['taskkill', '/F', '/IM', 'winws2.exe'],
                                        capture_output=True, timeout=3)
-                        time.sleep(1)
+                        wait_for_exit(WINWS_PROCESS_NAMES, timeout=1.0)
                     except Exception as e:
                         log(f"Ошибка taskkill: {e}", "DEBUG")
-
-                # Дополнительная пауза для освобождения WinDivert
-                time.sleep(0.5)
             
             # Определяем путь к .bat файлу
             bat_file: Optional[str] = None
@@ -375,20 +367,14 @@ class BatDPIStart:
             
             log("✅ winws запущен напрямую через CreateProcess (быстрый метод)", "SUCCESS")
             
-            # ⚡ ПРОВЕРКА ЗАПУСКА с несколькими попытками
-            max_attempts = 5
-            for attempt in range(max_attempts):
-                time.sleep(0.5)  # Уменьшенная пауза - прямой запуск быстрее
-                
-                if self.check_process_running_fast(silent=True):
-                    log(f"✅ DPI успешно запущен: {strategy_name}", level="SUCCESS")
-                    self.set_status(f"✅ DPI запущен: {strategy_name}")
-                    self._update_ui(True)
-                    return True
-                    
-                # Логируем только на последней попытке
-                if attempt == max_attempts - 1:
-                    log(f"⚠️ DPI не запустился после {max_attempts} проверок", level="WARNING")
+            # ⚡ ПРОВЕРКА ЗАПУСКА: ждём появления процесса (до 2.5 секунд)
+            if wait_for_start(WINWS_PROCESS_NAMES, timeout=2.5):
+                log(f"✅ DPI успешно запущен: {strategy_name}", level="SUCCESS")
+                self.set_status(f"✅ DPI запущен: {strategy_name}")
+                self._update_ui(True)
+                return True
+
+            log("⚠️ DPI не запустился за 2.5 секунды", level="WARNING")
             
             # Процесс упал - добавляем диагностику
             log("💡 Процесс winws запустился но сразу упал. Диагностика...", level="WARNING")
@@ -516,19 +502,14 @@ class BatDPIStart:
                 log("Ошибка ShellExecuteEx (fallback)", "ERROR")
                 return False
             
-            # Проверка запуска
-            max_attempts = 8  # Больше попыток для медленного метода
-            for attempt in range(max_attempts):
-                time.sleep(1)
-                
-                if self.check_process_running_fast(silent=True):
-                    log(f"✅ DPI успешно запущен через fallback: {strategy_name}", "SUCCESS")
-                    self.set_status(f"✅ DPI запущен: {strategy_name}")
-                    self._update_ui(True)
-                    return True
-                    
-                if attempt == max_attempts - 1:
-                    log(f"⚠️ DPI не запустился после {max_attempts} проверок (fallback)", "WARNING")
+            # Проверка запуска (до 8 секунд для медленного метода)
+            if wait_for_start(WINWS_PROCESS_NAMES, timeout=8.0, interval=0.1):
+                log(f"✅ DPI успешно запущен через fallback: {strategy_name}", "SUCCESS")
+                self.set_status(f"✅ DPI запущен: {strategy_name}")
+                self._update_ui(True)
+                return True
+
+            log("⚠️ DPI не запустился за 8 секунд (fallback)", "WARNING")
             
             log("DPI ещё не запущен, продолжаем мониторинг...", "INFO")
             self.set_status("⏳ Ожидание запуска DPI...")
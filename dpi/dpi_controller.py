@@ -6,7 +6,21 @@ from PyQt6.QtCore import QThread, QObject, pyqtSignal, QMetaObject, Qt, Q_ARG
 from strategy_menu import get_strategy_launch_method
 from log import log
 from dpi.process_health_check import diagnose_startup_error
-import time
+from utils.process_wait import EXIT_TIMEOUT, WINWS_PROCESS_NAMES, SwitchLatency, wait_for_exit, wait_for_start
+
+def _get_loaded_orchestra_page(app_instance):
+    """
+    Страница оркестра, только если она уже создана.
+    Рабочие потоки не должны обращаться к app.orchestra_page: ленивый атрибут
+    создал бы QWidget вне GUI-потока.
+    """
+    from ui.page_names import PageName
+
+    get_loaded_page = getattr(app_instance, "get_loaded_page", None)
+    if get_loaded_page is None:
+        return None
+    return get_loaded_page(PageName.ORCHESTRA)
+
 
 class DPIStartWorker(QObject):
     """Worker для асинхронного запуска DPI"""
@@ -27,6 +41,7 @@ class DPIStartWorker(QObject):
         return get_winws_exe_for_method(self.launch_method)
 
     def run(self):
+        latency = None
         try:
             self.progress.emit("Подготовка к запуску...")
             
@@ -61,6 +76,7 @@ class DPIStartWorker(QObject):
 
                 if not skip_stop:
                     self.progress.emit("Останавливаем предыдущий процесс...")
+                    latency = SwitchLatency("Переключение стратегии")
 
                 # Останавливаем через соответствующий метод
                 if (not skip_stop) and self.launch_method in ("direct_zapret2", "direct_zapret2_orchestra", "direct_zapret1"):
@@ -71,14 +87,12 @@ class DPIStartWorker(QObject):
                     from dpi.stop import stop_dpi
                     stop_dpi(self.app_instance)
 
-                # Ждём пока процесс действительно остановится (до 5 секунд)
+                # Ждём завершения по дескрипторам процессов (до 5 секунд):
+                # возврат сразу, как только последний winws/winws2 завершился
                 if not skip_stop:
-                    max_wait = 10
-                    for attempt in range(max_wait):
-                        time.sleep(0.5)
-                        if not self.dpi_starter.check_process_running_wmi(silent=True):
-                            log(f"✅ Предыдущий процесс остановлен (попытка {attempt + 1})", "DEBUG")
-                            break
+                    latency.mark("остановка")
+                    if wait_for_exit(WINWS_PROCESS_NAMES, timeout=EXIT_TIMEOUT):
+                        log("✅ Предыдущий процесс остановлен", "DEBUG")
                     else:
                         log("⚠️ Процесс не остановился за 5 секунд, принудительное завершение...", "WARNING")
                         import subprocess
@@ -87,12 +101,10 @@ class DPIStartWorker(QObject):
                                            capture_output=True, timeout=3)
                             subprocess.run(['taskkill', '/F', '/IM', 'winws2.exe'],
                                            capture_output=True, timeout=3)
-                            time.sleep(1)
+                            wait_for_exit(WINWS_PROCESS_NAMES, timeout=1.0)
                         except Exception as e:
                             log(f"Ошибка taskkill: {e}", "DEBUG")
-
-                    # Дополнительная пауза для освобождения WinDivert
-                    time.sleep(0.5)
+                    latency.mark("ожидание завершения")
 
             self.progress.emit("Запуск DPI...")
             
@@ -105,6 +117,10 @@ class DPIStartWorker(QObject):
                 success = self._start_direct()
             else:
                 success = self._start_bat()
+
+            if latency is not None:
+                latency.mark("запуск")
+                latency.report(success)
             
             if success:
                 self.progress.emit("DPI успешно запущен")
@@ -273,18 +289,11 @@ class DPIStartWorker(QObject):
             # Используем BatDPIStart для BAT режима
             result = self.app_instance.dpi_starter.start_dpi(selected_mode=mode_param)
             
-            # Добавляем дополнительную проверку с несколькими попытками
+            # Добавляем дополнительную проверку: ждём появления процесса (до 2 секунд)
             if result:
-                import time
-                
-                # Даем процессу время на инициализацию - несколько проверок
-                max_checks = 5
-                for attempt in range(max_checks):
-                    time.sleep(0.4)  # Проверяем каждые 400мс
-                    
-                    if self.app_instance.dpi_starter.check_process_running_wmi(silent=True):
-                        log(f"✅ Процесс winws.exe успешно запущен и работает (попытка {attempt + 1})", "✅ SUCCESS")
-                        return True
+                if wait_for_start(WINWS_PROCESS_NAMES, timeout=2.0):
+                    log("✅ Процесс winws.exe успешно запущен и работает", "✅ SUCCESS")
+                    return True
                 
                 # Если после всех проверок процесс не найден
                 log("❌ DPI не запустился - процесс не найден после старта", "❌ ERROR")
@@ -339,14 +348,14 @@ class DPIStartWorker(QObject):
             runner = self.app_instance.orchestra_runner
 
             # Подключаем callback для логов через сигнал Qt (thread-safe)
-            # emit_log() эмитит сигнал с QueuedConnection - безопасно из любого потока
-            has_attr = hasattr(self.app_instance, 'orchestra_page')
-            page_exists = self.app_instance.orchestra_page if has_attr else None
-            print(f"[DEBUG _start_orchestra] has_attr={has_attr}, page_exists={page_exists}")  # DEBUG
-            if has_attr and page_exists:
-                runner.set_output_callback(self.app_instance.orchestra_page.emit_log)
+            # emit_log() эмитит сигнал с QueuedConnection - безопасно из любого потока.
+            # Страницу не создаём: мы в рабочем потоке, а QWidget создаётся только в GUI-потоке.
+            # Если страница ещё не открывалась, callback подключит её start_monitoring().
+            orchestra_page = _get_loaded_orchestra_page(self.app_instance)
+            if orchestra_page is not None:
+                runner.set_output_callback(orchestra_page.emit_log)
             else:
-                log("orchestra_page не существует при старте, callback будет установлен позже", "WARNING")
+                log("orchestra_page ещё не создана, callback будет установлен при её открытии", "DEBUG")
 
             # Запускаем (prepare + start)
             if runner.start():
@@ -354,9 +363,9 @@ class DPIStartWorker(QObject):
 
                 # Запускаем мониторинг на странице оркестра (через main thread!)
                 # ВАЖНО: start_monitoring() запускает QTimer, который нельзя создавать из другого потока
-                if hasattr(self.app_instance, 'orchestra_page') and self.app_instance.orchestra_page:
+                if orchestra_page is not None:
                     QMetaObject.invokeMethod(
-                        self.app_instance.orchestra_page,
+                        orchestra_page,
                         "start_monitoring",
                         Qt.ConnectionType.QueuedConnection
                     )
@@ -466,9 +475,14 @@ class DPIStopWorker(QObject):
             if hasattr(self.app_instance, 'orchestra_runner') and self.app_instance.orchestra_runner:
                 self.app_instance.orchestra_runner.stop()
 
-                # Останавливаем мониторинг на странице оркестра
-                if hasattr(self.app_instance, 'orchestra_page'):
-                    self.app_instance.orchestra_page.stop_monitoring()
+                # Останавливаем мониторинг на странице оркестра (QTimer - только через GUI-поток)
+                orchestra_page = _get_loaded_orchestra_page(self.app_instance)
+                if orchestra_page is not None:
+                    QMetaObject.invokeMethod(
+                        orchestra_page,
+                        "stop_monitoring",
+                        Qt.ConnectionType.QueuedConnection
+                    )
 
             # Дополнительно убиваем все процессы через Win API
             if self.app_instance.dpi_starter.check_process_running_wmi(silent=True):
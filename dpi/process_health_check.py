@@ -8,6 +8,7 @@ import subprocess
 import psutil  # ✅ ДОБАВИТЬ: pip install psutil
 from typing import Tuple, Optional, List, Dict
 from log import log
+from utils.process_snapshot import get_process_snapshot
 
 # Список конфликтующих программ
 CONFLICTING_PROCESSES = {
@@ -115,15 +116,11 @@ def _check_process_running(process_name: str) -> Tuple[bool, Optional[int]]:
     Returns:
         Tuple[bool, Optional[int]]: (is_running, pid)
     """
-    # ✅ ИСПРАВЛЕНИЕ: Используем psutil как основной метод (быстрее и надежнее WMI)
+    # ✅ Общий снимок процессов: здесь всегда свежий (процесс только что запущен),
+    # но сам снимок переиспользуют монитор и process_killer
     try:
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if proc.info['name'].lower() == process_name.lower():
-                    return True, proc.info['pid']
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return False, None
+        pid = get_process_snapshot(max_age=0).first_pid(process_name)
+        return pid is not None, pid
     except Exception as e:
         log(f"Ошибка проверки процесса через psutil: {e}", "DEBUG")
     
@@ -256,31 +253,24 @@ def check_conflicting_processes() -> List[Dict[str, str]]:
     """
     found_conflicts = []
     
-    # ✅ ИСПРАВЛЕНИЕ: Используем psutil вместо tasklist
+    # ✅ Общий снимок процессов: поиск по индексу имён вместо сравнения каждого процесса со списком
     try:
-        for proc in psutil.process_iter(['name', 'pid']):
-            try:
-                proc_name = proc.info['name']
-                
-                # Проверяем каждый конфликтующий процесс
-                for conflict_exe, info in CONFLICTING_PROCESSES.items():
-                    if proc_name.lower() == conflict_exe.lower():
-                        # ✅ ОСОБАЯ ПРОВЕРКА для winws.exe (игнорируем "свой" процесс)
-                        if conflict_exe.lower() == 'winws.exe':
-                            # Пропускаем если это наш процесс (будет проверяться отдельно)
-                            continue
-                        
-                        found_conflicts.append({
-                            'exe': conflict_exe,
-                            'name': info['name'],
-                            'reason': info['reason'],
-                            'solution': info['solution'],
-                            'pid': proc.info['pid']
-                        })
-                        log(f"⚠ Обнаружен конфликтующий процесс: {info['name']} ({conflict_exe}, PID: {proc.info['pid']})", "WARNING")
-                        break
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
+        snapshot = get_process_snapshot()
+        for conflict_exe, info in CONFLICTING_PROCESSES.items():
+            # ✅ ОСОБАЯ ПРОВЕРКА для winws.exe (игнорируем "свой" процесс)
+            if conflict_exe.lower() == 'winws.exe':
+                # Пропускаем если это наш процесс (будет проверяться отдельно)
                 continue
+
+            for pid in snapshot.pids(conflict_exe):
+                found_conflicts.append({
+                    'exe': conflict_exe,
+                    'name': info['name'],
+                    'reason': info['reason'],
+                    'solution': info['solution'],
+                    'pid': pid
+                })
+                log(f"⚠ Обнаружен конфликтующий процесс: {info['name']} ({conflict_exe}, PID: {pid})", "WARNING")
     
     except Exception as e:
         log(f"Ошибка проверки конфликтующих процессов через psutil: {e}", "DEBUG")
@@ -778,10 +768,11 @@ def _check_file_locked(file_path: str) -> Optional[str]:
 def _check_winws_already_running() -> Optional[int]:
     """Проверяет, запущен ли уже winws"""
     try:
-        for proc in psutil.process_iter(['pid', 'name']):
-            name = proc.info['name'].lower()
-            if name in ('winws.exe', 'winws2.exe'):
-                return proc.info['pid']
+        snapshot = get_process_snapshot()
+        for name in ('winws.exe', 'winws2.exe'):
+            pid = snapshot.first_pid(name)
+            if pid is not None:
+                return pid
     except:
         pass
     return None
\ No newline at end of file
@@ -5,13 +5,14 @@ import subprocess
 from pathlib import Path
 from PyQt6.QtWidgets import QMessageBox
 from .proxy_domains import (
+    get_all_service_domain_names,
     get_all_services,
     get_dns_profiles,
     get_service_domain_ip_map,
-    get_service_domain_names,
     get_service_domains,
 )
 from .adobe_domains import ADOBE_DOMAINS
+from .hosts_model import HostsFileModel
 from log import log
 
 def _get_hosts_path_from_env() -> Path:
@@ -38,6 +39,7 @@ HOSTS_PATH = _get_hosts_path_from_env() if os.name == "nt" else Path(r"C:\Window
 
 _HOSTS_TEXT_CACHE: str | None = None
 _HOSTS_SIG_CACHE: tuple[int, int] | None = None  # (mtime_ns, size)
+_HOSTS_MODEL_CACHE: HostsFileModel | None = None  # разбор _HOSTS_TEXT_CACHE
 
 
 def _get_hosts_sig(path: Path) -> tuple[int, int] | None:
@@ -59,14 +61,33 @@ def _set_hosts_cache(content: str | None, sig: tuple[int, int] | None) -> None:
 
 def invalidate_hosts_file_cache() -> None:
     """Принудительно сбрасывает кэш чтения hosts (на случай внешних изменений)."""
+    global _HOSTS_MODEL_CACHE
     _set_hosts_cache(None, None)
+    _HOSTS_MODEL_CACHE = None
 
 
-def _get_all_managed_domains() -> set[str]:
-    domains: set[str] = set()
-    for service_name in get_all_services():
-        domains.update(get_service_domain_names(service_name))
-    return domains
+def _get_hosts_model() -> HostsFileModel | None:
+    """
+    Разобранный hosts (индекс записей по домену/строке).
+    Пересобирается только когда меняется текст файла (кэш чтения - по сигнатуре).
+    """
+    global _HOSTS_MODEL_CACHE
+    content = safe_read_hosts_file()
+    if content is None:
+        return None
+
+    model = _HOSTS_MODEL_CACHE
+    if model is not None and (model.text is content or model.text == content):
+        return model
+
+    model = HostsFileModel(content)
+    _HOSTS_MODEL_CACHE = model
+    log(f"hosts разобран: {len(model.lines)} строк, {len(model)} записей за {model.parse_ms:.1f} мс", "DEBUG")
+    return model
+
+
+def _get_all_managed_domains() -> frozenset[str]:
+    return get_all_service_domain_names()
 
 
 def _run_cmd(args, description):
@@ -459,6 +480,26 @@ def safe_read_hosts_file():
         log(f"Критическая ошибка при чтении файла hosts: {e}", "❌ ERROR")
         return None
 
+def _write_hosts_atomic(content: str) -> None:
+    """
+    Записывает hosts через временный файл рядом и os.replace, чтобы DNS-клиент
+    и другие читатели не увидели наполовину записанный файл.
+    Если заменить файл нельзя (блокировка антивирусом и т.п.) - пишем напрямую.
+    """
+    tmp_path = HOSTS_PATH.with_name(HOSTS_PATH.name + ".zapret.tmp")
+    try:
+        tmp_path.write_text(content, encoding="utf-8-sig", newline='\n')
+        os.replace(tmp_path, HOSTS_PATH)
+        return
+    except OSError as e:
+        log(f"Атомарная запись hosts не удалась ({e}), пишем напрямую", "DEBUG")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    HOSTS_PATH.write_text(content, encoding="utf-8-sig", newline='\n')
+
+
 def safe_write_hosts_file(content):
     """Безопасно записывает файл hosts с правильной кодировкой"""
     try:
@@ -469,7 +510,7 @@ def safe_write_hosts_file(content):
                 log("Не удалось снять атрибут 'только для чтения'")
                 return False
 
-        HOSTS_PATH.write_text(content, encoding="utf-8-sig", newline='\n')
+        _write_hosts_atomic(content)
         _set_hosts_cache(content, _get_hosts_sig(HOSTS_PATH))
         return True
     except PermissionError:
@@ -478,7 +519,7 @@ def safe_write_hosts_file(content):
         success, message = restore_hosts_permissions()
         if success:
             try:
-                HOSTS_PATH.write_text(content, encoding="utf-8-sig", newline='\n')
+                _write_hosts_atomic(content)
                 log("✅ Файл hosts успешно записан после восстановления прав")
                 _set_hosts_cache(content, _get_hosts_sig(HOSTS_PATH))
                 return True
@@ -620,29 +661,12 @@ class HostsManager:
     def get_active_domains_map(self) -> dict[str, str]:
         """Возвращает {domain: ip} для всех управляемых доменов, найденных в hosts (без проверки IP)."""
         current_active: dict[str, str] = {}
-        managed_domains = _get_all_managed_domains()
         try:
-            content = safe_read_hosts_file()
-            if content is None:
+            model = _get_hosts_model()
+            if model is None:
                 return current_active
-                
-            lines = content.splitlines()
-            
-            for line in lines:
-                line = line.strip()
-                # Пропускаем пустые строки и комментарии
-                if not line or line.startswith('#'):
-                    continue
-                    
-                # Разбиваем строку на части (IP домен)
-                parts = line.split()
-                if len(parts) >= 2:
-                    ip = parts[0]
-                    domain = parts[1]
-                    
-                    if domain in managed_domains:
-                        current_active[domain] = ip
-                            
+
+            current_active = model.active_map(_get_all_managed_domains())
             log(f"Найдено активных управляемых доменов: {len(current_active)}", "DEBUG")
         except Exception as e:
             log(f"Ошибка при чтении hosts: {e}", "ERROR")
@@ -668,28 +692,10 @@ class HostsManager:
     def is_proxy_domains_active(self) -> bool:
         """Проверяет, есть ли активные (НЕ закомментированные) записи управляемых доменов в hosts"""
         try:
-            content = safe_read_hosts_file()
-            if content is None:
+            model = _get_hosts_model()
+            if model is None:
                 return False
-                
-            lines = content.splitlines()
-            domains = _get_all_managed_domains()
-            
-            for line in lines:
-                line = line.strip()
-                # Пропускаем пустые строки и комментарии
-                if not line or line.startswith('#'):
-                    continue
-                    
-                # Разбиваем строку на части (IP домен)
-                parts = line.split()
-                if len(parts) >= 2:
-                    domain = parts[1]  # Второй элемент - это домен
-                    if domain in domains:
-                        # Найден активный (не закомментированный) домен
-                        return True
-                        
-            return False
+            return model.has_any(_get_all_managed_domains())
         except Exception as e:
             log(f"Ошибка при проверке hosts: {e}")
             return False
@@ -697,25 +703,10 @@ class HostsManager:
     def is_adobe_domains_active(self) -> bool:
         """Проверяет, есть ли активные записи Adobe в hosts"""
         try:
-            content = safe_read_hosts_file()
-            if content is None:
+            model = _get_hosts_model()
+            if model is None:
                 return False
-                
-            lines = content.splitlines()
-            domains = set(ADOBE_DOMAINS.keys())
-            
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                    
-                parts = line.split()
-                if len(parts) >= 2:
-                    domain = parts[1]
-                    if domain in domains:
-                        return True
-                        
-            return False
+            return model.has_any(ADOBE_DOMAINS.keys())
         except Exception as e:
             log(f"Ошибка при проверке Adobe в hosts: {e}")
             return False
@@ -865,63 +856,41 @@ class HostsManager:
         return self.apply_domain_ip_map(selected)
 
     def apply_domain_ip_map(self, domain_ip_map: dict[str, str]) -> bool:
-        """Применяет домены в hosts: удаляет все управляемые и добавляет указанные."""
+        """
+        Применяет домены в hosts: из управляемых доменов остаются ровно указанные.
+        Файл меняется минимально (замена/удаление/добавление строк) и не
+        переписывается, если записи уже совпадают.
+        """
         log(f"🟡 apply_domain_ip_map начат: {len(domain_ip_map)} записей", "DEBUG")
 
         if not self.is_hosts_file_accessible():
             self.set_status("Файл hosts недоступен для изменения")
             return False
 
-        managed_domains = _get_all_managed_domains()
-
         try:
-            content = safe_read_hosts_file()
-            if content is None:
+            model = _get_hosts_model()
+            if model is None:
                 self.set_status("Не удалось прочитать файл hosts")
                 return False
 
-            lines = content.splitlines(keepends=True)
-            new_lines: list[str] = []
-
-            removed_count = 0
-            for line in lines:
-                if (
-                    line.strip()
-                    and not line.lstrip().startswith("#")
-                    and len(line.split()) >= 2
-                    and line.split()[1] in managed_domains
-                ):
-                    removed_count += 1
-                    continue
-                new_lines.append(line)
-
-            # Убираем лишние пустые строки в конце
-            while new_lines and new_lines[-1].strip() == "":
-                new_lines.pop()
+            diff = model.plan_apply(_get_all_managed_domains(), domain_ip_map)
+            new_content = model.apply(diff)
+            log(
+                f"apply_domain_ip_map: {diff.summary()} "
+                f"(разбор {model.parse_ms:.1f} мс, применение {model.last_apply_ms:.1f} мс)",
+                "DEBUG",
+            )
 
-            # Ничего не добавляем — просто очищаем управляемые домены
-            if not domain_ip_map:
-                if new_lines and not new_lines[-1].endswith("\n"):
-                    new_lines[-1] += "\n"
-                if not safe_write_hosts_file("".join(new_lines)):
-                    return False
-                self.set_status(f"Файл hosts обновлён: удалено {removed_count} записей")
+            if diff.is_empty:
+                self.set_status("Файл hosts уже актуален")
                 return True
 
-            # Добавляем выбранные домены
-            if new_lines and not new_lines[-1].endswith("\n"):
-                new_lines.append("\n")
-            new_lines.append("\n")  # Разделитель
-
-            for domain, ip in domain_ip_map.items():
-                new_lines.append(f"{ip} {domain}\n")
-
-            if not safe_write_hosts_file("".join(new_lines)):
+            if not safe_write_hosts_file(new_content):
                 self.set_status("Не удалось записать файл hosts")
                 return False
 
-            self.set_status(f"Файл hosts обновлён: добавлено {len(domain_ip_map)} записей")
-            log(f"✅ apply_domain_ip_map: removed={removed_count}, added={len(domain_ip_map)}", "DEBUG")
+            self.set_status(f"Файл hosts обновлён: {diff.summary()}")
+            log(f"✅ apply_domain_ip_map: {diff.summary()}", "DEBUG")
             return True
 
         except PermissionError:
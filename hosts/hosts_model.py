@@ -0,0 +1,169 @@
+"""
+Разобранный файл hosts с индексом записей по домену и номеру строки.
+
+Раньше HostsManager в get_active_domains_map / is_proxy_domains_active /
+apply_domain_ip_map каждый раз заново резал весь текст hosts на строки и
+делал line.split() (в apply_domain_ip_map - дважды на строку), а применение
+выбора удаляло все управляемые записи и дописывало их заново в конец файла -
+даже если ничего не изменилось.
+
+HostsFileModel разбирает текст один раз (каждая строка - один split()) и
+хранит индексы {домен: [номера строк]} и {номер строки: запись}. Модель
+неизменяема и кешируется в hosts.py пока не изменится содержимое файла.
+
+plan_apply() строит минимальную разницу для нужного набора {домен: ip}:
+запись с тем же IP остаётся на месте, с другим IP заменяется в той же строке,
+лишние и дубликаты удаляются, недостающие дописываются в конец. Пустая
+разница означает, что файл переписывать не нужно.
+
+Модуль не импортирует Qt.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, NamedTuple
+
+
+class HostsEntry(NamedTuple):
+    """Активная (не закомментированная) запись hosts"""
+    line_no: int  # индекс строки в HostsFileModel.lines
+    ip: str
+    domain: str
+
+
+@dataclass
+class HostsDiff:
+    """Минимальное изменение файла hosts"""
+    removed: list[int] = field(default_factory=list)        # номера удаляемых строк
+    replaced: dict[int, str] = field(default_factory=dict)  # номер строки -> новая строка
+    added: list[str] = field(default_factory=list)          # строки, дописываемые в конец
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.removed and not self.replaced and not self.added
+
+    def summary(self) -> str:
+        return f"добавлено {len(self.added)}, заменено {len(self.replaced)}, удалено {len(self.removed)}"
+
+
+def _parse_line(line: str) -> tuple[str, str] | None:
+    """(ip, домен) для активной строки hosts или None (пустая строка/комментарий)"""
+    parts = line.split()
+    if len(parts) < 2 or parts[0].startswith("#"):
+        return None
+    return parts[0], parts[1]
+
+
+def _format_entry(ip: str, domain: str) -> str:
+    return f"{ip} {domain}\n"
+
+
+class HostsFileModel:
+    """Неизменяемый разбор текста hosts"""
+
+    def __init__(self, text: str):
+        started = time.perf_counter()
+        self.text = text
+        self.lines: list[str] = text.splitlines(keepends=True)
+        self._by_line: dict[int, HostsEntry] = {}
+        self._by_domain: dict[str, list[int]] = {}
+
+        for line_no, line in enumerate(self.lines):
+            parsed = _parse_line(line)
+            if parsed is None:
+                continue
+            ip, domain = parsed
+            self._by_line[line_no] = HostsEntry(line_no, ip, domain)
+            self._by_domain.setdefault(domain, []).append(line_no)
+
+        self.parse_ms = (time.perf_counter() - started) * 1000
+        self.last_apply_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._by_line)
+
+    def entry_at(self, line_no: int) -> HostsEntry | None:
+        return self._by_line.get(line_no)
+
+    def entries_for(self, domain: str) -> list[HostsEntry]:
+        """Все активные записи домена в порядке следования в файле"""
+        return [self._by_line[line_no] for line_no in self._by_domain.get(domain, ())]
+
+    def has_any(self, domains: Iterable[str]) -> bool:
+        """Есть ли активная запись хотя бы для одного из доменов"""
+        by_domain = self._by_domain
+        return any(domain in by_domain for domain in domains)
+
+    def active_map(self, domains: Iterable[str]) -> dict[str, str]:
+        """{домен: ip} для найденных доменов (при дубликатах - последняя запись, как раньше)"""
+        result: dict[str, str] = {}
+        for domain in domains:
+            line_nos = self._by_domain.get(domain)
+            if line_nos:
+                result[domain] = self._by_line[line_nos[-1]].ip
+        return result
+
+    def plan_apply(self, managed_domains: Iterable[str], domain_ip_map: dict[str, str]) -> HostsDiff:
+        """
+        Разница, после которой из managed_domains в hosts останутся ровно
+        записи domain_ip_map (по одной на домен).
+        """
+        diff = HostsDiff()
+        targets = set(domain_ip_map)
+        for domain in set(managed_domains) | targets:
+            line_nos = self._by_domain.get(domain)
+            if not line_nos:
+                continue
+            ip = domain_ip_map.get(domain)
+            first, duplicates = line_nos[0], line_nos[1:]
+            if ip is None:
+                diff.removed.extend(line_nos)
+                continue
+            if self._by_line[first].ip != ip:
+                diff.replaced[first] = _format_entry(ip, domain)
+            diff.removed.extend(duplicates)
+
+        diff.removed.sort()
+        diff.added = [
+            _format_entry(ip, domain)
+            for domain, ip in domain_ip_map.items()
+            if domain not in self._by_domain
+        ]
+        return diff
+
+    def apply(self, diff: HostsDiff) -> str:
+        """Новый текст hosts после применения diff (время - в last_apply_ms)"""
+        started = time.perf_counter()
+        if diff.is_empty:
+            self.last_apply_ms = (time.perf_counter() - started) * 1000
+            return self.text
+
+        removed = set(diff.removed)
+        new_lines: list[str] = []
+        for line_no, line in enumerate(self.lines):
+            if line_no in removed:
+                continue
+            replacement = diff.replaced.get(line_no)
+            if replacement is not None:
+                # Сохраняем отсутствие перевода строки у последней строки файла
+                if not line.endswith("\n"):
+                    replacement = replacement.rstrip("\n")
+                new_lines.append(replacement)
+            else:
+                new_lines.append(line)
+
+        if removed or diff.added:
+            # Убираем лишние пустые строки в конце
+            while new_lines and new_lines[-1].strip() == "":
+                new_lines.pop()
+            if new_lines and not new_lines[-1].endswith("\n"):
+                new_lines[-1] += "\n"
+
+        if diff.added:
+            new_lines.append("\n")  # Разделитель
+            new_lines.extend(diff.added)
+
+        self.last_apply_ms = (time.perf_counter() - started) * 1000
+        return "".join(new_lines)
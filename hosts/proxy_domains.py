@@ -49,6 +49,7 @@ _CACHE_TEXT: str | None = None
 _CACHE_SIG: tuple[int, int] | None = None  # (mtime_ns, size)
 _CACHE_PATH: Path | None = None
 _MISSING_CATALOG_LOGGED: bool = False
+_MANAGED_DOMAINS_CACHE: tuple[HostsCatalog, frozenset[str]] | None = None
 
 
 def _get_app_root() -> Path:
@@ -319,6 +320,26 @@ def get_hosts_catalog_text() -> str:
         return _CACHE_TEXT or ""
 
 
+def get_all_service_domain_names() -> frozenset[str]:
+    """
+    Все домены всех сервисов каталога (управляемые домены hosts).
+    Кэшируется до перечитывания hosts.ini (по объекту каталога).
+    """
+    global _MANAGED_DOMAINS_CACHE
+    cat = _load_catalog()
+    with _CACHE_LOCK:
+        cached = _MANAGED_DOMAINS_CACHE
+        if cached is not None and cached[0] is cat:
+            return cached[1]
+        names = frozenset(
+            domain
+            for service_name in cat.service_order
+            for domain in (cat.services.get(service_name, {}) or {})
+        )
+        _MANAGED_DOMAINS_CACHE = (cat, names)
+        return names
+
+
 def get_dns_profiles() -> list[str]:
     return list(_load_catalog().dns_profiles)
 
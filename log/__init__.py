@@ -1,4 +1,4 @@
-from .log import log, LogViewerDialog, global_logger, LOG_FILE, cleanup_old_logs
+from .log import log, LogViewerDialog, global_logger, LOG_FILE, cleanup_old_logs, flush_logs, set_log_level
 from .crash_handler import install_crash_handler, install_qt_crash_handler, test_crash
 
 __all__ = [
@@ -7,6 +7,8 @@ __all__ = [
     'global_logger',
     'LOG_FILE',
     'cleanup_old_logs',
+    'flush_logs',
+    'set_log_level',
     # Crash handler
     'install_crash_handler',
     'install_qt_crash_handler',
@@ -0,0 +1,195 @@
+# log/buffered_writer.py
+"""
+Буферизованная асинхронная запись лог-файла.
+
+Раньше каждая строка лога открывала файл, дописывала строку и закрывала его
+(open/close + настройка кодека на каждую строку). BufferedLogWriter держит
+один открытый дескриптор, а строки пишет фоновый поток пачками:
+всё, что накопилось в очереди, пока шла предыдущая запись, уходит одним write().
+
+Очередь ограничена: если поток записи не успевает, write() ждёт (строки не теряются).
+flush() дожидается записи всего, что было поставлено в очередь до вызова -
+используется crash handler'ом перед завершением процесса.
+
+Модуль не зависит от Qt, чтобы его можно было тестировать и бенчмаркать отдельно.
+"""
+
+import atexit
+import queue
+import threading
+from typing import List, Optional
+
+
+# Размер очереди строк
+QUEUE_SIZE = 10000
+
+# Максимум строк в одной пачке записи
+MAX_BATCH = 1000
+
+# Ранги уровней логирования. Уровни вида "❌ ERROR" / "⚠ WARNING" определяются
+# по последнему слову, неизвестные (SUCCESS, DNS, 🔁 UPDATE...) считаются INFO.
+LEVEL_RANKS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 20,
+    "WARNING": 30,
+    "WARN": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+DEFAULT_RANK = LEVEL_RANKS["INFO"]
+
+_rank_cache: dict = {}
+
+
+def level_rank(level) -> int:
+    """Числовой ранг уровня логирования (результат кэшируется)"""
+    rank = _rank_cache.get(level)
+    if rank is None:
+        words = str(level).split()
+        rank = LEVEL_RANKS.get(words[-1].upper(), DEFAULT_RANK) if words else DEFAULT_RANK
+        _rank_cache[level] = rank
+    return rank
+
+
+class _FlushRequest:
+    """Маркер в очереди: сигнализирует, когда всё до него записано"""
+
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class BufferedLogWriter:
+    """
+    Запись строк в файл через фоновый поток.
+
+    Использование:
+        writer = BufferedLogWriter(path)
+        writer.write("[12:00:00] [INFO] message\\n")
+        writer.flush()   # дождаться записи на диск
+        writer.close()
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8-sig",
+                 queue_size: int = QUEUE_SIZE, max_batch: int = MAX_BATCH):
+        self.path = path
+        self.encoding = encoding
+        self.max_batch = max_batch
+
+        # Файл открыт в режиме append: для utf-8-sig BOM повторно не пишется
+        self._file = open(path, "a", encoding=encoding)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._sync_lock = threading.Lock()
+
+        # Статистика
+        self.lines_written = 0
+        self.batches_written = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ==================== API ====================
+
+    def write(self, text: str):
+        """Ставит текст в очередь на запись"""
+        if self._closed or threading.current_thread() is self._thread:
+            self._write_sync(text)
+            return
+        self._queue.put(text)
+
+    def flush(self, timeout: Optional[float] = 2.0) -> bool:
+        """
+        Ждёт, пока всё поставленное в очередь будет записано на диск.
+
+        Returns:
+            True если запись завершилась за timeout
+        """
+        if self._closed or not self._thread.is_alive():
+            return True
+        if threading.current_thread() is self._thread:
+            return False
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float = 2.0):
+        """Дописывает очередь и закрывает файл"""
+        if self._closed:
+            return
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+                self._thread.join(timeout)
+            except queue.Full:
+                pass
+        self._closed = True
+        with self._sync_lock:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+
+    # ==================== ПОТОК ЗАПИСИ ====================
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch: List[str] = []
+            waiters: List[_FlushRequest] = []
+            stop = False
+
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _FlushRequest):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+            for waiter in waiters:
+                waiter.done.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[str]):
+        with self._sync_lock:
+            try:
+                self._file.write("".join(batch))
+                self._file.flush()
+                self.lines_written += len(batch)
+                self.batches_written += 1
+            except Exception:
+                self.write_errors += 1
+
+    def _write_sync(self, text: str):
+        """Прямая запись (после close() или из самого потока записи)"""
+        with self._sync_lock:
+            try:
+                if self._file.closed:
+                    with open(self.path, "a", encoding=self.encoding) as f:
+                        f.write(text)
+                else:
+                    self._file.write(text)
+                    self._file.flush()
+            except Exception:
+                self.write_errors += 1
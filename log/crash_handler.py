@@ -175,6 +175,19 @@ def _log_crash(report: str, filepath: str = None):
     except Exception:
         pass
 
+    # Основной лог пишется фоновым потоком - дожидаемся записи буфера,
+    # иначе последние строки перед крашем могут не попасть в файл
+    _flush_main_log()
+
+
+def _flush_main_log():
+    """Сбрасывает буфер основного лога на диск"""
+    try:
+        from log import flush_logs
+        flush_logs(timeout=2.0)
+    except Exception:
+        pass
+
 
 def _python_exception_handler(exc_type, exc_value, exc_tb):
     """Обработчик необработанных исключений Python"""
@@ -15,6 +15,8 @@ from log_tail import LogTailWorker
 
 from config import LOGS_FOLDER, MAX_LOG_FILES, MAX_DEBUG_LOG_FILES
 
+from .buffered_writer import BufferedLogWriter, level_rank
+
 def get_current_log_filename():
     """Генерирует имя файла лога с текущей датой и временем"""
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -125,6 +127,12 @@ class Logger:
             f.write(f"Total log files in folder: {len(glob.glob(os.path.join(log_dir, 'zapret_log_*.txt')))}\n")
             f.write("="*60 + "\n\n")
 
+        # Один открытый дескриптор + фоновая запись пачками
+        self._writer = BufferedLogWriter(self.log_file)
+
+        # Сообщения ниже этого уровня отбрасываются до форматирования
+        self.min_level = level_rank("DEBUG")
+
         self.orig_stdout = sys.stdout
         self.orig_stderr = sys.stderr
         sys.stdout = sys.stderr = self           # перенаправляем
@@ -133,15 +141,24 @@ class Logger:
     def write(self, message: str):
         if self.orig_stdout:
             self.orig_stdout.write(message)
-        with open(self.log_file, "a", encoding="utf-8-sig") as f:
-            f.write(f"[{datetime.now():%H:%M:%S}] {message}")
+        self._writer.write(f"[{datetime.now():%H:%M:%S}] {message}")
 
     def flush(self):                              # нужен для print(...)
         if self.orig_stdout:
             self.orig_stdout.flush()
+
+    def flush_to_disk(self, timeout=2.0):
+        """Дожидается записи всех строк в файл (crash handler, просмотр лога)"""
+        return self._writer.flush(timeout)
+
+    def set_level(self, level):
+        """Минимальный уровень сообщений log() (например "INFO" скрывает DEBUG)"""
+        self.min_level = level_rank(level)
     
     # --- helper API -----------------------------------------------------------
     def log(self, message, level="INFO", component=None):
+        if level_rank(level) < self.min_level:
+            return
         prefix = f"[{component}][{level}]" if component else f"[{level}]"
         self.write(f"{prefix} {message}\n")
 
@@ -173,6 +190,7 @@ class Logger:
     
     def get_log_content(self):
         """Return the content of the log file"""
+        self.flush_to_disk()
         try:
             with open(self.log_file, 'r', encoding='utf-8') as f:
                 return f.read()
@@ -428,6 +446,8 @@ except Exception:
         def log(self, *_a, **_kw): pass
         def log_exception(self, *_a, **_kw): pass
         def get_log_content(self): return "Logging system initialization failed."
+        def flush_to_disk(self, *_a, **_kw): return True
+        def set_level(self, *_a, **_kw): pass
     global_logger = _FallbackLogger()
 
 def log(msg, level="INFO", component=None):       # удобный helper
@@ -438,3 +458,9 @@ def log_exception(e, context=""):                 # helper для исключе
 
 def get_log_content():
     return global_logger.get_log_content()
+
+def flush_logs(timeout=2.0):                      # дописать буфер на диск
+    return global_logger.flush_to_disk(timeout)
+
+def set_log_level(level):                         # минимальный уровень log()
+    global_logger.set_level(level)
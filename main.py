@@ -44,6 +44,15 @@ Directory contents: {os.listdir(app_dir) if os.path.exists(app_dir) else 'N/A'}
 
 _set_workdir_to_app()
 
+# ──────────────────────────────────────────────────────────────
+# Профилировщик запуска (--profile-startup / --profile-startup-exit)
+# ──────────────────────────────────────────────────────────────
+from startup.profiler import startup_profiler
+startup_profiler.configure()
+if startup_profiler.exit_after_init:
+    # Headless режим: окно не показывается, приложение выходит после инициализации
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
 # ──────────────────────────────────────────────────────────────
 # ✅ УБРАНО: Очистка _MEI* папок больше не нужна
 # Приложение собирается в режиме --onedir (папка с файлами)
@@ -67,23 +76,31 @@ def _preload_slow_modules():
     """
     import threading
     
+    # Порядок важен! PyQt должен быть загружен до qt_material.
+    # Время каждого импорта - в отчёте профилировщика запуска (категория "preload").
+    modules = (
+        "PyQt6.QtWidgets",
+        "PyQt6.QtCore",
+        "PyQt6.QtGui",
+        "jinja2",        # нужен qt_material
+        "requests",
+        "qtawesome",     # нужен после PyQt
+        "qt_material",   # нужен после PyQt
+        "psutil",
+        "json",          # для config и API
+        "winreg",        # для реестра Windows
+    )
+
     def _preload():
-        try:
-            # Порядок важен! PyQt должен быть загружен до qt_material
-            import PyQt6.QtWidgets  # ~17ms
-            import PyQt6.QtCore
-            import PyQt6.QtGui
-            import jinja2            # ~1ms, но нужен qt_material
-            import requests          # ~99ms
-            import qtawesome         # ~115ms (нужен после PyQt)
-            import qt_material       # ~90ms (нужен после PyQt)
-            import psutil            # ~10ms
-            import json              # для config и API
-            import winreg            # для реестра Windows
-        except Exception:
-            pass  # Ошибки при предзагрузке не критичны
+        import importlib
+        for name in modules:
+            try:
+                with startup_profiler.span(name, "preload"):
+                    importlib.import_module(name)
+            except Exception:
+                pass  # Ошибки при предзагрузке не критичны
     
-    t = threading.Thread(target=_preload, daemon=True)
+    t = threading.Thread(target=_preload, daemon=True, name="StartupPreload")
     t.start()
 
 _preload_slow_modules()
@@ -116,6 +133,10 @@ from log import log
 from config import CHANNEL
 from ui.page_names import PageName, SectionName
 
+# Headless профилирование: максимальное время ожидания инициализации
+STARTUP_PROFILE_TIMEOUT_MS = 120_000
+
+
 def _set_attr_if_exists(name: str, on: bool = True) -> None:
     """Безопасно включает атрибут, если он есть в текущей версии Qt."""
     from PyQt6.QtCore import QCoreApplication
@@ -204,18 +225,18 @@ class LupiDPIApp(QWidget, MainWindowUI, ThemeSubscriptionManager, FramelessWindo
             except Exception as e:
                 log(f"Ошибка при очистке theme_manager: {e}", "DEBUG")
         
-        # ✅ Очищаем страницы с потоками
+        # ✅ Очищаем страницы с потоками (только созданные - страницы создаются лениво)
         try:
-            if hasattr(self, 'logs_page') and hasattr(self.logs_page, 'cleanup'):
-                self.logs_page.cleanup()
-            if hasattr(self, 'servers_page') and hasattr(self.servers_page, 'cleanup'):
-                self.servers_page.cleanup()
-            if hasattr(self, 'connection_page') and hasattr(self.connection_page, 'cleanup'):
-                self.connection_page.cleanup()
-            if hasattr(self, 'dns_check_page') and hasattr(self.dns_check_page, 'cleanup'):
-                self.dns_check_page.cleanup()
-            if hasattr(self, 'hosts_page') and hasattr(self.hosts_page, 'cleanup'):
-                self.hosts_page.cleanup()
+            for page_name in (
+                PageName.LOGS,
+                PageName.SERVERS,
+                PageName.CONNECTION_TEST,
+                PageName.DNS_CHECK,
+                PageName.HOSTS,
+            ):
+                page = self.get_loaded_page(page_name)
+                if page is not None and hasattr(page, 'cleanup'):
+                    page.cleanup()
         except Exception as e:
             log(f"Ошибка при очистке страниц: {e}", "DEBUG")
         
@@ -1040,7 +1061,8 @@ class LupiDPIApp(QWidget, MainWindowUI, ThemeSubscriptionManager, FramelessWindo
             pass
 
         # Теперь строим UI в main_widget (не в self)
-        self._build_main_ui()
+        with startup_profiler.span("build_ui", "phase"):
+            self._build_main_ui()
 
         # Создаем менеджеры
         from managers.initialization_manager import InitializationManager
@@ -1761,7 +1783,8 @@ def main():
         _set_attr_if_exists("AA_EnableHighDpiScaling")
         _set_attr_if_exists("AA_UseHighDpiPixmaps")
 
-        app = QApplication(sys.argv)
+        with startup_profiler.span("QApplication()", "phase"):
+            app = QApplication(sys.argv)
 
         # На Windows принудительно отключаем "transient/overlay" скроллбары
         # (иначе они могут не отображаться/быть практически невидимыми).
@@ -1808,7 +1831,15 @@ def main():
                 "⚠️ KASPERSKY")
 
     # СОЗДАЁМ ОКНО
-    window = LupiDPIApp(start_in_tray=start_in_tray)
+    with startup_profiler.span("LupiDPIApp()", "phase"):
+        window = LupiDPIApp(start_in_tray=start_in_tray)
+
+    if startup_profiler.enabled:
+        # Headless профилирование: выходим сразу после инициализации (код 1 - не всё инициализировано)
+        if startup_profiler.exit_after_init:
+            startup_profiler.on_finished(lambda ok: QTimer.singleShot(0, lambda: QApplication.exit(0 if ok else 1)))
+            QTimer.singleShot(STARTUP_PROFILE_TIMEOUT_MS, lambda: startup_profiler.finish(False, "timeout"))
+        log(f"Профилирование запуска включено, trace: {startup_profiler.trace_path}", "INFO")
 
     # ✅ ЗАПУСКАЕМ IPC СЕРВЕР
     ipc_manager = IPCManager()
@@ -1921,7 +1952,8 @@ def main():
         log(f"UNCAUGHT EXCEPTION: {error_msg}", level="❌ CRITICAL")
 
     sys.excepthook = global_exception_handler
-    
+
+    startup_profiler.instant("event_loop_start")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 from PyQt6.QtCore import QTimer, QThread, QObject, pyqtSignal
 from log import log
+from startup.profiler import startup_profiler
 
 
 class InitializationManager:
@@ -97,7 +98,7 @@ class InitializationManager:
 
         for delay, task in init_tasks:
             log(f"🟡 Планируем {task.__name__} через {delay}ms", "DEBUG")
-            QTimer.singleShot(delay, task)
+            QTimer.singleShot(delay, startup_profiler.wrap(task, task.__name__, "init"))
 
         # Мягкая верификация с повторами
         if not self._verify_timer_started:
@@ -681,6 +682,7 @@ class InitializationManager:
             except Exception:
                 pass
             log("Все компоненты успешно инициализированы", "✅ SUCCESS")
+            startup_profiler.finish(True)
 
             # Финальные задачи
             QTimer.singleShot(500, self._post_init_tasks)
@@ -721,6 +723,9 @@ class InitializationManager:
         except Exception:
             pass
         log(error_msg, "❌ ERROR")
+        startup_profiler.finish(False, "init_incomplete")
+        if startup_profiler.exit_after_init:
+            return
 
         try:
             from PyQt6.QtWidgets import QMessageBox
@@ -23,11 +23,12 @@
 """
 
 import json
-from typing import Dict, List, Callable, Optional, Set
+from typing import Dict, List, Callable, Optional, Set, Tuple
 
 from log import log
 from config import REGISTRY_PATH
-from config.reg import reg, reg_enumerate_values, reg_delete_all_values, reg_delete_value
+from config.reg import reg, reg_enumerate_values, reg_delete_all_values
+from .registry_writer import RegistryWriteBehind, get_registry_writer
 
 
 # Все 9 askey профилей (синхронизировано с locked_strategies_manager)
@@ -148,10 +149,11 @@ class BlockedStrategiesManager:
     Использует унифицированную структуру по 9 askey профилям (аналогично locked_strategies_manager).
     """
 
-    def __init__(self, locked_manager=None):
+    def __init__(self, locked_manager=None, writer: Optional[RegistryWriteBehind] = None):
         """
         Args:
             locked_manager: LockedStrategiesManager для удаления конфликтующих locks
+            writer: Очередь отложенной записи в реестр (по умолчанию общая get_registry_writer())
         """
         # Унифицированный словарь заблокированных стратегий по askey: {askey: {hostname: [strategy_list]}}
         self.blocked_by_askey: Dict[str, Dict[str, List[int]]] = {askey: {} for askey in ASKEY_ALL}
@@ -167,6 +169,10 @@ class BlockedStrategiesManager:
         # Менеджер залоченных стратегий (для удаления конфликтов)
         self.locked_manager = locked_manager
 
+        # Отложенная запись в реестр: save() ставит в очередь только изменённые (askey, hostname)
+        self.writer = writer if writer is not None else get_registry_writer()
+        self._dirty: Set[Tuple[str, str]] = set()
+
         # Callback для уведомлений (опционально)
         self.output_callback: Optional[Callable[[str], None]] = None
 
@@ -239,6 +245,10 @@ class BlockedStrategiesManager:
 
     def load(self):
         """Загружает заблокированные стратегии из реестра + дефолтные блокировки s1"""
+        # Дописываем в реестр всё, что ещё стоит в очереди, иначе прочитаем устаревшие данные
+        self.writer.flush()
+        self._dirty.clear()
+
         # Очищаем все словари по askey БЕЗ создания новых (сохраняем ссылки!)
         for askey in ASKEY_ALL:
             self.blocked_by_askey[askey].clear()
@@ -312,44 +322,48 @@ class BlockedStrategiesManager:
         except Exception as e:
             log(f"Ошибка загрузки blocked strategies: {e}", "DEBUG")
 
-    def save(self):
-        """Сохраняет заблокированные стратегии в реестр (только пользовательские)"""
+    def mark_dirty(self, hostname: str, askey: str = "tls"):
+        """Помечает блокировки домена в askey как изменённые (будут записаны при save())"""
+        self._dirty.add((self._normalize_askey(askey), self._normalize_hostname(hostname)))
+
+    def save(self, full: bool = False):
+        """
+        Сохраняет изменённые блокировки в реестр (только пользовательские).
+
+        Записи ставятся в очередь writer'а. Если у домена не осталось пользовательских
+        блокировок, его значение удаляется из реестра.
+
+        Args:
+            full: True - переписать блокировки всех доменов всех askey
+        """
         try:
+            if full:
+                for askey in ASKEY_ALL:
+                    self._dirty.update((askey, hostname) for hostname in list(self.blocked_by_askey[askey]))
+                    self._dirty.update((askey, hostname) for hostname in list(self.user_blocked_by_askey[askey]))
+
+            dirty, self._dirty = self._dirty, set()
             total_saved = 0
 
-            # Сохраняем для всех 9 askey профилей
-            for askey in ASKEY_ALL:
+            for askey, hostname in dirty:
                 reg_path = get_blocked_registry_path(askey)
                 user_reg_path = get_user_blocked_registry_path(askey)
-                target_dict = self.blocked_by_askey[askey]
-                user_dict = self.user_blocked_by_askey[askey]
 
-                # Собираем данные для сохранения (только пользовательские блокировки)
-                to_save = {}
-                for hostname, strategies in target_dict.items():
-                    hostname_norm = self._normalize_hostname(hostname)
-                    # Фильтруем только пользовательские блокировки
-                    user_strategies = [s for s in strategies if not self.is_default_blocked(hostname_norm, s)]
-                    if user_strategies:
-                        to_save[hostname_norm] = user_strategies
-
-                # Сохраняем blocked
-                for hostname, user_strategies in to_save.items():
-                    try:
-                        json_str = json.dumps(user_strategies)
-                        reg(reg_path, hostname, json_str)
-                        total_saved += len(user_strategies)
-                    except Exception as e:
-                        log(f"Ошибка сохранения blocked для {hostname} [{askey}]: {e}", "DEBUG")
-
-                # Сохраняем user blocks маркеры
-                for hostname, strategies_set in user_dict.items():
-                    if strategies_set:
-                        try:
-                            json_str = json.dumps(sorted(list(strategies_set)))
-                            reg(user_reg_path, hostname, json_str)
-                        except Exception as e:
-                            log(f"Ошибка сохранения user_blocked для {hostname} [{askey}]: {e}", "DEBUG")
+                # Фильтруем только пользовательские блокировки
+                strategies = self.blocked_by_askey[askey].get(hostname, [])
+                user_strategies = [s for s in strategies if not self.is_default_blocked(hostname, s)]
+                if user_strategies:
+                    self.writer.set(reg_path, hostname, json.dumps(user_strategies))
+                    total_saved += len(user_strategies)
+                else:
+                    self.writer.delete(reg_path, hostname)
+
+                # User blocks маркеры
+                strategies_set = self.user_blocked_by_askey[askey].get(hostname)
+                if strategies_set:
+                    self.writer.set(user_reg_path, hostname, json.dumps(sorted(strategies_set)))
+                else:
+                    self.writer.delete(user_reg_path, hostname)
 
             if total_saved > 0:
                 log(f"Сохранено {total_saved} пользовательских заблокированных стратегий", "DEBUG")
@@ -510,6 +524,7 @@ class BlockedStrategiesManager:
                     user_dict[hostname] = set()
                 user_dict[hostname].add(strategy)
 
+            self.mark_dirty(hostname, askey)
             self.save()
             block_type = "[USER] " if user_block else ""
             log(f"{block_type}Заблокирована стратегия #{strategy} для {hostname} [{askey.upper()}]", "INFO")
@@ -544,8 +559,6 @@ class BlockedStrategiesManager:
 
         target_dict = self.blocked_by_askey[askey]
         user_dict = self.user_blocked_by_askey[askey]
-        reg_path = get_blocked_registry_path(askey)
-        user_reg_path = get_user_blocked_registry_path(askey)
 
         if hostname in target_dict:
             if strategy in target_dict[hostname]:
@@ -556,25 +569,14 @@ class BlockedStrategiesManager:
                     user_dict[hostname].discard(strategy)
                     if not user_dict[hostname]:
                         del user_dict[hostname]
-                        try:
-                            reg_delete_value(user_reg_path, hostname)
-                        except Exception:
-                            pass
 
-                # Если остались только дефолтные блокировки - удаляем ключ из реестра
-                user_strategies = [s for s in target_dict[hostname] if not self.is_default_blocked(hostname, s)]
-                if not user_strategies:
-                    # Удаляем из реестра (но оставляем в памяти если есть дефолтные)
-                    try:
-                        reg_delete_value(reg_path, hostname)
-                    except Exception:
-                        pass
-                    # Если нет дефолтных - удаляем и из памяти
-                    if not target_dict[hostname]:
-                        del target_dict[hostname]
-                else:
-                    # Сохраняем только пользовательские
-                    self.save()
+                # Если блокировок не осталось - удаляем и из памяти
+                if not target_dict[hostname]:
+                    del target_dict[hostname]
+
+                # save() удалит значения из реестра, если пользовательских блокировок не осталось
+                self.mark_dirty(hostname, askey)
+                self.save()
 
                 log(f"Разблокирована стратегия #{strategy} для {hostname} [{askey.upper()}]", "INFO")
 
@@ -596,6 +598,10 @@ class BlockedStrategiesManager:
                     if not self.is_default_blocked(hostname, strategy):
                         user_count += 1
 
+        # Сначала дописываем очередь, чтобы отложенные записи не воскресили данные после очистки
+        self._dirty.clear()
+        self.writer.flush()
+
         # Очищаем реестр для всех askey (там только пользовательские)
         for askey in ASKEY_ALL:
             try:
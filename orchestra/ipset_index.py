@@ -0,0 +1,241 @@
+# orchestra/ipset_index.py
+"""
+Индекс ipset подсетей для быстрого определения сервиса по IP (UDP/QUIC).
+
+Все подсети из ipset-*.txt и my-ipset.txt переводятся в целочисленные
+диапазоны [start, end] и "расплющиваются" в отсортированный список
+непересекающихся отрезков (отдельно IPv4 и IPv6). Поиск - bisect, O(log n).
+
+Приоритет при пересечении подсетей такой же, как у прежнего линейного
+поиска: побеждает подсеть из файла, который идёт раньше в списке файлов
+(ipset-*.txt по алфавиту, my-ipset.txt последним), внутри файла - более ранняя строка.
+
+Результаты поиска кэшируются в LRU. refresh() перечитывает только
+изменившиеся файлы (по mtime+size) и пересобирает индекс.
+"""
+
+import glob
+import heapq
+import ipaddress
+import os
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from log import log
+
+
+# Размер LRU кэша результатов поиска
+LOOKUP_CACHE_SIZE = 4096
+
+# Как часто (секунды) resolve() проверяет изменения файлов на диске
+REFRESH_CHECK_INTERVAL = 5.0
+
+# Маркер "IP не найден" в кэше
+_MISS = object()
+
+
+def label_for_path(path: str) -> str:
+    """ipset-discord.txt -> discord, my-ipset.txt -> my-ipset"""
+    label = os.path.splitext(os.path.basename(path))[0]
+    if label.startswith("ipset-"):
+        label = label[len("ipset-"):]
+    return label
+
+
+def parse_ipset_file(path: str) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """
+    Читает ipset файл.
+
+    Returns:
+        (диапазоны IPv4, диапазоны IPv6) в порядке строк файла
+    """
+    v4: List[Tuple[int, int]] = []
+    v6: List[Tuple[int, int]] = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                net = ipaddress.ip_network(line, strict=False)
+            except ValueError:
+                continue
+            rng = (int(net.network_address), int(net.broadcast_address))
+            (v4 if net.version == 4 else v6).append(rng)
+    return v4, v6
+
+
+def build_ranges(ranges: List[Tuple[int, int, int, str]]) -> Tuple[List[int], List[int], List[str]]:
+    """
+    Строит непересекающиеся отрезки из (start, end, priority, label).
+    В каждой точке побеждает диапазон с наименьшим priority.
+
+    Returns:
+        (starts, ends, labels) - параллельные списки, отсортированы по start
+    """
+    starts: List[int] = []
+    ends: List[int] = []
+    labels: List[str] = []
+    if not ranges:
+        return starts, ends, labels
+
+    ranges = sorted(ranges)
+    bounds = sorted({r[0] for r in ranges} | {r[1] + 1 for r in ranges})
+    heap: List[Tuple[int, int, str]] = []  # (priority, end, label)
+    i = 0
+    for b_index, point in enumerate(bounds[:-1]):
+        while i < len(ranges) and ranges[i][0] == point:
+            start, end, priority, label = ranges[i]
+            heapq.heappush(heap, (priority, end, label))
+            i += 1
+        while heap and heap[0][1] < point:
+            heapq.heappop(heap)
+        if not heap:
+            continue
+        seg_end = bounds[b_index + 1] - 1
+        label = heap[0][2]
+        if labels and labels[-1] == label and ends[-1] + 1 == point:
+            ends[-1] = seg_end
+        else:
+            starts.append(point)
+            ends.append(seg_end)
+            labels.append(label)
+    return starts, ends, labels
+
+
+class IpsetIndex:
+    """
+    Индекс подсетей ipset-файлов папки lists.
+
+    Использование:
+        index = IpsetIndex(LISTS_FOLDER)
+        index.refresh()
+        index.resolve("162.159.130.234")  # -> "discord"
+    """
+
+    def __init__(self, folder: str, cache_size: int = LOOKUP_CACHE_SIZE,
+                 check_interval: float = REFRESH_CHECK_INTERVAL):
+        self.folder = folder
+        self.cache_size = cache_size
+        self.check_interval = check_interval
+
+        # {path: ((mtime, size), v4_ranges, v6_ranges)}
+        self._files: Dict[str, tuple] = {}
+        self._tables: Dict[int, Tuple[List[int], List[int], List[str]]] = {
+            4: ([], [], []),
+            6: ([], [], []),
+        }
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+        self._last_check = 0.0
+
+        # Статистика
+        self.network_count = 0
+        self.rebuild_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self) -> int:
+        return self.network_count
+
+    def _list_files(self) -> List[str]:
+        files = sorted(glob.glob(os.path.join(self.folder, "ipset-*.txt")))
+        # Пользовательский ipset - последним (наименьший приоритет, как раньше)
+        files.append(os.path.join(self.folder, "my-ipset.txt"))
+        return files
+
+    def refresh(self) -> bool:
+        """
+        Перечитывает изменившиеся файлы и пересобирает индекс.
+
+        Returns:
+            True если индекс был пересобран
+        """
+        self._last_check = time.monotonic()
+        paths = [p for p in self._list_files() if os.path.exists(p)]
+
+        changed = set(self._files) - set(paths)
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                changed.add(path)
+                continue
+            signature = (st.st_mtime_ns, st.st_size)
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == signature:
+                continue
+            try:
+                v4, v6 = parse_ipset_file(path)
+            except Exception as e:
+                log(f"Ошибка чтения {path}: {e}", "DEBUG")
+                v4, v6 = [], []
+            self._files[path] = (signature, v4, v6)
+            changed.add(path)
+
+        for path in list(self._files):
+            if path not in paths:
+                del self._files[path]
+
+        if not changed and self.rebuild_count:
+            return False
+
+        self._rebuild(paths)
+        return True
+
+    def _rebuild(self, paths: List[str]):
+        v4_ranges: List[Tuple[int, int, int, str]] = []
+        v6_ranges: List[Tuple[int, int, int, str]] = []
+        priority = 0
+        for path in paths:
+            entry = self._files.get(path)
+            if entry is None:
+                continue
+            label = label_for_path(path)
+            for target, ranges in ((v4_ranges, entry[1]), (v6_ranges, entry[2])):
+                for start, end in ranges:
+                    target.append((start, end, priority, label))
+                    priority += 1
+
+        self._tables = {4: build_ranges(v4_ranges), 6: build_ranges(v6_ranges)}
+        self._cache.clear()
+        self.network_count = len(v4_ranges) + len(v6_ranges)
+        self.rebuild_count += 1
+        if self.network_count:
+            log(f"Загружено {self.network_count} ipset подсетей ({len(paths)} файлов)", "DEBUG")
+
+    def resolve(self, ip: str) -> Optional[str]:
+        """Возвращает имя ipset файла по IP или None"""
+        if not ip:
+            return None
+        if self.check_interval is not None and time.monotonic() - self._last_check >= self.check_interval:
+            try:
+                self.refresh()
+            except Exception as e:
+                log(f"Ошибка обновления ipset индекса: {e}", "DEBUG")
+
+        cached = self._cache.get(ip)
+        if cached is not None:
+            self._cache.move_to_end(ip)
+            self.cache_hits += 1
+            return None if cached is _MISS else cached
+
+        self.cache_misses += 1
+        label = self._lookup(ip)
+        self._cache[ip] = _MISS if label is None else label
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return label
+
+    def _lookup(self, ip: str) -> Optional[str]:
+        try:
+            ip_obj = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        starts, ends, labels = self._tables[ip_obj.version]
+        value = int(ip_obj)
+        pos = bisect_right(starts, value) - 1
+        if pos >= 0 and value <= ends[pos]:
+            return labels[pos]
+        return None
@@ -20,11 +20,12 @@
 """
 
 import json
-from typing import Dict, Optional, Callable, Set, List
+from typing import Dict, Optional, Callable, Set, List, Tuple
 
 from log import log
 from config import REGISTRY_PATH
-from config.reg import reg, reg_enumerate_values, reg_delete_all_values, reg_delete_value
+from config.reg import reg, reg_enumerate_values, reg_delete_all_values
+from .registry_writer import RegistryWriteBehind, get_registry_writer
 
 
 # Все 9 askey профилей
@@ -84,10 +85,11 @@ class LockedStrategiesManager:
     Использует унифицированную структуру по 9 askey профилям.
     """
 
-    def __init__(self, blocked_manager=None):
+    def __init__(self, blocked_manager=None, writer: Optional[RegistryWriteBehind] = None):
         """
         Args:
             blocked_manager: BlockedStrategiesManager для проверки заблокированных стратегий
+            writer: Очередь отложенной записи в реестр (по умолчанию общая get_registry_writer())
         """
         # Унифицированный словарь залоченных стратегий по askey: {askey: {hostname: strategy}}
         self.locked_by_askey: Dict[str, Dict[str, int]] = {askey: {} for askey in ASKEY_ALL}
@@ -101,6 +103,12 @@ class LockedStrategiesManager:
         # Менеджер заблокированных стратегий (для проверки конфликтов)
         self.blocked_manager = blocked_manager
 
+        # Отложенная запись в реестр: save()/save_history() ставят в очередь
+        # только записи, изменённые с прошлого сохранения
+        self.writer = writer if writer is not None else get_registry_writer()
+        self._dirty_locked: Set[Tuple[str, str]] = set()  # (askey, hostname)
+        self._dirty_history: Set[str] = set()  # hostname
+
         # Callbacks
         self.output_callback: Optional[Callable[[str], None]] = None
         self.lock_callback: Optional[Callable[[str, int], None]] = None
@@ -182,10 +190,7 @@ class LockedStrategiesManager:
                 quic_path = get_registry_path("quic")
                 for ip, strategy in old_udp_data.items():
                     reg(quic_path, ip, int(strategy))
-                    try:
-                        reg_delete_value(REGISTRY_ORCHESTRA_UDP, ip)
-                    except Exception:
-                        pass
+                    self.writer.delete(REGISTRY_ORCHESTRA_UDP, ip)
                 migrated = True
                 log(f"Мигрировано {len(old_udp_data)} UDP стратегий в Quic", "INFO")
 
@@ -195,10 +200,7 @@ class LockedStrategiesManager:
                 user_quic_path = get_user_registry_path("quic")
                 for ip in old_user_udp_data.keys():
                     reg(user_quic_path, ip, 1)
-                    try:
-                        reg_delete_value(REGISTRY_ORCHESTRA_USER_UDP, ip)
-                    except Exception:
-                        pass
+                    self.writer.delete(REGISTRY_ORCHESTRA_USER_UDP, ip)
                 migrated = True
                 log(f"Мигрировано {len(old_user_udp_data)} UserUDP locks в UserQuic", "INFO")
 
@@ -217,6 +219,10 @@ class LockedStrategiesManager:
         Returns:
             Словарь TLS стратегий {hostname: strategy} (для backward compatibility)
         """
+        # Дописываем в реестр всё, что ещё стоит в очереди, иначе прочитаем устаревшие данные
+        self.writer.flush()
+        self._dirty_locked.clear()
+
         # Очищаем все словари по askey БЕЗ создания новых (сохраняем ссылки!)
         for askey in ASKEY_ALL:
             self.locked_by_askey[askey].clear()
@@ -294,10 +300,7 @@ class LockedStrategiesManager:
                         if hostname not in user_set:  # Не удалять user locks!
                             blocked_cleaned.append((hostname, askey))
                             del target_dict[hostname]
-                            try:
-                                reg_delete_value(reg_path, hostname)
-                            except Exception:
-                                pass
+                            self.writer.delete(reg_path, hostname)
 
             # Очистка конфликтов: locked + blocked = удаляем lock (включая user locks!)
             # ВАЖНО: blocked имеет ПРИОРИТЕТ над user_lock
@@ -306,17 +309,11 @@ class LockedStrategiesManager:
                     conflicts_cleaned.append((hostname, strategy, askey.upper()))
                     del target_dict[hostname]
                     # Удаляем из реестра locked
-                    try:
-                        reg_delete_value(reg_path, hostname)
-                    except Exception:
-                        pass
+                    self.writer.delete(reg_path, hostname)
                     # Удаляем также из user locks если есть
                     if hostname in user_set:
                         user_set.discard(hostname)
-                        try:
-                            reg_delete_value(user_reg_path, hostname)
-                        except Exception:
-                            pass
+                        self.writer.delete(user_reg_path, hostname)
 
         if blocked_cleaned:
             sample = [f"{h}[{a}]" for h, a in blocked_cleaned[:5]]
@@ -327,29 +324,49 @@ class LockedStrategiesManager:
             for hostname, strategy, askey_upper in conflicts_cleaned[:10]:
                 log(f"  - {hostname} strategy={strategy} [{askey_upper}]", "INFO")
 
-    def save(self):
-        """Сохраняет залоченные стратегии в реестр"""
-        try:
-            total_saved = 0
+    def mark_dirty(self, hostname: str, askey: str = "tls"):
+        """
+        Помечает запись locked_by_askey[askey][hostname] как изменённую.
+        Нужно вызывать после прямого изменения словарей locked_by_askey
+        (запись или удаление) - при следующем save() значение попадёт в реестр.
+        """
+        self._dirty_locked.add((self._normalize_askey(askey), hostname))
 
-            # Сохраняем стратегии для всех 9 askey профилей
-            for askey in ASKEY_ALL:
-                reg_path = get_registry_path(askey)
-                target_dict = self.locked_by_askey[askey]
+    def save(self, full: bool = False):
+        """
+        Сохраняет изменённые залоченные стратегии в реестр.
+
+        Записи ставятся в очередь writer'а и пишутся в реестр фоновым потоком
+        (или при writer.flush()). Удалённые из словарей хосты удаляются из реестра.
+
+        Args:
+            full: True - переписать все стратегии всех askey, а не только изменённые
+        """
+        try:
+            if full:
+                for askey in ASKEY_ALL:
+                    self._dirty_locked.update((askey, hostname) for hostname in list(self.locked_by_askey[askey]))
 
-                for hostname, strategy in target_dict.items():
-                    reg(reg_path, hostname, int(strategy))
-                total_saved += len(target_dict)
+            dirty, self._dirty_locked = self._dirty_locked, set()
+            for askey, hostname in dirty:
+                strategy = self.locked_by_askey[askey].get(hostname)
+                if strategy is None:
+                    self.writer.delete(get_registry_path(askey), hostname)
+                else:
+                    self.writer.set(get_registry_path(askey), hostname, int(strategy))
 
-            # Логируем детальную статистику
-            stats = ", ".join(f"{askey.upper()}: {len(self.locked_by_askey[askey])}"
-                              for askey in ASKEY_ALL if self.locked_by_askey[askey])
-            if stats:
-                log(f"Сохранено {total_saved} стратегий ({stats})", "DEBUG")
+            if dirty:
+                log(f"Сохранение {len(dirty)} изменённых стратегий поставлено в очередь", "DEBUG")
 
         except Exception as e:
             log(f"Ошибка сохранения стратегий в реестр: {e}", "ERROR")
 
+    def flush(self):
+        """Немедленно записывает в реестр всё, что стоит в очереди"""
+        self.save()
+        self.save_history()
+        self.writer.flush()
+
     # ==================== LOCK/UNLOCK ====================
 
     def lock(self, hostname: str, strategy: int, proto: str = "tls", user_lock: bool = False):
@@ -373,12 +390,13 @@ class LockedStrategiesManager:
 
         # Сохраняем стратегию
         target_dict[hostname] = strategy
-        reg(reg_path, hostname, strategy)
+        self._dirty_locked.discard((askey, hostname))
+        self.writer.set(reg_path, hostname, int(strategy))
 
         # Если user_lock - добавляем в user set и сохраняем в реестр
         if user_lock:
             user_set.add(hostname)
-            reg(user_reg_path, hostname, 1)  # Просто маркер (значение 1)
+            self.writer.set(user_reg_path, hostname, 1)  # Просто маркер (значение 1)
             log(f"[USER] Залочена стратегия #{strategy} для {hostname} [{askey.upper()}]", "INFO")
         else:
             log(f"Залочена стратегия #{strategy} для {hostname} [{askey.upper()}]", "INFO")
@@ -411,18 +429,13 @@ class LockedStrategiesManager:
             old_strategy = target_dict[hostname]
             del target_dict[hostname]
             # Удаляем из реестра
-            try:
-                reg(reg_path, hostname, None)  # None = удалить значение
-            except Exception:
-                pass
+            self._dirty_locked.discard((askey, hostname))
+            self.writer.delete(reg_path, hostname)
 
             # Удаляем также из user locks если есть
             if hostname in user_set:
                 user_set.discard(hostname)
-                try:
-                    reg(user_reg_path, hostname, None)
-                except Exception:
-                    pass
+                self.writer.delete(user_reg_path, hostname)
 
             log(f"Разлочена стратегия #{old_strategy} для {hostname} [{askey.upper()}]", "INFO")
 
@@ -457,6 +470,11 @@ class LockedStrategiesManager:
             True если очистка успешна
         """
         try:
+            # Сначала дописываем очередь, чтобы отложенные записи не воскресили данные после очистки
+            self._dirty_locked.clear()
+            self._dirty_history.clear()
+            self.writer.flush()
+
             # Очищаем реестр для всех 9 askey профилей
             for askey in ASKEY_ALL:
                 try:
@@ -553,6 +571,8 @@ class LockedStrategiesManager:
 
     def load_history(self):
         """Загружает историю стратегий из реестра"""
+        self.writer.flush()
+        self._dirty_history.clear()
         self.strategy_history = {}
         try:
             history_data = reg_enumerate_values(REGISTRY_ORCHESTRA_HISTORY)
@@ -568,13 +588,24 @@ class LockedStrategiesManager:
             log(f"Ошибка загрузки истории: {e}", "DEBUG")
             self.strategy_history = {}
 
-    def save_history(self):
-        """Сохраняет историю стратегий в реестр"""
+    def save_history(self, full: bool = False):
+        """
+        Сохраняет историю изменённых доменов в реестр (через очередь writer'а).
+
+        Args:
+            full: True - переписать историю всех доменов
+        """
         try:
-            for domain, strategies in self.strategy_history.items():
-                json_str = json.dumps(strategies, ensure_ascii=False)
-                reg(REGISTRY_ORCHESTRA_HISTORY, domain, json_str)
-            log(f"Сохранена история для {len(self.strategy_history)} доменов", "DEBUG")
+            if full:
+                self._dirty_history.update(list(self.strategy_history))
+
+            dirty, self._dirty_history = self._dirty_history, set()
+            for domain in dirty:
+                strategies = self.strategy_history.get(domain)
+                if strategies is None:
+                    self.writer.delete(REGISTRY_ORCHESTRA_HISTORY, domain)
+                else:
+                    self.writer.set(REGISTRY_ORCHESTRA_HISTORY, domain, json.dumps(strategies, ensure_ascii=False))
         except Exception as e:
             log(f"Ошибка сохранения истории: {e}", "ERROR")
 
@@ -588,6 +619,7 @@ class LockedStrategiesManager:
             'successes': successes,
             'failures': failures
         }
+        self._dirty_history.add(hostname)
 
     def increment_history(self, hostname: str, strategy: int, is_success: bool):
         """Инкрементирует счётчик успехов или неудач для домена/стратегии"""
@@ -602,6 +634,7 @@ class LockedStrategiesManager:
             self.strategy_history[hostname][strat_key]['successes'] += 1
         else:
             self.strategy_history[hostname][strat_key]['failures'] += 1
+        self._dirty_history.add(hostname)
 
     def get_history_for_domain(self, hostname: str) -> dict:
         """Возвращает историю стратегий для домена с рейтингами"""
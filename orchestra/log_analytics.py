@@ -0,0 +1,364 @@
+# orchestra/log_analytics.py
+"""
+Офлайн-аналитика архивных логов оркестратора.
+
+Лог (все сегменты, включая сжатые .gz) прогоняется потоково через LogParser,
+в память целиком не загружается. Результат сохраняется рядом с логом в
+компактный индекс orchestra_<id>.log.idx.json:
+
+- счётчики успехов/неудач по host -> askey -> strategy
+- поминутные счётчики успехов/неудач по askey:strategy (для "за последний час")
+- смещения (сегмент, байт) событий LOCK/UNLOCK/RST - строку можно прочитать
+  без чтения всего лога; вместе со смещениями хранится идентичность
+  сегмента (inode и несжатый размер на момент индексации), поэтому после
+  ротации активного файла смещения не применяются к новому файлу с тем же
+  именем
+
+Индекс хранится по сегментам: закрытый сегмент разбирается один раз
+(ключ - номер сегмента и несжатый размер, поэтому сжатие сегмента после
+ротации индекс не инвалидирует), повторно разбирается только активный.
+Каждый сегмент разбирается отдельным LogParser, контекст (текущий хост)
+между сегментами не переносится.
+
+Строки winws2 не содержат времени, поэтому время события оценивается
+линейно по смещению внутри сегмента между временем начала сегмента
+(mtime предыдущего сегмента или заголовок лога) и mtime самого сегмента.
+"""
+
+import gzip
+import json
+import os
+import re
+import struct
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from log import log
+from .log_parser import LogParser, EventType
+from .log_segments import list_segments, segment_number
+from .locked_strategies_manager import PROTO_TO_ASKEY, ASKEY_ALL
+
+
+# Версия формата индекса (при изменении индекс пересобирается)
+INDEX_VERSION = 1
+
+# События, смещения которых сохраняются в индексе
+INDEXED_EVENTS = {
+    EventType.LOCK: "lock",
+    EventType.UNLOCK: "unlock",
+    EventType.RST: "rst",
+}
+
+# Размер поминутного бакета (секунды)
+BUCKET_SECONDS = 60
+
+_HEADER_RE = re.compile(r"=== Orchestra Debug Log Started (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) ===")
+
+
+def index_path_for(active_path: str) -> str:
+    """Путь к файлу индекса лога"""
+    return active_path + ".idx.json"
+
+
+def _uncompressed_size(path: str) -> int:
+    """Несжатый размер сегмента (для .gz - из поля ISIZE, сегменты < 4 ГБ)"""
+    if not path.endswith(".gz"):
+        return os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(-4, os.SEEK_END)
+        return struct.unpack("<I", f.read(4))[0]
+
+
+def _file_id(path: str) -> Optional[int]:
+    """Идентификатор файла (inode / NTFS file index); сохраняется при переименовании"""
+    try:
+        return os.stat(path).st_ino or None
+    except OSError:
+        return None
+
+
+def _open_binary(path: str):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _header_time(path: str) -> Optional[float]:
+    """Время из заголовка "=== Orchestra Debug Log Started ... ===" (первая строка лога)"""
+    try:
+        with _open_binary(path) as f:
+            m = _HEADER_RE.search(f.readline(256).decode("utf-8", errors="replace"))
+        if m:
+            return datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+    except (OSError, EOFError, ValueError):
+        pass
+    return None
+
+
+def iter_lines_with_offsets(path: str) -> Iterator[Tuple[int, str]]:
+    """(смещение начала строки, строка) для сегмента; .gz читается потоково"""
+    offset = 0
+    with _open_binary(path) as f:
+        for raw in f:
+            yield offset, raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            offset += len(raw)
+
+
+def _to_askey(proto: Optional[str]) -> str:
+    proto = proto or "tls"
+    return PROTO_TO_ASKEY.get(proto, proto if proto in ASKEY_ALL else "tls")
+
+
+def host_matches(hostname: str, query: str) -> bool:
+    """youtube.com совпадает с youtube.com и *.youtube.com"""
+    return hostname == query or hostname.endswith("." + query)
+
+
+def analyze_segment(path: str, start_time: float, end_time: float) -> dict:
+    """
+    Разбирает один сегмент лога.
+
+    Returns:
+        Словарь-запись индекса сегмента (см. LogIndex)
+    """
+    size = _uncompressed_size(path) or 1
+    parser = LogParser()
+    stats: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+    buckets: Dict[str, Dict[str, List[int]]] = {}
+    events: List[list] = []
+    lines = 0
+
+    def estimate(offset: int) -> float:
+        return start_time + (end_time - start_time) * min(offset / size, 1.0)
+
+    for offset, line in iter_lines_with_offsets(path):
+        lines += 1
+        event = parser.parse_line(line)
+        if event is None:
+            continue
+
+        if event.event_type in (EventType.SUCCESS, EventType.FAIL):
+            if not event.hostname or event.strategy is None:
+                continue
+            askey = _to_askey(event.l7proto)
+            strategy = str(event.strategy)
+            column = 0 if event.event_type == EventType.SUCCESS else 1
+            counts = stats.setdefault(event.hostname, {}).setdefault(askey, {}).setdefault(strategy, [0, 0])
+            counts[column] += 1
+            minute = str(int(estimate(offset) // BUCKET_SECONDS) * BUCKET_SECONDS)
+            bucket = buckets.setdefault(minute, {}).setdefault(f"{askey}:{strategy}", [0, 0])
+            bucket[column] += 1
+
+        elif event.event_type in INDEXED_EVENTS:
+            host = event.hostname or parser.current_host
+            events.append([
+                offset,
+                INDEXED_EVENTS[event.event_type],
+                host,
+                _to_askey(event.l7proto or parser.current_l7proto),
+                event.strategy,
+                round(estimate(offset), 1),
+            ])
+
+    return {
+        "size": size,
+        "lines": lines,
+        "stats": stats,
+        "buckets": buckets,
+        "events": events,
+    }
+
+
+class LogIndex:
+    """
+    Индекс одного лога оркестратора.
+
+    Использование:
+        index = LogIndex.build(path)                  # строит/обновляет .idx.json
+        index.events_for_host("youtube.com")
+        index.strategy_win_rates(since=time.time() - 3600)
+        index.read_event_lines(index.events_for_host("youtube.com"))
+    """
+
+    def __init__(self, active_path: str, segments: Dict[str, dict]):
+        self.active_path = active_path
+        # {номер сегмента ("1", "2", ..., "active"): запись сегмента}
+        self.segments = segments
+        # Порядок сегментов (по времени)
+        self.order = sorted(segments, key=lambda n: (n == "active", int(n) if n.isdigit() else 0))
+
+    # ==================== ПОСТРОЕНИЕ ====================
+
+    @classmethod
+    def build(cls, active_path: str, use_cache: bool = True) -> "LogIndex":
+        """Строит индекс, переиспользуя записи неизменившихся сегментов из .idx.json"""
+        cached: Dict[str, dict] = {}
+        idx_path = index_path_for(active_path)
+        if use_cache and os.path.exists(idx_path):
+            try:
+                with open(idx_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    cached = data.get("segments", {})
+            except Exception as e:
+                log(f"Индекс лога повреждён, пересборка: {e}", "DEBUG")
+
+        segments: Dict[str, dict] = {}
+        changed = False
+        start_time = None
+        for path in list_segments(active_path):
+            number = segment_number(active_path, path)
+            key = "active" if number is None else str(number)
+            mtime = os.path.getmtime(path)
+            size = _uncompressed_size(path)
+
+            entry = cached.get(key)
+            if entry is None or entry.get("size") != size or key == "active" and entry.get("mtime") != mtime:
+                if start_time is None:
+                    # Заголовок лога даёт время начала первого сегмента
+                    start_time = _header_time(path) or mtime
+                entry = analyze_segment(path, start_time, mtime)
+                changed = True
+            entry["mtime"] = mtime
+            entry["file"] = os.path.basename(path)
+            entry["ino"] = _file_id(path)
+            segments[key] = entry
+            start_time = mtime
+
+        if set(cached) != set(segments):
+            changed = True
+
+        index = cls(active_path, segments)
+        if changed:
+            index.save()
+        return index
+
+    def save(self):
+        """Сохраняет индекс рядом с логом"""
+        try:
+            tmp_path = index_path_for(self.active_path) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "segments": self.segments}, f, separators=(",", ":"))
+            os.replace(tmp_path, index_path_for(self.active_path))
+        except Exception as e:
+            log(f"Не удалось сохранить индекс лога: {e}", "DEBUG")
+
+    # ==================== ЗАПРОСЫ ====================
+
+    def total_lines(self) -> int:
+        return sum(self.segments[n]["lines"] for n in self.order)
+
+    def hosts(self) -> List[str]:
+        """Все хосты с событиями SUCCESS/FAIL"""
+        result = set()
+        for n in self.order:
+            result.update(self.segments[n]["stats"])
+        return sorted(result)
+
+    def host_stats(self, host: str) -> Dict[str, Dict[int, Tuple[int, int]]]:
+        """{askey: {strategy: (successes, failures)}} для хоста и его поддоменов"""
+        result: Dict[str, Dict[int, List[int]]] = {}
+        for n in self.order:
+            for hostname, by_askey in self.segments[n]["stats"].items():
+                if not host_matches(hostname, host):
+                    continue
+                for askey, by_strategy in by_askey.items():
+                    for strategy, (s, f) in by_strategy.items():
+                        counts = result.setdefault(askey, {}).setdefault(int(strategy), [0, 0])
+                        counts[0] += s
+                        counts[1] += f
+        return {askey: {strat: tuple(c) for strat, c in by_strategy.items()}
+                for askey, by_strategy in result.items()}
+
+    def events_for_host(self, host: Optional[str] = None, types: Optional[set] = None) -> List[dict]:
+        """События LOCK/UNLOCK/RST (все или для хоста), в порядке лога"""
+        result = []
+        for n in self.order:
+            entry = self.segments[n]
+            for offset, event_type, hostname, askey, strategy, timestamp in entry["events"]:
+                if types and event_type not in types:
+                    continue
+                if host and not (hostname and host_matches(hostname, host)):
+                    continue
+                result.append({
+                    "segment": n,
+                    "file": entry["file"],
+                    "ino": entry.get("ino"),
+                    "size": entry["size"],
+                    "offset": offset,
+                    "type": event_type,
+                    "host": hostname,
+                    "askey": askey,
+                    "strategy": strategy,
+                    "time": timestamp,
+                })
+        return result
+
+    def strategy_win_rates(self, since: Optional[float] = None, askey: Optional[str] = None) -> Dict[Tuple[str, int], dict]:
+        """
+        Процент успеха стратегий (по оценочному времени событий).
+
+        Returns:
+            {(askey, strategy): {'successes': int, 'failures': int, 'rate': int}}
+        """
+        totals: Dict[Tuple[str, int], List[int]] = {}
+        for n in self.order:
+            for minute, counters in self.segments[n]["buckets"].items():
+                if since is not None and int(minute) + BUCKET_SECONDS <= since:
+                    continue
+                for key, (s, f) in counters.items():
+                    key_askey, strategy = key.rsplit(":", 1)
+                    if askey and key_askey != askey:
+                        continue
+                    counts = totals.setdefault((key_askey, int(strategy)), [0, 0])
+                    counts[0] += s
+                    counts[1] += f
+        return {
+            key: {"successes": s, "failures": f, "rate": round(s * 100 / (s + f)) if s + f else 0}
+            for key, (s, f) in sorted(totals.items())
+        }
+
+    @staticmethod
+    def _find_segment(paths: Dict[str, str], name: str, ino: Optional[int], size: int) -> Optional[str]:
+        """
+        Текущий путь сегмента, проиндексированного как name (inode ino, size байт).
+        None - сегмент удалён или под этим именем уже другой файл.
+        """
+        path = paths.get(name)
+        if path is not None:
+            # Тот же файл (активный мог только дописываться) - или ротация:
+            # под именем активного уже новый файл
+            if ino is None or _file_id(path) == ino:
+                return path if _uncompressed_size(path) >= size else None
+        else:
+            # Сегмент был сжат после построения индекса (inode у .gz новый)
+            path = paths.get(name + ".gz")
+            if path is not None and _uncompressed_size(path) == size:
+                return path
+        if ino is not None:
+            # Активный файл переименован ротацией в закрытый сегмент
+            for candidate in paths.values():
+                if not candidate.endswith(".gz") and _file_id(candidate) == ino:
+                    return candidate if _uncompressed_size(candidate) >= size else None
+        return None
+
+    def read_event_lines(self, events: List[dict]) -> List[str]:
+        """
+        Читает исходные строки событий по смещениям (без чтения всего лога).
+        События сегментов, которые не удаётся сопоставить с файлом на диске
+        (удалён или сжат после ротации), пропускаются.
+        """
+        paths = {os.path.basename(p): p for p in list_segments(self.active_path)}
+        lines = []
+        by_segment: Dict[Tuple[str, Optional[int], int], List[int]] = {}
+        for event in events:
+            key = (event["file"], event.get("ino"), event.get("size", 0))
+            by_segment.setdefault(key, []).append(event["offset"])
+        for (name, ino, size), offsets in by_segment.items():
+            path = self._find_segment(paths, name, ino, size)
+            if path is None:
+                log(f"Сегмент лога {name} изменился после индексации, события пропущены", "DEBUG")
+                continue
+            with _open_binary(path) as f:
+                for offset in sorted(offsets):
+                    f.seek(offset)
+                    lines.append(f.readline().decode("utf-8", errors="replace").rstrip("\r\n"))
+        return lines
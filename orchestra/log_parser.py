@@ -282,9 +282,14 @@ class LogParser:
             event = parser.parse_line(line)
             if event:
                 # обработать событие
+
+    dispatch=False отключает предварительный отбор правил по ключевым словам
+    (эталонный последовательный разбор - для бенчмарка и проверки эквивалентности).
     """
 
-    def __init__(self):
+    def __init__(self, dispatch: bool = True):
+        self.dispatch = dispatch
+        self._rules = [(keywords, getattr(self, name)) for keywords, name in self._RULES]
         self.reset()
 
     def reset(self):
@@ -412,107 +417,181 @@ class LogParser:
 
         return False
 
+    # === Диспетчеризация ===
+    # Правила проверяются в том же порядке, что и в исходном последовательном парсере.
+    # Для каждого правила указаны подстроки, без которых его паттерны заведомо не совпадут:
+    # если ни одной из них нет в строке, regex правила даже не запускается.
+    # Шумовые строки (packet:/IP4: ... proto=tcp) отсекаются одной проверкой _ANY_KEYWORD.
+    _RULES = (
+        (("desync profile search for tcp",), "_rule_tcp_profile_search"),
+        (("desync profile search for udp",), "_rule_udp_profile_search"),
+        (("proto=udp",), "_rule_ip4_udp"),
+        (("using cached desync profile",), "_rule_cached_profile"),
+        ((") matches",), "_rule_profile_matches"),
+        (("packet contains ",), "_rule_payload"),
+        (("dpi desync src=",), "_rule_dpi_desync"),
+        (("udp_protocol_success_detector: ",), "_rule_udp_success"),
+        (("udp_aggressive_failure_detector: FAIL",), "_rule_udp_fail"),
+        (("automate: host record key",), "_rule_automate_hostkey"),
+        (("APPLIED ",), "_rule_applied"),
+        (("LOCK",), "_rule_lock"),
+        (("LOCKED ",), "_rule_legacy_lock"),
+        (("UNLOCK",), "_rule_unlock"),
+        (("AUTO-UNLOCK ", "UNLOCKING "), "_rule_legacy_unlock"),
+        (("_quality: RESET ",), "_rule_reset"),
+        ((" SUCCESS ",), "_rule_success"),
+        ((" FAIL ",), "_rule_fail"),
+        (("circular: rotate strategy to ", "circular_quality: rotate to strategy "), "_rule_rotate"),
+        (("current strategy ",), "_rule_current_strategy"),
+        (("standard_failure_detector: incoming RST",), "_rule_rst"),
+        (("automate: success detected",), "_rule_automate_success"),
+        (("automate: failure detected",), "_rule_automate_failure"),
+        (("standard_success_detector:",), "_rule_std_success"),
+        (("HISTORY ",), "_rule_history"),
+        (("PRELOADED ",), "_rule_preloaded"),
+    )
+
+    _ANY_KEYWORD = re.compile("|".join(
+        re.escape(keyword) for keywords, _ in _RULES for keyword in keywords
+    ))
+
     def parse_line(self, line: str) -> Optional[ParsedEvent]:
         """
         Парсит строку лога и возвращает событие или None.
         Обновляет внутреннее состояние парсера.
+
+        В режиме dispatch (по умолчанию) запускаются только правила, ключевые
+        подстроки которых есть в строке. События и состояние парсера при этом
+        те же, что и при последовательной проверке всех паттернов (dispatch=False).
         """
         if not line:
             return None
 
-        # === TCP Profile Search ===
+        if not self.dispatch:
+            for _, rule in self._rules:
+                event = rule(line)
+                if event is not None:
+                    return event
+            return None
+
+        if self._ANY_KEYWORD.search(line) is None:
+            return None
+
+        for keywords, rule in self._rules:
+            for keyword in keywords:
+                if keyword in line:
+                    break
+            else:
+                continue
+            event = rule(line)
+            if event is not None:
+                return event
+        return None
+
+    # === Правила ===
+    # Каждое правило возвращает событие (разбор строки завершён) или None
+    # (правило не сработало либо только обновило контекст - идём дальше).
+
+    def _rule_tcp_profile_search(self, line: str) -> Optional[ParsedEvent]:
         # desync profile search for tcp ip=... port=443 l7proto=tls hostname='youtube.com'
         m = Patterns.tcp_profile_search.search(line)
-        if m:
-            ip, port, l7proto, hostname = m.groups()
-            self.current_ip = ip
-            self.current_port = int(port)
-            self.current_proto = "tcp"
-            self.current_l7proto = l7proto
-
-            if hostname and not hostname.replace('.', '').isdigit():
-                self.current_host = nld_cut(hostname, 2)
-                self._cache_hostname(ip, self.current_host)
-                # Сохраняем протокол для hostname (TLS или HTTP)
-                proto_key = "http" if l7proto == "http" or int(port) == 80 else "tls"
-                self.host_to_proto[self.current_host] = proto_key
-            else:
-                self.current_host = self.ip_to_hostname.get(ip)
-
-            return ParsedEvent(
-                event_type=EventType.TCP_PROFILE_SEARCH,
-                hostname=self.current_host,
-                ip=ip,
-                port=int(port),
-                l7proto=l7proto,
-                raw_line=line
-            )
-
-        # === UDP Profile Search ===
+        if not m:
+            return None
+        ip, port, l7proto, hostname = m.groups()
+        self.current_ip = ip
+        self.current_port = int(port)
+        self.current_proto = "tcp"
+        self.current_l7proto = l7proto
+
+        if hostname and not hostname.replace('.', '').isdigit():
+            self.current_host = nld_cut(hostname, 2)
+            self._cache_hostname(ip, self.current_host)
+            # Сохраняем протокол для hostname (TLS или HTTP)
+            proto_key = "http" if l7proto == "http" or int(port) == 80 else "tls"
+            self.host_to_proto[self.current_host] = proto_key
+        else:
+            self.current_host = self.ip_to_hostname.get(ip)
+
+        return ParsedEvent(
+            event_type=EventType.TCP_PROFILE_SEARCH,
+            hostname=self.current_host,
+            ip=ip,
+            port=int(port),
+            l7proto=l7proto,
+            raw_line=line
+        )
+
+    def _rule_udp_profile_search(self, line: str) -> Optional[ParsedEvent]:
         # desync profile search for udp ip=... port=443 l7proto=quic
         m = Patterns.udp_profile_search.search(line)
-        if m:
-            ip, port, l7proto = m.groups()
-            self.current_ip = ip
-            self.current_port = int(port)
-            self.current_proto = "udp"
-            self.current_l7proto = l7proto
-
-            if not is_local_ip(ip):
-                self.current_host = ip  # Для UDP используем полный IP
-                # Сохраняем протокол для IP (UDP)
-                self.host_to_proto[ip] = "udp"
-                # Ограничиваем размер кэша
-                if len(self.host_to_proto) > 2000:
-                    keys = list(self.host_to_proto.keys())
-                    for k in keys[:1000]:
-                        del self.host_to_proto[k]
-            else:
-                self.current_host = None
-
-            return ParsedEvent(
-                event_type=EventType.UDP_PROFILE_SEARCH,
-                ip=ip,
-                port=int(port),
-                l7proto=l7proto,
-                raw_line=line
-            )
-
-        # === UDP Packet IP (fallback для cached profile) ===
+        if not m:
+            return None
+        ip, port, l7proto = m.groups()
+        self.current_ip = ip
+        self.current_port = int(port)
+        self.current_proto = "udp"
+        self.current_l7proto = l7proto
+
+        if not is_local_ip(ip):
+            self.current_host = ip  # Для UDP используем полный IP
+            # Сохраняем протокол для IP (UDP)
+            self.host_to_proto[ip] = "udp"
+            # Ограничиваем размер кэша
+            if len(self.host_to_proto) > 2000:
+                keys = list(self.host_to_proto.keys())
+                for k in keys[:1000]:
+                    del self.host_to_proto[k]
+        else:
+            self.current_host = None
+
+        return ParsedEvent(
+            event_type=EventType.UDP_PROFILE_SEARCH,
+            ip=ip,
+            port=int(port),
+            l7proto=l7proto,
+            raw_line=line
+        )
+
+    def _rule_ip4_udp(self, line: str) -> Optional[ParsedEvent]:
+        # UDP Packet IP (fallback для cached profile)
         # IP4: 151.101.1.140 => 192.168.1.100 proto=udp
         m = Patterns.ip4_udp.search(line)
-        if m:
-            src_ip, dst_ip = m.groups()
-            remote_ip = get_remote_ip(src_ip, dst_ip)
-            if remote_ip:
-                self.current_host = remote_ip
-                self.current_ip = remote_ip
-                self.current_proto = "udp"
-                return ParsedEvent(
-                    event_type=EventType.UDP_PACKET,
-                    ip=remote_ip,
-                    raw_line=line
-                )
-
-        # === Cached Profile ===
+        if not m:
+            return None
+        src_ip, dst_ip = m.groups()
+        remote_ip = get_remote_ip(src_ip, dst_ip)
+        if not remote_ip:
+            return None
+        self.current_host = remote_ip
+        self.current_ip = remote_ip
+        self.current_proto = "udp"
+        return ParsedEvent(
+            event_type=EventType.UDP_PACKET,
+            ip=remote_ip,
+            raw_line=line
+        )
+
+    def _rule_cached_profile(self, line: str) -> Optional[ParsedEvent]:
         m = Patterns.cached_profile.search(line)
-        if m:
-            profile_num = int(m.group(1))
-            self.current_profile = profile_num
-            if profile_num >= 3:
-                self.current_proto = "udp"
-            return ParsedEvent(
-                event_type=EventType.CACHED_PROFILE,
-                profile=profile_num,
-                raw_line=line
-            )
-
-        # === Profile Matches ===
+        if not m:
+            return None
+        profile_num = int(m.group(1))
+        self.current_profile = profile_num
+        if profile_num >= 3:
+            self.current_proto = "udp"
+        return ParsedEvent(
+            event_type=EventType.CACHED_PROFILE,
+            profile=profile_num,
+            raw_line=line
+        )
+
+    def _rule_profile_matches(self, line: str) -> None:
         m = Patterns.profile_matches.search(line)
         if m:
             self.current_profile = int(m.group(1))
 
-        # === Protocol Detection by Packet Content (NOT ports) ===
+    def _rule_payload(self, line: str) -> None:
+        # Protocol Detection by Packet Content (NOT ports)
         # Эти паттерны появляются ДО dpi desync строки и устанавливают протокол
 
         # STUN - определяется по Magic Cookie 0x2112A442, НЕ по портам
@@ -542,7 +621,8 @@ class LogParser:
             self.current_proto = "udp"
             self.current_l7proto = "dht"
 
-        # === DPI Desync (connection_proto) ===
+    def _rule_dpi_desync(self, line: str) -> None:
+        # DPI Desync (connection_proto)
         m = Patterns.dpi_desync.search(line)
         if m:
             src_ip, _, dst_ip, _, conn_proto = m.groups()
@@ -554,7 +634,7 @@ class LogParser:
                     self.current_ip = remote_ip
                     self.current_proto = "udp"
 
-        # === UDP Protocol Success Detector ===
+    def _rule_udp_success(self, line: str) -> None:
         # LUA: udp_protocol_success_detector: QUIC (QUIC_SHORT_HEADER) - SUCCESS
         # Устанавливает UDP контекст для последующих событий (strategy_quality)
         m = Patterns.udp_success.search(line)
@@ -567,365 +647,345 @@ class LogParser:
             # Не возвращаем событие - это информационная строка
             # Контекст будет использован следующим strategy_quality событием
 
-        # === UDP Aggressive Failure Detector ===
+    def _rule_udp_fail(self, line: str) -> None:
         # LUA: udp_aggressive_failure_detector: FAIL out=2>=2 in=0<=0
         # Устанавливает UDP контекст для последующих событий
         if Patterns.udp_fail.search(line):
             self.current_proto = "udp"
             # Не возвращаем событие - это информационная строка
 
-        # === Automate Hostkey ===
+    def _rule_automate_hostkey(self, line: str) -> Optional[ParsedEvent]:
         # LUA: automate: host record key 'autostate.circular_quality_1_1.youtube.com'
         # Profile 1 = TLS, Profile 2 = HTTP, Profile 3+ = UDP
         m = Patterns.automate_hostkey.search(line)
-        if m:
-            profile_num, hostname = m.groups()
-            profile = int(profile_num)
-            is_ip = hostname.replace('.', '').replace(':', '').isdigit()
-
-            # Для UDP (profile >= 3) используем IP как hostname
-            # Для TCP/TLS/HTTP - только домены (не IP)
-            if profile >= 3:
-                # UDP: используем IP адрес как есть
-                self.current_host = hostname
-                self.current_proto = "udp"
-            elif not is_ip:
-                # TCP: используем домен с NLD-cut
-                self.current_host = nld_cut(hostname, 2)
-                if self.current_ip:
-                    self._cache_hostname(self.current_ip, self.current_host)
-
-            return ParsedEvent(
-                event_type=EventType.HOSTKEY,
-                hostname=self.current_host,
-                profile=profile,
-                raw_line=line
-            )
-
-        # === APPLIED ===
+        if not m:
+            return None
+        profile_num, hostname = m.groups()
+        profile = int(profile_num)
+        is_ip = hostname.replace('.', '').replace(':', '').isdigit()
+
+        # Для UDP (profile >= 3) используем IP как hostname
+        # Для TCP/TLS/HTTP - только домены (не IP)
+        if profile >= 3:
+            # UDP: используем IP адрес как есть
+            self.current_host = hostname
+            self.current_proto = "udp"
+        elif not is_ip:
+            # TCP: используем домен с NLD-cut
+            self.current_host = nld_cut(hostname, 2)
+            if self.current_ip:
+                self._cache_hostname(self.current_ip, self.current_host)
+
+        return ParsedEvent(
+            event_type=EventType.HOSTKEY,
+            hostname=self.current_host,
+            profile=profile,
+            raw_line=line
+        )
+
+    def _rule_applied(self, line: str) -> Optional[ParsedEvent]:
         # LUA: strategy-stats: APPLIED youtube.com [tls] = strategy 2
         m = Patterns.applied.search(line)
-        if m:
-            hostname = m.group(1)
-            proto_tag = m.group(2)  # [tls] между hostname и =
-            strategy = int(m.group(3))
-            tag = m.group(4)  # [circular_quality_1_1] после strategy
-
-            host_key = nld_cut(hostname, 2)
-
-            # Определяем протокол из тега
-            proto_key = None
-            if tag:
-                tag_m = re.match(r"circular_quality_(\d+)_", tag)
-                if tag_m:
-                    prof = int(tag_m.group(1))
-                    proto_key = {1: "tls", 2: "http", 3: "udp", 4: "udp"}.get(prof, "tls")
-            if not proto_key and proto_tag:
-                proto_key = proto_tag.lower()
-            if not proto_key:
-                proto_key = self._get_proto_key()
-
-            self.last_applied[(host_key, proto_key)] = strategy
-            self.last_host_by_proto[proto_key] = host_key
-            self.current_host = host_key
-
-            return ParsedEvent(
-                event_type=EventType.APPLIED,
-                hostname=host_key,
-                strategy=strategy,
-                l7proto=proto_key,
-                tag=tag,
-                raw_line=line
-            )
-
-        # === LOCK ===
+        if not m:
+            return None
+        hostname = m.group(1)
+        proto_tag = m.group(2)  # [tls] между hostname и =
+        strategy = int(m.group(3))
+        tag = m.group(4)  # [circular_quality_1_1] после strategy
+
+        host_key = nld_cut(hostname, 2)
+
+        # Определяем протокол из тега
+        proto_key = None
+        if tag:
+            tag_m = re.match(r"circular_quality_(\d+)_", tag)
+            if tag_m:
+                prof = int(tag_m.group(1))
+                proto_key = {1: "tls", 2: "http", 3: "udp", 4: "udp"}.get(prof, "tls")
+        if not proto_key and proto_tag:
+            proto_key = proto_tag.lower()
+        if not proto_key:
+            proto_key = self._get_proto_key()
+
+        self.last_applied[(host_key, proto_key)] = strategy
+        self.last_host_by_proto[proto_key] = host_key
+        self.current_host = host_key
+
+        return ParsedEvent(
+            event_type=EventType.APPLIED,
+            hostname=host_key,
+            strategy=strategy,
+            l7proto=proto_key,
+            tag=tag,
+            raw_line=line
+        )
+
+    def _rule_lock(self, line: str) -> Optional[ParsedEvent]:
         # Patterns.lock: Groups: 1=protocol, 2=hostname, 3=strategy
-        # Patterns.legacy_lock: Groups: 1=hostname, 2=strategy, 3=proto_tag
         m = Patterns.lock.search(line)
-        if m:
-            proto_from_log = m.group(1)  # [tls], [quic], [unknown], or None
-            hostname = m.group(2)
-            strategy = int(m.group(3))
-
-            # Приоритет 1: протокол из Lua лога (самый точный источник)
-            if proto_from_log:
-                proto = proto_from_log.lower()
-                is_udp = proto in ("udp", "quic", "stun", "discord", "wireguard", "dht", "unknown")
-            else:
-                # Приоритет 2: контекст из предыдущих строк
-                proto = self._get_proto_from_context()
-                is_udp = proto in ("udp", "quic", "stun", "discord", "wireguard", "dht")
-
-            # Fallback: проверяем hostname если контекст не определён
-            if not proto_from_log and not self.current_proto and not is_udp:
-                is_udp = self._is_udp_hostname(hostname)
-                if is_udp:
-                    proto = "udp"
-
-            # Для UDP НЕ режем IP (используем полный)
-            host_key = hostname if is_udp else nld_cut(hostname, 2)
-
-            return ParsedEvent(
-                event_type=EventType.LOCK,
-                hostname=host_key,
-                strategy=strategy,
-                l7proto=proto,
-                raw_line=line
-            )
-
-        # Legacy LOCK: Groups: 1=hostname, 2=strategy, 3=proto_tag
-        m = Patterns.legacy_lock.search(line)
-        if m:
-            hostname = m.group(1)
-            strategy = int(m.group(2))
-            proto_tag = m.group(3) if len(m.groups()) >= 3 else None
+        if not m:
+            return None
+        proto_from_log = m.group(1)  # [tls], [quic], [unknown], or None
+        hostname = m.group(2)
+        strategy = int(m.group(3))
 
-            # Определяем протокол динамически по контексту
+        # Приоритет 1: протокол из Lua лога (самый точный источник)
+        if proto_from_log:
+            proto = proto_from_log.lower()
+            is_udp = proto in ("udp", "quic", "stun", "discord", "wireguard", "dht", "unknown")
+        else:
+            # Приоритет 2: контекст из предыдущих строк
             proto = self._get_proto_from_context()
             is_udp = proto in ("udp", "quic", "stun", "discord", "wireguard", "dht")
 
-            # Переопределяем из proto_tag если есть
-            if proto_tag:
-                proto_tag_upper = proto_tag.upper()
-                if proto_tag_upper == "UDP":
-                    is_udp = True
-                    proto = "udp"
-                elif proto_tag_upper == "HTTP":
-                    is_udp = False
-                    proto = "http"
-                elif proto_tag_upper == "TLS":
-                    is_udp = False
-                    proto = "tls"
-
-            # Fallback: проверяем hostname если контекст не определён
-            if not self.current_proto and not is_udp:
-                is_udp = self._is_udp_hostname(hostname)
-                if is_udp:
-                    proto = "udp"
-
-            # Для UDP НЕ режем IP (используем полный)
-            host_key = hostname if is_udp else nld_cut(hostname, 2)
-
-            return ParsedEvent(
-                event_type=EventType.LOCK,
-                hostname=host_key,
-                strategy=strategy,
-                l7proto=proto,
-                raw_line=line
-            )
-
-        # === UNLOCK ===
+        # Fallback: проверяем hostname если контекст не определён
+        if not proto_from_log and not self.current_proto and not is_udp:
+            is_udp = self._is_udp_hostname(hostname)
+            if is_udp:
+                proto = "udp"
+
+        # Для UDP НЕ режем IP (используем полный)
+        host_key = hostname if is_udp else nld_cut(hostname, 2)
+
+        return ParsedEvent(
+            event_type=EventType.LOCK,
+            hostname=host_key,
+            strategy=strategy,
+            l7proto=proto,
+            raw_line=line
+        )
+
+    def _rule_legacy_lock(self, line: str) -> Optional[ParsedEvent]:
+        # Patterns.legacy_lock: Groups: 1=hostname, 2=strategy, 3=proto_tag
+        m = Patterns.legacy_lock.search(line)
+        if not m:
+            return None
+        hostname = m.group(1)
+        strategy = int(m.group(2))
+        proto_tag = m.group(3) if len(m.groups()) >= 3 else None
+
+        # Определяем протокол динамически по контексту
+        proto = self._get_proto_from_context()
+        is_udp = proto in ("udp", "quic", "stun", "discord", "wireguard", "dht")
+
+        # Переопределяем из proto_tag если есть
+        if proto_tag:
+            proto_tag_upper = proto_tag.upper()
+            if proto_tag_upper == "UDP":
+                is_udp = True
+                proto = "udp"
+            elif proto_tag_upper == "HTTP":
+                is_udp = False
+                proto = "http"
+            elif proto_tag_upper == "TLS":
+                is_udp = False
+                proto = "tls"
+
+        # Fallback: проверяем hostname если контекст не определён
+        if not self.current_proto and not is_udp:
+            is_udp = self._is_udp_hostname(hostname)
+            if is_udp:
+                proto = "udp"
+
+        # Для UDP НЕ режем IP (используем полный)
+        host_key = hostname if is_udp else nld_cut(hostname, 2)
+
+        return ParsedEvent(
+            event_type=EventType.LOCK,
+            hostname=host_key,
+            strategy=strategy,
+            l7proto=proto,
+            raw_line=line
+        )
+
+    def _rule_unlock(self, line: str) -> Optional[ParsedEvent]:
         # Patterns.unlock: Groups: 1=protocol (or None), 2=hostname
-        # Patterns.auto_unlock, Patterns.legacy_unlock: Groups: 1=hostname
         m = Patterns.unlock.search(line)
-        if m:
-            proto_from_log = m.group(1)  # [tls], [quic], [unknown], or None
-            hostname = m.group(2)
+        if not m:
+            return None
+        proto_from_log = m.group(1)  # [tls], [quic], [unknown], or None
+        hostname = m.group(2)
 
-            # Определяем протокол
-            if proto_from_log:
-                proto = proto_from_log.lower()
-            else:
-                proto = self._get_proto_from_context()
+        # Определяем протокол
+        if proto_from_log:
+            proto = proto_from_log.lower()
+        else:
+            proto = self._get_proto_from_context()
 
-            return ParsedEvent(
-                event_type=EventType.UNLOCK,
-                hostname=hostname,
-                l7proto=proto,
-                raw_line=line
-            )
+        return ParsedEvent(
+            event_type=EventType.UNLOCK,
+            hostname=hostname,
+            l7proto=proto,
+            raw_line=line
+        )
 
+    def _rule_legacy_unlock(self, line: str) -> Optional[ParsedEvent]:
         # Legacy UNLOCK / AUTO-UNLOCK: Groups: 1=hostname
         m = Patterns.auto_unlock.search(line) or Patterns.legacy_unlock.search(line)
-        if m:
-            hostname = m.group(1)
-            return ParsedEvent(
-                event_type=EventType.UNLOCK,
-                hostname=hostname,
-                raw_line=line
-            )
-
-        # === RESET ===
+        if not m:
+            return None
+        return ParsedEvent(
+            event_type=EventType.UNLOCK,
+            hostname=m.group(1),
+            raw_line=line
+        )
+
+    def _rule_reset(self, line: str) -> Optional[ParsedEvent]:
         m = Patterns.reset.search(line)
-        if m:
-            hostname = m.group(1)
-            return ParsedEvent(
-                event_type=EventType.RESET,
-                hostname=hostname,
-                raw_line=line
-            )
-
-        # === SUCCESS ===
+        if not m:
+            return None
+        return ParsedEvent(
+            event_type=EventType.RESET,
+            hostname=m.group(1),
+            raw_line=line
+        )
+
+    def _quality_event(self, event_type: EventType, m: re.Match, line: str) -> ParsedEvent:
+        """Общий разбор SUCCESS/FAIL строк strategy_quality/slm_quality"""
         # Groups: 1=protocol (tls/quic/unknown/discord/None), 2=hostname, 3=strategy, 4=successes, 5=total
-        m = Patterns.success.search(line)
-        if m:
-            proto_from_log, hostname, strat, successes, total = m.groups()
-            host_key = nld_cut(hostname, 2)
-
-            # Приоритет 1: протокол из Lua лога (самый точный источник)
-            if proto_from_log:
-                proto = proto_from_log.lower()
-            else:
-                # Приоритет 2: сохранённый протокол для hostname (решает race condition)
-                proto = self.host_to_proto.get(host_key)
-                if not proto:
-                    # Приоритет 3: текущий контекст
-                    proto = self._get_proto_from_context()
+        proto_from_log, hostname, strat, successes, total = m.groups()
+        host_key = nld_cut(hostname, 2)
+
+        # Приоритет 1: протокол из Lua лога (самый точный источник)
+        if proto_from_log:
+            proto = proto_from_log.lower()
+        else:
+            # Приоритет 2: сохранённый протокол для hostname (решает race condition)
+            proto = self.host_to_proto.get(host_key)
+            if not proto:
+                # Приоритет 3: текущий контекст
+                proto = self._get_proto_from_context()
 
-            is_udp = proto in ("udp", "quic", "stun", "discord", "wireguard", "dht", "unknown")
+        # Fallback: проверяем hostname ТОЛЬКО если протокол не был явно указан в логе
+        # НЕ перезаписываем proto_from_log - это приоритетный источник
+        if not proto_from_log and (not proto or proto == "tls"):
+            if self._is_udp_hostname(hostname):
+                proto = "udp"
+                host_key = hostname  # Для UDP НЕ режем IP
+
+        return ParsedEvent(
+            event_type=event_type,
+            hostname=host_key,
+            strategy=int(strat),
+            successes=int(successes),
+            total=int(total),
+            l7proto=proto,
+            raw_line=line
+        )
+
+    def _rule_success(self, line: str) -> Optional[ParsedEvent]:
+        m = Patterns.success.search(line)
+        if not m:
+            return None
+        return self._quality_event(EventType.SUCCESS, m, line)
 
-            # Fallback: проверяем hostname ТОЛЬКО если протокол не был явно указан в логе
-            # НЕ перезаписываем proto_from_log - это приоритетный источник
-            if not proto_from_log and (not proto or proto == "tls"):
-                if self._is_udp_hostname(hostname):
-                    is_udp = True
-                    proto = "udp"
-                    host_key = hostname  # Для UDP НЕ режем IP
-
-            return ParsedEvent(
-                event_type=EventType.SUCCESS,
-                hostname=host_key,
-                strategy=int(strat),
-                successes=int(successes),
-                total=int(total),
-                l7proto=proto,
-                raw_line=line
-            )
-
-        # === FAIL ===
-        # Groups: 1=protocol (tls/quic/unknown/discord/None), 2=hostname, 3=strategy, 4=successes, 5=total
+    def _rule_fail(self, line: str) -> Optional[ParsedEvent]:
         m = Patterns.fail.search(line)
-        if m:
-            proto_from_log, hostname, strat, successes, total = m.groups()
-            host_key = nld_cut(hostname, 2)
-
-            # Приоритет 1: протокол из Lua лога (самый точный источник)
-            if proto_from_log:
-                proto = proto_from_log.lower()
-            else:
-                # Приоритет 2: сохранённый протокол для hostname (решает race condition)
-                proto = self.host_to_proto.get(host_key)
-                if not proto:
-                    # Приоритет 3: текущий контекст
-                    proto = self._get_proto_from_context()
-
-            is_udp = proto in ("udp", "quic", "stun", "discord", "wireguard", "dht", "unknown")
+        if not m:
+            return None
+        return self._quality_event(EventType.FAIL, m, line)
 
-            # Fallback: проверяем hostname ТОЛЬКО если протокол не был явно указан в логе
-            # НЕ перезаписываем proto_from_log - это приоритетный источник
-            if not proto_from_log and (not proto or proto == "tls"):
-                if self._is_udp_hostname(hostname):
-                    is_udp = True
-                    proto = "udp"
-                    host_key = hostname  # Для UDP НЕ режем IP
-
-            return ParsedEvent(
-                event_type=EventType.FAIL,
-                hostname=host_key,
-                strategy=int(strat),
-                successes=int(successes),
-                total=int(total),
-                l7proto=proto,
-                raw_line=line
-            )
-
-        # === ROTATE ===
+    def _rule_rotate(self, line: str) -> Optional[ParsedEvent]:
         m = Patterns.rotate.search(line) or Patterns.cq_rotate.search(line)
-        if m:
-            new_strat = int(m.group(1))
-            # НЕ обновляем last_applied! Только APPLIED должен это делать
-            return ParsedEvent(
-                event_type=EventType.ROTATE,
-                strategy=new_strat,
-                hostname=self.current_host,
-                raw_line=line
-            )
-
-        # === Current Strategy ===
+        if not m:
+            return None
+        # НЕ обновляем last_applied! Только APPLIED должен это делать
+        return ParsedEvent(
+            event_type=EventType.ROTATE,
+            strategy=int(m.group(1)),
+            hostname=self.current_host,
+            raw_line=line
+        )
+
+    def _rule_current_strategy(self, line: str) -> None:
         m = Patterns.current_strategy.search(line) or Patterns.cq_current_strategy.search(line)
         if m:
             self.current_strategy = int(m.group(1))
 
-        # === RST ===
-        if Patterns.std_rst.search(line):
-            proto_key = self._get_proto_key()
-            host_key = self.current_host
-            if not host_key and self.current_ip:
-                host_key = self.ip_to_hostname.get(self.current_ip)
-            if not host_key:
-                host_key = self.last_host_by_proto.get(proto_key)
-
-            applied_strat = self.last_applied.get((host_key, proto_key)) if host_key else None
-
-            return ParsedEvent(
-                event_type=EventType.RST,
-                hostname=host_key,
-                strategy=applied_strat,
-                l7proto=proto_key,
-                raw_line=line
-            )
-
-        # === Automate Success ===
-        if Patterns.automate_success.search(line):
-            return ParsedEvent(
-                event_type=EventType.AUTOMATE_SUCCESS,
-                hostname=self.current_host,
-                raw_line=line
-            )
-
-        # === Automate Failure ===
-        if Patterns.automate_failure.search(line):
-            return ParsedEvent(
-                event_type=EventType.AUTOMATE_FAILURE,
-                hostname=self.current_host,
-                raw_line=line
-            )
-
-        # === Standard Success ===
-        if Patterns.std_success.search(line):
-            proto_key = self._get_proto_key()
-            host_key = self.current_host
-            if not host_key and self.current_ip:
-                host_key = self.ip_to_hostname.get(self.current_ip)
-
-            applied_strat = self.last_applied.get((host_key, proto_key)) if host_key else None
-
-            return ParsedEvent(
-                event_type=EventType.SUCCESS,
-                hostname=host_key,
-                strategy=applied_strat,
-                l7proto=proto_key,
-                raw_line=line
-            )
-
-        # === HISTORY ===
+    def _rule_rst(self, line: str) -> Optional[ParsedEvent]:
+        if not Patterns.std_rst.search(line):
+            return None
+        proto_key = self._get_proto_key()
+        host_key = self.current_host
+        if not host_key and self.current_ip:
+            host_key = self.ip_to_hostname.get(self.current_ip)
+        if not host_key:
+            host_key = self.last_host_by_proto.get(proto_key)
+
+        applied_strat = self.last_applied.get((host_key, proto_key)) if host_key else None
+
+        return ParsedEvent(
+            event_type=EventType.RST,
+            hostname=host_key,
+            strategy=applied_strat,
+            l7proto=proto_key,
+            raw_line=line
+        )
+
+    def _rule_automate_success(self, line: str) -> Optional[ParsedEvent]:
+        if not Patterns.automate_success.search(line):
+            return None
+        return ParsedEvent(
+            event_type=EventType.AUTOMATE_SUCCESS,
+            hostname=self.current_host,
+            raw_line=line
+        )
+
+    def _rule_automate_failure(self, line: str) -> Optional[ParsedEvent]:
+        if not Patterns.automate_failure.search(line):
+            return None
+        return ParsedEvent(
+            event_type=EventType.AUTOMATE_FAILURE,
+            hostname=self.current_host,
+            raw_line=line
+        )
+
+    def _rule_std_success(self, line: str) -> Optional[ParsedEvent]:
+        if not Patterns.std_success.search(line):
+            return None
+        proto_key = self._get_proto_key()
+        host_key = self.current_host
+        if not host_key and self.current_ip:
+            host_key = self.ip_to_hostname.get(self.current_ip)
+
+        applied_strat = self.last_applied.get((host_key, proto_key)) if host_key else None
+
+        return ParsedEvent(
+            event_type=EventType.SUCCESS,
+            hostname=host_key,
+            strategy=applied_strat,
+            l7proto=proto_key,
+            raw_line=line
+        )
+
+    def _rule_history(self, line: str) -> Optional[ParsedEvent]:
         # Format: HISTORY youtube.com s2 successes=10 failures=2 rate=83%
         m = Patterns.history.search(line)
-        if m:
-            hostname, strat, successes, failures, rate = m.groups()
-            return ParsedEvent(
-                event_type=EventType.HISTORY,
-                hostname=nld_cut(hostname, 2),
-                strategy=int(strat),
-                successes=int(successes),
-                failures=int(failures),
-                rate=int(rate),
-                raw_line=line
-            )
-
-        # === PRELOADED ===
+        if not m:
+            return None
+        hostname, strat, successes, failures, rate = m.groups()
+        return ParsedEvent(
+            event_type=EventType.HISTORY,
+            hostname=nld_cut(hostname, 2),
+            strategy=int(strat),
+            successes=int(successes),
+            failures=int(failures),
+            rate=int(rate),
+            raw_line=line
+        )
+
+    def _rule_preloaded(self, line: str) -> Optional[ParsedEvent]:
         m = Patterns.preloaded.search(line)
-        if m:
-            hostname, strat, proto = m.groups()
-            return ParsedEvent(
-                event_type=EventType.PRELOADED,
-                hostname=hostname,
-                strategy=int(strat),
-                l7proto=proto,
-                raw_line=line
-            )
-
-        return None
+        if not m:
+            return None
+        hostname, strat, proto = m.groups()
+        return ParsedEvent(
+            event_type=EventType.PRELOADED,
+            hostname=hostname,
+            strategy=int(strat),
+            l7proto=proto,
+            raw_line=line
+        )
 
     def get_applied_strategy(self, hostname: str, proto: str) -> Optional[int]:
         """Возвращает последнюю применённую стратегию для хоста и протокола"""
@@ -0,0 +1,277 @@
+# orchestra/log_segments.py
+"""
+Сегментированный debug лог оркестратора.
+
+Вместо одного файла, который растёт до гигабайта и затем очищается целиком,
+лог пишется сегментами:
+
+    orchestra_<id>.log          - активный сегмент (в него идёт запись)
+    orchestra_<id>.log.001.gz   - закрытые сегменты (001 - самый старый)
+    orchestra_<id>.log.002      - закрытый сегмент, ещё не сжатый
+
+Когда активный сегмент превышает segment_size, он переименовывается в
+следующий номер, а сжатие gzip выполняется в фоновом потоке. Хранится не более
+max_segments сегментов (включая активный) - самые старые удаляются.
+
+Запись блочно-буферизованная, буфер сбрасывается на диск раз в flush_interval.
+Функции чтения (list_segments, read_log, iter_log_lines, delete_log_segments)
+понимают и сжатые, и несжатые сегменты.
+"""
+
+import glob
+import gzip
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from log import log
+
+
+# Размер одного сегмента (64 МБ)
+SEGMENT_SIZE_BYTES = 64 * 1024 * 1024
+
+# Максимум сегментов на один лог (включая активный)
+MAX_SEGMENTS = 16
+
+# Период сброса буфера на диск (секунды)
+FLUSH_INTERVAL = 1.0
+
+# Размер буфера записи
+WRITE_BUFFER_SIZE = 256 * 1024
+
+_SEGMENT_RE = re.compile(r"\.(\d{3,})(\.gz)?$")
+
+
+def segment_number(active_path: str, path: str) -> Optional[int]:
+    """Номер закрытого сегмента по пути (None для активного/чужого файла)"""
+    tail = path[len(active_path):]
+    match = _SEGMENT_RE.fullmatch(tail)
+    return int(match.group(1)) if match else None
+
+
+def list_segments(active_path: str) -> List[str]:
+    """
+    Все сегменты лога в хронологическом порядке (активный - последним).
+    Если есть и сжатая, и несжатая версия сегмента (сжатие не завершилось) - берётся несжатая.
+    """
+    closed = {}
+    for path in glob.glob(glob.escape(active_path) + ".*"):
+        number = segment_number(active_path, path)
+        if number is None:
+            continue
+        if number not in closed or not path.endswith(".gz"):
+            closed[number] = path
+    segments = [closed[n] for n in sorted(closed)]
+    if os.path.exists(active_path):
+        segments.append(active_path)
+    return segments
+
+
+def open_segment(path: str):
+    """Открывает сегмент на чтение (текст), .gz распаковывается на лету"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def iter_log_lines(active_path: str) -> Iterator[str]:
+    """Строки всех сегментов лога по порядку (без перевода строки)"""
+    for path in list_segments(active_path):
+        try:
+            with open_segment(path) as f:
+                for line in f:
+                    yield line.rstrip("\n")
+        except (OSError, EOFError) as e:
+            log(f"Ошибка чтения сегмента {os.path.basename(path)}: {e}", "DEBUG")
+
+
+def read_log(active_path: str) -> Optional[str]:
+    """Полное содержимое лога (все сегменты) или None если лога нет"""
+    segments = list_segments(active_path)
+    if not segments:
+        return None
+    parts = []
+    for path in segments:
+        try:
+            with open_segment(path) as f:
+                parts.append(f.read())
+        except (OSError, EOFError) as e:
+            log(f"Ошибка чтения сегмента {os.path.basename(path)}: {e}", "DEBUG")
+    return "".join(parts)
+
+
+def log_size(active_path: str) -> int:
+    """Суммарный размер всех сегментов на диске"""
+    total = 0
+    for path in list_segments(active_path):
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def delete_log_segments(active_path: str) -> int:
+    """Удаляет все сегменты лога (включая незавершённые .gz). Возвращает число удалённых файлов"""
+    deleted = 0
+    paths = set(list_segments(active_path))
+    paths.update(glob.glob(glob.escape(active_path) + ".*"))
+    for path in paths:
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            pass
+    return deleted
+
+
+def compress_segment(path: str) -> Optional[str]:
+    """Сжимает сегмент в path.gz и удаляет исходный файл"""
+    gz_path = path + ".gz"
+    tmp_path = gz_path + ".tmp"
+    try:
+        with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp_path, gz_path)
+        os.remove(path)
+        return gz_path
+    except FileNotFoundError:
+        # Сегмент удалён (ротация/удаление лога) пока ждал сжатия
+        return None
+    except Exception as e:
+        log(f"Ошибка сжатия сегмента {os.path.basename(path)}: {e}", "DEBUG")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+
+
+class RotatingLogWriter:
+    """
+    Запись debug лога с ротацией по размеру.
+
+    Использование:
+        writer = RotatingLogWriter(path)
+        writer.write("line")
+        writer.close()
+    """
+
+    def __init__(self, path: str, segment_size: int = SEGMENT_SIZE_BYTES,
+                 max_segments: int = MAX_SEGMENTS, compress: bool = True,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.segment_size = segment_size
+        self.max_segments = max(1, max_segments)
+        self.compress = compress
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._file = open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+        self._segment_bytes = 0
+        self._next_number = 1
+        self._last_flush = time.monotonic()
+        # Незавершённое сжатие: путь закрытого сегмента -> поток
+        self._compressing: Dict[str, threading.Thread] = {}
+
+        # Статистика
+        self.rotations = 0
+
+    def write(self, line: str):
+        """Пишет строку (перевод строки добавляется)"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.write("\n")
+            # Размер считается в символах - для ASCII лога winws2 это байты
+            self._segment_bytes += len(line) + 1
+
+            if self._segment_bytes >= self.segment_size:
+                self._rotate()
+            elif time.monotonic() - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Сбрасывает буфер на диск (например перед чтением активного лога)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def close(self, wait_compression: bool = False):
+        """Закрывает активный сегмент"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if wait_compression:
+            for thread in list(self._compressing.values()):
+                thread.join()
+            # Сегменты, пропущенные _prune() пока они сжимались
+            with self._lock:
+                self._prune()
+
+    def _rotate(self):
+        """Закрывает активный сегмент и начинает новый (под self._lock)"""
+        self._file.close()
+        self._file = None
+        closed_path = f"{self.path}.{self._next_number:03d}"
+        try:
+            os.replace(self.path, closed_path)
+        except OSError as e:
+            # В Windows переименование не проходит, пока активный файл открыт читателем
+            # (хвост лога на странице оркестра, get_log_content, LogIndex.build).
+            # Продолжаем писать в тот же файл, повторная попытка - через ещё один сегмент.
+            log(f"Ротация debug лога отложена: {e}", "DEBUG")
+            self._reopen("a")
+            return
+
+        self._next_number += 1
+        self._reopen("w")
+        self.rotations += 1
+
+        self._prune()
+        if self.compress:
+            thread = threading.Thread(target=self._compress, args=(closed_path,),
+                                      name="OrchestraLogCompress", daemon=True)
+            self._compressing[closed_path] = thread
+            thread.start()
+
+    def _reopen(self, mode: str):
+        """Открывает активный сегмент заново (под self._lock). При ошибке запись отключается"""
+        try:
+            self._file = open(self.path, mode, encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+        except OSError as e:
+            log(f"Не удалось открыть debug лог {os.path.basename(self.path)}: {e}", "WARNING")
+            self._file = None
+        self._segment_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def _compress(self, closed_path: str):
+        try:
+            compress_segment(closed_path)
+        finally:
+            with self._lock:
+                self._compressing.pop(closed_path, None)
+
+    def _prune(self):
+        """Удаляет самые старые сегменты сверх max_segments (кроме тех, что ещё сжимаются)"""
+        # Активный файл может отсутствовать (не удалось открыть после ротации) -
+        # тогда срез [:-1] отбросил бы самый новый закрытый сегмент
+        closed = [p for p in list_segments(self.path) if p != self.path]
+        excess = len(closed) - (self.max_segments - 1)
+        for path in closed[:max(0, excess)]:
+            base = path[:-3] if path.endswith(".gz") else path
+            thread = self._compressing.get(base)
+            if thread is not None and thread.is_alive():
+                # Удалим при следующей ротации, когда сжатие закончится
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
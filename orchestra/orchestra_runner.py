@@ -20,7 +20,6 @@ import subprocess
 import threading
 import json
 import glob
-import ipaddress
 from typing import Optional, Callable, Dict, List
 from datetime import datetime
 
@@ -32,6 +31,13 @@ from orchestra.blocked_strategies_manager import BlockedStrategiesManager
 from orchestra.locked_strategies_manager import (
     LockedStrategiesManager, ASKEY_ALL, TCP_ASKEYS, UDP_ASKEYS, PROTO_TO_ASKEY
 )
+from orchestra.registry_writer import get_registry_writer
+from orchestra.output_pipeline import OutputPipeline
+from orchestra.ipset_index import IpsetIndex
+from orchestra.log_segments import (
+    RotatingLogWriter, list_segments, read_log, log_size, delete_log_segments
+)
+from orchestra.log_analytics import LogIndex
 
 # Путь в реестре (основные константы теперь в менеджерах)
 REGISTRY_ORCHESTRA = f"{REGISTRY_PATH}\\Orchestra"
@@ -39,11 +45,10 @@ REGISTRY_ORCHESTRA = f"{REGISTRY_PATH}\\Orchestra"
 # Максимальное количество лог-файлов оркестратора
 MAX_ORCHESTRA_LOGS = 10
 
-# Максимальный размер лог-файла (1 ГБ) - при превышении файл очищается
-MAX_LOG_SIZE_BYTES = 1024 * 1024 * 1024
-
-# Интервал проверки размера файла (каждые N строк)
-LOG_SIZE_CHECK_INTERVAL = 1000
+# Ротация debug лога: размер сегмента и максимум сегментов на один лог
+# (закрытые сегменты сжимаются gzip в фоне)
+LOG_SEGMENT_SIZE_BYTES = 64 * 1024 * 1024
+LOG_MAX_SEGMENTS = 16
 
 # Белый список по умолчанию - сайты которые НЕ нужно обрабатывать
 # Эти сайты работают без DPI bypass или требуют особой обработки
@@ -142,6 +147,26 @@ SW_HIDE = 0
 CREATE_NO_WINDOW = 0x08000000
 STARTF_USESHOWWINDOW = 0x00000001
 
+
+class _OutputSession:
+    """
+    Состояние обработки вывода одного запуска winws2 (поток worker).
+
+    Парсер, debug лог и счётчик сохранения истории живут в сессии, а не в
+    runner: worker прошлого запуска, не завершившийся за join(timeout) в
+    stop(), работает со своей сессией и не трогает состояние нового запуска.
+    """
+
+    __slots__ = ("log_id", "parser", "debug_log", "history_save_counter", "pipeline")
+
+    def __init__(self, log_id: Optional[str]):
+        self.log_id = log_id
+        self.parser = LogParser()
+        self.debug_log: Optional[RotatingLogWriter] = None
+        self.history_save_counter = 0
+        self.pipeline: Optional[OutputPipeline] = None
+
+
 class OrchestraRunner:
     """
     Runner для circular оркестратора с автоматическим обучением.
@@ -178,6 +203,8 @@ class OrchestraRunner:
         # Теперь используем уникальные имена с ID сессии
         self.current_log_id: Optional[str] = None
         self.debug_log_path: Optional[str] = None
+        # Состояние обработки вывода текущего запуска (парсер, debug лог)
+        self._output_session: Optional[_OutputSession] = None
         # Загружаем настройку сохранения debug файла из реестра
         saved_debug = reg(f"{REGISTRY_PATH}\\Orchestra", "KeepDebugFile")
         self.keep_debug_file = bool(saved_debug)
@@ -195,16 +222,18 @@ class OrchestraRunner:
         # Состояние
         self.running_process: Optional[subprocess.Popen] = None
         self.output_thread: Optional[threading.Thread] = None
+        self.output_pipeline: Optional[OutputPipeline] = None
         self.stop_event = threading.Event()
 
-        # Менеджеры стратегий
-        self.blocked_manager = BlockedStrategiesManager()
-        self.locked_manager = LockedStrategiesManager(blocked_manager=self.blocked_manager)
+        # Менеджеры стратегий (общая очередь отложенной записи в реестр)
+        self.registry_writer = get_registry_writer()
+        self.blocked_manager = BlockedStrategiesManager(writer=self.registry_writer)
+        self.locked_manager = LockedStrategiesManager(blocked_manager=self.blocked_manager, writer=self.registry_writer)
         # Обратная ссылка: blocked нужен locked для удаления конфликтующих locks
         self.blocked_manager.set_locked_manager(self.locked_manager)
 
         # Кэши ipset подсетей для UDP (игры/Discord/QUIC)
-        self.ipset_networks: list[tuple[ipaddress._BaseNetwork, str]] = []
+        self.ipset_index = IpsetIndex(LISTS_FOLDER)
 
         # Белый список (exclude list) - домены которые НЕ обрабатываются
         self.user_whitelist: list = []  # Только пользовательские (из реестра)
@@ -212,6 +241,8 @@ class OrchestraRunner:
 
         # Callbacks
         self.output_callback: Optional[Callable[[str], None]] = None
+        # Пачка сообщений за тик (если задан - используется вместо output_callback для вывода winws2)
+        self.batch_output_callback: Optional[Callable[[List[str]], None]] = None
         self.lock_callback: Optional[Callable[[str, int], None]] = None
         self.unlock_callback: Optional[Callable[[str], None]] = None
 
@@ -230,6 +261,10 @@ class OrchestraRunner:
         self.blocked_manager.set_output_callback(callback)
         self.locked_manager.set_output_callback(callback)
 
+    def set_batch_output_callback(self, callback: Optional[Callable[[List[str]], None]]):
+        """Callback для получения строк лога пачками (один вызов на тик конвейера)"""
+        self.batch_output_callback = callback
+
     def set_lock_callback(self, callback: Callable[[str, int], None]):
         """Callback при LOCK стратегии (hostname, strategy_num)"""
         self.lock_callback = callback
@@ -282,7 +317,8 @@ class OrchestraRunner:
                     'id': log_id,
                     'path': filepath,
                     'filename': filename,
-                    'size': stat.st_size,
+                    'size': log_size(filepath),
+                    'segments': len(list_segments(filepath)),
                     'created': created
                 })
             except Exception as e:
@@ -308,7 +344,7 @@ class OrchestraRunner:
 
             for log_info in logs_to_delete:
                 try:
-                    os.remove(log_info['path'])
+                    delete_log_segments(log_info['path'])
                     deleted += 1
                     log(f"Удалён старый лог: {log_info['filename']}", "DEBUG")
                 except Exception as e:
@@ -332,6 +368,7 @@ class OrchestraRunner:
             'filename': l['filename'],
             'size': l['size'],
             'size_str': self._format_size(l['size']),
+            'segments': l['segments'],
             'created': l['created'].strftime("%Y-%m-%d %H:%M:%S"),
             'is_current': l['id'] == self.current_log_id
         } for l in logs]
@@ -359,13 +396,40 @@ class OrchestraRunner:
         if not os.path.exists(log_path):
             return None
 
+        # Активный лог: сбрасываем буфер записи, чтобы отдать свежие строки
+        self._flush_debug_log(log_id)
+
         try:
-            with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
-                return f.read()
+            # Все сегменты по порядку, сжатые распаковываются
+            return read_log(log_path)
         except Exception as e:
             log(f"Ошибка чтения лога {log_id}: {e}", "DEBUG")
             return None
 
+    def get_log_index(self, log_id: str) -> Optional[LogIndex]:
+        """
+        Возвращает индекс лога для офлайн-аналитики (события по хосту,
+        процент успеха стратегий за период) без загрузки лога в память.
+        Индекс сохраняется рядом с логом и обновляется только для изменившихся сегментов.
+
+        Args:
+            log_id: ID лога
+
+        Returns:
+            LogIndex или None
+        """
+        log_path = self._generate_log_path(log_id)
+        if not list_segments(log_path):
+            return None
+
+        self._flush_debug_log(log_id)
+
+        try:
+            return LogIndex.build(log_path)
+        except Exception as e:
+            log(f"Ошибка индексации лога {log_id}: {e}", "DEBUG")
+            return None
+
     def delete_log(self, log_id: str) -> bool:
         """
         Удаляет лог-файл по ID.
@@ -386,7 +450,7 @@ class OrchestraRunner:
             return False
 
         try:
-            os.remove(log_path)
+            delete_log_segments(log_path)
             log(f"Удалён лог: orchestra_{log_id}.log", "INFO")
             return True
         except Exception as e:
@@ -409,7 +473,7 @@ class OrchestraRunner:
                 continue
 
             try:
-                os.remove(log_info['path'])
+                delete_log_segments(log_info['path'])
                 deleted += 1
             except Exception:
                 pass
@@ -612,374 +676,396 @@ class OrchestraRunner:
     # REMOVED: _generate_single_numbered_file() - стратегии теперь встроены в circular-config.txt
     # REMOVED: _generate_numbered_strategies() - стратегии теперь встроены в circular-config.txt
 
-    def _read_output(self):
-        """Поток чтения stdout от winws2 с использованием LogParser"""
-        parser = LogParser()
-        history_save_counter = 0
-        log_line_counter = 0  # Счётчик строк для периодической проверки размера файла
-
-        # Открываем файл для записи сырого debug лога (для отправки в техподдержку)
-        log_file = None
-        if self.debug_log_path:
-            try:
-                log_file = open(self.debug_log_path, 'w', encoding='utf-8', buffering=1)  # line buffered
-                log_file.write(f"=== Orchestra Debug Log Started {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-            except Exception as e:
-                log(f"Не удалось открыть лог-файл: {e}", "WARNING")
+    def _start_output_pipeline(self):
+        """
+        Запускает конвейер обработки stdout winws2 (см. orchestra/output_pipeline.py):
+        reader только читает pipe, worker пишет debug лог / парсит / обновляет менеджеры,
+        emitter пачками отправляет сообщения в UI.
+        """
+        session = _OutputSession(self.current_log_id)
+        session.debug_log = self._open_debug_log()
+        session.pipeline = OutputPipeline(
+            process_line=lambda line: self._process_output_line(session, line),
+            deliver=self._deliver_output,
+            on_finish=lambda: self._on_output_finished(session),
+        )
+        self._output_session = session
+        self.output_pipeline = session.pipeline
+        self.output_pipeline.start(self.running_process.stdout)
+        self.output_thread = self.output_pipeline.threads[0]  # reader
+
+    def get_pipeline_stats(self) -> dict:
+        """Счётчики конвейера вывода (очереди, backpressure, отброшенные UI сообщения)"""
+        if self.output_pipeline is None:
+            return {}
+        return self.output_pipeline.get_stats()
+
+    def _emit_output(self, session: _OutputSession, msg: str):
+        """Ставит сообщение в очередь на отправку в UI (из потока worker)"""
+        if session.pipeline is not None and (self.output_callback or self.batch_output_callback):
+            session.pipeline.emit(msg)
+
+    def _deliver_output(self, batch: List[str]):
+        """Отправляет пачку сообщений в UI (из потока emitter)"""
+        if self.batch_output_callback:
+            self.batch_output_callback(batch)
+        elif self.output_callback:
+            for msg in batch:
+                self.output_callback(msg)
+
+    def _open_debug_log(self) -> Optional[RotatingLogWriter]:
+        """Открывает файл для записи сырого debug лога (для отправки в техподдержку)"""
+        if not self.debug_log_path:
+            return None
+        try:
+            writer = RotatingLogWriter(
+                self.debug_log_path,
+                segment_size=LOG_SEGMENT_SIZE_BYTES,
+                max_segments=LOG_MAX_SEGMENTS,
+            )
+            writer.write(f"=== Orchestra Debug Log Started {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===")
+            return writer
+        except Exception as e:
+            log(f"Не удалось открыть лог-файл: {e}", "WARNING")
+            return None
 
-        if self.running_process and self.running_process.stdout:
+    def _flush_debug_log(self, log_id: str):
+        """Сбрасывает буфер debug лога, если log_id - лог текущего запуска"""
+        session = self._output_session
+        if session is None or session.log_id != log_id or session.debug_log is None:
+            return
+        try:
+            session.debug_log.flush()
+        except Exception:
+            pass
+
+    def _write_debug_log(self, session: _OutputSession, line: str):
+        """Записывает строку в debug лог (ротация по размеру - в RotatingLogWriter)"""
+        log_file = session.debug_log
+        if not log_file:
+            return
+        try:
+            log_file.write(line)
+        except Exception:
+            pass
+
+    def _on_output_finished(self, session: _OutputSession):
+        """Вызывается в потоке worker после последней строки вывода"""
+        # Закрываем лог-файл
+        if session.debug_log:
             try:
-                for line in self.running_process.stdout:
-                    if self.stop_event.is_set():
-                        break
-
-                    line = line.rstrip()
-                    if not line:
-                        continue
+                session.debug_log.write(f"=== Orchestra Debug Log Ended {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===")
+                session.debug_log.close()
+            except Exception:
+                pass
+            session.debug_log = None
+        # Сохраняем историю при завершении
+        if self.locked_manager.strategy_history:
+            self.locked_manager.save_history()
 
-                    # Записываем в debug лог
-                    if log_file:
-                        try:
-                            log_file.write(f"{line}\n")
-                            log_line_counter += 1
-
-                            # Периодически проверяем размер файла
-                            if log_line_counter >= LOG_SIZE_CHECK_INTERVAL:
-                                log_line_counter = 0
-                                try:
-                                    log_file.flush()
-                                    file_size = os.path.getsize(self.debug_log_path)
-                                    if file_size > MAX_LOG_SIZE_BYTES:
-                                        # Файл превысил лимит - очищаем
-                                        log_file.close()
-                                        log_file = open(self.debug_log_path, 'w', encoding='utf-8', buffering=1)
-                                        log_file.write(f"=== Log truncated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (exceeded {MAX_LOG_SIZE_BYTES // (1024*1024*1024)} GB) ===\n")
-                                        log(f"Лог-файл оркестратора очищен (превышен лимит {MAX_LOG_SIZE_BYTES // (1024*1024*1024)} ГБ)", "INFO")
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-
-                    # Парсим строку
-                    event = parser.parse_line(line)
-                    if not event:
-                        continue
+    def _process_output_line(self, session: _OutputSession, line: str):
+        """Обрабатывает одну строку stdout winws2 (поток worker)"""
+        # Записываем в debug лог
+        self._write_debug_log(session, line)
+
+        # Парсим строку
+        event = session.parser.parse_line(line)
+        if event:
+            self._handle_event(session, event)
+
+    def _handle_event(self, session: _OutputSession, event: ParsedEvent):
+        """Обновляет менеджеры по событию лога и формирует сообщения для UI"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        is_udp = event.l7proto in ("udp", "quic", "stun", "discord", "wireguard", "dht", "unknown")
+
+        # === LOCK ===
+        if event.event_type == EventType.LOCK:
+            host = event.hostname
+            strat = event.strategy
+            proto = event.l7proto or "tls"
+
+            # Пропускаем заблокированные стратегии
+            if self.blocked_manager.is_blocked(host, strat):
+                return
+
+            # Маппинг l7proto -> askey
+            askey = PROTO_TO_ASKEY.get(proto, proto if proto in ASKEY_ALL else "tls")
+
+            # Пропускаем user locks - их нельзя перезаписать auto-lock
+            if self.locked_manager.is_user_locked(host, askey):
+                log(f"SKIP auto-lock: {host} has user lock [{askey.upper()}]", "DEBUG")
+                return
+
+            # Protocol tag and port for UI
+            if askey in UDP_ASKEYS:
+                proto_tag = f"[{askey.upper()}]"
+                port_str = ""
+            elif askey == "http":
+                proto_tag = "[HTTP]"
+                port_str = ":80"
+            else:
+                proto_tag = f"[{askey.upper()}]"
+                port_str = ":443" if askey in TCP_ASKEYS else ""
+
+            target_dict = self.locked_manager.locked_by_askey[askey]
+            if host not in target_dict or target_dict[host] != strat:
+                target_dict[host] = strat
+                self.locked_manager.mark_dirty(host, askey)
+                msg = f"[{timestamp}] {proto_tag} 🔒 LOCKED: {host}{port_str} = strategy {strat}"
+                log(msg, "INFO")
+                self._emit_output(session, msg)
+                if self.lock_callback:
+                    self.lock_callback(host, strat)
+                self.locked_manager.save()
+            return
 
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    is_udp = event.l7proto in ("udp", "quic", "stun", "discord", "wireguard", "dht", "unknown")
+        # === UNLOCK ===
+        if event.event_type == EventType.UNLOCK:
+            host = event.hostname
+            proto = event.l7proto or "tls"
+            askey = PROTO_TO_ASKEY.get(proto, proto if proto in ASKEY_ALL else "tls")
+            removed = False
+
+            # Ищем хост во всех askey профилях и удаляем
+            for ak in ASKEY_ALL:
+                target_dict = self.locked_manager.locked_by_askey[ak]
+                if host in target_dict:
+                    del target_dict[host]
+                    self.locked_manager.mark_dirty(host, ak)
+                    removed = True
+                    proto_tag = f"[{ak.upper()}]"
+                    port_str = ":443" if ak == "tls" else (":80" if ak == "http" else "")
+                    msg = f"[{timestamp}] {proto_tag} 🔓 UNLOCKED: {host}{port_str} - re-learning..."
+                    log(msg, "INFO")
+                    self._emit_output(session, msg)
+                    if self.unlock_callback:
+                        self.unlock_callback(host)
+            if removed:
+                self.locked_manager.save()
+            return
 
-                    # === LOCK ===
-                    if event.event_type == EventType.LOCK:
-                        host = event.hostname
-                        strat = event.strategy
-                        proto = event.l7proto or "tls"
+        # === RESET ===
+        if event.event_type == EventType.RESET:
+            host = event.hostname
+            msg = f"[{timestamp}] 🔄 RESET: {host} - statistics cleared"
+            log(msg, "INFO")
+            self._emit_output(session, msg)
+            return
 
-                        # Пропускаем заблокированные стратегии
-                        if self.blocked_manager.is_blocked(host, strat):
-                            continue
+        # === APPLIED ===
+        if event.event_type == EventType.APPLIED:
+            host = event.hostname
+            strat = event.strategy
+            proto = event.l7proto or "tls"
+            prev = session.parser.last_applied.get((host, proto))
+
+            # Protocol tag for APPLIED
+            if is_udp:
+                proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
+            elif proto == "http":
+                proto_tag = "[HTTP]"
+            else:
+                proto_tag = "[TLS]"
 
-                        # Маппинг l7proto -> askey
-                        askey = PROTO_TO_ASKEY.get(proto, proto if proto in ASKEY_ALL else "tls")
+            if prev is None or prev != strat:
+                if prev is None:
+                    msg = f"[{timestamp}] {proto_tag} 🎯 APPLIED: {host} = strategy {strat}"
+                else:
+                    msg = f"[{timestamp}] {proto_tag} 🔄 APPLIED: {host} {prev} → {strat}"
+                self._emit_output(session, msg)
+            return
 
-                        # Пропускаем user locks - их нельзя перезаписать auto-lock
-                        if self.locked_manager.is_user_locked(host, askey):
-                            log(f"SKIP auto-lock: {host} has user lock [{askey.upper()}]", "DEBUG")
-                            continue
+        # === SUCCESS (from strategy_quality) ===
+        if event.event_type == EventType.SUCCESS and event.total is not None:
+            host = event.hostname
+            strat = event.strategy
+            proto = event.l7proto or "tls"
+
+            if host and strat:
+                self.locked_manager.increment_history(host, strat, is_success=True)
+                session.history_save_counter += 1
+
+                # Сброс счётчика Discord FAIL при SUCCESS
+                if "discord" in host.lower() and self.discord_fail_count > 0:
+                    self.discord_fail_count = 0
+
+                # Protocol tag for clear identification
+                if is_udp:
+                    proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
+                    port_str = ""
+                elif proto == "http":
+                    proto_tag = "[HTTP]"
+                    port_str = ":80"
+                else:
+                    proto_tag = "[TLS]"
+                    port_str = ":443"
+                msg = f"[{timestamp}] {proto_tag} ✓ SUCCESS: {host}{port_str} strategy={strat} ({event.successes}/{event.total})"
+                self._emit_output(session, msg)
 
-                        # Protocol tag and port for UI
-                        if askey in UDP_ASKEYS:
-                            proto_tag = f"[{askey.upper()}]"
-                            port_str = ""
-                        elif askey == "http":
-                            proto_tag = "[HTTP]"
-                            port_str = ":80"
-                        else:
-                            proto_tag = f"[{askey.upper()}]"
-                            port_str = ":443" if askey in TCP_ASKEYS else ""
+                if session.history_save_counter >= 5:
+                    self.locked_manager.save_history()
+                    session.history_save_counter = 0
+            return
 
+        # === SUCCESS (from std_success_detector) ===
+        if event.event_type == EventType.SUCCESS:
+            host = event.hostname
+            strat = event.strategy
+            proto = event.l7proto or "tls"
+
+            if host and strat and not self.blocked_manager.is_blocked(host, strat):
+                self.locked_manager.increment_history(host, strat, is_success=True)
+                session.history_save_counter += 1
+
+                # Сброс счётчика Discord FAIL при SUCCESS
+                if "discord" in host.lower() and self.discord_fail_count > 0:
+                    self.discord_fail_count = 0
+
+                # Protocol tag for clear identification
+                if is_udp:
+                    proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
+                    port_str = ""
+                elif proto == "http":
+                    proto_tag = "[HTTP]"
+                    port_str = ":80"
+                else:
+                    proto_tag = "[TLS]"
+                    port_str = ":443"
+
+                # Auto-LOCK после успехов
+                host_key = f"{host}:{strat}"
+                if not hasattr(self, '_success_counts'):
+                    self._success_counts = {}
+                self._success_counts[host_key] = self._success_counts.get(host_key, 0) + 1
+
+                lock_threshold = 1 if is_udp else 3
+                if self._success_counts[host_key] >= lock_threshold:
+                    # Маппинг l7proto -> askey
+                    askey = PROTO_TO_ASKEY.get(proto, proto if proto in ASKEY_ALL else "tls")
+
+                    # Пропускаем user locks - их нельзя перезаписать auto-lock
+                    if self.locked_manager.is_user_locked(host, askey):
+                        log(f"SKIP auto-lock: {host} has user lock [{askey.upper()}]", "DEBUG")
+                    else:
                         target_dict = self.locked_manager.locked_by_askey[askey]
+
                         if host not in target_dict or target_dict[host] != strat:
                             target_dict[host] = strat
+                            self.locked_manager.mark_dirty(host, askey)
                             msg = f"[{timestamp}] {proto_tag} 🔒 LOCKED: {host}{port_str} = strategy {strat}"
                             log(msg, "INFO")
-                            if self.output_callback:
-                                self.output_callback(msg)
-                            if self.lock_callback:
-                                self.lock_callback(host, strat)
+                            self._emit_output(session, msg)
                             self.locked_manager.save()
-                        continue
+                            self.locked_manager.save_history()
+                            session.history_save_counter = 0
 
-                    # === UNLOCK ===
-                    if event.event_type == EventType.UNLOCK:
-                        host = event.hostname
-                        proto = event.l7proto or "tls"
-                        askey = PROTO_TO_ASKEY.get(proto, proto if proto in ASKEY_ALL else "tls")
-                        removed = False
-
-                        # Ищем хост во всех askey профилях и удаляем
-                        for ak in ASKEY_ALL:
-                            target_dict = self.locked_manager.locked_by_askey[ak]
-                            if host in target_dict:
-                                del target_dict[host]
-                                removed = True
-                                proto_tag = f"[{ak.upper()}]"
-                                port_str = ":443" if ak == "tls" else (":80" if ak == "http" else "")
-                                msg = f"[{timestamp}] {proto_tag} 🔓 UNLOCKED: {host}{port_str} - re-learning..."
-                                log(msg, "INFO")
-                                if self.output_callback:
-                                    self.output_callback(msg)
-                                if self.unlock_callback:
-                                    self.unlock_callback(host)
-                        if removed:
-                            self.locked_manager.save()
-                        continue
-
-                    # === RESET ===
-                    if event.event_type == EventType.RESET:
-                        host = event.hostname
-                        msg = f"[{timestamp}] 🔄 RESET: {host} - statistics cleared"
-                        log(msg, "INFO")
-                        if self.output_callback:
-                            self.output_callback(msg)
-                        continue
-
-                    # === APPLIED ===
-                    if event.event_type == EventType.APPLIED:
-                        host = event.hostname
-                        strat = event.strategy
-                        proto = event.l7proto or "tls"
-                        prev = parser.last_applied.get((host, proto))
-
-                        # Protocol tag for APPLIED
-                        if is_udp:
-                            proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
-                        elif proto == "http":
-                            proto_tag = "[HTTP]"
-                        else:
-                            proto_tag = "[TLS]"
-
-                        if prev is None or prev != strat:
-                            if prev is None:
-                                msg = f"[{timestamp}] {proto_tag} 🎯 APPLIED: {host} = strategy {strat}"
-                            else:
-                                msg = f"[{timestamp}] {proto_tag} 🔄 APPLIED: {host} {prev} → {strat}"
-                            if self.output_callback:
-                                self.output_callback(msg)
-                        continue
+                msg = f"[{timestamp}] {proto_tag} ✓ SUCCESS: {host}{port_str} strategy={strat}"
+                self._emit_output(session, msg)
 
-                    # === SUCCESS (from strategy_quality) ===
-                    if event.event_type == EventType.SUCCESS and event.total is not None:
-                        host = event.hostname
-                        strat = event.strategy
-                        proto = event.l7proto or "tls"
-
-                        if host and strat:
-                            self.locked_manager.increment_history(host, strat, is_success=True)
-                            history_save_counter += 1
-
-                            # Сброс счётчика Discord FAIL при SUCCESS
-                            if "discord" in host.lower() and self.discord_fail_count > 0:
-                                self.discord_fail_count = 0
-
-                            # Protocol tag for clear identification
-                            if is_udp:
-                                proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
-                                port_str = ""
-                            elif proto == "http":
-                                proto_tag = "[HTTP]"
-                                port_str = ":80"
-                            else:
-                                proto_tag = "[TLS]"
-                                port_str = ":443"
-                            msg = f"[{timestamp}] {proto_tag} ✓ SUCCESS: {host}{port_str} strategy={strat} ({event.successes}/{event.total})"
-                            if self.output_callback:
-                                self.output_callback(msg)
-
-                            if history_save_counter >= 5:
-                                self.locked_manager.save_history()
-                                history_save_counter = 0
-                        continue
+                if session.history_save_counter >= 5:
+                    self.locked_manager.save_history()
+                    session.history_save_counter = 0
+            return
 
-                    # === SUCCESS (from std_success_detector) ===
-                    if event.event_type == EventType.SUCCESS:
-                        host = event.hostname
-                        strat = event.strategy
-                        proto = event.l7proto or "tls"
-
-                        if host and strat and not self.blocked_manager.is_blocked(host, strat):
-                            self.locked_manager.increment_history(host, strat, is_success=True)
-                            history_save_counter += 1
-
-                            # Сброс счётчика Discord FAIL при SUCCESS
-                            if "discord" in host.lower() and self.discord_fail_count > 0:
-                                self.discord_fail_count = 0
-
-                            # Protocol tag for clear identification
-                            if is_udp:
-                                proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
-                                port_str = ""
-                            elif proto == "http":
-                                proto_tag = "[HTTP]"
-                                port_str = ":80"
-                            else:
-                                proto_tag = "[TLS]"
-                                port_str = ":443"
-
-                            # Auto-LOCK после успехов
-                            host_key = f"{host}:{strat}"
-                            if not hasattr(self, '_success_counts'):
-                                self._success_counts = {}
-                            self._success_counts[host_key] = self._success_counts.get(host_key, 0) + 1
-
-                            lock_threshold = 1 if is_udp else 3
-                            if self._success_counts[host_key] >= lock_threshold:
-                                # Маппинг l7proto -> askey
-                                askey = PROTO_TO_ASKEY.get(proto, proto if proto in ASKEY_ALL else "tls")
-
-                                # Пропускаем user locks - их нельзя перезаписать auto-lock
-                                if self.locked_manager.is_user_locked(host, askey):
-                                    log(f"SKIP auto-lock: {host} has user lock [{askey.upper()}]", "DEBUG")
-                                else:
-                                    target_dict = self.locked_manager.locked_by_askey[askey]
-
-                                    if host not in target_dict or target_dict[host] != strat:
-                                        target_dict[host] = strat
-                                        msg = f"[{timestamp}] {proto_tag} 🔒 LOCKED: {host}{port_str} = strategy {strat}"
-                                        log(msg, "INFO")
-                                        if self.output_callback:
-                                            self.output_callback(msg)
-                                        self.locked_manager.save()
-                                        self.locked_manager.save_history()
-                                        history_save_counter = 0
-
-                            msg = f"[{timestamp}] {proto_tag} ✓ SUCCESS: {host}{port_str} strategy={strat}"
-                            if self.output_callback:
-                                self.output_callback(msg)
-
-                            if history_save_counter >= 5:
-                                self.locked_manager.save_history()
-                                history_save_counter = 0
-                        continue
+        # === FAIL ===
+        if event.event_type == EventType.FAIL:
+            host = event.hostname
+            strat = event.strategy
+            proto = event.l7proto or "tls"
+
+            if host and strat:
+                self.locked_manager.increment_history(host, strat, is_success=False)
+                session.history_save_counter += 1
+
+                # Protocol tag for clear identification
+                if is_udp:
+                    proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
+                    port_str = ""
+                elif proto == "http":
+                    proto_tag = "[HTTP]"
+                    port_str = ":80"
+                else:
+                    proto_tag = "[TLS]"
+                    port_str = ":443"
+                msg = f"[{timestamp}] {proto_tag} ✗ FAIL: {host}{port_str} strategy={strat} ({event.successes}/{event.total})"
+                self._emit_output(session, msg)
+
+                # Проверяем Discord FAIL для авторестарта Discord (с подсчётом фейлов)
+                if self.auto_restart_on_discord_fail and "discord" in host.lower():
+                    self.discord_fail_count += 1
+                    log(f"Discord FAIL #{self.discord_fail_count}/{self.discord_fails_threshold} ({host})", "DEBUG")
+                    if self.discord_fail_count >= self.discord_fails_threshold:
+                        log(f"🔄 Достигнут порог Discord FAIL ({self.discord_fail_count}), перезапускаю Discord...", "WARNING")
+                        self._emit_output(session, f"[{timestamp}] ⚠️ Discord FAIL x{self.discord_fail_count} - перезапуск Discord...")
+                        if self.restart_callback:
+                            # Вызываем callback для перезапуска Discord (через главный поток)
+                            self.restart_callback()
+                        self.discord_fail_count = 0  # Сброс после рестарта
+
+                if session.history_save_counter >= 5:
+                    self.locked_manager.save_history()
+                    session.history_save_counter = 0
+            return
 
-                    # === FAIL ===
-                    if event.event_type == EventType.FAIL:
-                        host = event.hostname
-                        strat = event.strategy
-                        proto = event.l7proto or "tls"
-
-                        if host and strat:
-                            self.locked_manager.increment_history(host, strat, is_success=False)
-                            history_save_counter += 1
-
-                            # Protocol tag for clear identification
-                            if is_udp:
-                                proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
-                                port_str = ""
-                            elif proto == "http":
-                                proto_tag = "[HTTP]"
-                                port_str = ":80"
-                            else:
-                                proto_tag = "[TLS]"
-                                port_str = ":443"
-                            msg = f"[{timestamp}] {proto_tag} ✗ FAIL: {host}{port_str} strategy={strat} ({event.successes}/{event.total})"
-                            if self.output_callback:
-                                self.output_callback(msg)
-
-                            # Проверяем Discord FAIL для авторестарта Discord (с подсчётом фейлов)
-                            if self.auto_restart_on_discord_fail and "discord" in host.lower():
-                                self.discord_fail_count += 1
-                                log(f"Discord FAIL #{self.discord_fail_count}/{self.discord_fails_threshold} ({host})", "DEBUG")
-                                if self.discord_fail_count >= self.discord_fails_threshold:
-                                    log(f"🔄 Достигнут порог Discord FAIL ({self.discord_fail_count}), перезапускаю Discord...", "WARNING")
-                                    if self.output_callback:
-                                        self.output_callback(f"[{timestamp}] ⚠️ Discord FAIL x{self.discord_fail_count} - перезапуск Discord...")
-                                    if self.restart_callback:
-                                        # Вызываем callback для перезапуска Discord (через главный поток)
-                                        self.restart_callback()
-                                    self.discord_fail_count = 0  # Сброс после рестарта
-
-                            if history_save_counter >= 5:
-                                self.locked_manager.save_history()
-                                history_save_counter = 0
-                        continue
+        # === ROTATE ===
+        if event.event_type == EventType.ROTATE:
+            host = event.hostname or session.parser.current_host
+            proto = event.l7proto or "tls"
+            # Protocol tag for rotate
+            if is_udp:
+                proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
+            elif proto == "http":
+                proto_tag = "[HTTP]"
+            else:
+                proto_tag = "[TLS]"
+            msg = f"[{timestamp}] {proto_tag} 🔄 Strategy rotated to {event.strategy}"
+            if host:
+                msg += f" ({host})"
+            self._emit_output(session, msg)
+            return
 
-                    # === ROTATE ===
-                    if event.event_type == EventType.ROTATE:
-                        host = event.hostname or parser.current_host
-                        proto = event.l7proto or "tls"
-                        # Protocol tag for rotate
-                        if is_udp:
-                            proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
-                        elif proto == "http":
-                            proto_tag = "[HTTP]"
-                        else:
-                            proto_tag = "[TLS]"
-                        msg = f"[{timestamp}] {proto_tag} 🔄 Strategy rotated to {event.strategy}"
-                        if host:
-                            msg += f" ({host})"
-                        if self.output_callback:
-                            self.output_callback(msg)
-                        continue
+        # === RST ===
+        if event.event_type == EventType.RST:
+            host = event.hostname
+            strat = event.strategy
+            proto = event.l7proto or "tls"
+            # Protocol tag for RST
+            if is_udp:
+                proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
+                port_str = ""
+            elif proto == "http":
+                proto_tag = "[HTTP]"
+                port_str = ":80"
+            else:
+                proto_tag = "[TLS]"
+                port_str = ":443"
 
-                    # === RST ===
-                    if event.event_type == EventType.RST:
-                        host = event.hostname
-                        strat = event.strategy
-                        proto = event.l7proto or "tls"
-                        # Protocol tag for RST
-                        if is_udp:
-                            proto_tag = f"[{proto.upper()}]" if proto else "[UDP]"
-                            port_str = ""
-                        elif proto == "http":
-                            proto_tag = "[HTTP]"
-                            port_str = ":80"
-                        else:
-                            proto_tag = "[TLS]"
-                            port_str = ":443"
-
-                        if host and strat:
-                            msg = f"[{timestamp}] {proto_tag} ⚡ RST detected: {host}{port_str} strategy={strat}"
-                        elif host:
-                            msg = f"[{timestamp}] {proto_tag} ⚡ RST detected: {host}{port_str}"
-                        else:
-                            msg = f"[{timestamp}] {proto_tag} ⚡ RST detected - DPI block"
-                        if self.output_callback:
-                            self.output_callback(msg)
-                        continue
+            if host and strat:
+                msg = f"[{timestamp}] {proto_tag} ⚡ RST detected: {host}{port_str} strategy={strat}"
+            elif host:
+                msg = f"[{timestamp}] {proto_tag} ⚡ RST detected: {host}{port_str}"
+            else:
+                msg = f"[{timestamp}] {proto_tag} ⚡ RST detected - DPI block"
+            self._emit_output(session, msg)
+            return
 
-                    # === HISTORY ===
-                    if event.event_type == EventType.HISTORY:
-                        self.locked_manager.update_history(event.hostname, event.strategy, event.successes, event.failures)
-                        # Не спамим UI историей - данные и так сохраняются
-                        # msg = f"[{timestamp}] HISTORY: {event.hostname} strat={event.strategy} ({event.successes}✓/{event.failures}✗) = {event.rate}%"
-                        # if self.output_callback:
-                        #     self.output_callback(msg)
-                        self.locked_manager.save_history()
-                        continue
+        # === HISTORY ===
+        if event.event_type == EventType.HISTORY:
+            self.locked_manager.update_history(event.hostname, event.strategy, event.successes, event.failures)
+            # Не спамим UI историей - данные и так сохраняются
+            # msg = f"[{timestamp}] HISTORY: {event.hostname} strat={event.strategy} ({event.successes}✓/{event.failures}✗) = {event.rate}%"
+            # if self.output_callback:
+            #     self.output_callback(msg)
+            self.locked_manager.save_history()
+            return
 
-                    # === PRELOADED ===
-                    if event.event_type == EventType.PRELOADED:
-                        proto_str = f" [{event.l7proto}]" if event.l7proto else ""
-                        msg = f"[{timestamp}] PRELOADED: {event.hostname} = strategy {event.strategy}{proto_str}"
-                        if self.output_callback:
-                            self.output_callback(msg)
-                        continue
+        # === PRELOADED ===
+        if event.event_type == EventType.PRELOADED:
+            proto_str = f" [{event.l7proto}]" if event.l7proto else ""
+            msg = f"[{timestamp}] PRELOADED: {event.hostname} = strategy {event.strategy}{proto_str}"
+            self._emit_output(session, msg)
+            return
 
-            except Exception as e:
-                import traceback
-                log(f"Read output error: {e}", "DEBUG")
-                log(f"Traceback: {traceback.format_exc()}", "DEBUG")
-            finally:
-                # Закрываем лог-файл
-                if log_file:
-                    try:
-                        log_file.write(f"=== Orchestra Debug Log Ended {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-                        log_file.close()
-                    except Exception:
-                        pass
-                # Сохраняем историю при завершении
-                if self.locked_manager.strategy_history:
-                    self.locked_manager.save_history()
 
     def prepare(self) -> bool:
         """
@@ -1085,7 +1171,7 @@ class OrchestraRunner:
             if learned_lua:
                 cmd.append(f"--lua-init=@{learned_lua}")
 
-            # Debug: выводим в stdout для парсинга, записываем в файл вручную в _read_output
+            # Debug: выводим в stdout для парсинга, записываем в файл вручную в потоке worker
             cmd.append("--debug=1")
 
             log_msg = f"Запуск: winws2.exe @{os.path.basename(self.config_path)}"
@@ -1106,8 +1192,7 @@ class OrchestraRunner:
             )
 
             # Чтение stdout (парсим LOCKED/UNLOCKING для UI)
-            self.output_thread = threading.Thread(target=self._read_output, daemon=True)
-            self.output_thread.start()
+            self._start_output_pipeline()
 
             log(f"Оркестратор запущен (PID: {self.running_process.pid})", "INFO")
 
@@ -1147,9 +1232,16 @@ class OrchestraRunner:
                 self.running_process.kill()
                 self.running_process.wait()
 
-            # Сохраняем стратегии и историю
+            # Дожидаемся закрытия debug лога и финального сохранения истории в потоке worker
+            if self.output_pipeline:
+                self.output_pipeline.stop()
+                self.output_pipeline.join(timeout=3)
+
+            # Сохраняем стратегии и историю (сбрасываем очередь записи в реестр)
             self.locked_manager.save()
             self.locked_manager.save_history()
+            self.blocked_manager.save()
+            self.registry_writer.flush()
 
             # Лог оркестратора всегда сохраняется (для отправки в техподдержку)
             # Ротация старых логов выполняется при следующем запуске (_cleanup_old_logs)
@@ -1167,6 +1259,7 @@ class OrchestraRunner:
 
             # Сбрасываем ID текущего лога
             self.current_log_id = None
+            self._output_session = None
             self.running_process = None
             return True
 
@@ -1370,56 +1463,16 @@ class OrchestraRunner:
         """
         Загружает ipset подсети для определения игр/сервисов по IP (UDP/QUIC).
         Читает все ipset-*.txt и my-ipset.txt из папки lists.
+        Повторный вызов перечитывает только изменившиеся файлы.
         """
-        if self.ipset_networks:
-            return
         try:
-            ipset_files = glob.glob(os.path.join(LISTS_FOLDER, "ipset-*.txt"))
-            # Добавляем пользовательский ipset
-            ipset_files.append(os.path.join(LISTS_FOLDER, "my-ipset.txt"))
-
-            networks: list[tuple[ipaddress._BaseNetwork, str]] = []
-            for path in ipset_files:
-                if not os.path.exists(path):
-                    continue
-                base = os.path.basename(path)
-                label = os.path.splitext(base)[0]
-                if label.startswith("ipset-"):
-                    label = label[len("ipset-"):]
-                elif label == "my-ipset":
-                    label = "my-ipset"
-                try:
-                    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                        for line in f:
-                            line = line.strip()
-                            if not line or line.startswith("#"):
-                                continue
-                            try:
-                                net = ipaddress.ip_network(line, strict=False)
-                                networks.append((net, label))
-                            except ValueError:
-                                continue
-                except Exception as e:
-                    log(f"Ошибка чтения {path}: {e}", "DEBUG")
-
-            self.ipset_networks = networks
-            if networks:
-                log(f"Загружено {len(networks)} ipset подсетей ({len(ipset_files)} файлов)", "DEBUG")
+            self.ipset_index.refresh()
         except Exception as e:
             log(f"Ошибка загрузки ipset подсетей: {e}", "DEBUG")
 
     def _resolve_ipset_label(self, ip: str) -> Optional[str]:
         """Возвращает имя ipset файла по IP, если найдено соответствие подсети."""
-        if not ip or not self.ipset_networks:
-            return None
-        try:
-            ip_obj = ipaddress.ip_address(ip)
-        except ValueError:
-            return None
-        for net, label in self.ipset_networks:
-            if ip_obj in net:
-                return label
-        return None
+        return self.ipset_index.resolve(ip)
 
     # REMOVED: _write_strategies_from_file() - стратегии теперь встроены в circular-config.txt
     # REMOVED: _generate_circular_config() - конфиг теперь статический в /home/privacy/zapret/lua/circular-config.txt
@@ -0,0 +1,244 @@
+# orchestra/output_pipeline.py
+"""
+Конвейер обработки stdout winws2 для оркестратора.
+
+Три потока:
+- reader  - только читает строки из pipe и кладёт в ограниченную очередь
+            (если очередь полна - ждёт, это backpressure; строки не теряются)
+- worker  - забирает строки, пишет debug лог, парсит, обновляет менеджеры
+- emitter - раз в тик отправляет в UI пачку из не более чем ui_batch_size сообщений
+            (если UI не успевает и буфер полон - отбрасываются самые старые сообщения)
+
+Медленный шаг (реестр, UI callback) больше не тормозит чтение pipe:
+winws2 блокируется только когда переполнена очередь сырых строк.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, List, Optional
+
+from log import log
+
+
+# Размер очереди сырых строк (reader -> worker)
+RAW_QUEUE_SIZE = 20000
+
+# Размер буфера сообщений для UI (worker -> emitter)
+UI_QUEUE_SIZE = 2000
+
+# Сколько сообщений отправляется в UI за один тик и период тика (секунды)
+UI_BATCH_SIZE = 50
+UI_EMIT_INTERVAL = 0.05
+
+# Маркер конца потока
+_EOF = object()
+
+
+class MessageBuffer:
+    """Ограниченный буфер сообщений: при переполнении отбрасывает самые старые"""
+
+    def __init__(self, maxlen: int = UI_QUEUE_SIZE):
+        self.maxlen = maxlen
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.peak = 0
+
+    def push(self, message: str):
+        with self._lock:
+            if len(self._items) >= self.maxlen:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(message)
+            if len(self._items) > self.peak:
+                self.peak = len(self._items)
+
+    def pop_batch(self, limit: int) -> List[str]:
+        with self._lock:
+            count = min(limit, len(self._items))
+            return [self._items.popleft() for _ in range(count)]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class OutputPipeline:
+    """
+    Конвейер reader -> worker -> emitter.
+
+    Использование:
+        pipeline = OutputPipeline(process_line, deliver, on_finish=...)
+        pipeline.start(process.stdout)
+        ...
+        pipeline.emit("[12:00:00] message")   # из process_line
+        ...
+        pipeline.stop(); pipeline.join(timeout=2)
+    """
+
+    def __init__(
+        self,
+        process_line: Callable[[str], None],
+        deliver: Callable[[List[str]], None],
+        on_finish: Optional[Callable[[], None]] = None,
+        raw_queue_size: int = RAW_QUEUE_SIZE,
+        ui_queue_size: int = UI_QUEUE_SIZE,
+        ui_batch_size: int = UI_BATCH_SIZE,
+        ui_interval: float = UI_EMIT_INTERVAL,
+    ):
+        """
+        Args:
+            process_line: Обработка одной строки (поток worker)
+            deliver: Отправка пачки сообщений в UI (поток emitter)
+            on_finish: Вызывается в потоке worker после последней строки
+        """
+        self.process_line = process_line
+        self.deliver = deliver
+        self.on_finish = on_finish
+        self.ui_batch_size = ui_batch_size
+        self.ui_interval = ui_interval
+
+        self._raw: queue.Queue = queue.Queue(maxsize=raw_queue_size)
+        self._messages = MessageBuffer(ui_queue_size)
+        self._stop = threading.Event()
+        self._worker_done = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+        # Счётчики
+        self.lines_read = 0
+        self.lines_processed = 0
+        self.process_errors = 0
+        self.backpressure_waits = 0      # сколько раз reader ждал место в очереди
+        self.backpressure_seconds = 0.0  # суммарное время ожидания reader'а
+        self.ui_sent = 0
+        self.ui_batches = 0
+
+    # ==================== УПРАВЛЕНИЕ ====================
+
+    def start(self, stream: Iterable[str]):
+        """Запускает потоки reader/worker/emitter для указанного потока строк"""
+        self.threads = [
+            threading.Thread(target=self._read, args=(stream,), name="OrchestraReader", daemon=True),
+            threading.Thread(target=self._work, name="OrchestraWorker", daemon=True),
+            threading.Thread(target=self._emit_loop, name="OrchestraEmitter", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        """Просит все стадии завершиться (необработанные строки отбрасываются)"""
+        self._stop.set()
+
+    def join(self, timeout: float = None):
+        """Ждёт завершения потоков (общий timeout на все)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in self.threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+
+    def emit(self, message: str):
+        """Ставит сообщение в очередь на отправку в UI"""
+        self._messages.push(message)
+
+    def get_stats(self) -> dict:
+        """Счётчики конвейера (для диагностики: успевает ли GUI)"""
+        return {
+            'lines_read': self.lines_read,
+            'lines_processed': self.lines_processed,
+            'process_errors': self.process_errors,
+            'raw_pending': self._raw.qsize(),
+            'raw_capacity': self._raw.maxsize,
+            'backpressure_waits': self.backpressure_waits,
+            'backpressure_seconds': round(self.backpressure_seconds, 3),
+            'ui_pending': len(self._messages),
+            'ui_capacity': self._messages.maxlen,
+            'ui_peak': self._messages.peak,
+            'ui_sent': self.ui_sent,
+            'ui_batches': self.ui_batches,
+            'ui_dropped': self._messages.dropped,
+        }
+
+    # ==================== СТАДИИ ====================
+
+    def _put_raw(self, item) -> bool:
+        """Кладёт строку в очередь; при переполнении ждёт (backpressure). False - остановка"""
+        try:
+            self._raw.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        self.backpressure_waits += 1
+        started = time.monotonic()
+        try:
+            while not self._stop.is_set() and not self._worker_done.is_set():
+                try:
+                    self._raw.put(item, timeout=0.2)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.backpressure_seconds += time.monotonic() - started
+
+    def _read(self, stream: Iterable[str]):
+        """Reader: только чтение pipe и постановка строк в очередь"""
+        try:
+            for line in stream:
+                if self._stop.is_set():
+                    break
+                line = line.rstrip()
+                if not line:
+                    continue
+                self.lines_read += 1
+                if not self._put_raw(line):
+                    break
+        except Exception as e:
+            log(f"Read output error: {e}", "DEBUG")
+        finally:
+            self._put_raw(_EOF)
+
+    def _work(self):
+        """Worker: обработка строк по одной"""
+        try:
+            while not self._stop.is_set():
+                try:
+                    line = self._raw.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if line is _EOF:
+                    break
+                try:
+                    self.process_line(line)
+                except Exception as e:
+                    self.process_errors += 1
+                    if self.process_errors <= 10:
+                        import traceback
+                        log(f"Ошибка обработки строки оркестратора: {e}", "DEBUG")
+                        log(f"Traceback: {traceback.format_exc()}", "DEBUG")
+                self.lines_processed += 1
+        finally:
+            try:
+                if self.on_finish:
+                    self.on_finish()
+            except Exception as e:
+                log(f"Ошибка завершения обработки вывода оркестратора: {e}", "DEBUG")
+            self._worker_done.set()
+
+    def _emit_loop(self):
+        """Emitter: раз в тик отправляет в UI не больше ui_batch_size сообщений"""
+        while True:
+            finished = self._worker_done.is_set()
+            batch = self._messages.pop_batch(self.ui_batch_size)
+            if batch:
+                try:
+                    self.deliver(batch)
+                except Exception as e:
+                    log(f"Ошибка отправки сообщений оркестратора в UI: {e}", "DEBUG")
+                self.ui_sent += len(batch)
+                self.ui_batches += 1
+            if finished and not len(self._messages):
+                break
+            if not finished:
+                time.sleep(self.ui_interval)
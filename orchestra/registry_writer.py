@@ -0,0 +1,192 @@
+# orchestra/registry_writer.py
+"""
+Отложенная (write-behind) запись в реестр для менеджеров оркестратора.
+
+Менеджеры ставят изменённые значения в очередь, фоновый поток сбрасывает их
+пачкой: по таймеру (flush_interval) или при накоплении max_pending значений.
+Повторные изменения одного значения до сброса схлопываются в одну запись,
+значения одного ключа реестра пишутся за одно открытие ключа.
+
+Хранилище подключаемое:
+- WinRegistryBackend - реестр Windows через config.reg
+- MemoryRegistryBackend - словарь в памяти (тесты на Linux)
+
+Менеджеры по умолчанию используют общую для процесса очередь
+get_registry_writer(): временные менеджеры страниц и менеджеры runner'а
+пишут через одну очередь, поэтому load() после flush() видит все изменения.
+"""
+
+import atexit
+import threading
+from typing import Dict, Optional, Tuple
+
+from log import log
+
+
+# Маркер удаления значения в очереди
+_DELETE = object()
+
+
+class WinRegistryBackend:
+    """Запись в реестр Windows (HKCU) через config.reg"""
+
+    def set_values(self, subkey: str, values: dict) -> bool:
+        from config.reg import reg_set_values
+        return reg_set_values(subkey, values)
+
+    def delete_value(self, subkey: str, name: str) -> bool:
+        from config.reg import reg_delete_value
+        return reg_delete_value(subkey, name)
+
+
+class MemoryRegistryBackend:
+    """Реестр в памяти: {subkey: {name: value}}"""
+
+    def __init__(self):
+        self.data: Dict[str, dict] = {}
+        # Количество обращений к хранилищу (для тестов/бенчмарков)
+        self.calls = 0
+
+    def set_values(self, subkey: str, values: dict) -> bool:
+        self.calls += 1
+        self.data.setdefault(subkey, {}).update(values)
+        return True
+
+    def delete_value(self, subkey: str, name: str) -> bool:
+        self.calls += 1
+        self.data.get(subkey, {}).pop(name, None)
+        return True
+
+    def enumerate_values(self, subkey: str) -> dict:
+        return dict(self.data.get(subkey, {}))
+
+
+class RegistryWriteBehind:
+    """
+    Очередь отложенной записи значений реестра.
+
+    Использование:
+        writer = RegistryWriteBehind()
+        writer.set(subkey, "youtube.com", 2)
+        writer.delete(subkey, "example.com")
+        writer.flush()  # немедленный сброс (например при остановке)
+    """
+
+    def __init__(self, backend=None, flush_interval: float = 2.0, max_pending: int = 256):
+        """
+        Args:
+            backend: Хранилище (по умолчанию WinRegistryBackend)
+            flush_interval: Период фонового сброса, секунды
+            max_pending: Порог размера очереди для внеочередного сброса
+        """
+        self.backend = backend if backend is not None else WinRegistryBackend()
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        # {(subkey, name): value | _DELETE}
+        self._pending: Dict[Tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+        # Сбросы выполняются строго по очереди, чтобы более старая пачка
+        # не перезаписала более новую
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Статистика
+        self.flush_count = 0
+        self.written_count = 0
+
+    # ==================== ОЧЕРЕДЬ ====================
+
+    def set(self, subkey: str, name: str, value):
+        """Ставит в очередь запись значения"""
+        self._enqueue(subkey, name, value)
+
+    def delete(self, subkey: str, name: str):
+        """Ставит в очередь удаление значения"""
+        self._enqueue(subkey, name, _DELETE)
+
+    def pending_count(self) -> int:
+        """Количество значений, ожидающих записи"""
+        with self._lock:
+            return len(self._pending)
+
+    def _enqueue(self, subkey: str, name: str, value):
+        with self._lock:
+            self._pending[(subkey, name)] = value
+            size = len(self._pending)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="RegistryWriteBehind", daemon=True)
+                self._thread.start()
+        if size >= self.max_pending:
+            self._wake.set()
+
+    # ==================== СБРОС ====================
+
+    def flush(self) -> int:
+        """
+        Записывает все накопленные изменения в хранилище.
+
+        Returns:
+            Количество записанных/удалённых значений
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            to_set: Dict[str, dict] = {}
+            to_delete = []
+            for (subkey, name), value in pending.items():
+                if value is _DELETE:
+                    to_delete.append((subkey, name))
+                else:
+                    to_set.setdefault(subkey, {})[name] = value
+
+            for subkey, values in to_set.items():
+                try:
+                    self.backend.set_values(subkey, values)
+                except Exception as e:
+                    log(f"Ошибка записи в реестр [{subkey}]: {e}", "ERROR")
+
+            for subkey, name in to_delete:
+                try:
+                    self.backend.delete_value(subkey, name)
+                except Exception as e:
+                    log(f"Ошибка удаления из реестра [{subkey}\\{name}]: {e}", "DEBUG")
+
+            self.flush_count += 1
+            self.written_count += len(pending)
+            return len(pending)
+
+    def _run(self):
+        """
+        Фоновый поток: сброс по таймеру или по порогу размера очереди.
+        Завершается, когда очередь опустела - следующий _enqueue() запустит новый.
+        """
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                log(f"RegistryWriteBehind: ошибка сброса: {e}", "DEBUG")
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+
+_shared_writer: Optional[RegistryWriteBehind] = None
+_shared_writer_lock = threading.Lock()
+
+
+def get_registry_writer() -> RegistryWriteBehind:
+    """Общая для процесса очередь записи в реестр (сбрасывается при выходе)"""
+    global _shared_writer
+    with _shared_writer_lock:
+        if _shared_writer is None:
+            _shared_writer = RegistryWriteBehind()
+            atexit.register(_shared_writer.flush)
+        return _shared_writer
@@ -65,6 +65,7 @@ from .preset_storage import (
     get_presets_dir,
     get_user_settings_path,
     import_preset,
+    list_preset_headers,
     list_presets,
     load_preset,
     preset_exists,
@@ -73,6 +74,9 @@ from .preset_storage import (
     set_active_preset_name,
 )
 
+# Parse cache (header metadata without a full parse)
+from .preset_repository import PresetHeader, invalidate_preset_cache
+
 # High-level manager
 from .preset_manager import PresetManager
 
@@ -369,6 +373,9 @@ __all__ = [
     "get_active_preset_path",
     "get_user_settings_path",
     "list_presets",
+    "list_preset_headers",
+    "PresetHeader",
+    "invalidate_preset_cache",
     "preset_exists",
     "load_preset",
     "save_preset",
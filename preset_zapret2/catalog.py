@@ -13,6 +13,14 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, Optional
 
+from utils.ini_catalog import (
+    ParsedCatalog,
+    invalidate_catalog_cache,
+    load_catalog,
+    parse_catalog_text,
+    strategies_from_catalog,
+)
+
 
 @dataclass(frozen=True)
 class CatalogPaths:
@@ -23,7 +31,12 @@ class CatalogPaths:
 
 _CACHED_PATHS: Optional[CatalogPaths] = None
 _CACHED_CATEGORIES: Optional[Dict[str, Dict]] = None
-_CACHED_STRATEGIES: Dict[tuple[str, Optional[str]], Dict[str, Dict]] = {}
+# Signature of the category files `_CACHED_CATEGORIES` was built from.
+_CACHED_CATEGORIES_SIGNATURE: Optional[tuple] = None
+# {(strategy_type, strategy_set): (builtin ParsedCatalog, user ParsedCatalog, merged)}
+# Parsed files are cached in `utils.ini_catalog` by mtime/size; `merged` is rebuilt only
+# when `utils.ini_catalog` returns a different object (i.e. a file changed on disk).
+_CACHED_STRATEGIES: Dict[tuple[str, Optional[str]], tuple] = {}
 _LAST_PATHS_MISS_AT: float = 0.0
 _PATHS_MISS_BACKOFF_SECONDS: float = 1.0
 
@@ -74,17 +87,51 @@ def get_catalog_paths() -> Optional[CatalogPaths]:
     return None
 
 
-def _read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="replace")
-
-
 def _parse_bool(value: str) -> bool:
     return value.strip().lower() in ("true", "1", "yes", "y", "on")
 
 
+# User categories are stored outside the install folder (updates may overwrite it).
+def _user_categories_file() -> Path:
+    appdata = os.environ.get("APPDATA")
+    if appdata:
+        return Path(appdata) / "zapret" / "user_categories.txt"
+    return Path.home() / ".config" / "zapret" / "user_categories.txt"
+
+
+def categories_signature() -> tuple:
+    """
+    (path, mtime_ns, size) of the builtin and user category files.
+
+    Changes whenever either file is edited, created or removed, so callers
+    can key derived caches on it (see `load_categories`).
+    """
+    paths = get_catalog_paths()
+    files = [_user_categories_file()]
+    if paths is not None:
+        files.append(paths.builtin_dir / "categories.txt")
+
+    signature = []
+    for file_path in files:
+        try:
+            st = file_path.stat()
+            signature.append((str(file_path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append((str(file_path), None, None))
+    return tuple(signature)
+
+
 def load_categories() -> Dict[str, Dict]:
-    global _CACHED_CATEGORIES
-    if _CACHED_CATEGORIES is not None:
+    """
+    Merged builtin + user categories.
+
+    The result is cached and returned as the same dict object until one of
+    the category files changes on disk; callers may use the object identity
+    as the catalog version.
+    """
+    global _CACHED_CATEGORIES, _CACHED_CATEGORIES_SIGNATURE
+    signature = categories_signature()
+    if _CACHED_CATEGORIES is not None and signature == _CACHED_CATEGORIES_SIGNATURE:
         return _CACHED_CATEGORIES
 
     paths = get_catalog_paths()
@@ -100,58 +147,10 @@ def load_categories() -> Dict[str, Dict]:
         return {}
 
     def _load_one(file_path: Path) -> Dict[str, Dict]:
-        if not file_path.exists():
-            return {}
-        text = _read_text(file_path)
-        return _load_one_text(text)
+        return _categories_from_catalog(load_catalog(file_path))
 
     def _load_one_text(text: str) -> Dict[str, Dict]:
-        categories: Dict[str, Dict] = {}
-        current_key: Optional[str] = None
-        current: Dict[str, object] = {}
-        section_index = 0
-
-        def _flush() -> None:
-            nonlocal current_key, current
-            if not current_key:
-                return
-            # Categories are ordered strictly by section appearance in the file.
-            file_order = current.get("_file_order")
-            if isinstance(file_order, int):
-                # Ignore any explicit `order`/`command_order` values in the file.
-                current["order"] = file_order
-                current["command_order"] = file_order
-            categories[current_key] = dict(current)
-
-        for raw in text.splitlines():
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.startswith("[") and line.endswith("]"):
-                _flush()
-                # Keep category keys normalized (lower-case) to match preset parsing,
-                # which infers category keys in lower-case from filter tokens/filenames.
-                current_key = line[1:-1].strip().lower()
-                section_index += 1
-                current = {"key": current_key, "_file_order": section_index}
-                continue
-            if "=" not in line or current_key is None:
-                continue
-
-            k, _, v = line.partition("=")
-            k = k.strip()
-            v = v.strip()
-
-            if k in ("order", "command_order"):
-                # Deprecated: order/command_order are ignored; ordering is determined by section order.
-                continue
-            elif k in ("needs_new_separator", "strip_payload", "requires_all_ports"):
-                current[k] = _parse_bool(v)
-            else:
-                current[k] = v
-
-        _flush()
-        return categories
+        return _categories_from_catalog(parse_catalog_text(text))
 
     builtin = _load_one(paths.builtin_dir / "categories.txt")
     if not builtin:
@@ -162,13 +161,6 @@ def load_categories() -> Dict[str, Dict]:
             builtin = {}
     merged = dict(builtin)
 
-    # User categories are stored outside the install folder (updates may overwrite it).
-    def _user_categories_file() -> Path:
-        appdata = os.environ.get("APPDATA")
-        if appdata:
-            return Path(appdata) / "zapret" / "user_categories.txt"
-        return Path.home() / ".config" / "zapret" / "user_categories.txt"
-
     user = _load_one(_user_categories_file())
     for key, data in user.items():
         if key in merged:
@@ -177,18 +169,44 @@ def load_categories() -> Dict[str, Dict]:
         merged[key] = data
 
     _CACHED_CATEGORIES = merged
+    _CACHED_CATEGORIES_SIGNATURE = signature
     return _CACHED_CATEGORIES
 
 
+def _categories_from_catalog(parsed: Optional[ParsedCatalog]) -> Dict[str, Dict]:
+    categories: Dict[str, Dict] = {}
+    if parsed is None:
+        return categories
+    for section in parsed.sections:
+        # Keep category keys normalized (lower-case) to match preset parsing,
+        # which infers category keys in lower-case from filter tokens/filenames.
+        key = section.name.lower()
+        if not key:
+            continue
+        current: Dict[str, object] = {"key": key, "_file_order": section.index}
+        for k, v in section.fields.items():
+            if k in ("order", "command_order"):
+                # Deprecated: order/command_order are ignored; ordering is determined by section order.
+                continue
+            elif k in ("needs_new_separator", "strip_payload", "requires_all_ports"):
+                current[k] = _parse_bool(v)
+            else:
+                current[k] = v
+        # Categories are ordered strictly by section appearance in the file.
+        current["order"] = section.index
+        current["command_order"] = section.index
+        categories[key] = current
+    return categories
+
+
 def invalidate_categories_cache() -> None:
     global _CACHED_CATEGORIES
     _CACHED_CATEGORIES = None
+    invalidate_catalog_cache()
 
 
 def load_strategies(strategy_type: str, strategy_set: Optional[str] = None) -> Dict[str, Dict]:
     cache_key = (strategy_type, strategy_set)
-    if cache_key in _CACHED_STRATEGIES:
-        return _CACHED_STRATEGIES[cache_key]
 
     paths = get_catalog_paths()
     if paths is None:
@@ -197,72 +215,20 @@ def load_strategies(strategy_type: str, strategy_set: Optional[str] = None) -> D
 
     filename = f"{strategy_type}.txt" if not strategy_set else f"{strategy_type}_{strategy_set}.txt"
 
-    def _load_one(file_path: Path) -> Dict[str, Dict]:
-        if not file_path.exists():
-            return {}
-        text = _read_text(file_path)
-        strategies: Dict[str, Dict] = {}
-        current_id: Optional[str] = None
-        current: Dict[str, object] = {}
-        args: list[str] = []
-
-        def _flush() -> None:
-            nonlocal current_id, current, args
-            if not current_id:
-                return
-            current["id"] = current_id
-            current["args"] = "\n".join(args).strip()
-            strategies[current_id] = dict(current)
-
-        for raw in text.splitlines():
-            line = raw.rstrip()
-            if not line or line.lstrip().startswith("#"):
-                continue
-            if line.startswith("[") and line.endswith("]"):
-                _flush()
-                current_id = line[1:-1].strip()
-                current = {
-                    "name": current_id,
-                    "author": "unknown",
-                    "label": None,
-                    "description": "",
-                    "blobs": [],
-                }
-                args = []
-                continue
+    builtin_parsed = load_catalog(paths.builtin_dir / filename)
+    user_parsed = load_catalog(paths.user_dir / filename)
 
-            if current_id is None:
-                continue
+    cached = _CACHED_STRATEGIES.get(cache_key)
+    if cached is not None and cached[0] is builtin_parsed and cached[1] is user_parsed:
+        return cached[2]
 
-            if line.startswith("--"):
-                args.append(line.strip())
-                continue
-
-            if "=" in line:
-                k, _, v = line.partition("=")
-                k = k.strip().lower()
-                v = v.strip()
-                if k == "name":
-                    current["name"] = v
-                elif k == "author":
-                    current["author"] = v
-                elif k == "label":
-                    current["label"] = v or None
-                elif k == "description":
-                    current["description"] = v
-                elif k == "blobs":
-                    current["blobs"] = [b.strip() for b in v.split(",") if b.strip()]
-
-        _flush()
-        return strategies
-
-    builtin = _load_one(paths.builtin_dir / filename)
-    user = _load_one(paths.user_dir / filename)
-    merged = dict(builtin)
-    merged.update(user)  # user overrides builtin by id
+    merged: Dict[str, Dict] = {}
+    for parsed in (builtin_parsed, user_parsed):
+        for strategy in strategies_from_catalog(parsed):
+            merged[strategy["id"]] = strategy  # user overrides builtin by id
 
     # If the file(s) aren't present yet, don't cache an empty result: allow
     # later retries when an updater/extractor finishes writing the catalog.
     if merged:
-        _CACHED_STRATEGIES[cache_key] = merged
+        _CACHED_STRATEGIES[cache_key] = (builtin_parsed, user_parsed, merged)
     return merged
@@ -27,7 +27,7 @@ import os
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from log import log
 
@@ -42,6 +42,7 @@ from .preset_storage import (
     get_preset_path,
     get_presets_dir,
     import_preset,
+    list_preset_headers,
     list_presets,
     load_preset,
     preset_exists,
@@ -50,6 +51,9 @@ from .preset_storage import (
     set_active_preset_name,
 )
 
+if TYPE_CHECKING:
+    from .preset_repository import PresetHeader
+
 
 class PresetManager:
     """
@@ -97,6 +101,16 @@ class PresetManager:
         """
         return list_presets()
 
+    def list_preset_headers(self) -> List["PresetHeader"]:
+        """
+        Lists header metadata (name, builtin flag, created/modified,
+        description) of all presets without a full parse.
+
+        Returns:
+            List of PresetHeader sorted by preset name
+        """
+        return list_preset_headers()
+
     def preset_exists(self, name: str) -> bool:
         """
         Checks if preset exists.
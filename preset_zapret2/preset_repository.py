@@ -0,0 +1,180 @@
+# preset_zapret2/preset_repository.py
+"""
+Parse cache for preset files.
+
+Preset files are re-read every time the presets page is shown and on every
+`load_preset()`. This module keeps parsed results keyed by the file
+signature (mtime_ns, size), so only changed files are parsed again:
+
+- `get_preset_data(path)`   full `PresetData` (blocks, base args)
+- `get_preset_header(path)` header metadata only (name, builtin flag,
+  created/modified/description) - reads just the leading comment lines
+
+Parsed `PresetData` also depends on the categories catalog (category
+inference), so entries are additionally keyed on
+`catalog.categories_signature()`.
+
+Cached objects are shared: callers must not mutate them.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from log import log
+
+from .txt_preset_parser import PresetData, parse_preset_file, parse_preset_header_file
+
+
+Signature = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class PresetHeader:
+    """Preset metadata available without parsing category blocks."""
+    file_name: str          # preset name = file stem
+    name: str               # "# Preset:" value (file stem if missing)
+    is_builtin: bool        # "# Builtin:" flag or well-known builtin name
+    created: str
+    modified: str
+    description: str
+    active_preset: Optional[str]
+    raw_header: str
+
+
+# {absolute path: (signature, categories signature, PresetData)}
+_data_cache: Dict[str, Tuple[Signature, object, PresetData]] = {}
+# {absolute path: (signature, PresetHeader)}
+_header_cache: Dict[str, Tuple[Signature, PresetHeader]] = {}
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "header_hits": 0, "header_misses": 0}
+
+
+def _signature(path: str) -> Optional[Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _catalog_version() -> object:
+    """Signature of the category files (see `catalog.categories_signature`)."""
+    try:
+        from .catalog import categories_signature
+        return categories_signature()
+    except Exception:
+        return None
+
+
+def get_preset_data(file_path: Path) -> PresetData:
+    """
+    Returns parsed preset file, re-parsing only if the file changed.
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    key = os.path.abspath(os.fspath(file_path))
+    signature = _signature(key)
+    if signature is None:
+        raise FileNotFoundError(f"Preset file not found: {file_path}")
+    version = _catalog_version()
+
+    with _cache_lock:
+        cached = _data_cache.get(key)
+        if cached is not None and cached[0] == signature and cached[1] == version:
+            _stats["hits"] += 1
+            return cached[2]
+
+    data = parse_preset_file(Path(key))
+
+    with _cache_lock:
+        _data_cache[key] = (signature, version, data)
+        _stats["misses"] += 1
+    return data
+
+
+def get_preset_header(file_path: Path) -> Optional[PresetHeader]:
+    """Returns header metadata of a preset file (None if file is missing/unreadable)."""
+    from .preset_storage import _parse_metadata_from_header
+    from .preset_defaults import is_builtin_preset_name
+
+    key = os.path.abspath(os.fspath(file_path))
+    signature = _signature(key)
+    if signature is None:
+        return None
+
+    with _cache_lock:
+        cached = _header_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _stats["header_hits"] += 1
+            return cached[1]
+
+    try:
+        data = parse_preset_header_file(Path(key))
+    except Exception as e:
+        log(f"Error reading preset header {file_path}: {e}", "DEBUG")
+        return None
+
+    file_name = Path(key).stem
+    created, modified, description = _parse_metadata_from_header(data.raw_header)
+    header = PresetHeader(
+        file_name=file_name,
+        name=data.name if data.name != "Unnamed" else file_name,
+        # Same rule as preset_storage.load_preset()
+        is_builtin=bool(data.is_builtin) or is_builtin_preset_name(file_name),
+        created=created,
+        modified=modified,
+        description=description,
+        active_preset=data.active_preset,
+        raw_header=data.raw_header,
+    )
+
+    with _cache_lock:
+        _header_cache[key] = (signature, header)
+        _stats["header_misses"] += 1
+    return header
+
+
+def list_preset_headers(presets_dir: Path) -> List[PresetHeader]:
+    """Headers of all presets in a directory, sorted by file name."""
+    result = []
+    seen = set()
+    for f in sorted(Path(presets_dir).glob("*.txt"), key=lambda p: p.stem):
+        header = get_preset_header(f)
+        if header is not None:
+            result.append(header)
+            seen.add(os.path.abspath(f))
+    _prune(Path(presets_dir), seen)
+    return result
+
+
+def _prune(presets_dir: Path, existing: set) -> None:
+    """Drops cache entries of deleted files in `presets_dir`."""
+    folder = os.path.abspath(presets_dir)
+    with _cache_lock:
+        for cache in (_data_cache, _header_cache):
+            for key in [k for k in cache if os.path.dirname(k) == folder and k not in existing]:
+                del cache[key]
+
+
+def invalidate_preset_cache(file_path: Optional[Path] = None) -> None:
+    """Drops cached entries for one file or for all files (file_path=None)."""
+    with _cache_lock:
+        if file_path is None:
+            _data_cache.clear()
+            _header_cache.clear()
+        else:
+            key = os.path.abspath(os.fspath(file_path))
+            _data_cache.pop(key, None)
+            _header_cache.pop(key, None)
+
+
+def get_preset_cache_stats() -> Dict[str, int]:
+    """Cache statistics: hits/misses for full parses and headers."""
+    with _cache_lock:
+        return dict(_stats, files=len(_data_cache), headers=len(_header_cache))
@@ -231,6 +231,22 @@ def list_presets() -> List[str]:
     return sorted(presets)
 
 
+def list_preset_headers() -> List["PresetHeader"]:
+    """
+    Lists header metadata of all presets without parsing category blocks.
+
+    Returns:
+        List of PresetHeader sorted by preset name. Only files changed since
+        the previous call are read.
+    """
+    from .preset_repository import list_preset_headers as _list_headers
+
+    presets_dir = get_presets_dir()
+    if not presets_dir.exists():
+        return []
+    return _list_headers(presets_dir)
+
+
 def preset_exists(name: str) -> bool:
     """
     Checks if preset with given name exists.
@@ -259,7 +275,8 @@ def load_preset(name: str) -> Optional["Preset"]:
         Preset object or None if not found
     """
     from .preset_model import Preset, CategoryConfig, SyndataSettings
-    from .txt_preset_parser import parse_preset_file, PresetData
+    from .txt_preset_parser import PresetData
+    from .preset_repository import get_preset_data
 
     preset_path = get_preset_path(name)
 
@@ -268,8 +285,8 @@ def load_preset(name: str) -> Optional["Preset"]:
         return None
 
     try:
-        # Parse txt file
-        data: PresetData = parse_preset_file(preset_path)
+        # Parse txt file (cached until the file changes; do not mutate `data`)
+        data: PresetData = get_preset_data(preset_path)
 
         # Convert to Preset model
         # Force is_builtin=True for built-in presets by well-known name.
@@ -505,6 +522,10 @@ def save_preset(preset: "Preset") -> bool:
         # Write file
         success = generate_preset_file(data, preset_path, atomic=True)
 
+        # mtime granularity may hide a rewrite of the same size - drop the entry explicitly
+        from .preset_repository import invalidate_preset_cache
+        invalidate_preset_cache(preset_path)
+
         if success:
             log(f"Saved preset '{preset.name}' to {preset_path}", "DEBUG")
         else:
@@ -550,6 +571,8 @@ def delete_preset(name: str) -> bool:
 
     try:
         preset_path.unlink()
+        from .preset_repository import invalidate_preset_cache
+        invalidate_preset_cache(preset_path)
         log(f"Deleted preset '{name}'", "DEBUG")
         return True
     except Exception as e:
@@ -19,6 +19,12 @@ Usage:
 from typing import Dict, Optional
 
 
+# {strategy_type: (strategies dict from catalog.load_strategies, {normalized args: strategy_id})}
+# catalog.load_strategies() returns the same dict object until a catalog file
+# changes on disk, so the object identity serves as the catalog version.
+_ARGS_INDEX: Dict[str, tuple] = {}
+
+
 def normalize_args(args: str) -> str:
     """
     Normalizes strategy arguments for comparison.
@@ -63,6 +69,43 @@ def normalize_args(args: str) -> str:
     return "\n--new\n".join(normalized_blocks)
 
 
+def _get_args_index(strategy_type: str) -> Optional[Dict[str, str]]:
+    """
+    Returns {normalized args: strategy_id} for a strategy type.
+
+    The index is built once per catalog version; the first strategy (in file
+    order, user overrides applied) wins when several share the same args.
+    Returns None if the catalog has no strategies of this type.
+    """
+    try:
+        from .catalog import load_strategies
+        strategies = load_strategies(strategy_type)
+    except Exception:
+        strategies = {}
+
+    if not strategies:
+        return None
+
+    cached = _ARGS_INDEX.get(strategy_type)
+    if cached is not None and cached[0] is strategies:
+        return cached[1]
+
+    index: Dict[str, str] = {}
+    for strategy_id, strategy_data in strategies.items():
+        strategy_args = (strategy_data or {}).get("args", "")
+        if not strategy_args:
+            continue
+        index.setdefault(normalize_args(strategy_args), strategy_id)
+
+    _ARGS_INDEX[strategy_type] = (strategies, index)
+    return index
+
+
+def invalidate_args_index() -> None:
+    """Drops the args index (it is also rebuilt automatically when catalogs change)."""
+    _ARGS_INDEX.clear()
+
+
 def _get_strategy_type_for_category(category_key: str) -> Optional[str]:
     try:
         from .catalog import load_categories
@@ -88,12 +131,9 @@ def infer_strategy_id_from_args(
 
     Algorithm:
     1. Normalize input args
-    2. Get all strategies for the category
-    3. For each strategy:
-       - Get strategy["args"] (pure args, without base_filter)
-       - Normalize
-       - Compare with input
-    4. Return first match or "none" if not found
+    2. Look it up in the {normalized args: strategy_id} index of the
+       category's strategy type (built once per catalog version)
+    3. Return the match or "custom" if not found
 
     Args:
         category_key: Category name (e.g., "youtube", "discord")
@@ -143,26 +183,14 @@ def infer_strategy_id_from_args(
 
     any_strategies_loaded = False
     for candidate_type in _iter_candidate_strategy_types(strategy_type):
-        try:
-            from .catalog import load_strategies
-            candidates = load_strategies(candidate_type)
-        except Exception:
-            candidates = {}
-
-        if candidates:
-            any_strategies_loaded = True
-
-        for strategy_id, strategy_data in (candidates or {}).items():
-            strategy_args = (strategy_data or {}).get("args", "")
-            if not strategy_args:
-                continue
-
-            # Normalize strategy args
-            normalized_strategy = normalize_args(strategy_args)
+        index = _get_args_index(candidate_type)
+        if index is None:
+            continue
+        any_strategies_loaded = True
 
-            # Compare
-            if normalized_strategy == normalized_input:
-                return strategy_id
+        strategy_id = index.get(normalized_input)
+        if strategy_id is not None:
+            return strategy_id
 
     if not any_strategies_loaded:
         # Strategies catalog isn't available (first-run extract/update/etc).
@@ -19,6 +19,11 @@ from log import log
 
 _CATEGORY_FILTER_CACHE: Optional[Dict[str, List[Tuple[str, Set[str]]]]] = None
 _CATEGORY_INFO_CACHE: Optional[Dict[str, Dict]] = None
+# Inverted index {filter token: [(key, mode, token set)]}. Each variant is
+# stored under its rarest token only: a variant can match a block only if all
+# of its tokens are present, so looking up every block token visits each
+# candidate variant exactly once.
+_CATEGORY_TOKEN_INDEX: Optional[Dict[str, List[Tuple[str, str, frozenset]]]] = None
 
 
 def invalidate_category_inference_cache() -> None:
@@ -27,12 +32,14 @@ def invalidate_category_inference_cache() -> None:
 
     Important for user categories: blocks that use `--hostlist-domains=...` or
     `--ipset-ip=...` can't be mapped to a category via filename, so we rely on
-    matching against categories base filters. If categories change at runtime,
-    this cache must be cleared to avoid falling back to `category=unknown`.
+    matching against categories base filters. The caches are rebuilt
+    automatically when the category files change on disk; this forces a
+    rebuild regardless.
     """
-    global _CATEGORY_FILTER_CACHE, _CATEGORY_INFO_CACHE
+    global _CATEGORY_FILTER_CACHE, _CATEGORY_INFO_CACHE, _CATEGORY_TOKEN_INDEX
     _CATEGORY_FILTER_CACHE = None
     _CATEGORY_INFO_CACHE = None
+    _CATEGORY_TOKEN_INDEX = None
 
 
 _PLACEHOLDER_HOSTLIST_FILES = {"unknown.txt"}
@@ -458,17 +465,17 @@ def _extract_filter_tokens(args: str) -> List[str]:
 
 
 def _load_category_filters(*, force_reload: bool = False) -> Dict[str, List[Tuple[str, Set[str]]]]:
-    global _CATEGORY_FILTER_CACHE
+    """
+    Base filter token sets per category: {key: [(mode, tokens)]}.
+
+    Rebuilt only when `catalog.load_categories()` returns a different dict,
+    i.e. when categories.txt / user_categories.txt changed on disk.
+    """
+    global _CATEGORY_FILTER_CACHE, _CATEGORY_TOKEN_INDEX
+    categories = _load_category_info(force_reload=force_reload)
     if not force_reload and _CATEGORY_FILTER_CACHE is not None:
         return _CATEGORY_FILTER_CACHE
 
-    try:
-        from .catalog import load_categories
-        categories = load_categories()
-    except Exception as e:
-        log(f"Category filters unavailable: {e}", "DEBUG")
-        categories = {}
-
     filters: Dict[str, List[Tuple[str, Set[str]]]] = {}
     for key, data in categories.items():
         variants: List[Tuple[str, set[str]]] = []
@@ -487,50 +494,75 @@ def _load_category_filters(*, force_reload: bool = False) -> Dict[str, List[Tupl
             filters[key] = variants
 
     _CATEGORY_FILTER_CACHE = filters
+    _CATEGORY_TOKEN_INDEX = None
     return _CATEGORY_FILTER_CACHE
 
 
 def _load_category_info(*, force_reload: bool = False) -> Dict[str, Dict]:
-    global _CATEGORY_INFO_CACHE
-    if not force_reload and _CATEGORY_INFO_CACHE is not None:
-        return _CATEGORY_INFO_CACHE
-
+    """
+    Categories from the catalog. Derived caches (filters, token index) are
+    dropped whenever the catalog returns a new categories dict.
+    """
+    global _CATEGORY_INFO_CACHE, _CATEGORY_FILTER_CACHE, _CATEGORY_TOKEN_INDEX
     try:
         from .catalog import load_categories
-        _CATEGORY_INFO_CACHE = load_categories()
+        categories = load_categories()
     except Exception as e:
         log(f"Category info unavailable: {e}", "DEBUG")
-        _CATEGORY_INFO_CACHE = {}
+        categories = {}
+
+    if force_reload or categories is not _CATEGORY_INFO_CACHE:
+        _CATEGORY_INFO_CACHE = categories
+        _CATEGORY_FILTER_CACHE = None
+        _CATEGORY_TOKEN_INDEX = None
 
     return _CATEGORY_INFO_CACHE
 
 
+def _load_category_token_index() -> Dict[str, List[Tuple[str, str, frozenset]]]:
+    """Inverted index filter token -> category variants (see `_CATEGORY_TOKEN_INDEX`)."""
+    global _CATEGORY_TOKEN_INDEX
+    filters = _load_category_filters()
+    if _CATEGORY_TOKEN_INDEX is not None:
+        return _CATEGORY_TOKEN_INDEX
+
+    frequency: Dict[str, int] = {}
+    for variants in filters.values():
+        for _mode, token_set in variants:
+            for token in token_set:
+                frequency[token] = frequency.get(token, 0) + 1
+
+    index: Dict[str, List[Tuple[str, str, frozenset]]] = {}
+    for key, variants in filters.items():
+        for mode, token_set in variants:
+            rarest = min(token_set, key=lambda t: (frequency[t], t))
+            index.setdefault(rarest, []).append((key, mode, frozenset(token_set)))
+
+    _CATEGORY_TOKEN_INDEX = index
+    return _CATEGORY_TOKEN_INDEX
+
+
+_MODE_PRIORITY = {"ipset": 2, "hostlist": 1, "base": 0}
+_USER_KEY_RE = re.compile(r"^user_category_(\d+)$")
+
+
 def infer_category_key_from_args(args: str) -> Tuple[str, Optional[str]]:
     tokens = set(_extract_filter_tokens(args))
     if not tokens:
         return ("unknown", None)
 
-    # Domain/IP based blocks can't be categorized by filename, so if categories
-    # were changed during runtime (user_categories.txt), stale caches would
-    # incorrectly return "unknown". Prefer a fresh view for these blocks.
-    needs_fresh = any(
-        t.startswith("--hostlist-domains=") or t.startswith("--ipset-ip=")
-        for t in tokens
-    )
-
-    filters = _load_category_filters(force_reload=needs_fresh)
-    if not filters:
+    # Categories edited at runtime (user_categories.txt) are picked up
+    # automatically: the index is keyed on the catalog files signature.
+    index = _load_category_token_index()
+    if not index:
         return ("unknown", None)
 
-    mode_priority = {"ipset": 2, "hostlist": 1, "base": 0}
-    user_key_re = re.compile(r"^user_category_(\d+)$")
-
     def _user_rank(key: str) -> tuple[int, int]:
         """
         Prefer user_category_N when matching is ambiguous.
         This prevents user categories from being mis-detected as built-ins when they share the same filter tokens.
         """
-        m = user_key_re.fullmatch(str(key or "").strip().lower())
+        m = _USER_KEY_RE.fullmatch(str(key or "").strip().lower())
         if not m:
             return (1, 10**9)
         try:
@@ -539,24 +571,13 @@ def infer_category_key_from_args(args: str) -> Tuple[str, Optional[str]]:
             return (0, 10**9)
 
     matches = []
-    for key in sorted(filters.keys()):
-        for mode, base_tokens in filters[key]:
-            if base_tokens and base_tokens.issubset(tokens):
-                matches.append((len(base_tokens), mode_priority.get(mode, -1), _user_rank(key), key, mode))
+    for token in tokens:
+        for key, mode, base_tokens in index.get(token, ()):
+            if base_tokens.issubset(tokens):
+                matches.append((len(base_tokens), _MODE_PRIORITY.get(mode, -1), _user_rank(key), key, mode))
 
     if not matches:
-        # One more retry: categories may have changed without cache invalidation
-        # (e.g., user added/edited a user category).
-        if not needs_fresh:
-            invalidate_category_inference_cache()
-            filters = _load_category_filters(force_reload=True)
-            if filters:
-                for key in sorted(filters.keys()):
-                    for mode, base_tokens in filters[key]:
-                        if base_tokens and base_tokens.issubset(tokens):
-                            matches.append((len(base_tokens), mode_priority.get(mode, -1), key, mode))
-        if not matches:
-            return ("unknown", None)
+        return ("unknown", None)
 
     matches.sort(key=lambda item: (-item[0], -item[1], item[2], item[3]))
     best_score, best_priority, best_user_rank, best_key, best_mode = matches[0]
@@ -830,6 +851,56 @@ def parse_preset_file(file_path: Path) -> PresetData:
     return parse_preset_content(content)
 
 
+def _parse_header_comment(stripped: str, data: PresetData) -> None:
+    """Applies one `# Key: value` header comment to `data`."""
+    # Extract preset name
+    name_match = re.match(r'#\s*Preset:\s*(.+)', stripped, re.IGNORECASE)
+    if name_match:
+        data.name = name_match.group(1).strip()
+
+    # Extract active preset
+    active_match = re.match(r'#\s*ActivePreset:\s*(.+)', stripped, re.IGNORECASE)
+    if active_match:
+        data.active_preset = active_match.group(1).strip()
+
+    # Also check "Strategy:" for compatibility
+    strategy_match = re.match(r'#\s*Strategy:\s*(.+)', stripped, re.IGNORECASE)
+    if strategy_match and data.name == "Unnamed":
+        data.name = strategy_match.group(1).strip()
+
+    # Extract builtin flag
+    builtin_match = re.match(r'#\s*Builtin:\s*(.+)', stripped, re.IGNORECASE)
+    if builtin_match:
+        data.is_builtin = builtin_match.group(1).strip().lower() in ('true', 'yes', '1')
+
+
+def parse_preset_header_file(file_path: Path) -> PresetData:
+    """
+    Parses only the header comments of a preset file.
+
+    Reading stops at the first non-comment line, so this is cheap even for
+    large presets. Returned PresetData has `name`, `active_preset`,
+    `is_builtin` and `raw_header` set; `base_args` and `categories` are empty.
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    data = PresetData()
+    header_lines = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for raw in f:
+            line = raw.rstrip('\r\n')
+            stripped = line.strip()
+            if stripped.startswith('#'):
+                _parse_header_comment(stripped, data)
+            elif stripped:
+                break
+            header_lines.append(line)
+
+    data.raw_header = '\n'.join(header_lines)
+    return data
+
+
 def parse_preset_content(content: str) -> PresetData:
     """
     Parses preset content string into PresetData.
@@ -852,26 +923,7 @@ def parse_preset_content(content: str) -> PresetData:
         stripped = line.strip()
         if stripped.startswith('#'):
             header_lines.append(line)
-
-            # Extract preset name
-            name_match = re.match(r'#\s*Preset:\s*(.+)', stripped, re.IGNORECASE)
-            if name_match:
-                data.name = name_match.group(1).strip()
-
-            # Extract active preset
-            active_match = re.match(r'#\s*ActivePreset:\s*(.+)', stripped, re.IGNORECASE)
-            if active_match:
-                data.active_preset = active_match.group(1).strip()
-
-            # Also check "Strategy:" for compatibility
-            strategy_match = re.match(r'#\s*Strategy:\s*(.+)', stripped, re.IGNORECASE)
-            if strategy_match and data.name == "Unnamed":
-                data.name = strategy_match.group(1).strip()
-
-            # Extract builtin flag
-            builtin_match = re.match(r'#\s*Builtin:\s*(.+)', stripped, re.IGNORECASE)
-            if builtin_match:
-                data.is_builtin = builtin_match.group(1).strip().lower() in ('true', 'yes', '1')
+            _parse_header_comment(stripped, data)
 
         elif stripped:
             # First non-comment, non-empty line
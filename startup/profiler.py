@@ -0,0 +1,301 @@
+# startup/profiler.py
+"""
+Профилировщик запуска приложения.
+
+Записывает время (wall time) фаз запуска, импортов модулей, задач
+InitializationManager и создания страниц и экспортирует их:
+
+- в Chrome trace (JSON, открывается в chrome://tracing или ui.perfetto.dev);
+- текстовым отчётом в лог (самые долгие импорты, задачи и страницы).
+
+Модуль использует только стандартную библиотеку и импортируется в main.py
+до тяжёлых импортов. Пока профилирование не включено, span()/record()
+только дописывают события в список (без импорт-хука и экспорта); после
+finish() события больше не записываются.
+
+Включение (аргументы командной строки или переменная окружения):
+    --profile-startup[=trace.json]   записать trace после инициализации
+    --profile-startup-exit           то же + выйти после инициализации
+                                     (без окна, QT_QPA_PLATFORM=offscreen)
+    ZAPRET_PROFILE_STARTUP=trace.json
+
+Использование:
+    from startup.profiler import startup_profiler
+
+    with startup_profiler.span("build_ui", "phase"):
+        ...
+    QTimer.singleShot(0, startup_profiler.wrap(task, task.__name__, "init"))
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# Аргументы командной строки
+PROFILE_ARG = "--profile-startup"
+PROFILE_EXIT_ARG = "--profile-startup-exit"
+PROFILE_ENV = "ZAPRET_PROFILE_STARTUP"
+
+# Имя файла trace по умолчанию (в рабочей папке приложения)
+DEFAULT_TRACE_FILE = "startup_trace.json"
+
+# Импорты быстрее этого порога (мс) не записываются
+MIN_IMPORT_MS = 0.5
+
+
+class StartupProfiler:
+    """Сборщик событий запуска (потокобезопасный)"""
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._finished = False
+        self._original_import = None
+        self._on_finished: List[Callable[[bool], None]] = []
+
+        self.enabled = False
+        self.exit_after_init = False
+        self.trace_path: Optional[str] = None
+
+    # ---------- настройка ----------
+
+    def configure(self, argv: Optional[List[str]] = None, environ=None) -> bool:
+        """Включает профилирование по аргументам/переменной окружения. Возвращает enabled."""
+        argv = sys.argv if argv is None else argv
+        environ = os.environ if environ is None else environ
+
+        path = environ.get(PROFILE_ENV) or None
+        for arg in argv[1:]:
+            if arg == PROFILE_EXIT_ARG:
+                self.exit_after_init = True
+            elif arg == PROFILE_ARG:
+                path = path or DEFAULT_TRACE_FILE
+            elif arg.startswith(PROFILE_ARG + "="):
+                path = arg.split("=", 1)[1] or DEFAULT_TRACE_FILE
+
+        if self.exit_after_init and not path:
+            path = DEFAULT_TRACE_FILE
+        if path:
+            self.enable(path)
+        return self.enabled
+
+    def enable(self, trace_path: str = DEFAULT_TRACE_FILE, track_imports: bool = True) -> None:
+        self.enabled = True
+        self.trace_path = trace_path
+        if track_imports:
+            self.install_import_hook()
+
+    # ---------- запись событий ----------
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def record(self, name: str, cat: str, start: float, end: float, **args) -> None:
+        """Записывает интервал [start, end] (значения time.perf_counter())"""
+        if self._finished:
+            return
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._t0) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": thread.ident or 0,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            self._thread_names.setdefault(thread.ident or 0, thread.name)
+
+    def instant(self, name: str, cat: str = "mark", **args) -> None:
+        """Отметка момента времени (например, «окно показано»)"""
+        if self._finished:
+            return
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "p",
+            "ts": round((time.perf_counter() - self._t0) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": thread.ident or 0,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            self._thread_names.setdefault(thread.ident or 0, thread.name)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "phase", **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, cat, start, time.perf_counter(), **args)
+
+    def wrap(self, func: Callable, name: Optional[str] = None, cat: str = "task") -> Callable:
+        """
+        Оборачивает отложенную задачу (QTimer.singleShot): записывает время
+        выполнения и задержку от постановки в очередь до запуска.
+        """
+        name = name or getattr(func, "__name__", repr(func))
+        scheduled = time.perf_counter()
+
+        def _wrapped(*a, **kw):
+            start = time.perf_counter()
+            try:
+                return func(*a, **kw)
+            finally:
+                self.record(name, cat, start, time.perf_counter(),
+                            queued_ms=round((start - scheduled) * 1000, 2))
+
+        _wrapped.__name__ = name
+        return _wrapped
+
+    # ---------- импорты ----------
+
+    def install_import_hook(self) -> None:
+        """Замеряет импорты модулей (время включает вложенные импорты)"""
+        if self._original_import is not None:
+            return
+        original = builtins.__import__
+        self._original_import = original
+        modules = sys.modules
+
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level == 0:
+                full_name = name
+            else:
+                try:
+                    package = (globals or {}).get("__package__") or ""
+                    full_name = importlib.util.resolve_name("." * level + name, package)
+                except Exception:
+                    return original(name, globals, locals, fromlist, level)
+            if full_name in modules:
+                return original(name, globals, locals, fromlist, level)
+
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                end = time.perf_counter()
+                if (end - start) * 1000 >= MIN_IMPORT_MS:
+                    self.record(full_name, "import", start, end)
+
+        builtins.__import__ = _timed_import
+
+    def uninstall_import_hook(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # ---------- завершение ----------
+
+    def on_finished(self, callback: Callable[[bool], None]) -> None:
+        """callback(ok) вызывается при finish() (например, выход в headless режиме)"""
+        self._on_finished.append(callback)
+
+    def finish(self, ok: bool = True, reason: str = "init_complete") -> None:
+        """Конец запуска: снимает импорт-хук, экспортирует trace и пишет отчёт в лог"""
+        if self._finished:
+            return
+        self.instant(reason)
+        self._finished = True
+        self.uninstall_import_hook()
+
+        if self.enabled:
+            try:
+                from log import log
+                log(self.format_report(), "INFO")
+            except Exception:
+                pass
+            if self.trace_path:
+                try:
+                    self.export_chrome_trace(self.trace_path)
+                except Exception as e:
+                    try:
+                        from log import log
+                        log(f"Не удалось сохранить startup trace: {e}", "WARNING")
+                    except Exception:
+                        pass
+
+        for callback in self._on_finished:
+            try:
+                callback(ok)
+            except Exception:
+                pass
+
+    # ---------- экспорт ----------
+
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace event format (chrome://tracing, ui.perfetto.dev)"""
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        pid = os.getpid()
+        meta = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "Zapret"}},
+        ]
+        for tid, thread_name in thread_names.items():
+            meta.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        return {"traceEvents": meta + events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> str:
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return path
+
+    def totals(self, cat: str) -> Dict[str, float]:
+        """{имя: суммарное время (мс)} для категории"""
+        result: Dict[str, float] = {}
+        for event in self.events():
+            if event["cat"] == cat and event["ph"] == "X":
+                result[event["name"]] = result.get(event["name"], 0.0) + event["dur"] / 1000
+        return result
+
+    def format_report(self, top: int = 15) -> str:
+        """Текстовый отчёт: фазы, самые долгие импорты, задачи и страницы"""
+        elapsed = (time.perf_counter() - self._t0) * 1000
+        lines = [f"[STARTUP] отчёт о запуске ({elapsed:.0f} мс с начала профилирования)"]
+        for cat, title in (
+            ("phase", "фазы"),
+            ("import", "импорты (включая вложенные)"),
+            ("init", "задачи инициализации"),
+            ("page", "страницы"),
+            ("profile", "замеры PerformanceProfiler"),
+        ):
+            totals = self.totals(cat)
+            if not totals:
+                continue
+            items = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+            lines.append(f"  {title}:")
+            for name, ms in items[:top]:
+                lines.append(f"    {ms:9.1f} мс  {name}")
+            if len(items) > top:
+                lines.append(f"    ... ещё {len(items) - top}")
+        return "\n".join(lines)
+
+
+# Глобальный профилировщик процесса
+startup_profiler = StartupProfiler()
@@ -1,10 +1,14 @@
 """
 Профилировщик для определения узких мест
+
+Замеры также попадают в timeline запуска (startup.profiler, категория
+"profile"), пока запуск не завершён.
 """
 
 import time
 from functools import wraps
 from log import log
+from startup.profiler import startup_profiler
 
 
 class PerformanceProfiler:
@@ -19,6 +23,7 @@ class PerformanceProfiler:
         """Начинает профилирование"""
         self.start_time = time.perf_counter()
         self.checkpoints = []
+        startup_profiler.instant(f"{self.name} - START", "profile")
         log(f"[PROFILE] {self.name} - START", "DEBUG")
         
     def checkpoint(self, label):
@@ -28,6 +33,7 @@ class PerformanceProfiler:
             
         elapsed = (time.perf_counter() - self.start_time) * 1000  # в миллисекундах
         self.checkpoints.append((label, elapsed))
+        startup_profiler.instant(f"{self.name} - {label}", "profile", elapsed_ms=round(elapsed, 2))
         log(f"[PROFILE] {self.name} - {label}: {elapsed:.2f}ms", "DEBUG")
         
     def end(self):
@@ -35,7 +41,10 @@ class PerformanceProfiler:
         if self.start_time is None:
             return
             
-        total = (time.perf_counter() - self.start_time) * 1000
+        end_time = time.perf_counter()
+        total = (end_time - self.start_time) * 1000
+        startup_profiler.record(self.name, "profile", self.start_time, end_time,
+                                checkpoints=len(self.checkpoints))
         log(f"[PROFILE] {self.name} - TOTAL: {total:.2f}ms", "INFO")
         
         # Показываем детализацию
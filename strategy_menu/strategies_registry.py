@@ -261,6 +261,9 @@ def reload_categories():
     global _categories_cache, _categories_loaded
     _categories_cache = {}
     _categories_loaded = False
+    # Общий кэш разобранных TXT каталогов (ini_catalog) - перечитываем файлы с диска
+    from utils.ini_catalog import invalidate_catalog_cache
+    invalidate_catalog_cache()
     return _get_categories()
 
 # Режимы которые требуют агрессивной фильтрации (все порты)
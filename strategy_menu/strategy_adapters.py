@@ -8,13 +8,19 @@
 import json
 import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 from log import log
 from config import BAT_FOLDER, INDEXJSON_FOLDER
 from strategy_menu.strategy_info import StrategyInfo
-from utils.bat_parser import parse_bat_file
+from utils.bat_parser import parse_bat_file_with_metadata
+from utils.bat_cache import BAT_CACHE_FILENAME, BatScanCache, file_signature
+
+
+# Потоков для разбора BAT файлов (чтение с медленного диска / под антивирусом)
+BAT_SCAN_WORKERS = 8
 
 
 class BaseStrategyAdapter(ABC):
@@ -63,16 +69,22 @@ class BatStrategyAdapter(BaseStrategyAdapter):
 
     Парсит .bat файлы в указанной папке, извлекает метаданные
     из REM комментариев и создаёт объекты StrategyInfo.
+
+    Каждый файл читается один раз (метаданные и аргументы за один проход),
+    изменившиеся файлы разбираются параллельно, результаты кэшируются на
+    диске по (путь, mtime, size) - неизменившиеся файлы не перечитываются.
     """
 
-    def __init__(self, bat_folder: str):
+    def __init__(self, bat_folder: str, cache_path: Optional[str] = None):
         """
         Инициализирует адаптер.
 
         Args:
             bat_folder: Путь к папке с .bat файлами
+            cache_path: Файл дискового кэша (по умолчанию - в папке bat_folder)
         """
         self._bat_folder = bat_folder
+        self._cache_path = cache_path or os.path.join(bat_folder, BAT_CACHE_FILENAME)
         self._cache: Optional[List[StrategyInfo]] = None
         self._cache_by_id: Optional[Dict[str, StrategyInfo]] = None
 
@@ -128,36 +140,73 @@ class BatStrategyAdapter(BaseStrategyAdapter):
             log(f"Ошибка чтения папки BAT: {e}", "ERROR")
             return
 
-        for bat_file in bat_files:
-            try:
-                file_path = os.path.join(self._bat_folder, bat_file)
-                strategy = self._parse_bat_file(file_path)
-
-                if strategy:
-                    self._cache.append(strategy)
-                    self._cache_by_id[strategy.id] = strategy
-
-            except Exception as e:
-                log(f"Ошибка парсинга BAT файла {bat_file}: {e}", "ERROR")
-
-        log(f"BatStrategyAdapter: загружено {len(self._cache)} стратегий из {self._bat_folder}", "DEBUG")
+        disk_cache = BatScanCache(self._cache_path)
+        results: Dict[str, tuple] = {}
+        to_parse = []
+
+        file_paths = [os.path.join(self._bat_folder, bat_file) for bat_file in bat_files]
+        for file_path in file_paths:
+            signature = file_signature(file_path)
+            if signature is None:
+                continue
+            cached = disk_cache.get(file_path, signature)
+            if cached is not None:
+                results[file_path] = cached
+            else:
+                to_parse.append((file_path, signature))
+
+        if to_parse:
+            workers = max(1, min(BAT_SCAN_WORKERS, len(to_parse)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BatScan") as pool:
+                parsed_all = pool.map(self._scan_bat_file, [path for path, _ in to_parse])
+                for (file_path, signature), scanned in zip(to_parse, parsed_all):
+                    if scanned is None:
+                        continue
+                    metadata, parsed = scanned
+                    disk_cache.put(file_path, signature, metadata, parsed)
+                    results[file_path] = scanned
+
+        disk_cache.prune(file_paths)
+        disk_cache.save()
+
+        # Порядок стратегий - порядок файлов в папке (как при последовательном разборе)
+        for file_path in file_paths:
+            scanned = results.get(file_path)
+            if scanned is None:
+                continue
+            strategy = self._build_strategy(file_path, *scanned)
+            if strategy:
+                self._cache.append(strategy)
+                self._cache_by_id[strategy.id] = strategy
+
+        log(f"BatStrategyAdapter: загружено {len(self._cache)} стратегий из {self._bat_folder} "
+            f"(из кэша: {disk_cache.hits}, разобрано: {len(to_parse)})", "DEBUG")
+
+    @staticmethod
+    def _scan_bat_file(file_path: str) -> Optional[tuple]:
+        """Разбирает BAT файл за одно чтение (выполняется в пуле потоков)"""
+        try:
+            return parse_bat_file_with_metadata(file_path)
+        except Exception as e:
+            log(f"Ошибка парсинга BAT файла {os.path.basename(file_path)}: {e}", "ERROR")
+            return None
 
-    def _parse_bat_file(self, file_path: str) -> Optional[StrategyInfo]:
+    def _build_strategy(self, file_path: str, metadata: Dict[str, Any], parsed) -> Optional[StrategyInfo]:
         """
-        Парсит отдельный BAT файл.
+        Создаёт StrategyInfo из результата разбора BAT файла.
 
         Args:
             file_path: Полный путь к файлу
+            metadata: Метаданные из REM/# комментариев
+            parsed: (exe_path, args) или None
 
         Returns:
             StrategyInfo или None при ошибке
         """
         try:
-            metadata = self._extract_metadata(file_path)
+            metadata = dict(metadata)
             metadata['file_path'] = file_path
 
-            # Извлекаем аргументы через bat_parser
-            parsed = parse_bat_file(file_path)
             if parsed:
                 exe_path, args = parsed
                 # Сохраняем аргументы в многострочном формате (один аргумент на строку)
@@ -169,65 +218,6 @@ class BatStrategyAdapter(BaseStrategyAdapter):
             log(f"Ошибка создания StrategyInfo из {file_path}: {e}", "ERROR")
             return None
 
-    def _extract_metadata(self, file_path: str) -> Dict[str, Any]:
-        """
-        Извлекает метаданные из REM комментариев BAT файла.
-
-        Поддерживаемые комментарии:
-            REM NAME: Название стратегии
-            REM VERSION: 1.0
-            REM DESCRIPTION: Описание
-            REM LABEL: recommended|deprecated|experimental|game
-            REM AUTHOR: Автор
-
-        Args:
-            file_path: Путь к BAT файлу
-
-        Returns:
-            Словарь с метаданными
-        """
-        metadata = {}
-
-        try:
-            with open(file_path, 'r', encoding='utf-8-sig', errors='ignore') as f:
-                lines = f.readlines()
-
-            for line in lines:
-                line = line.strip()
-
-                # Парсим REM комментарии
-                if line.upper().startswith('REM '):
-                    content = line[4:].strip()
-
-                    # Ищем паттерн KEY: VALUE
-                    if ':' in content:
-                        key, value = content.split(':', 1)
-                        key = key.strip().upper()
-                        value = value.strip()
-
-                        if key in ('NAME', 'VERSION', 'DESCRIPTION', 'LABEL', 'AUTHOR', 'COMMENT'):
-                            metadata[key] = value
-
-                # Также поддерживаем # комментарии (новый формат)
-                elif line.startswith('#') and ':' in line:
-                    content = line[1:].strip()
-                    key, value = content.split(':', 1)
-                    key = key.strip().upper()
-                    value = value.strip()
-
-                    if key in ('NAME', 'VERSION', 'DESCRIPTION', 'LABEL', 'AUTHOR', 'COMMENT'):
-                        metadata[key] = value
-
-            # Если имя не найдено - используем имя файла
-            if 'NAME' not in metadata:
-                metadata['NAME'] = os.path.splitext(os.path.basename(file_path))[0]
-
-        except Exception as e:
-            log(f"Ошибка извлечения метаданных из {file_path}: {e}", "ERROR")
-            metadata['NAME'] = os.path.splitext(os.path.basename(file_path))[0]
-
-        return metadata
-
 
 class JsonStrategyAdapter(BaseStrategyAdapter):
     """
@@ -33,6 +33,10 @@ from typing import Dict, List, Optional, Any, Union
 from log import log
 from config import INDEXJSON_FOLDER
 from strategy_menu.user_categories_store import get_user_categories_file_path
+from utils.ini_catalog import (
+    load_catalog, parse_catalog_text, strategies_from_catalog, invalidate_catalog_cache,
+    lowercase_fields,
+)
 
 # Путь к папке со стратегиями - используем INDEXJSON_FOLDER из конфига
 # Структура: {INDEXJSON_FOLDER}/strategies/builtin/ и {INDEXJSON_FOLDER}/strategies/user/
@@ -156,79 +160,12 @@ def load_txt_file(filepath: Path) -> Optional[Dict]:
         Dict в формате {'strategies': [...]} или None при ошибке
     """
     try:
-        if not filepath.exists():
+        # Разбор и кэш (по mtime/size) - общие с preset_zapret2.catalog
+        parsed = load_catalog(filepath)
+        if parsed is None:
             return None
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        strategies = []
-        current_strategy = None
-        current_args = []
-
-        for line in content.splitlines():
-            line = line.rstrip()
-
-            # Пропускаем пустые строки
-            if not line:
-                continue
-
-            # Пропускаем комментарии (строки начинающиеся с #)
-            if line.startswith('#'):
-                continue
-
-            # Начало новой стратегии [id]
-            if line.startswith('[') and line.endswith(']'):
-                # Сохраняем предыдущую стратегию
-                if current_strategy is not None:
-                    current_strategy['args'] = '\n'.join(current_args)
-                    strategies.append(current_strategy)
-
-                # Начинаем новую
-                strategy_id = line[1:-1].strip()
-                current_strategy = {
-                    'id': strategy_id,
-                    'name': strategy_id,  # По умолчанию имя = id
-                    'description': '',
-                    'author': 'unknown',
-                    'label': None,
-                    'blobs': [],
-                    'args': ''
-                }
-                current_args = []
-                continue
-
-            # Если нет текущей стратегии - пропускаем
-            if current_strategy is None:
-                continue
-
-            # Аргументы (строки начинающиеся с --)
-            if line.startswith('--'):
-                current_args.append(line)
-                continue
-
-            # Метаданные (key = value)
-            if '=' in line:
-                key, _, value = line.partition('=')
-                key = key.strip().lower()
-                value = value.strip()
-
-                if key == 'name':
-                    current_strategy['name'] = value
-                elif key == 'author':
-                    current_strategy['author'] = value
-                elif key == 'label':
-                    current_strategy['label'] = value if value else None
-                elif key == 'description':
-                    current_strategy['description'] = value
-                elif key == 'blobs':
-                    # blobs = tls7, tls_google -> ['tls7', 'tls_google']
-                    current_strategy['blobs'] = [b.strip() for b in value.split(',') if b.strip()]
-
-        # Сохраняем последнюю стратегию
-        if current_strategy is not None:
-            current_strategy['args'] = '\n'.join(current_args)
-            strategies.append(current_strategy)
+        strategies = strategies_from_catalog(parsed)
 
         log(f"Загружено {len(strategies)} стратегий из TXT: {filepath.name}", "DEBUG")
         return {'strategies': strategies}
@@ -292,6 +229,8 @@ def save_txt_file(filepath: Path, data: Dict) -> bool:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write('\n'.join(lines))
 
+        # mtime может не успеть измениться - сбрасываем кэш разбора явно
+        invalidate_catalog_cache(filepath)
         return True
     except Exception as e:
         log(f"Ошибка сохранения TXT {filepath}: {e}", "ERROR")
@@ -718,116 +657,49 @@ def load_strategies_as_dict(category: str, strategy_set: str = None) -> Dict[str
 
 # ==================== ЗАГРУЗКА КАТЕГОРИЙ ====================
 
-def _parse_categories_txt_content(content: str, *, source_name: str) -> Optional[Dict]:
-    try:
-        categories = []
-        current_category = None
-        file_version = '1.0'
-        file_description = ''
-        section_index = 0
-
-        for line in content.splitlines():
-            line = line.rstrip()
+# Поля категории, которые копируются из файла как есть
+_CATEGORY_STR_FIELDS = (
+    'full_name', 'description', 'tooltip', 'color', 'default_strategy', 'ports', 'protocol',
+    'command_group', 'icon_name', 'icon_color', 'base_filter', 'base_filter_ipset',
+    'base_filter_hostlist', 'strategy_type',
+)
+_CATEGORY_BOOL_FIELDS = ('needs_new_separator', 'strip_payload', 'requires_all_ports')
 
-            # Пропускаем пустые строки
-            if not line:
-                continue
-
-            # Пропускаем комментарии (строки начинающиеся с #)
-            if line.startswith('#'):
-                continue
-
-            # Начало новой категории [key]
-            if line.startswith('[') and line.endswith(']'):
-                # Сохраняем предыдущую категорию
-                if current_category is not None:
-                    # Строго следуем порядку секций в файле, независимо от order/command_order.
-                    file_order = int(current_category.get("_file_order") or 0)
-                    current_category["order"] = file_order
-                    current_category["command_order"] = file_order
-                    categories.append(current_category)
-
-                # Начинаем новую
-                # Normalize keys to lower-case so categories match preset parsing logic
-                # (preset blocks infer category keys in lower-case from filter tokens/filenames).
-                raw_key = line[1:-1].strip()
-                category_key = raw_key.lower()
-                section_index += 1
-                current_category = {
-                    'key': category_key,
-                    'full_name': raw_key or category_key,  # По умолчанию имя = исходный key
-                    '_file_order': section_index,
-                }
-                continue
-
-            # Метаданные (key = value)
-            if '=' in line:
-                key, _, value = line.partition('=')
-                key = key.strip().lower()
-                value = value.strip()
-
-                # Глобальные метаданные файла (до первой категории)
-                if current_category is None:
-                    if key == 'version':
-                        file_version = value
-                    elif key == 'description':
-                        file_description = value
-                    continue
 
-                # Метаданные категории
-                if key == 'full_name':
-                    current_category['full_name'] = value
-                elif key == 'description':
-                    current_category['description'] = value
-                elif key == 'tooltip':
-                    # tooltip может содержать \n - оставляем как есть
-                    current_category['tooltip'] = value
-                elif key == 'color':
-                    current_category['color'] = value
-                elif key == 'default_strategy':
-                    current_category['default_strategy'] = value
-                elif key == 'ports':
-                    current_category['ports'] = value
-                elif key == 'protocol':
-                    current_category['protocol'] = value
-                elif key == 'order':
-                    # Deprecated: order/command_order are ignored; ordering is determined by section order.
-                    pass
-                elif key == 'command_order':
-                    # Deprecated: order/command_order are ignored; ordering is determined by section order.
-                    pass
-                elif key == 'needs_new_separator':
-                    current_category['needs_new_separator'] = value.lower() == 'true'
-                elif key == 'command_group':
-                    current_category['command_group'] = value
-                elif key == 'icon_name':
-                    current_category['icon_name'] = value
-                elif key == 'icon_color':
-                    current_category['icon_color'] = value
-                elif key == 'base_filter':
-                    current_category['base_filter'] = value
-                elif key == 'base_filter_ipset':
-                    current_category['base_filter_ipset'] = value
-                elif key == 'base_filter_hostlist':
-                    current_category['base_filter_hostlist'] = value
-                elif key == 'strategy_type':
-                    current_category['strategy_type'] = value
-                elif key == 'strip_payload':
-                    current_category['strip_payload'] = value.lower() == 'true'
-                elif key == 'requires_all_ports':
-                    current_category['requires_all_ports'] = value.lower() == 'true'
-
-        # Сохраняем последнюю категорию
-        if current_category is not None:
-            file_order = int(current_category.get("_file_order") or 0)
-            current_category["order"] = file_order
-            current_category["command_order"] = file_order
+def _categories_from_catalog(parsed, *, source_name: str) -> Optional[Dict]:
+    try:
+        categories = []
+        for section in parsed.sections:
+            # Normalize keys to lower-case so categories match preset parsing logic
+            # (preset blocks infer category keys in lower-case from filter tokens/filenames).
+            raw_key = section.name
+            category_key = raw_key.lower()
+            current_category = {
+                'key': category_key,
+                'full_name': raw_key or category_key,  # По умолчанию имя = исходный key
+                '_file_order': section.index,
+            }
+
+            # order/command_order устарели и игнорируются: порядок определяется порядком секций.
+            # tooltip может содержать \n - оставляем как есть.
+            fields = lowercase_fields(section.fields)
+            for key in _CATEGORY_STR_FIELDS:
+                if key in fields:
+                    current_category[key] = fields[key]
+            for key in _CATEGORY_BOOL_FIELDS:
+                if key in fields:
+                    current_category[key] = fields[key].lower() == 'true'
+
+            # Строго следуем порядку секций в файле, независимо от order/command_order.
+            current_category["order"] = section.index
+            current_category["command_order"] = section.index
             categories.append(current_category)
 
         log(f"Загружено {len(categories)} категорий из TXT: {source_name}", "DEBUG")
+        preamble = lowercase_fields(parsed.preamble)
         return {
-            'version': file_version,
-            'description': file_description,
+            'version': preamble.get('version', '1.0'),
+            'description': preamble.get('description', ''),
             'categories': categories
         }
     except Exception as e:
@@ -835,6 +707,10 @@ def _parse_categories_txt_content(content: str, *, source_name: str) -> Optional
         return None
 
 
+def _parse_categories_txt_content(content: str, *, source_name: str) -> Optional[Dict]:
+    return _categories_from_catalog(parse_catalog_text(content), source_name=source_name)
+
+
 def load_categories_txt(filepath: Path) -> Optional[Dict]:
     """
     Загружает категории из TXT файла в INI-подобном формате.
@@ -870,13 +746,11 @@ def load_categories_txt(filepath: Path) -> Optional[Dict]:
         Dict в формате {'version': '...', 'description': '...', 'categories': [...]} или None при ошибке
     """
     try:
-        if not filepath.exists():
+        parsed = load_catalog(filepath)
+        if parsed is None:
             return None
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        return _parse_categories_txt_content(content, source_name=filepath.name)
+        return _categories_from_catalog(parsed, source_name=filepath.name)
 
     except Exception as e:
         log(f"Ошибка чтения TXT категорий {filepath}: {e}", "ERROR")
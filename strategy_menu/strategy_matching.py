@@ -5,9 +5,17 @@ strategy_menu/strategy_matching.py
 Используется для восстановления strategy_id из preset файлов.
 """
 
+from typing import Dict, Optional
+
 from log.log import log
 
 
+# {category_key: (strategies, category_info, filter_mode, {нормализованные args: strategy_id})}
+# Словарь стратегий реестра не пересоздаётся до reload_strategies(), поэтому
+# identity словаря и CategoryInfo служит версией каталога.
+_args_index: Dict[str, tuple] = {}
+
+
 def match_strategy_by_args(
     category_key: str,
     tcp_args: str,
@@ -26,40 +34,64 @@ def match_strategy_by_args(
     Returns:
         strategy_id или "none" если не найдено совпадение
     """
-    from strategy_menu.strategies_registry import StrategiesRegistry
-
-    registry = StrategiesRegistry()
-
-    # Получить все стратегии для категории
-    strategies = registry.get_category_strategies(category_key)
-
-    if not strategies:
-        return "none"
-
     # Выбрать нужные args
     target_args = tcp_args.strip() if protocol == "tcp" else udp_args.strip()
 
     if not target_args:
         return "none"
 
+    index = _get_args_index(category_key)
+    if not index:
+        return "none"
+
     # Поиск совпадения
+    strategy_id = index.get(_normalize_args(target_args))
+    if strategy_id is not None:
+        log(f"Matched strategy: {category_key} → {strategy_id}", "DEBUG")
+        return strategy_id
+
+    # Не найдено совпадение
+    log(f"No strategy match for {category_key} with args: {target_args[:50]}...", "DEBUG")
+    return "none"
+
+
+def _get_args_index(category_key: str) -> Optional[Dict[str, str]]:
+    """
+    Возвращает индекс {нормализованные полные args: strategy_id} для категории.
+
+    Полные args (base_filter + техника) зависят от категории и filter_mode,
+    поэтому индекс строится на категорию и пересобирается при смене
+    словаря стратегий, CategoryInfo или filter_mode.
+    """
+    from strategy_menu.strategies_registry import registry
+    from strategy_menu.command_builder import get_filter_mode
+
+    strategies = registry.get_category_strategies(category_key)
+    if not strategies:
+        return None
+
+    category_info = registry.get_category_info(category_key)
+    filter_mode = get_filter_mode(category_key)
+
+    cached = _args_index.get(category_key)
+    if (cached is not None and cached[0] is strategies
+            and cached[1] is category_info and cached[2] == filter_mode):
+        return cached[3]
+
+    index: Dict[str, str] = {}
     for strategy_id in strategies.keys():
         try:
             strategy_args = registry.get_strategy_args_safe(category_key, strategy_id)
-
-            if strategy_args is None:
-                continue
-
-            if _args_match(strategy_args, target_args):
-                log(f"Matched strategy: {category_key} → {strategy_id}", "DEBUG")
-                return strategy_id
         except Exception as e:
             log(f"Error checking strategy {strategy_id}: {e}", "WARNING")
             continue
+        if strategy_args is None:
+            continue
+        # Первая стратегия с такими args побеждает (как при линейном поиске)
+        index.setdefault(_normalize_args(strategy_args), strategy_id)
 
-    # Не найдено совпадение
-    log(f"No strategy match for {category_key} with args: {target_args[:50]}...", "DEBUG")
-    return "none"
+    _args_index[category_key] = (strategies, category_info, filter_mode, index)
+    return index
 
 
 def _args_match(strategy_args: str, target_args: str) -> bool:
@@ -0,0 +1,119 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_modules():
+    repo_root = Path(__file__).resolve().parents[1]
+
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    config_stub = types.ModuleType("config")
+    config_stub.BAT_FOLDER = ""
+    config_stub.INDEXJSON_FOLDER = ""
+    config_stub.__path__ = []
+    sys.modules["config"] = config_stub
+
+    # Stub packages so imports work without the package __init__ files (GUI/Windows deps).
+    for name in ("utils", "strategy_menu"):
+        pkg = types.ModuleType(name)
+        pkg.__path__ = [str(repo_root / name)]
+        sys.modules[name] = pkg
+
+    bat_parser = _load_module("utils.bat_parser", repo_root / "utils" / "bat_parser.py")
+    _load_module("utils.bat_cache", repo_root / "utils" / "bat_cache.py")
+    _load_module("strategy_menu.strategy_info", repo_root / "strategy_menu" / "strategy_info.py")
+    adapters = _load_module("strategy_menu.strategy_adapters", repo_root / "strategy_menu" / "strategy_adapters.py")
+    return bat_parser, adapters
+
+
+bat_parser, strategy_adapters = _load_modules()
+
+
+NEW_FORMAT_BAT = """REM NAME: YouTube Fake
+REM LABEL: recommended
+# AUTHOR: tester
+--filter-tcp=443 --hostlist=youtube.txt --dpi-desync=fake
+--filter-udp=443 --dpi-desync=fake
+"""
+
+
+class BatStrategyScanCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, text):
+        path = self.folder / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_single_pass_returns_metadata_and_args(self):
+        path = self._write("yt.bat", NEW_FORMAT_BAT)
+        metadata, parsed = bat_parser.parse_bat_file_with_metadata(str(path))
+
+        self.assertEqual(metadata, {"NAME": "YouTube Fake", "LABEL": "recommended", "AUTHOR": "tester"})
+        self.assertEqual(parsed, bat_parser.parse_bat_file(str(path)))
+        exe_path, args = parsed
+        self.assertIsNone(exe_path)
+        self.assertEqual(args[:2], ["--wf-tcp=443", "--wf-udp=443"])
+        self.assertIn("--new", args)
+
+    def test_unchanged_files_are_not_reparsed(self):
+        self._write("a.bat", NEW_FORMAT_BAT)
+        self._write("b.bat", NEW_FORMAT_BAT.replace("YouTube Fake", "Second"))
+
+        calls = []
+        original = strategy_adapters.parse_bat_file_with_metadata
+
+        def counting(path):
+            calls.append(os.path.basename(path))
+            return original(path)
+
+        strategy_adapters.parse_bat_file_with_metadata = counting
+        try:
+            adapter = strategy_adapters.BatStrategyAdapter(str(self.folder))
+            names = sorted(s.name for s in adapter.get_all_strategies())
+            self.assertEqual(names, ["Second", "YouTube Fake"])
+            self.assertEqual(sorted(calls), ["a.bat", "b.bat"])
+
+            # Новый адаптер (новый запуск) - всё из дискового кэша
+            calls.clear()
+            adapter = strategy_adapters.BatStrategyAdapter(str(self.folder))
+            self.assertEqual(sorted(s.name for s in adapter.get_all_strategies()), names)
+            self.assertEqual(calls, [])
+            self.assertIn("--wf-tcp=443", adapter.get_strategy_by_id("a").args)
+
+            # Изменённый файл разбирается заново, удалённый пропадает
+            path = self._write("a.bat", NEW_FORMAT_BAT.replace("YouTube Fake", "Changed name"))
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            (self.folder / "b.bat").unlink()
+            adapter.refresh()
+            self.assertEqual(calls, ["a.bat"])
+            self.assertEqual([s.name for s in adapter.get_all_strategies()], ["Changed name"])
+        finally:
+            strategy_adapters.parse_bat_file_with_metadata = original
+
+
+if __name__ == "__main__":
+    unittest.main()
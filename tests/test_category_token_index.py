@@ -0,0 +1,99 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class CategoryTokenIndexTests(unittest.TestCase):
+    def setUp(self):
+        log_stub = types.ModuleType("log")
+        log_stub.log = lambda *_a, **_kw: None
+        sys.modules["log"] = log_stub
+
+        repo_root = Path(__file__).resolve().parents[1]
+        pkg_dir = repo_root / "preset_zapret2"
+        pkg = types.ModuleType("preset_zapret2")
+        pkg.__path__ = [str(pkg_dir)]
+        sys.modules["preset_zapret2"] = pkg
+
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp_path = Path(self._tmp.name)
+        builtin_dir = tmp_path / "json" / "strategies" / "builtin"
+        builtin_dir.mkdir(parents=True, exist_ok=True)
+        sections = "".join(
+            f"[cat{i}]\nbase_filter = --filter-tcp=443 --hostlist=cat{i}.txt\n"
+            f"base_filter_ipset = --filter-tcp=443 --ipset=ipset-cat{i}.txt\n\n"
+            for i in range(50)
+        )
+        (builtin_dir / "categories.txt").write_text(sections, encoding="utf-8")
+
+        self.user_file = tmp_path / "appdata" / "zapret" / "user_categories.txt"
+        self.user_file.parent.mkdir(parents=True, exist_ok=True)
+        self.user_file.write_text("", encoding="utf-8")
+
+        self._env = {k: os.environ.get(k) for k in ("ZAPRET_INDEXJSON_FOLDER", "APPDATA")}
+        os.environ["ZAPRET_INDEXJSON_FOLDER"] = str(tmp_path / "json")
+        os.environ["APPDATA"] = str(tmp_path / "appdata")
+
+        _load_module("utils.ini_catalog", repo_root / "utils" / "ini_catalog.py")
+        _load_module("preset_zapret2.catalog", pkg_dir / "catalog.py")
+        self.parser = _load_module("preset_zapret2.txt_preset_parser", pkg_dir / "txt_preset_parser.py")
+
+    def tearDown(self):
+        for key, value in self._env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._tmp.cleanup()
+
+    def test_block_is_matched_via_rarest_token(self):
+        parser = self.parser
+        key, mode = parser.infer_category_key_from_args(
+            "--filter-tcp=443\n--ipset=ipset-cat7.txt\n--lua-desync=fake"
+        )
+        self.assertEqual((key, mode), ("cat7", "ipset"))
+        self.assertEqual(
+            parser.infer_category_key_from_args("--filter-tcp=443 --hostlist=cat42.txt --lua-desync=fake"),
+            ("cat42", "base"),
+        )
+        self.assertEqual(parser.infer_category_key_from_args("--filter-tcp=443 --lua-desync=fake"), ("unknown", None))
+
+        # Общий токен --filter-tcp=443 не используется как ключ индекса
+        index = parser._load_category_token_index()
+        self.assertNotIn("--filter-tcp=443", index)
+        self.assertEqual(len(index["--hostlist=cat7.txt"]), 1)
+
+    def test_user_categories_change_is_picked_up_without_invalidation(self):
+        parser = self.parser
+        args = "--filter-tcp=443\n--hostlist-domains=meduza.io\n--lua-desync=pass"
+        self.assertEqual(parser.infer_category_key_from_args(args), ("unknown", None))
+        index = parser._load_category_token_index()
+
+        self.user_file.write_text(
+            "[user_category_1]\nbase_filter = --filter-tcp=443 --hostlist-domains=meduza.io\n",
+            encoding="utf-8",
+        )
+        key, _mode = parser.infer_category_key_from_args(args)
+        self.assertEqual(key, "user_category_1")
+        self.assertIsNot(parser._load_category_token_index(), index)
+
+        # Без изменений файлов индекс не пересобирается
+        self.assertIs(parser._load_category_token_index(), parser._load_category_token_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
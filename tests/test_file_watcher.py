@@ -0,0 +1,152 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_file_watcher():
+    repo_root = Path(__file__).resolve().parents[1]
+
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    return _load_module("utils.file_watcher", repo_root / "utils" / "file_watcher.py")
+
+
+def _write(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _wait_until(predicate, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class FileWatcherServiceTests(unittest.TestCase):
+    backend = "polling"
+
+    def setUp(self):
+        self.fw = _load_file_watcher()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "preset.txt")
+        _write(self.path, "--lua-init=@a.lua\n")
+        self.service = self.fw.FileWatcherService(backend=self.backend, poll_interval=0.05)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.service.stop()
+        self.tmp.cleanup()
+
+    def _callback(self):
+        with self.lock:
+            self.calls.append(time.monotonic())
+
+    def _count(self) -> int:
+        with self.lock:
+            return len(self.calls)
+
+    def test_burst_of_writes_triggers_single_callback(self):
+        self.service.watch(self.path, self._callback, debounce=0.3)
+        time.sleep(0.1)
+
+        for i in range(5):
+            _write(self.path, f"--lua-init=@a.lua\n--filter-tcp={i}\n")
+            time.sleep(0.05)
+
+        self.assertTrue(_wait_until(lambda: self._count() >= 1))
+        time.sleep(0.5)
+        self.assertEqual(self._count(), 1)
+        self.assertEqual(self.service.notifications, 1)
+
+    def test_rewrite_with_same_content_is_suppressed(self):
+        self.service.watch(self.path, self._callback, debounce=0.1)
+        time.sleep(0.1)
+
+        _write(self.path, "--lua-init=@a.lua\n")
+        os.utime(self.path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+
+        self.assertTrue(_wait_until(lambda: self.service.suppressed >= 1))
+        self.assertEqual(self._count(), 0)
+
+    def test_cancelled_handle_is_not_called(self):
+        handle = self.service.watch(self.path, self._callback, debounce=0.1)
+        other = []
+        self.service.watch(self.path, lambda: other.append(1), debounce=0.1)
+        handle.cancel()
+
+        _write(self.path, "--lua-init=@b.lua\n")
+
+        self.assertTrue(_wait_until(lambda: len(other) == 1))
+        self.assertEqual(self._count(), 0)
+
+    def test_stop_wakes_backend_wait(self):
+        self.service.watch(self.path, self._callback)
+        self.assertTrue(_wait_until(lambda: self.service.backend_name is not None))
+        time.sleep(0.1)  # поток наблюдения уже в backend.wait()
+
+        started = time.monotonic()
+        self.service.stop()
+        self.assertLess(time.monotonic() - started, 0.2)
+
+    def test_restart_after_join_timeout_keeps_dispatchers_apart(self):
+        release = threading.Event()
+        threads = []
+
+        def slow_callback():
+            threads.append(threading.current_thread())
+            if len(threads) == 1:
+                release.wait(5)
+
+        self.service.watch(self.path, slow_callback, debounce=0.05)
+        _write(self.path, "--lua-init=@b.lua\n")
+        self.assertTrue(_wait_until(lambda: len(threads) == 1))
+
+        # Диспетчер занят callback'ом - join истекает, старый поток ещё жив
+        self.service.stop(timeout=0.05)
+        self.assertTrue(threads[0].is_alive())
+
+        self.service.watch(self.path, self._callback, debounce=0.05)
+        _write(self.path, "--lua-init=@c.lua\n")
+        try:
+            self.assertTrue(_wait_until(lambda: len(threads) == 2 and self._count() == 1))
+            self.assertIsNot(threads[1], threads[0])
+        finally:
+            release.set()
+        threads[0].join(2)
+        self.assertFalse(threads[0].is_alive())
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+class InotifyBackendTests(FileWatcherServiceTests):
+    backend = "inotify"
+
+    def test_backend_is_inotify(self):
+        self.service.watch(self.path, self._callback)
+        self.assertTrue(_wait_until(lambda: self.service.backend_name is not None))
+        self.assertEqual(self.service.backend_name, "inotify")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import random
+import unittest
+
+from hosts.hosts_model import HostsFileModel
+
+
+MANAGED = {"a.com", "b.com", "c.com", "d.com", "e.com"}
+
+BASE = (
+    "# Copyright (c) 1993-2009 Microsoft Corp.\n"
+    "#\t127.0.0.1       localhost\n"
+    "10.0.0.1 router.lan\n"
+    "\n"
+    "1.1.1.1 a.com\n"
+    "# 2.2.2.2 b.com\n"
+    "3.3.3.3 c.com  # comment\n"
+    "4.4.4.4 c.com\n"
+    "10.0.0.2 nas.lan\n"
+)
+
+
+def _legacy_apply(content, managed, domain_ip_map):
+    # Previous HostsManager.apply_domain_ip_map text transformation.
+    new_lines = []
+    for line in content.splitlines(keepends=True):
+        if (
+            line.strip()
+            and not line.lstrip().startswith("#")
+            and len(line.split()) >= 2
+            and line.split()[1] in managed
+        ):
+            continue
+        new_lines.append(line)
+    while new_lines and new_lines[-1].strip() == "":
+        new_lines.pop()
+    if not domain_ip_map:
+        if new_lines and not new_lines[-1].endswith("\n"):
+            new_lines[-1] += "\n"
+        return "".join(new_lines)
+    if new_lines and not new_lines[-1].endswith("\n"):
+        new_lines.append("\n")
+    new_lines.append("\n")
+    for domain, ip in domain_ip_map.items():
+        new_lines.append(f"{ip} {domain}\n")
+    return "".join(new_lines)
+
+
+def _active(content, managed):
+    return {
+        (line.split()[0], line.split()[1])
+        for line in content.splitlines()
+        if line.strip() and not line.lstrip().startswith("#") and len(line.split()) >= 2
+        and line.split()[1] in managed
+    }
+
+
+def _unmanaged_lines(content, managed):
+    result = []
+    for line in content.splitlines():
+        parts = line.split()
+        if parts and not parts[0].startswith("#") and len(parts) >= 2 and parts[1] in managed:
+            continue
+        if line.strip():
+            result.append(line)
+    return result
+
+
+class HostsFileModelTests(unittest.TestCase):
+    def test_indexes_active_entries(self):
+        model = HostsFileModel(BASE)
+        self.assertEqual(len(model), 5)
+        self.assertEqual([e.ip for e in model.entries_for("c.com")], ["3.3.3.3", "4.4.4.4"])
+        self.assertEqual(model.entry_at(4).domain, "a.com")
+        self.assertIsNone(model.entry_at(5))  # commented out
+        self.assertEqual(model.active_map(MANAGED), {"a.com": "1.1.1.1", "c.com": "4.4.4.4"})
+        self.assertTrue(model.has_any(["x.com", "a.com"]))
+        self.assertFalse(model.has_any(["b.com"]))
+        self.assertGreaterEqual(model.parse_ms, 0.0)
+
+    def test_minimal_diff_replaces_in_place(self):
+        model = HostsFileModel(BASE)
+        diff = model.plan_apply(MANAGED, {"a.com": "1.1.1.1", "c.com": "9.9.9.9", "d.com": "5.5.5.5"})
+        self.assertEqual(diff.replaced, {6: "9.9.9.9 c.com\n"})
+        self.assertEqual(diff.removed, [7])
+        self.assertEqual(diff.added, ["5.5.5.5 d.com\n"])
+
+        text = model.apply(diff)
+        self.assertEqual(text.splitlines()[4:7], ["1.1.1.1 a.com", "# 2.2.2.2 b.com", "9.9.9.9 c.com"])
+        self.assertTrue(text.endswith("10.0.0.2 nas.lan\n\n5.5.5.5 d.com\n"))
+        self.assertGreaterEqual(model.last_apply_ms, 0.0)
+
+    def test_unchanged_selection_produces_empty_diff(self):
+        model = HostsFileModel(BASE)
+        target = {"a.com": "1.1.1.1", "c.com": "7.7.7.7"}
+        text = model.apply(model.plan_apply(MANAGED, target))
+
+        again = HostsFileModel(text)
+        diff = again.plan_apply(MANAGED, target)
+        self.assertTrue(diff.is_empty)
+        self.assertIs(again.apply(diff), text)
+
+    def test_matches_legacy_result_semantics(self):
+        rng = random.Random(3)
+        domains = sorted(MANAGED) + ["x.org"]
+        content = BASE
+        for _ in range(300):
+            managed = MANAGED | ({"x.org"} if rng.random() < 0.5 else set())
+            # The catalog always manages the domains it selects
+            target = {d: f"{rng.randint(1, 3)}.0.0.{rng.randint(1, 2)}" for d in domains
+                      if d in managed and rng.random() < 0.5}
+
+            model = HostsFileModel(content)
+            new_content = model.apply(model.plan_apply(managed, target))
+            legacy = _legacy_apply(content, managed, target)
+
+            scope = managed | set(target)
+            self.assertEqual(_active(new_content, scope), _active(legacy, scope))
+            self.assertEqual(_unmanaged_lines(new_content, scope), _unmanaged_lines(legacy, scope))
+            self.assertTrue(new_content == "" or new_content.endswith("\n"))
+            content = new_content
+
+    def test_replacing_last_line_without_newline(self):
+        model = HostsFileModel("10.0.0.1 router.lan\n1.1.1.1 a.com")
+        text = model.apply(model.plan_apply(MANAGED, {"a.com": "2.2.2.2"}))
+        self.assertEqual(text, "10.0.0.1 router.lan\n2.2.2.2 a.com")
+
+        text = model.apply(model.plan_apply(MANAGED, {}))
+        self.assertEqual(text, "10.0.0.1 router.lan\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
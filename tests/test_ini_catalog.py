@@ -0,0 +1,135 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+repo_root = Path(__file__).resolve().parents[1]
+ini_catalog = _load_module("utils.ini_catalog", repo_root / "utils" / "ini_catalog.py")
+# Load directly: preset_zapret2/__init__.py pulls the whole preset system.
+catalog = _load_module("preset_zapret2_catalog", repo_root / "preset_zapret2" / "catalog.py")
+
+
+TCP_TXT = """# TCP strategies
+[multisplit]
+name = Multisplit
+author = tester
+label = recommended
+blobs = tls7, tls_google
+--lua-desync=multisplit:pos=1,midsld
+--lua-desync=fake:blob=tls7
+
+[fake_only]
+description = Just fake
+--lua-desync=fake:blob=tls_google
+"""
+
+
+class IniCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        ini_catalog.invalidate_catalog_cache()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, rel, text):
+        path = Path(self._tmp.name) / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_strategies_are_parsed(self):
+        strategies = ini_catalog.strategies_from_catalog(ini_catalog.parse_catalog_text(TCP_TXT))
+        self.assertEqual([s["id"] for s in strategies], ["multisplit", "fake_only"])
+        self.assertEqual(strategies[0]["name"], "Multisplit")
+        self.assertEqual(strategies[0]["label"], "recommended")
+        self.assertEqual(strategies[0]["blobs"], ["tls7", "tls_google"])
+        self.assertEqual(strategies[0]["args"], "--lua-desync=multisplit:pos=1,midsld\n--lua-desync=fake:blob=tls7")
+        self.assertEqual(strategies[1]["name"], "fake_only")
+        self.assertEqual(strategies[1]["author"], "unknown")
+        self.assertIsNone(strategies[1]["label"])
+
+    def test_indented_headers_and_args_are_parsed(self):
+        parsed = ini_catalog.parse_catalog_text(
+            "  # comment\n"
+            "  [multisplit]\n"
+            "\tname = Multisplit\n"
+            "    --lua-desync=multisplit:pos=1\n"
+            "\t--lua-desync=fake:blob=tls7  \n"
+        )
+        self.assertEqual([s.name for s in parsed.sections], ["multisplit"])
+        self.assertEqual(parsed.sections[0].args, ("--lua-desync=multisplit:pos=1", "--lua-desync=fake:blob=tls7"))
+        self.assertEqual(parsed.sections[0].fields, {"name": "Multisplit"})
+
+    def test_key_case_is_kept_for_loaders_to_decide(self):
+        parsed = ini_catalog.parse_catalog_text(
+            "Version = 2.0\n[s1]\nName = First\nBase_Filter = --filter-tcp=443\nname = Second\n"
+        )
+        section = parsed.sections[0]
+        self.assertEqual(parsed.preamble, {"Version": "2.0"})
+        self.assertEqual(section.fields["Base_Filter"], "--filter-tcp=443")
+        # Strategy loaders lower-case keys; the last assignment wins as before
+        self.assertEqual(ini_catalog.strategy_from_section(section)["name"], "Second")
+
+        categories = catalog._categories_from_catalog(parsed)
+        self.assertIn("Base_Filter", categories["s1"])
+        self.assertNotIn("base_filter", categories["s1"])
+
+    def test_empty_section_name_is_rejected(self):
+        parsed = ini_catalog.parse_catalog_text(
+            "[]\nname = Orphan\n--lua-desync=fake\n[real]\n--lua-desync=multisplit\n"
+        )
+        self.assertEqual([s.name for s in parsed.sections], ["real"])
+        self.assertEqual(parsed.sections[0].args, ("--lua-desync=multisplit",))
+        self.assertEqual(parsed.sections[0].index, 1)
+
+    def test_file_cache_keyed_by_mtime_and_size(self):
+        path = self._write("tcp.txt", TCP_TXT)
+        first = ini_catalog.load_catalog(path)
+        self.assertIs(ini_catalog.load_catalog(path), first)
+        self.assertEqual(ini_catalog.get_catalog_cache_stats()["files"], 1)
+
+        self._write("tcp.txt", TCP_TXT + "\n[extra]\n--lua-desync=fake\n")
+        second = ini_catalog.load_catalog(path)
+        self.assertIsNot(second, first)
+        self.assertEqual(len(second.sections), 3)
+
+        ini_catalog.invalidate_catalog_cache(path)
+        self.assertIsNot(ini_catalog.load_catalog(path), second)
+        self.assertIsNone(ini_catalog.load_catalog(Path(self._tmp.name) / "missing.txt"))
+
+    def test_preset_catalog_uses_shared_cache(self):
+        self._write("strategies/builtin/tcp.txt", TCP_TXT)
+        self._write("strategies/user/tcp.txt", "[fake_only]\nname = Mine\n--lua-desync=fake\n")
+        catalog._CACHED_PATHS = catalog.CatalogPaths(
+            indexjson_dir=Path(self._tmp.name),
+            builtin_dir=Path(self._tmp.name) / "strategies" / "builtin",
+            user_dir=Path(self._tmp.name) / "strategies" / "user",
+        )
+        try:
+            strategies = catalog.load_strategies("tcp")
+            self.assertEqual(strategies["fake_only"]["name"], "Mine")
+            self.assertEqual(strategies["multisplit"]["args"].count("\n"), 1)
+            self.assertIs(catalog.load_strategies("tcp"), strategies)
+
+            self._write("strategies/user/tcp.txt", "")
+            self.assertEqual(catalog.load_strategies("tcp")["fake_only"]["name"], "fake_only")
+        finally:
+            catalog._CACHED_PATHS = None
+            catalog._CACHED_STRATEGIES.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
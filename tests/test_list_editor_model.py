@@ -0,0 +1,157 @@
+import importlib.util
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _split(line: str):
+    return [part for part in re.split(r"[\s,;]+", line) if part]
+
+
+def _normalize(item: str):
+    item = item.strip().lower()
+    if re.fullmatch(r"[a-z0-9-]+(\.[a-z0-9-]+)+", item):
+        return item
+    return None
+
+
+def _legacy_normalize(lines):
+    # Previous page implementation: list membership dedupe.
+    entries, normalized_lines = [], []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            entries.append(line)
+            normalized_lines.append(line)
+            continue
+        for item in _split(line):
+            norm = _normalize(item)
+            if norm:
+                if norm not in entries:
+                    entries.append(norm)
+                    normalized_lines.append(norm)
+            else:
+                normalized_lines.append(item)
+    return entries, normalized_lines
+
+
+class ListEditorModelTests(unittest.TestCase):
+    def setUp(self):
+        repo_root = Path(__file__).resolve().parents[1]
+        self.mod = _load_module("_list_editor_model_under_test", repo_root / "ui" / "list_editor_model.py")
+
+    def _model(self, text=""):
+        model = self.mod.ListEditorModel(_split, _normalize)
+        model.reset(text)
+        return model
+
+    def _assert_matches_full_scan(self, model):
+        fresh = self._model(model.text())
+        fresh.process_pending(10 ** 9)
+        model.process_pending(10 ** 9)
+        self.assertEqual(model.entry_lines, fresh.entry_lines)
+        self.assertEqual(model.invalid_total, fresh.invalid_total)
+        self.assertEqual(model._norm_counts, fresh._norm_counts)
+        self.assertEqual(model.pending, 0)
+
+    def test_replace_lines_keeps_counters_consistent(self):
+        model = self._model("# comment\nexample.com\nbad_item\n\nvk.com youtube.com")
+        self.assertEqual(model.entry_lines, 3)
+        self.assertEqual(model.invalid_total, 1)
+        self.assertTrue(model.contains("youtube.com"))
+
+        model.replace_lines(2, 1, ["fixed.org"])
+        self.assertEqual(model.invalid_total, 0)
+        self.assertTrue(model.contains("fixed.org"))
+
+        model.replace_lines(1, 1, [])
+        self.assertFalse(model.contains("example.com"))
+        self._assert_matches_full_scan(model)
+
+    def test_random_edits_match_full_scan(self):
+        rng = random.Random(7)
+        pool = ["a.com", "b.org", "A.COM", "bad", "# note", "", "c.net d.net", "x,y.io"]
+        model = self._model("\n".join(rng.choice(pool) for _ in range(50)))
+        for _ in range(300):
+            start = rng.randrange(model.line_count)
+            old_count = rng.randrange(min(4, model.line_count - start) + 1)
+            new_lines = [rng.choice(pool) for _ in range(rng.randrange(4))]
+            if model.line_count - old_count + len(new_lines) == 0:
+                continue
+            model.replace_lines(start, old_count, new_lines)
+        self._assert_matches_full_scan(model)
+
+    def test_large_insert_is_validated_in_batches(self):
+        count = self.mod.INLINE_VALIDATE_LINES + 10
+        model = self._model("\n".join(f"host{i}.com" for i in range(count)))
+        self.assertEqual(model.pending, count)
+        self.assertEqual(model.entry_lines, count)
+        self.assertFalse(model.contains("host0.com"))
+
+        self.assertEqual(model.process_pending(budget=100), count - 100)
+        # Edit an unchecked line: it is dropped from pending, not counted twice.
+        model.replace_lines(count - 1, 1, ["bad"])
+        while model.process_pending(budget=100):
+            pass
+        self.assertTrue(model.contains("host0.com"))
+        self.assertEqual(model.invalid_total, 1)
+        self._assert_matches_full_scan(model)
+
+    def test_first_invalid_reports_line_numbers(self):
+        model = self._model("ok.com\nbad1\n# bad\nok.org bad2\nbad3")
+        self.assertEqual(model.first_invalid(2), [(2, "bad1"), (4, "bad2")])
+        self.assertEqual(len(model.first_invalid(10)), 3)
+
+    def test_normalize_lines_matches_legacy_output(self):
+        rng = random.Random(11)
+        pool = ["A.com", "a.com", "b.org c.net", "bad", "# keep", "  ", "b.org"]
+        lines = [rng.choice(pool) for _ in range(200)]
+        self.assertEqual(self.mod.normalize_lines(lines, _split, _normalize), _legacy_normalize(lines))
+
+    def test_save_snapshot_reports_errors(self):
+        saved = []
+        result = self.mod.save_snapshot(["a.com", "A.com", "bad"], 5, _split, _normalize,
+                                        lambda entries: saved.append(entries) or True)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.revision, 5)
+        self.assertEqual(saved, [["a.com"]])
+        self.assertEqual(result.normalized_lines, ["a.com", "bad"])
+
+        def failing(_entries):
+            raise OSError("disk full")
+
+        result = self.mod.save_snapshot(["a.com"], 6, _split, _normalize, failing)
+        self.assertFalse(result.ok)
+        self.assertIn("disk full", result.error)
+
+    def test_line_edit_span_round_trip(self):
+        rng = random.Random(3)
+        pool = ["a", "b", "c", "", "dd"]
+        for _ in range(2000):
+            old = [rng.choice(pool) for _ in range(rng.randrange(1, 6))]
+            new = [rng.choice(pool) for _ in range(rng.randrange(1, 6))]
+            span = self.mod.line_edit_span(old, new)
+            old_text = "\n".join(old)
+            if span is None:
+                self.assertEqual(old, new)
+                continue
+            pos, removed, inserted = span
+            self.assertEqual(old_text[:pos] + inserted + old_text[pos + removed:], "\n".join(new), (old, new))
+
+
+if __name__ == "__main__":
+    unittest.main()
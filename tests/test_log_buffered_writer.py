@@ -0,0 +1,79 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+repo_root = Path(__file__).resolve().parents[1]
+buffered_writer = _load_module("log_buffered_writer", repo_root / "log" / "buffered_writer.py")
+
+
+class BufferedLogWriterTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "zapret_log_test.txt")
+        with open(self.path, "w", encoding="utf-8-sig") as f:
+            f.write("=== header ===\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_lines_from_many_threads_are_written_once_with_single_bom(self):
+        writer = buffered_writer.BufferedLogWriter(self.path, queue_size=16)
+
+        def produce(tag):
+            for i in range(500):
+                writer.write(f"{tag} {i}\n")
+
+        threads = [threading.Thread(target=produce, args=(t,)) for t in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(writer.flush())
+
+        raw = self._read()
+        self.assertEqual(raw.count(b"\xef\xbb\xbf"), 1)
+        lines = raw.decode("utf-8-sig").splitlines()[1:]
+        self.assertEqual(len(lines), 2000)
+        for tag in "abcd":
+            own = [line for line in lines if line.startswith(tag)]
+            self.assertEqual(own, [f"{tag} {i}" for i in range(500)])
+        writer.close()
+
+    def test_write_after_close_goes_straight_to_file(self):
+        writer = buffered_writer.BufferedLogWriter(self.path)
+        writer.write("before\n")
+        writer.close()
+        writer.write("after\n")
+        self.assertTrue(writer.flush())
+        self.assertTrue(self._read().decode("utf-8-sig").endswith("before\nafter\n"))
+
+    def test_level_rank(self):
+        rank = buffered_writer.level_rank
+        self.assertLess(rank("DEBUG"), rank("INFO"))
+        self.assertEqual(rank("❌ ERROR"), rank("ERROR"))
+        self.assertEqual(rank("⚠ WARNING"), rank("WARNING"))
+        self.assertEqual(rank("🔁 UPDATE"), rank("INFO"))
+        self.assertEqual(rank(""), rank("INFO"))
+
+
+if __name__ == "__main__":
+    unittest.main()
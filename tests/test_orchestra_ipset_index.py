@@ -0,0 +1,110 @@
+import importlib.util
+import ipaddress
+import os
+import random
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Stub out `log` import to avoid Qt deps in headless test env.
+log_stub = types.ModuleType("log")
+log_stub.log = lambda *_a, **_kw: None
+sys.modules["log"] = log_stub
+
+repo_root = Path(__file__).resolve().parents[1]
+ipset_index = _load_module("orchestra_ipset_index", repo_root / "orchestra" / "ipset_index.py")
+
+
+def _linear_resolve(files, ip):
+    """Прежний линейный поиск (эталон)"""
+    ip_obj = ipaddress.ip_address(ip)
+    for path in files:
+        label = ipset_index.label_for_path(path)
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    net = ipaddress.ip_network(line, strict=False)
+                except ValueError:
+                    continue
+                if ip_obj in net:
+                    return label
+    return None
+
+
+class IpsetIndexTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, lines):
+        path = os.path.join(self.folder, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def test_matches_linear_scan_with_overlaps(self):
+        rng = random.Random(7)
+        for name in ("ipset-a.txt", "ipset-b.txt", "my-ipset.txt"):
+            lines = ["# comment", "garbage"]
+            for _ in range(200):
+                prefix = rng.choice((8, 12, 16, 20, 24, 28, 32))
+                lines.append(f"10.{rng.randrange(4)}.{rng.randrange(256)}.{rng.randrange(256)}/{prefix}")
+            lines.append(f"2001:db8:{rng.randrange(16):x}::/48")
+            self._write(name, lines)
+        files = [os.path.join(self.folder, n) for n in ("ipset-a.txt", "ipset-b.txt", "my-ipset.txt")]
+
+        index = ipset_index.IpsetIndex(self.folder, check_interval=None)
+        index.refresh()
+        probes = [f"10.{rng.randrange(5)}.{rng.randrange(256)}.{rng.randrange(256)}" for _ in range(500)]
+        probes += [f"2001:db8:{rng.randrange(16):x}::1" for _ in range(20)] + ["11.0.0.1", "bad-ip"]
+        for ip in probes:
+            expected = _linear_resolve(files, ip) if ip != "bad-ip" else None
+            self.assertEqual(index.resolve(ip), expected, ip)
+
+    def test_lru_cache_and_incremental_rebuild(self):
+        path = self._write("ipset-discord.txt", ["162.159.128.0/19"])
+        self._write("ipset-games.txt", ["5.0.0.0/8"])
+        index = ipset_index.IpsetIndex(self.folder, cache_size=2, check_interval=None)
+        index.refresh()
+
+        self.assertEqual(index.resolve("162.159.130.234"), "discord")
+        self.assertEqual(index.resolve("162.159.130.234"), "discord")
+        self.assertEqual(index.cache_hits, 1)
+        self.assertIsNone(index.resolve("8.8.8.8"))
+        index.resolve("5.1.1.1")
+        self.assertLessEqual(len(index._cache), 2)
+
+        self.assertFalse(index.refresh())  # nothing changed
+
+        self._write("ipset-discord.txt", ["162.159.128.0/19", "8.8.8.0/24"])
+        os.utime(path, ns=(0, 10**18))
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.resolve("8.8.8.8"), "discord")
+
+        os.remove(path)
+        self.assertTrue(index.refresh())
+        self.assertIsNone(index.resolve("162.159.130.234"))
+        self.assertEqual(index.resolve("5.1.1.1"), "games")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_orchestra_modules():
+    repo_root = Path(__file__).resolve().parents[1]
+    pkg_dir = repo_root / "orchestra"
+
+    # Stub out `log`/`config`/`config.reg` (winreg is not available on Linux).
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    config_stub = types.ModuleType("config")
+    config_stub.REGISTRY_PATH = "Software\\ZapretTest"
+    config_stub.__path__ = []
+    sys.modules["config"] = config_stub
+
+    reg_stub = types.ModuleType("config.reg")
+    reg_stub.reg = lambda *_a, **_kw: None
+    reg_stub.reg_enumerate_values = lambda *_a, **_kw: {}
+    reg_stub.reg_delete_all_values = lambda *_a, **_kw: True
+    reg_stub.reg_delete_value = lambda *_a, **_kw: True
+    sys.modules["config.reg"] = reg_stub
+
+    # Stub package so relative imports work without orchestra/__init__.py (runner deps).
+    pkg = types.ModuleType("orchestra")
+    pkg.__path__ = [str(pkg_dir)]
+    sys.modules["orchestra"] = pkg
+
+    segments = _load_module("orchestra.log_segments", pkg_dir / "log_segments.py")
+    analytics = _load_module("orchestra.log_analytics", pkg_dir / "log_analytics.py")
+    return segments, analytics
+
+
+log_segments, log_analytics = _load_orchestra_modules()
+
+
+BLOCK = [
+    "packet: id=1 len=40 outbound IPv6=0",
+    "desync profile search for tcp ip=142.250.74.206 port=443 l7proto=tls ssid='' hostname='youtube.com'",
+    "LUA: slm_quality: [tls] youtube.com strat=2 SUCCESS 1/1",
+    "LUA: slm_quality: [tls] youtube.com strat=3 FAIL 0/1",
+    "LUA: slm_quality: [tls] discord.com strat=1 SUCCESS 1/1",
+    "LUA: standard_failure_detector: incoming RST s1 in range s4096",
+]
+
+
+class LogAnalyticsTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "orchestra_20250101_120000.log")
+        writer = log_segments.RotatingLogWriter(self.path, segment_size=2048)
+        writer.write("=== Orchestra Debug Log Started 2025-01-01 12:00:00 ===")
+        for _ in range(40):
+            for line in BLOCK:
+                writer.write(line)
+        writer.write("LUA: slm_quality: [tls] LOCK: youtube.com -> strat=2")
+        writer.write("LUA: slm_quality: [tls] UNLOCK: youtube.com strat=2 (now blocked)")
+        writer.close(wait_compression=True)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_counts_and_event_offsets_across_compressed_segments(self):
+        self.assertTrue(any(p.endswith(".gz") for p in log_segments.list_segments(self.path)))
+        index = log_analytics.LogIndex.build(self.path)
+
+        stats = index.host_stats("youtube.com")
+        self.assertEqual(stats["tls"][2], (40, 0))
+        self.assertEqual(stats["tls"][3], (0, 40))
+        self.assertEqual(index.hosts(), ["discord.com", "youtube.com"])
+
+        locks = index.events_for_host("youtube.com", types={"lock", "unlock"})
+        self.assertEqual([e["type"] for e in locks], ["lock", "unlock"])
+        self.assertEqual(index.read_event_lines(locks), [
+            "LUA: slm_quality: [tls] LOCK: youtube.com -> strat=2",
+            "LUA: slm_quality: [tls] UNLOCK: youtube.com strat=2 (now blocked)",
+        ])
+        rst = index.events_for_host(types={"rst"})
+        self.assertEqual(len(rst), 40)
+        self.assertTrue(all(line.endswith("incoming RST s1 in range s4096") for line in index.read_event_lines(rst)))
+
+        rates = index.strategy_win_rates()
+        self.assertEqual(rates[("tls", 2)], {"successes": 40, "failures": 0, "rate": 100})
+        self.assertEqual(rates[("tls", 3)]["rate"], 0)
+        self.assertEqual(index.strategy_win_rates(since=time.time() + 3600), {})
+
+    def test_event_offsets_follow_active_segment_through_rotation(self):
+        path = os.path.join(self._tmp.name, "orchestra_20250102_120000.log")
+        lock_line = "LUA: slm_quality: [tls] LOCK: youtube.com -> strat=2"
+        for compress in (False, True):
+            log_segments.delete_log_segments(path)
+            writer = log_segments.RotatingLogWriter(path, segment_size=4096, compress=compress)
+            writer.write(lock_line)
+            writer.flush()
+            index = log_analytics.LogIndex.build(path)
+            locks = index.events_for_host("youtube.com", types={"lock"})
+            self.assertEqual(locks[0]["file"], os.path.basename(path))
+
+            # Активный файл уходит в закрытый сегмент, под его именем - новый файл
+            for _ in range(200):
+                writer.write(BLOCK[0])
+            writer.close(wait_compression=True)
+            self.assertGreater(len(log_segments.list_segments(path)), 1)
+
+            lines = index.read_event_lines(locks)
+            # Без сжатия сегмент находится по inode, после сжатия - пропускается,
+            # но строки нового файла с тем же именем не возвращаются никогда
+            self.assertEqual(lines, [] if compress else [lock_line])
+
+    def test_index_is_cached_and_reused(self):
+        log_analytics.LogIndex.build(self.path)
+        idx_path = log_analytics.index_path_for(self.path)
+        self.assertTrue(os.path.exists(idx_path))
+        mtime = os.path.getmtime(idx_path)
+
+        index = log_analytics.LogIndex.build(self.path)
+        self.assertEqual(os.path.getmtime(idx_path), mtime)
+        self.assertEqual(index.host_stats("discord.com")["tls"][1], (40, 0))
+
+        log_segments.delete_log_segments(self.path)
+        self.assertFalse(os.path.exists(idx_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import importlib.util
+import random
+import sys
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _legacy_matches(text, domain_filter, protocol_filter):
+    # Previous OrchestraPage._matches_filter.
+    domain_filter = domain_filter.strip().lower()
+    if domain_filter and domain_filter not in text.lower():
+        return False
+    if protocol_filter != "Все":
+        text_upper = text.upper()
+        if protocol_filter == "TLS" and "[TLS]" not in text_upper and "TLS" not in text_upper:
+            return False
+        elif protocol_filter == "HTTP" and "[HTTP]" not in text_upper and "HTTP" not in text_upper:
+            return False
+        elif protocol_filter == "UDP" and "UDP" not in text_upper:
+            return False
+        elif protocol_filter == "SUCCESS" and "SUCCESS" not in text_upper and "✓" not in text:
+            return False
+        elif protocol_filter == "FAIL" and "FAIL" not in text_upper and "✗" not in text and "X " not in text:
+            return False
+    return True
+
+
+LINES = [
+    "[17:45:13] [TLS] ✓ SUCCESS: youtube.com :443 strategy=1",
+    "[17:45:14] [HTTP] ✗ FAIL: Example.org :80 strategy=3",
+    "[17:45:15] [QUIC] 🔒 LOCKED: 1.2.3.4 = strategy 2 (udp)",
+    "[17:45:16] 🔄 Strategy rotated to 2",
+    "[INFO] X failed to parse",
+    "[17:45:17] [TLS] 🔓 UNLOCKED: discord.com :443 - re-learning...",
+]
+
+
+class LogRingBufferTests(unittest.TestCase):
+    def setUp(self):
+        repo_root = Path(__file__).resolve().parents[1]
+        self.mod = _load_module("_orchestra_log_buffer_under_test", repo_root / "ui" / "orchestra_log_buffer.py")
+
+    def test_filters_match_legacy_behaviour(self):
+        rng = random.Random(9)
+        buffer = self.mod.LogRingBuffer(maxlen=500)
+        lines = [rng.choice(LINES) for _ in range(400)]
+        buffer.extend(lines)
+        for protocol in self.mod.PROTOCOL_FILTER_FLAGS:
+            for domain in ("", "YouTube", "example.org", "discord", "nothing"):
+                log_filter = self.mod.LogFilter.from_ui(domain, protocol)
+                expected = [line for line in lines if _legacy_matches(line, domain, protocol)]
+                self.assertEqual(buffer.filtered(log_filter), expected, (domain, protocol))
+
+    def test_ring_buffer_keeps_newest_lines(self):
+        buffer = self.mod.LogRingBuffer(maxlen=3)
+        buffer.extend(f"line {i}" for i in range(10))
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual([entry.text for entry in buffer], ["line 7", "line 8", "line 9"])
+        buffer.clear()
+        self.assertEqual(buffer.filtered(self.mod.LogFilter()), [])
+
+    def test_append_returns_indexed_entry(self):
+        buffer = self.mod.LogRingBuffer()
+        entry = buffer.append(LINES[0])
+        self.assertEqual(entry.lower, LINES[0].lower())
+        self.assertTrue(entry.flags & self.mod.FLAG_TLS and entry.flags & self.mod.FLAG_SUCCESS)
+        self.assertFalse(entry.flags & self.mod.FLAG_FAIL)
+        self.assertTrue(self.mod.LogFilter().is_empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
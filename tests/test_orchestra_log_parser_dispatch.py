@@ -0,0 +1,86 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+repo_root = Path(__file__).resolve().parents[1]
+log_parser = _load_module("orchestra_log_parser", repo_root / "orchestra" / "log_parser.py")
+
+
+LINES = [
+    "packet: id=2079 len=40 inbound IPv6=0",
+    "IP4: 64.233.162.198 => 192.168.1.100 proto=tcp ttl=116 sport=443 dport=55666 flags=R",
+    "desync profile search for tcp ip=142.250.74.206 port=443 l7proto=tls ssid='' hostname='rr1---sn-xx.googlevideo.com'",
+    "desync profile 1 (noname) matches",
+    "dpi desync src=192.168.1.100:55666 dst=142.250.74.206:443 track_direction=out connection_proto=tls",
+    "LUA: automate: host record key 'autostate.circular_quality_1_1.youtube.com'",
+    "LUA: strategy-stats: APPLIED youtube.com = strategy 2 [circular_quality_1_1]",
+    "LUA: standard_failure_detector: incoming RST s1 in range s4096",
+    "LUA: slm_quality: youtube.com strat=2 SUCCESS 3/5",
+    "LUA: slm_quality: [tls] LOCK: dns.sb -> strat=6",
+    "LUA: slm_quality: [tls] UNLOCK: dns.sb strat=5 (now blocked)",
+    "LUA: strategy_quality: RESET youtube.com",
+    "IP4: 151.101.1.140 => 192.168.1.100 proto=udp ttl=55 sport=443 dport=64028",
+    "IP4: 192.168.1.1 => 192.168.1.100 proto=udp ttl=55 sport=53 dport=64028",
+    "using cached desync profile 3 (noname)",
+    "packet contains QUIC initial",
+    "desync profile search for udp ip=108.177.122.95 port=443 l7proto=quic",
+    "LUA: udp_protocol_success_detector: QUIC (QUIC_SHORT_HEADER) - SUCCESS",
+    "LUA: slm_quality: udp 178.18.0.0 strat=1 FAIL 0/3",
+    "LUA: udp_aggressive_failure_detector: FAIL out=2>=2 in=0<=0",
+    "LUA: strategy_quality: LOCK Discord Voice -> strat=4",
+    "LOCKED example.org to strategy=3 [HTTP]",
+    "LUA: circular_quality: AUTO-UNLOCK example.org after 2 fails",
+    "UNLOCKING example.net [TLS]",
+    "LUA: circular: rotate strategy to 7",
+    "LUA: circular_quality: current strategy 8",
+    "LUA: automate: success detected",
+    "LUA: automate: failure detected",
+    "LUA: standard_success_detector: treating connection as successful",
+    "LUA: strategy-stats: HISTORY youtube.com s2 successes=10 failures=2 rate=83%",
+    "LUA: strategy-stats: PRELOADED youtube.com = strategy 15 [tls]",
+    "",
+]
+
+
+class LogParserDispatchTests(unittest.TestCase):
+    def test_dispatch_matches_sequential_events_and_state(self):
+        sequential = log_parser.LogParser(dispatch=False)
+        dispatch = log_parser.LogParser()
+        for line in LINES:
+            self.assertEqual(sequential.parse_line(line), dispatch.parse_line(line), line)
+
+        state_keys = (
+            "current_host", "current_ip", "current_port", "current_proto", "current_l7proto",
+            "current_profile", "current_strategy", "ip_to_hostname", "last_applied",
+            "last_host_by_proto", "host_to_proto",
+        )
+        for key in state_keys:
+            self.assertEqual(getattr(sequential, key), getattr(dispatch, key), key)
+
+    def test_noise_lines_produce_no_events(self):
+        parser = log_parser.LogParser()
+        self.assertIsNone(parser.parse_line(LINES[0]))
+        self.assertIsNone(parser.parse_line(LINES[1]))
+
+    def test_lock_event(self):
+        event = log_parser.LogParser().parse_line("LUA: slm_quality: [quic] LOCK: 103.3.0.0 -> strat=2")
+        self.assertEqual(event.event_type, log_parser.EventType.LOCK)
+        self.assertEqual(event.hostname, "103.3.0.0")
+        self.assertEqual(event.strategy, 2)
+        self.assertEqual(event.l7proto, "quic")
+
+
+if __name__ == "__main__":
+    unittest.main()
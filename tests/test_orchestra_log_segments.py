@@ -0,0 +1,135 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Stub out `log` import to avoid Qt deps in headless test env.
+log_stub = types.ModuleType("log")
+log_stub.log = lambda *_a, **_kw: None
+sys.modules["log"] = log_stub
+
+repo_root = Path(__file__).resolve().parents[1]
+log_segments = _load_module("orchestra_log_segments", repo_root / "orchestra" / "log_segments.py")
+
+
+class RotatingLogWriterTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "orchestra_20250101_120000.log")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_lines(self, count, **kwargs):
+        writer = log_segments.RotatingLogWriter(self.path, **kwargs)
+        lines = [f"packet: id={i} len=40 outbound" for i in range(count)]
+        for line in lines:
+            writer.write(line)
+        writer.close(wait_compression=True)
+        return writer, lines
+
+    def test_rotation_compresses_and_reads_back_in_order(self):
+        writer, lines = self._write_lines(1000, segment_size=4096, max_segments=100)
+
+        self.assertGreater(writer.rotations, 3)
+        segments = log_segments.list_segments(self.path)
+        self.assertEqual(segments[-1], self.path)
+        self.assertTrue(all(p.endswith(".gz") for p in segments[:-1]))
+        self.assertEqual(list(log_segments.iter_log_lines(self.path)), lines)
+        self.assertEqual(log_segments.read_log(self.path), "\n".join(lines) + "\n")
+        self.assertGreater(log_segments.log_size(self.path), 0)
+
+    def test_old_segments_are_pruned(self):
+        writer, lines = self._write_lines(1000, segment_size=4096, max_segments=3)
+
+        segments = log_segments.list_segments(self.path)
+        self.assertEqual(len(segments), 3)
+        kept = list(log_segments.iter_log_lines(self.path))
+        self.assertEqual(kept, lines[-len(kept):])
+
+    def test_failed_rotation_keeps_writing_to_active_file(self):
+        from unittest import mock
+
+        writer = log_segments.RotatingLogWriter(self.path, segment_size=512, compress=False)
+        lines = [f"packet: id={i} len=40 outbound" for i in range(200)]
+        with mock.patch.object(log_segments.os, "replace", side_effect=PermissionError("in use")):
+            for line in lines[:100]:
+                writer.write(line)
+        self.assertEqual(writer.rotations, 0)
+
+        for line in lines[100:]:
+            writer.write(line)
+        writer.close()
+
+        self.assertGreater(writer.rotations, 0)
+        self.assertEqual(list(log_segments.iter_log_lines(self.path)), lines)
+
+    def test_prune_skips_segment_being_compressed(self):
+        import threading
+
+        writer = log_segments.RotatingLogWriter(self.path, segment_size=512, max_segments=100, compress=False)
+        for i in range(80):
+            writer.write(f"packet: id={i} len=40 outbound")
+        writer.max_segments = 2
+        oldest = log_segments.list_segments(self.path)[0]
+        self.assertGreater(len(log_segments.list_segments(self.path)), 2)
+
+        gate = threading.Event()
+        busy = threading.Thread(target=gate.wait, daemon=True)
+        busy.start()
+        writer._compressing[oldest] = busy
+        try:
+            with writer._lock:
+                writer._prune()
+            self.assertTrue(os.path.exists(oldest))
+        finally:
+            gate.set()
+            busy.join()
+
+        with writer._lock:
+            writer._prune()
+        self.assertFalse(os.path.exists(oldest))
+        writer.close()
+
+    def test_prune_counts_segments_when_active_file_is_missing(self):
+        writer = log_segments.RotatingLogWriter(self.path, segment_size=512, max_segments=100, compress=False)
+        for i in range(80):
+            writer.write(f"packet: id={i} len=40 outbound")
+        writer.close()
+        os.remove(self.path)
+        closed = log_segments.list_segments(self.path)
+        self.assertGreater(len(closed), 3)
+
+        writer.max_segments = 3
+        writer._prune()
+
+        # Активного файла нет - остаются max_segments - 1 самых новых закрытых сегментов
+        self.assertEqual(log_segments.list_segments(self.path), closed[-2:])
+
+    def test_uncompressed_segments_and_delete(self):
+        self._write_lines(500, segment_size=2048, compress=False)
+        segments = log_segments.list_segments(self.path)
+        self.assertFalse(any(p.endswith(".gz") for p in segments))
+
+        deleted = log_segments.delete_log_segments(self.path)
+        self.assertEqual(deleted, len(segments))
+        self.assertEqual(log_segments.list_segments(self.path), [])
+        self.assertIsNone(log_segments.read_log(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import importlib.util
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Stub out `log` import to avoid Qt deps in headless test env.
+log_stub = types.ModuleType("log")
+log_stub.log = lambda *_a, **_kw: None
+sys.modules["log"] = log_stub
+
+repo_root = Path(__file__).resolve().parents[1]
+output_pipeline = _load_module("orchestra_output_pipeline", repo_root / "orchestra" / "output_pipeline.py")
+
+
+class OutputPipelineTests(unittest.TestCase):
+    def _run(self, lines, process_line, **kwargs):
+        batches = []
+        finished = threading.Event()
+        pipeline = output_pipeline.OutputPipeline(
+            process_line=lambda line: process_line(pipeline, line),
+            deliver=batches.append,
+            on_finish=finished.set,
+            ui_interval=0.001,
+            **kwargs,
+        )
+        pipeline.start(iter(lines))
+        pipeline.join(timeout=5)
+        self.assertTrue(finished.is_set())
+        return pipeline, batches
+
+    def test_all_lines_processed_in_order_and_batched(self):
+        seen = []
+
+        def process(pipeline, line):
+            seen.append(line)
+            pipeline.emit(line.upper())
+
+        lines = [f"line {i}\n" for i in range(500)] + ["   \n"]
+        pipeline, batches = self._run(lines, process, ui_batch_size=20)
+
+        self.assertEqual(seen, [f"line {i}" for i in range(500)])
+        self.assertTrue(all(len(batch) <= 20 for batch in batches))
+        self.assertEqual([m for batch in batches for m in batch], [f"LINE {i}" for i in range(500)])
+
+        stats = pipeline.get_stats()
+        self.assertEqual(stats["lines_read"], 500)
+        self.assertEqual(stats["lines_processed"], 500)
+        self.assertEqual(stats["ui_sent"], 500)
+        self.assertEqual(stats["ui_dropped"], 0)
+
+    def test_slow_worker_causes_backpressure_not_loss(self):
+        def process(_pipeline, _line):
+            time.sleep(0.001)
+
+        pipeline, _ = self._run([f"{i}\n" for i in range(50)], process, raw_queue_size=2)
+        stats = pipeline.get_stats()
+        self.assertEqual(stats["lines_processed"], 50)
+        self.assertGreater(stats["backpressure_waits"], 0)
+
+    def test_ui_buffer_drops_oldest_when_full(self):
+        buffer = output_pipeline.MessageBuffer(maxlen=3)
+        for i in range(5):
+            buffer.push(str(i))
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual(buffer.pop_batch(10), ["2", "3", "4"])
+
+    def test_process_errors_do_not_stop_pipeline(self):
+        def process(_pipeline, line):
+            if line == "bad":
+                raise ValueError("boom")
+
+        pipeline, _ = self._run(["ok\n", "bad\n", "ok\n"], process)
+        stats = pipeline.get_stats()
+        self.assertEqual(stats["lines_processed"], 3)
+        self.assertEqual(stats["process_errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
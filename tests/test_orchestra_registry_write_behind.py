@@ -0,0 +1,184 @@
+import importlib.util
+import json
+import sys
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_orchestra_modules():
+    repo_root = Path(__file__).resolve().parents[1]
+    pkg_dir = repo_root / "orchestra"
+
+    # Stub out `log`/`config`/`config.reg` (winreg is not available on Linux).
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    config_stub = types.ModuleType("config")
+    config_stub.REGISTRY_PATH = "Software\\ZapretTest"
+    config_stub.__path__ = []
+    sys.modules["config"] = config_stub
+
+    reg_stub = types.ModuleType("config.reg")
+    reg_stub.reg = lambda *_a, **_kw: None
+    reg_stub.reg_enumerate_values = lambda *_a, **_kw: {}
+    reg_stub.reg_delete_all_values = lambda *_a, **_kw: True
+    reg_stub.reg_delete_value = lambda *_a, **_kw: True
+    sys.modules["config.reg"] = reg_stub
+
+    # Stub package so relative imports work without orchestra/__init__.py (runner deps).
+    pkg = types.ModuleType("orchestra")
+    pkg.__path__ = [str(pkg_dir)]
+    sys.modules["orchestra"] = pkg
+
+    writer = _load_module("orchestra.registry_writer", pkg_dir / "registry_writer.py")
+    locked = _load_module("orchestra.locked_strategies_manager", pkg_dir / "locked_strategies_manager.py")
+    # Импортируется из locked_strategies_manager при очистке конфликтов
+    _load_module("orchestra.blocked_strategies_manager", pkg_dir / "blocked_strategies_manager.py")
+    return writer, locked
+
+
+registry_writer, locked_strategies_manager = _load_orchestra_modules()
+
+
+class RegistryWriteBehindTests(unittest.TestCase):
+    def _writer(self, **kwargs):
+        backend = registry_writer.MemoryRegistryBackend()
+        kwargs.setdefault("flush_interval", 60.0)
+        return registry_writer.RegistryWriteBehind(backend=backend, **kwargs), backend
+
+    def test_changes_are_coalesced_until_flush(self):
+        writer, backend = self._writer()
+        for strategy in range(1, 11):
+            writer.set("Key", "youtube.com", strategy)
+        writer.set("Key", "example.com", 3)
+        writer.delete("Key", "example.com")
+
+        self.assertEqual(backend.data, {})
+        self.assertEqual(writer.pending_count(), 2)
+
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(backend.data, {"Key": {"youtube.com": 10}})
+        # One write per subkey plus one delete
+        self.assertEqual(backend.calls, 2)
+        self.assertEqual(writer.flush(), 0)
+
+    def test_size_threshold_triggers_background_flush(self):
+        writer, backend = self._writer(max_pending=5)
+        for i in range(5):
+            writer.set("Key", f"host{i}.com", i)
+
+        deadline = time.monotonic() + 2.0
+        while writer.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(backend.data.get("Key", {})), 5)
+
+    def test_background_thread_exits_when_queue_is_empty(self):
+        writer, backend = self._writer(flush_interval=0.01)
+        writer.set("Key", "youtube.com", 1)
+
+        deadline = time.monotonic() + 2.0
+        while writer._thread is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIsNone(writer._thread)
+        self.assertEqual(backend.data, {"Key": {"youtube.com": 1}})
+
+        # Следующее изменение снова запускает поток
+        writer.set("Key", "discord.com", 2)
+        self.assertIsNotNone(writer._thread)
+        writer.flush()
+
+    def test_managers_share_process_wide_writer(self):
+        shared = registry_writer.get_registry_writer()
+        self.assertIs(registry_writer.get_registry_writer(), shared)
+        self.assertIs(locked_strategies_manager.LockedStrategiesManager().writer, shared)
+
+
+class LockedManagerDirtyTrackingTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = registry_writer.MemoryRegistryBackend()
+        self.writer = registry_writer.RegistryWriteBehind(backend=self.backend, flush_interval=60.0)
+        self.manager = locked_strategies_manager.LockedStrategiesManager(writer=self.writer)
+
+    def test_save_writes_only_changed_hosts(self):
+        tls = self.manager.locked_by_askey["tls"]
+        for i in range(100):
+            tls[f"host{i}.com"] = 2
+        self.manager.save(full=True)
+        self.writer.flush()
+        path = locked_strategies_manager.get_registry_path("tls")
+        self.assertEqual(len(self.backend.data[path]), 100)
+
+        self.backend.data.clear()
+        tls["host5.com"] = 7
+        self.manager.mark_dirty("host5.com", "tls")
+        del tls["host6.com"]
+        self.manager.mark_dirty("host6.com", "tls")
+        self.backend.data[path] = {"host6.com": 2}
+        self.manager.save()
+        self.writer.flush()
+
+        self.assertEqual(self.backend.data[path], {"host5.com": 7})
+
+    def test_history_is_serialized_once_per_dirty_domain(self):
+        for _ in range(20):
+            self.manager.increment_history("youtube.com", 2, is_success=True)
+        self.manager.increment_history("discord.com", 1, is_success=False)
+        self.manager.save_history()
+        self.manager.save_history()  # nothing new is dirty
+        self.writer.flush()
+
+        history = self.backend.data[locked_strategies_manager.REGISTRY_ORCHESTRA_HISTORY]
+        self.assertEqual(set(history), {"youtube.com", "discord.com"})
+        self.assertEqual(json.loads(history["youtube.com"]), {"2": {"successes": 20, "failures": 0}})
+
+    def test_unlock_queues_delete(self):
+        self.manager.lock("youtube.com", 3, "tls", user_lock=True)
+        self.writer.flush()
+        path = locked_strategies_manager.get_registry_path("tls")
+        user_path = locked_strategies_manager.get_user_registry_path("tls")
+        self.assertEqual(self.backend.data[path], {"youtube.com": 3})
+        self.assertEqual(self.backend.data[user_path], {"youtube.com": 1})
+
+        self.manager.unlock("youtube.com", "tls")
+        self.writer.flush()
+        self.assertEqual(self.backend.data[path], {})
+        self.assertEqual(self.backend.data[user_path], {})
+
+    def test_conflict_cleanup_deletes_through_writer(self):
+        class _Blocked:
+            def is_blocked(self, hostname, strategy):
+                return hostname == "bad.com"
+
+        self.manager.set_blocked_manager(_Blocked())
+        tls = self.manager.locked_by_askey["tls"]
+        tls["bad.com"] = 4
+        tls["good.com"] = 2
+        self.manager.user_locked_by_askey["tls"].add("bad.com")
+        path = locked_strategies_manager.get_registry_path("tls")
+        user_path = locked_strategies_manager.get_user_registry_path("tls")
+        self.backend.data[path] = {"bad.com": 4, "good.com": 2}
+        self.backend.data[user_path] = {"bad.com": 1}
+
+        self.manager._clean_blocked_conflicts()
+        self.assertEqual(self.writer.pending_count(), 2)
+        self.writer.flush()
+
+        self.assertEqual(self.backend.data[path], {"good.com": 2})
+        self.assertEqual(self.backend.data[user_path], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import importlib.util
+import random
+import sys
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class SortedRowsTests(unittest.TestCase):
+    def setUp(self):
+        repo_root = Path(__file__).resolve().parents[1]
+        self.mod = _load_module("_orchestra_rows_model_under_test", repo_root / "ui" / "orchestra_rows_model.py")
+
+    def _locked(self):
+        return self.mod.SortedRows(self.mod.locked_row_key, self.mod.locked_sort_key)
+
+    def _blocked(self):
+        return self.mod.SortedRows(self.mod.blocked_row_key, self.mod.blocked_sort_key)
+
+    def _assert_consistent(self, rows, expected):
+        expected = sorted(expected, key=rows.sort_key_func)
+        self.assertEqual(list(rows), expected)
+        for position, row in enumerate(expected):
+            self.assertEqual(rows.find(rows.key_func(row)), position)
+
+    def test_locked_rows_are_sorted_by_host(self):
+        rows = self._locked()
+        rows.reset(self.mod.locked_rows({"tls": {"b.com": 3, "a.com": 1}, "quic": {"a.com": 2}}))
+        self.assertEqual([(r.host, r.askey) for r in rows], [("a.com", "quic"), ("a.com", "tls"), ("b.com", "tls")])
+        self.assertIsNone(rows.find(("c.com", "tls")))
+
+    def test_blocked_user_rows_come_before_default(self):
+        rows = self._blocked()
+        rows.reset(self.mod.blocked_rows(
+            {"tls": {"youtube.com": [1, 5], "a.com": [2]}},
+            lambda host, strategy, askey: host == "youtube.com" and strategy == 1,
+        ))
+        self.assertEqual([(r.host, r.strategy, r.is_default) for r in rows],
+                         [("a.com", 2, False), ("youtube.com", 5, False), ("youtube.com", 1, True)])
+
+    def test_insert_reports_position_and_rejects_duplicates(self):
+        rows = self._locked()
+        rows.reset([self.mod.StrategyRow("b.com", "tls", 1), self.mod.StrategyRow("d.com", "tls", 1)])
+        row = self.mod.StrategyRow("c.com", "tls", 7)
+        self.assertEqual(rows.insert_position(row), 1)
+        self.assertEqual(rows.insert(row), 1)
+        with self.assertRaises(KeyError):
+            rows.insert(row)
+
+    def test_replace_keeps_order_or_refuses(self):
+        rows = self._blocked()
+        rows.reset([self.mod.StrategyRow("a.com", "tls", 1)])
+        self.assertTrue(rows.can_replace(0, self.mod.StrategyRow("a.com", "tls", 1)))
+        self.assertFalse(rows.can_replace(0, self.mod.StrategyRow("a.com", "tls", 2)))
+        with self.assertRaises(ValueError):
+            rows.replace(0, self.mod.StrategyRow("a.com", "tls", 2))
+
+        locked = self._locked()
+        locked.reset([self.mod.StrategyRow("a.com", "tls", 1)])
+        locked.replace(0, self.mod.StrategyRow("a.com", "tls", 9))
+        self.assertEqual(locked.get(("a.com", "tls")).strategy, 9)
+
+    def test_random_lock_unlock_matches_full_rebuild(self):
+        rng = random.Random(5)
+        hosts = [f"host{i}.com" for i in range(60)] + ["Mixed.com", "mixed.com"]
+        askeys = ["tls", "http", "quic"]
+        rows = self._locked()
+        state = {}
+        for _ in range(3000):
+            key = (rng.choice(hosts), rng.choice(askeys))
+            if rng.random() < 0.6:
+                row = self.mod.StrategyRow(key[0], key[1], rng.randint(1, 50))
+                position = rows.find(key)
+                if position is None:
+                    rows.insert(row)
+                else:
+                    rows.replace(position, row)
+                state[key] = row
+            else:
+                position = rows.find(key)
+                if position is not None:
+                    self.assertEqual(rows.pop(position), state.pop(key))
+                else:
+                    self.assertNotIn(key, state)
+        self._assert_consistent(rows, state.values())
+
+    def test_reset_drops_duplicate_keys(self):
+        rows = self._blocked()
+        row = self.mod.StrategyRow("a.com", "tls", 1)
+        rows.reset([row, row])
+        self.assertEqual(len(rows), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_modules():
+    repo_root = Path(__file__).resolve().parents[1]
+
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    # Stub package so the import works without ui/__init__ (Qt deps).
+    pkg = types.ModuleType("ui")
+    pkg.__path__ = [str(repo_root / "ui")]
+    sys.modules["ui"] = pkg
+
+    page_names = _load_module("ui.page_names", repo_root / "ui" / "page_names.py")
+    registry = _load_module("ui.page_registry", repo_root / "ui" / "page_registry.py")
+    return page_names, registry
+
+
+class _FakePage:
+    instances = 0
+
+    def __init__(self, owner):
+        type(self).instances += 1
+        self.owner = owner
+
+
+class PageRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.page_names, self.registry_mod = _load_modules()
+        PageName = self.page_names.PageName
+
+        self.module_name = "_test_lazy_pages"
+        module = types.ModuleType(self.module_name)
+        module.HomePage = type("HomePage", (_FakePage,), {"instances": 0})
+        module.HostsPage = type("HostsPage", (_FakePage,), {"instances": 0})
+        module.LogsPage = type("LogsPage", (_FakePage,), {"instances": 0})
+        sys.modules[self.module_name] = module
+        self.module = module
+
+        Spec = self.registry_mod.PageSpec
+        self.specs = (
+            Spec(PageName.HOME, "home_page", self.module_name, "HomePage", eager=True),
+            Spec(PageName.HOSTS, "hosts_page", self.module_name, "HostsPage"),
+            Spec(PageName.LOGS, "logs_page", self.module_name, "LogsPage"),
+        )
+        self.owner = object()
+        self.stack = []
+        self.wired = []
+        self.registry = self.registry_mod.PageRegistry(
+            construct=lambda cls: cls(self.owner),
+            add_page=lambda spec, page: self.stack.append((spec.name, page)),
+            on_created=lambda spec, page: self.wired.append(spec.name),
+            specs=self.specs,
+        )
+
+    def tearDown(self):
+        sys.modules.pop(self.module_name, None)
+
+    def test_only_eager_pages_are_created_at_startup(self):
+        PageName = self.page_names.PageName
+        self.registry.create_eager()
+        self.registry.finish_startup()
+
+        self.assertEqual([name for name, _ in self.stack], [PageName.HOME])
+        self.assertEqual(self.module.HostsPage.instances, 0)
+        self.assertIsNone(self.registry.get_loaded(PageName.HOSTS))
+        self.assertEqual(self.registry.pending_names(), [PageName.HOSTS, PageName.LOGS])
+
+    def test_page_is_created_once_on_first_request(self):
+        PageName = self.page_names.PageName
+        self.registry.create_eager()
+        self.registry.finish_startup()
+
+        first = self.registry.get(PageName.HOSTS)
+        second = self.registry.get(PageName.HOSTS)
+
+        self.assertIs(first, second)
+        self.assertIs(first.owner, self.owner)
+        self.assertEqual(self.module.HostsPage.instances, 1)
+        self.assertEqual(self.wired, [PageName.HOME, PageName.HOSTS])
+        self.assertIsNone(self.registry.get(PageName.ORCHESTRA))  # not registered
+
+    def test_when_created_runs_now_or_on_creation(self):
+        PageName = self.page_names.PageName
+        self.registry.create_eager()
+        seen = []
+
+        self.registry.when_created(PageName.HOME, lambda page: seen.append(("home", page)))
+        self.registry.when_created(PageName.LOGS, lambda page: seen.append(("logs", page)))
+        self.assertEqual([tag for tag, _ in seen], ["home"])
+
+        logs = self.registry.get(PageName.LOGS)
+        self.assertEqual(seen[-1], ("logs", logs))
+
+        # Callbacks fire once: a second get() does not re-run them.
+        self.registry.get(PageName.LOGS)
+        self.assertEqual(len(seen), 2)
+
+    def test_timing_report_separates_startup_and_on_demand(self):
+        PageName = self.page_names.PageName
+        self.registry.create_eager()
+        self.registry.finish_startup()
+        self.registry.get(PageName.LOGS)
+
+        timings = {t.name: t for t in self.registry.timings}
+        self.assertTrue(timings[PageName.HOME].at_startup)
+        self.assertFalse(timings[PageName.LOGS].at_startup)
+
+        report = self.registry.format_report()
+        self.assertIn("1 из 3", report)
+        self.assertIn("HOME", report)
+        self.assertIn("LOGS", report)
+        self.assertIn("не созданы: 1", report)
+
+    def test_failed_construction_can_be_retried(self):
+        PageName = self.page_names.PageName
+        calls = {"n": 0}
+
+        def construct(cls):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise RuntimeError("boom")
+            return cls(self.owner)
+
+        registry = self.registry_mod.PageRegistry(
+            construct=construct, add_page=lambda *_a: None, specs=self.specs
+        )
+        with self.assertRaises(RuntimeError):
+            registry.get(PageName.HOSTS)
+        self.assertFalse(registry.is_loaded(PageName.HOSTS))
+        self.assertIsNotNone(registry.get(PageName.HOSTS))
+
+    def test_pages_are_not_created_outside_gui_thread(self):
+        PageName = self.page_names.PageName
+        allowed = {"value": False}
+        registry = self.registry_mod.PageRegistry(
+            construct=lambda cls: cls(self.owner),
+            add_page=lambda spec, page: self.stack.append((spec.name, page)),
+            specs=self.specs,
+            can_create=lambda: allowed["value"],
+        )
+
+        with self.assertRaises(RuntimeError):
+            registry.get(PageName.HOSTS)
+        self.assertEqual(self.module.HostsPage.instances, 0)
+        self.assertEqual(self.stack, [])
+
+        allowed["value"] = True
+        page = registry.get(PageName.HOSTS)
+        allowed["value"] = False
+        # An already created page is still returned from any thread.
+        self.assertIs(registry.get(PageName.HOSTS), page)
+
+    def test_default_specs_cover_every_page_name_once(self):
+        PageName = self.page_names.PageName
+        names = [spec.name for spec in self.registry_mod.PAGE_SPECS]
+        self.assertEqual(sorted(names, key=lambda n: n.value), sorted(PageName, key=lambda n: n.value))
+        attrs = [spec.attr for spec in self.registry_mod.PAGE_SPECS]
+        self.assertEqual(len(attrs), len(set(attrs)))
+
+        repo_root = Path(__file__).resolve().parents[1]
+        for spec in self.registry_mod.PAGE_SPECS:
+            module_path = repo_root / Path(*spec.module.split(".")).with_suffix(".py")
+            self.assertTrue(module_path.exists(), spec.module)
+            self.assertIn(f"class {spec.class_name}(", module_path.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+PRESET_TXT = """# Preset: {name}
+# Created: 2025-01-01T00:00:00
+# Modified: 2025-02-02T00:00:00
+# Description: {description}
+
+--lua-init=@lua/zapret-lib.lua
+
+--filter-tcp=443
+--hostlist=youtube.txt
+--lua-desync=multisplit:pos=1,midsld
+"""
+
+
+class PresetRepositoryCacheTests(unittest.TestCase):
+    def setUp(self):
+        log_stub = types.ModuleType("log")
+        log_stub.log = lambda *_a, **_kw: None
+        sys.modules["log"] = log_stub
+
+        self._tmp = tempfile.TemporaryDirectory()
+        config_stub = types.ModuleType("config")
+        config_stub.PROGRAMDATA_PATH = self._tmp.name
+        config_stub.MAIN_DIRECTORY = self._tmp.name
+        config_stub.__path__ = []
+        sys.modules["config"] = config_stub
+
+        self._prev_index = os.environ.get("ZAPRET_INDEXJSON_FOLDER")
+        os.environ["ZAPRET_INDEXJSON_FOLDER"] = str(Path(self._tmp.name) / "json")
+
+        repo_root = Path(__file__).resolve().parents[1]
+        pkg_dir = repo_root / "preset_zapret2"
+        pkg = types.ModuleType("preset_zapret2")
+        pkg.__path__ = [str(pkg_dir)]
+        sys.modules["preset_zapret2"] = pkg
+
+        _load_module("utils.ini_catalog", repo_root / "utils" / "ini_catalog.py")
+        self.catalog = _load_module("preset_zapret2.catalog", pkg_dir / "catalog.py")
+        # Без каталога на диске - не искать его в config/путях разработчика
+        self.catalog._CACHED_PATHS = None
+        self.catalog._candidate_indexjson_dirs = lambda: iter(())
+        self.parser = _load_module("preset_zapret2.txt_preset_parser", pkg_dir / "txt_preset_parser.py")
+        self.repository = _load_module("preset_zapret2.preset_repository", pkg_dir / "preset_repository.py")
+        self.storage = _load_module("preset_zapret2.preset_storage", pkg_dir / "preset_storage.py")
+
+        self.presets_dir = self.storage.get_presets_dir()
+
+    def tearDown(self):
+        if self._prev_index is None:
+            os.environ.pop("ZAPRET_INDEXJSON_FOLDER", None)
+        else:
+            os.environ["ZAPRET_INDEXJSON_FOLDER"] = self._prev_index
+        self._tmp.cleanup()
+
+    def _write(self, name, description="desc"):
+        path = self.presets_dir / f"{name}.txt"
+        path.write_text(PRESET_TXT.format(name=name, description=description), encoding="utf-8")
+        return path
+
+    def _count_parses(self):
+        calls = []
+        original = self.repository.parse_preset_file
+
+        def counting(path):
+            calls.append(Path(path).stem)
+            return original(path)
+
+        self.repository.parse_preset_file = counting
+        self.addCleanup(setattr, self.repository, "parse_preset_file", original)
+        return calls
+
+    def test_headers_do_not_parse_blocks(self):
+        for i in range(3):
+            self._write(f"user{i}", description=f"d{i}")
+        calls = self._count_parses()
+
+        headers = self.storage.list_preset_headers()
+        self.assertEqual([h.file_name for h in headers], ["user0", "user1", "user2"])
+        self.assertEqual(headers[1].description, "d1")
+        self.assertEqual(headers[1].modified, "2025-02-02T00:00:00")
+        self.assertFalse(headers[1].is_builtin)
+        self.assertEqual(calls, [])
+
+        # Повторный вызов - из кэша, тот же объект
+        self.assertIs(self.storage.list_preset_headers()[0], headers[0])
+
+        # Удалённый файл исчезает из списка и из кэша
+        (self.presets_dir / "user2.txt").unlink()
+        self.assertEqual([h.file_name for h in self.storage.list_preset_headers()], ["user0", "user1"])
+        self.assertEqual(self.repository.get_preset_cache_stats()["headers"], 2)
+
+    def test_only_changed_files_are_reparsed(self):
+        self._write("a")
+        path_b = self._write("b")
+        calls = self._count_parses()
+
+        preset = self.storage.load_preset("a")
+        self.assertEqual(preset.categories["youtube"].tcp_args, "--lua-desync=multisplit:pos=1,midsld")
+        self.storage.load_preset("b")
+        self.assertEqual(calls, ["a", "b"])
+
+        # Возвращается новый Preset - изменения не попадают в кэш
+        preset.categories["youtube"].tcp_args = "changed"
+        self.assertEqual(
+            self.storage.load_preset("a").categories["youtube"].tcp_args,
+            "--lua-desync=multisplit:pos=1,midsld",
+        )
+        self.assertEqual(calls, ["a", "b"])
+
+        path_b.write_text(PRESET_TXT.format(name="b", description="new") + "\n", encoding="utf-8")
+        self.assertEqual(self.storage.load_preset("b").description, "new")
+        self.storage.load_preset("a")
+        self.assertEqual(calls, ["a", "b", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
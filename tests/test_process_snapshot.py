@@ -0,0 +1,159 @@
+import importlib.util
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_process_snapshot():
+    repo_root = Path(__file__).resolve().parents[1]
+
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    return _load_module("_process_snapshot_under_test", repo_root / "utils" / "process_snapshot.py")
+
+
+class _FakeTable:
+    """Fake process table with a controllable clock and call counters."""
+
+    def __init__(self, mod, processes):
+        self.mod = mod
+        self.processes = list(processes)
+        self.cmdlines = {}
+        self.now = 100.0
+        self.list_calls = 0
+        self.cmdline_calls = []
+
+    def list_processes(self):
+        self.list_calls += 1
+        return [self.mod.ProcessInfo(pid, name) for pid, name in self.processes]
+
+    def get_cmdline(self, pid):
+        self.cmdline_calls.append(pid)
+        return self.cmdlines.get(pid)
+
+    def clock(self):
+        return self.now
+
+    def service(self, **kwargs):
+        return self.mod.ProcessSnapshotService(self.list_processes, self.get_cmdline, clock=self.clock, **kwargs)
+
+
+class ProcessSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.mod = _load_process_snapshot()
+        self.table = _FakeTable(self.mod, [(10, "explorer.exe"), (42, "WinWS2.exe"), (7, "winws2.exe"),
+                                           (99, "procexp.exe")])
+
+    def test_name_and_pid_indexes(self):
+        snapshot = self.table.service().snapshot()
+        self.assertEqual(snapshot.pids("winws2.exe"), [7, 42])
+        self.assertEqual(snapshot.first_pid("WINWS2.EXE"), 7)
+        self.assertTrue(snapshot.is_running("procexp.exe"))
+        self.assertFalse(snapshot.is_running("winws.exe"))
+        self.assertEqual(snapshot.pids_by_name(["winws.exe", "winws2.exe"]), {"winws2.exe": [7, 42]})
+        self.assertEqual(snapshot.name_of(10), "explorer.exe")
+        self.assertEqual(len(snapshot), 4)
+
+    def test_ttl_cache_and_invalidate(self):
+        service = self.table.service(ttl=0.25)
+        first = service.snapshot()
+        self.table.now += 0.2
+        self.assertIs(service.snapshot(), first)
+        self.assertEqual(self.table.list_calls, 1)
+
+        self.table.now += 0.1
+        self.assertIsNot(service.snapshot(), first)
+        self.assertEqual(self.table.list_calls, 2)
+
+        service.invalidate()
+        service.snapshot()
+        self.assertEqual(self.table.list_calls, 3)
+        service.snapshot(max_age=0)
+        self.assertEqual(self.table.list_calls, 3)  # same clock tick: still fresh
+        service.refresh()
+        self.assertEqual(self.table.list_calls, 4)
+
+    def test_cmdline_is_fetched_lazily_once(self):
+        self.table.cmdlines = {42: ["winws2.exe", "@preset.txt"]}
+        snapshot = self.table.service().snapshot()
+        self.assertEqual(self.table.cmdline_calls, [])
+
+        self.assertEqual(snapshot.cmdline(42), ["winws2.exe", "@preset.txt"])
+        self.assertEqual(snapshot.cmdline(42), ["winws2.exe", "@preset.txt"])
+        self.assertIsNone(snapshot.cmdline(7))
+        self.assertIsNone(snapshot.cmdline(12345))  # not in the snapshot: no lookup
+        self.assertEqual(self.table.cmdline_calls, [42, 7])
+
+    def test_subscribers_are_notified_only_on_pid_changes(self):
+        service = self.table.service(ttl=0)
+        events = []
+        token = service.subscribe(["winws.exe", "winws2.exe"], events.append)
+
+        service.refresh()
+        self.table.processes.append((500, "notepad.exe"))
+        service.refresh()  # unrelated process started
+        self.assertEqual(events, [{"winws2.exe": [7, 42]}])
+
+        self.table.processes = [p for p in self.table.processes if p[0] != 7]
+        service.refresh()
+        self.table.processes = [p for p in self.table.processes if "winws" not in p[1].lower()]
+        service.refresh()
+        self.assertEqual(events[1:], [{"winws2.exe": [42]}, {}])
+
+        service.unsubscribe(token)
+        self.table.processes.append((8, "winws.exe"))
+        service.refresh()
+        self.assertEqual(len(events), 3)
+
+    def test_failing_subscriber_does_not_break_snapshot(self):
+        service = self.table.service()
+
+        def broken(_details):
+            raise RuntimeError("boom")
+
+        seen = []
+        service.subscribe(["winws2.exe"], broken)
+        service.subscribe(["winws2.exe"], seen.append)
+        self.assertEqual(service.snapshot().first_pid("winws2.exe"), 7)
+        self.assertEqual(seen, [{"winws2.exe": [7, 42]}])
+
+    def test_concurrent_callers_share_one_scan(self):
+        gate = threading.Event()
+        calls = []
+
+        def slow_list():
+            calls.append(1)
+            gate.wait(2)
+            return [self.mod.ProcessInfo(1, "winws.exe")]
+
+        service = self.mod.ProcessSnapshotService(slow_list, lambda _pid: None, ttl=5)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.snapshot())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        gate.set()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
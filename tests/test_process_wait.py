@@ -0,0 +1,137 @@
+import importlib.util
+import subprocess
+import sys
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_process_wait():
+    repo_root = Path(__file__).resolve().parents[1]
+
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    return _load_module("_process_wait_under_test", repo_root / "utils" / "process_wait.py")
+
+
+def _spawn(code: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ProcessWaitTests(unittest.TestCase):
+    def setUp(self):
+        self.mod = _load_process_wait()
+
+    def test_wait_for_exit_returns_immediately_without_processes(self):
+        waited = []
+        ok = self.mod.wait_for_exit(list_pids=lambda _names: [], wait_pids=lambda pids, t: waited.append(pids) or pids)
+        self.assertTrue(ok)
+        self.assertEqual(waited, [])
+
+    def test_wait_for_exit_reports_survivors(self):
+        calls = []
+
+        def wait_pids(pids, timeout):
+            calls.append((list(pids), timeout))
+            return [pid for pid in pids if pid == 42]
+
+        names_seen = []
+
+        def list_pids(names):
+            names_seen.append(tuple(names))
+            return [7, 42]
+
+        self.assertFalse(self.mod.wait_for_exit(timeout=1.5, list_pids=list_pids, wait_pids=wait_pids))
+        self.assertEqual(calls, [([7, 42], 1.5)])
+        self.assertEqual(names_seen, [self.mod.WINWS_PROCESS_NAMES])
+
+        self.assertTrue(self.mod.wait_for_exit(list_pids=list_pids, wait_pids=lambda pids, t: []))
+
+    def test_wait_for_exit_treats_wait_errors_as_alive(self):
+        def broken(_pids, _timeout):
+            raise OSError("access denied")
+
+        self.assertFalse(self.mod.wait_for_exit(list_pids=lambda _n: [1], wait_pids=broken))
+
+    def test_wait_popen_exit_returns_as_soon_as_child_exits(self):
+        proc = _spawn("import time; time.sleep(0.1)")
+        started = time.monotonic()
+        self.assertTrue(self.mod.wait_popen_exit(proc, timeout=5))
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertTrue(self.mod.wait_popen_exit(None, timeout=5))
+
+    def test_wait_popen_exit_times_out_for_running_child(self):
+        proc = _spawn("import time; time.sleep(30)")
+        try:
+            self.assertFalse(self.mod.wait_popen_exit(proc, timeout=0.05))
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_wait_startup_detects_crash_before_grace(self):
+        proc = _spawn("import sys; sys.exit(3)")
+        self.assertEqual(self.mod.wait_startup(proc, grace=5), 3)
+
+        proc = _spawn("import time; time.sleep(30)")
+        try:
+            self.assertIsNone(self.mod.wait_startup(proc, grace=0.05))
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_wait_for_start_polls_until_process_appears(self):
+        fake = _FakeClock()
+        answers = iter([[], [], [5]])
+        ok = self.mod.wait_for_start(timeout=1.0, interval=0.05, list_pids=lambda _n: next(answers),
+                                     clock=fake.clock, sleep=fake.sleep)
+        self.assertTrue(ok)
+        self.assertEqual(fake.sleeps, [0.05, 0.05])
+
+        fake = _FakeClock()
+        ok = self.mod.wait_for_start(timeout=0.12, interval=0.05, list_pids=lambda _n: [],
+                                     clock=fake.clock, sleep=fake.sleep)
+        self.assertFalse(ok)
+        self.assertAlmostEqual(sum(fake.sleeps), 0.12)
+
+    def test_switch_latency_stages(self):
+        fake = _FakeClock()
+        latency = self.mod.SwitchLatency("Переключение стратегии", clock=fake.clock)
+        fake.now += 0.120
+        latency.mark("остановка")
+        fake.now += 0.030
+        latency.mark("запуск")
+
+        self.assertAlmostEqual(latency.total_ms, 150.0)
+        self.assertEqual([stage for stage, _ms in latency.stages], ["остановка", "запуск"])
+        self.assertEqual(latency.summary(), "Переключение стратегии: 150 мс (остановка 120, запуск 30)")
+        self.assertTrue(latency.report(False).endswith("- неудачно"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+import hashlib
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_download():
+    repo_root = Path(__file__).resolve().parents[1]
+
+    log_stub = types.ModuleType("log")
+    log_stub.log = lambda *_a, **_kw: None
+    sys.modules["log"] = log_stub
+
+    # Stub package so the import works without updater/__init__ (Qt/requests deps).
+    pkg = types.ModuleType("updater")
+    pkg.__path__ = [str(repo_root / "updater")]
+    sys.modules["updater"] = pkg
+
+    return _load_module("updater.download", repo_root / "updater" / "download.py")
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+class _FileServer:
+    """Local HTTP server with Range support that can drop connections mid-transfer."""
+
+    def __init__(self, payload: bytes, drop_after=None, drops=0, ranges=True, down_after_drops=False):
+        server = self
+        self.payload = payload
+        self.drop_after = drop_after  # bytes sent before the connection is cut
+        self.drops = drops            # how many responses get cut
+        self.ranges = ranges
+        self.down = False                      # answer 503 (mirror went away)
+        self.down_after_drops = down_after_drops
+        self.bytes_sent = 0
+        self.requests = []
+        self.lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                data = server.payload
+                start, end = 0, len(data) - 1
+                range_header = self.headers.get("Range")
+                with server.lock:
+                    server.requests.append(range_header)
+                    down = server.down
+                    cut = server.drops > 0
+                    if cut:
+                        server.drops -= 1
+                        server.down = server.down_after_drops and server.drops == 0
+                if down:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                if range_header and server.ranges:
+                    spec = range_header.split("=", 1)[1]
+                    first, _, last = spec.partition("-")
+                    start = int(first)
+                    end = int(last) if last else len(data) - 1
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                else:
+                    self.send_response(200)
+                body = data[start:end + 1]
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+
+                if cut and server.drop_after is not None:
+                    body = body[:server.drop_after]
+                    self.close_connection = True
+                self.wfile.write(body)
+                with server.lock:
+                    server.bytes_sent += len(body)
+
+            def log_message(self, *_args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/download/Zapret2Setup.exe"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class DownloadPlanningTests(unittest.TestCase):
+    def setUp(self):
+        self.mod = _load_download()
+
+    def test_parse_content_range(self):
+        self.assertEqual(self.mod.parse_content_range("bytes 100-199/1000"), (100, 199, 1000))
+        self.assertEqual(self.mod.parse_content_range("bytes 0-9/*"), (0, 9, None))
+        self.assertIsNone(self.mod.parse_content_range("items 0-9/10"))
+        self.assertIsNone(self.mod.parse_content_range(None))
+
+    def test_plan_segments_covers_file_without_gaps(self):
+        for total in (1, 999, 1000, 1001, 12345):
+            segments = self.mod.plan_segments(total, 4, min_size=100)
+            self.assertEqual(segments[0][0], 0)
+            self.assertEqual(segments[-1][1], total)
+            for left, right in zip(segments, segments[1:]):
+                self.assertEqual(left[1], right[0])
+        self.assertEqual(len(self.mod.plan_segments(150, 4, min_size=100)), 1)
+        self.assertEqual(self.mod.plan_segments(None, 4), [[0, None, 0]])
+
+
+@unittest.skipUnless(_has_module("requests"), "requests is not installed")
+class ResumableDownloadTests(unittest.TestCase):
+    def setUp(self):
+        self.mod = _load_download()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, "Zapret2Setup.exe")
+        self.payload = random.Random(1).randbytes(3 * 1024 * 1024 + 123)
+        self.sha = hashlib.sha256(self.payload).hexdigest()
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+        self.tmp.cleanup()
+
+    def _server(self, **kwargs):
+        server = _FileServer(kwargs.pop("payload", self.payload), **kwargs)
+        self.servers.append(server)
+        return server
+
+    def _download(self, mirrors, **kwargs):
+        kwargs.setdefault("retry_delay", 0)
+        kwargs.setdefault("timeout", (2, 5))
+        return self.mod.download_resumable([(m.url, False) for m in mirrors], self.dest, **kwargs)
+
+    def _read_dest(self):
+        with open(self.dest, "rb") as f:
+            return f.read()
+
+    def test_resumes_after_dropped_connections(self):
+        server = self._server(drop_after=1024 * 1024, drops=2)
+        digest = self._download([server], expected_sha256=self.sha)
+
+        self.assertEqual(digest, self.sha)
+        self.assertEqual(self._read_dest(), self.payload)
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+        # Restarting from zero would have sent at least 2 MB more.
+        self.assertEqual(server.bytes_sent, len(self.payload))
+        self.assertEqual(server.requests[1], f"bytes=1048576-{len(self.payload) - 1}")
+
+    def test_partial_file_survives_failed_call(self):
+        server = self._server(drop_after=1024 * 1024, drops=1, down_after_drops=True)
+        with self.assertRaises(self.mod.DownloadError):
+            self._download([server], max_retries=2, expected_sha256=self.sha)
+        self.assertEqual(os.path.getsize(self.dest + ".part"), len(self.payload))
+
+        server.down = False
+
+        download = self.mod.ResumableDownload([(server.url, False)], self.dest, expected_sha256=self.sha,
+                                              retry_delay=0)
+        self.assertEqual(download.run(), self.sha)
+        self.assertEqual(download.resumed_from, 1024 * 1024)
+        self.assertEqual(server.bytes_sent, len(self.payload))
+
+    def test_segments_are_spread_across_mirrors(self):
+        self.mod.SEGMENT_MIN_SIZE = 512 * 1024
+        first = self._server(drop_after=200 * 1024, drops=1)
+        second = self._server()
+        progress = []
+        digest = self._download([first, second], segments=4, expected_sha256=self.sha,
+                                on_progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(digest, self.sha)
+        self.assertEqual(self._read_dest(), self.payload)
+        self.assertTrue(first.requests and second.requests)
+        self.assertGreater(len(first.requests) + len(second.requests), 4)  # probe + 3 segments + resume
+        self.assertEqual(progress[-1], (len(self.payload), len(self.payload)))
+
+    def test_mirror_with_other_file_is_not_mixed_in(self):
+        self.mod.SEGMENT_MIN_SIZE = 512 * 1024
+        good = self._server()
+        stale = self._server(payload=self.payload[:-1000])
+        digest = self._download([good, stale], segments=4, expected_sha256=self.sha)
+        self.assertEqual(digest, self.sha)
+        self.assertEqual(self._read_dest(), self.payload)
+
+    def test_without_checksum_all_ranges_come_from_one_mirror(self):
+        self.mod.SEGMENT_MIN_SIZE = 512 * 1024
+        first = self._server()
+        other = self._server(payload=bytes(len(self.payload)))  # same size, different file
+        digest = self._download([first, other], segments=4)
+
+        self.assertEqual(digest, self.sha)
+        self.assertEqual(self._read_dest(), self.payload)
+        self.assertEqual(other.requests, [])
+        self.assertGreater(len(first.requests), 1)
+
+    def test_checksum_mismatch_discards_partial_file(self):
+        server = self._server()
+        with self.assertRaises(self.mod.ChecksumMismatch):
+            self._download([server], expected_sha256="0" * 64)
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+        self.assertFalse(os.path.exists(self.dest))
+
+    def test_server_without_range_restarts_from_zero(self):
+        server = self._server(drop_after=1024 * 1024, drops=1, ranges=False)
+        digest = self._download([server])
+        self.assertEqual(digest, self.sha)
+        self.assertEqual(self._read_dest(), self.payload)
+
+    def test_completed_download_is_not_fetched_again(self):
+        server = self._server()
+        self._download([server], expected_sha256=self.sha)
+        requests_before = len(server.requests)
+
+        self.assertEqual(self._download([server], expected_sha256=self.sha), self.sha)
+        self.assertEqual(len(server.requests), requests_before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import importlib.util
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+class _StandIn:
+    """Local HTTPS server answering /api/all_versions.json after a delay."""
+
+    def __init__(self, cert_file, key_file, delay=0.0, status=200, version="1.0.0"):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(stand_in.delay)
+                body = json.dumps({"stable": {"version": stand_in.version}}).encode()
+                self.send_response(stand_in.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args):
+                pass
+
+        self.delay = delay
+        self.status = status
+        self.version = version
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def server(self, server_id):
+        return {"id": server_id, "name": server_id, "host": "127.0.0.1",
+                "https_port": self.httpd.server_address[1]}
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required for the HTTPS stand-ins")
+class ServerProbeTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        repo_root = Path(__file__).resolve().parents[1]
+        cls.mod = _load_module("_server_probe_under_test", repo_root / "updater" / "server_probe.py")
+        cls.tmp = tempfile.mkdtemp()
+        cls.cert = os.path.join(cls.tmp, "cert.pem")
+        cls.key = os.path.join(cls.tmp, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=127.0.0.1", "-keyout", cls.key, "-out", cls.cert],
+            check=True, capture_output=True,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def setUp(self):
+        self.stand_ins = []
+
+    def tearDown(self):
+        for stand_in in self.stand_ins:
+            stand_in.close()
+
+    def _stand_in(self, **kwargs):
+        stand_in = _StandIn(self.cert, self.key, **kwargs)
+        self.stand_ins.append(stand_in)
+        return stand_in
+
+    def _urllib_probe(self, server):
+        # Same contract as fetch_all_versions, via the standard library.
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(self.mod.all_versions_url(server), context=context, timeout=5) as resp:
+                data = json.loads(resp.read())
+            return self.mod.ProbeResult(server, True, time.perf_counter() - start, data=data)
+        except Exception as e:
+            return self.mod.ProbeResult(server, False, time.perf_counter() - start, error=str(e)[:40])
+
+    def test_results_stream_in_latency_order_and_run_concurrently(self):
+        slow = self._stand_in(delay=0.6).server("slow")
+        fast = self._stand_in(delay=0.05).server("fast")
+        broken = self._stand_in(delay=0.3, status=500).server("broken")
+
+        start = time.monotonic()
+        results = list(self.mod.probe_servers([slow, broken, fast], self._urllib_probe, deadline=5))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual([r.server["id"] for r in results], ["fast", "broken", "slow"])
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertEqual(results[0].data["stable"]["version"], "1.0.0")
+        self.assertLess(results[0].response_time, results[2].response_time)
+        # Sequential probing would take at least 0.95 s.
+        self.assertLess(elapsed, 0.9)
+
+    def test_deadline_reports_timeout_without_waiting_for_server(self):
+        hung = self._stand_in(delay=1.5).server("hung")
+        ok = self._stand_in().server("ok")
+
+        start = time.monotonic()
+        results = list(self.mod.probe_servers([hung, ok], self._urllib_probe, deadline=0.4))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual([r.server["id"] for r in results], ["ok", "hung"])
+        self.assertEqual(results[1].error, "Таймаут")
+        self.assertLess(elapsed, 1.2)
+
+    def test_bounded_pool_still_probes_every_server(self):
+        servers = [self._stand_in(delay=0.05).server(f"s{i}") for i in range(5)]
+        results = list(self.mod.probe_servers(servers, self._urllib_probe, max_workers=2, deadline=5))
+        self.assertEqual(sorted(r.server["id"] for r in results), [f"s{i}" for i in range(5)])
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_probe_exception_becomes_error_result(self):
+        def probe(_server):
+            raise RuntimeError("boom")
+
+        results = list(self.mod.probe_servers([{"id": "x"}], probe))
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].error, "boom")
+
+    @unittest.skipUnless(_has_module("requests"), "requests is not installed")
+    def test_fetch_all_versions_reuses_pooled_session(self):
+        server = self._stand_in(version="2.0.0").server("vps")
+        session = self.mod.get_probe_session()
+        self.assertIs(session, self.mod.get_probe_session())
+
+        first = self.mod.fetch_all_versions(server, verify=False)
+        second = self.mod.fetch_all_versions(server, verify=False)
+        self.assertTrue(first.ok and second.ok)
+        self.assertEqual(second.data["stable"]["version"], "2.0.0")
+
+        failing = self._stand_in(status=503).server("down")
+        result = self.mod.fetch_all_versions(failing, verify=False)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.error, "HTTP 503")
+
+
+if __name__ == "__main__":
+    unittest.main()
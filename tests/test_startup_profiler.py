@@ -0,0 +1,158 @@
+import builtins
+import importlib
+import importlib.util
+import json
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_profiler():
+    repo_root = Path(__file__).resolve().parents[1]
+
+    log_stub = types.ModuleType("log")
+    log_stub.messages = []
+    log_stub.log = lambda msg, level="INFO": log_stub.messages.append((level, msg))
+    sys.modules["log"] = log_stub
+
+    pkg = types.ModuleType("startup")
+    pkg.__path__ = [str(repo_root / "startup")]
+    sys.modules["startup"] = pkg
+
+    return _load_module("startup.profiler", repo_root / "startup" / "profiler.py"), log_stub
+
+
+class StartupProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self.mod, self.log_stub = _load_profiler()
+        self.profiler = self.mod.StartupProfiler()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_import = builtins.__import__
+
+    def tearDown(self):
+        self.profiler.uninstall_import_hook()
+        builtins.__import__ = self.original_import
+        self.tmp.cleanup()
+
+    def test_configure_parses_arguments_and_environment(self):
+        p = self.mod.StartupProfiler()
+        self.assertFalse(p.configure(["app.exe", "--tray"], {}))
+        self.assertIsNone(p.trace_path)
+
+        p = self.mod.StartupProfiler()
+        self.assertTrue(p.configure(["app.exe", "--profile-startup"], {}))
+        self.assertEqual(p.trace_path, self.mod.DEFAULT_TRACE_FILE)
+        self.assertFalse(p.exit_after_init)
+        p.uninstall_import_hook()
+
+        p = self.mod.StartupProfiler()
+        p.configure(["app.exe", "--profile-startup=out.json", "--profile-startup-exit"], {})
+        self.assertEqual(p.trace_path, "out.json")
+        self.assertTrue(p.exit_after_init)
+        p.uninstall_import_hook()
+
+        p = self.mod.StartupProfiler()
+        p.configure(["app.exe"], {self.mod.PROFILE_ENV: "env.json"})
+        self.assertEqual(p.trace_path, "env.json")
+        p.uninstall_import_hook()
+
+    def test_span_and_wrap_record_events(self):
+        with self.profiler.span("build_ui", "phase"):
+            pass
+        task = self.profiler.wrap(lambda: 42, "_init_tray", "init")
+        self.assertEqual(task(), 42)
+
+        events = {e["name"]: e for e in self.profiler.events()}
+        self.assertEqual(events["build_ui"]["cat"], "phase")
+        self.assertEqual(events["build_ui"]["ph"], "X")
+        self.assertGreaterEqual(events["build_ui"]["dur"], 0)
+        self.assertEqual(events["_init_tray"]["cat"], "init")
+        self.assertIn("queued_ms", events["_init_tray"]["args"])
+
+    def test_import_hook_records_new_modules_only(self):
+        module_name = "_startup_profiler_probe"
+        Path(self.tmp.name, module_name + ".py").write_text(
+            "import time\ntime.sleep(0.01)\n", encoding="utf-8"
+        )
+        sys.path.insert(0, self.tmp.name)
+        try:
+            self.profiler.install_import_hook()
+            importlib.import_module(module_name)  # does not go through __import__
+            sys.modules.pop(module_name, None)
+            __import__(module_name)
+            __import__(module_name)  # already loaded: not recorded again
+            self.profiler.uninstall_import_hook()
+        finally:
+            sys.path.remove(self.tmp.name)
+            sys.modules.pop(module_name, None)
+
+        imports = [e for e in self.profiler.events() if e["cat"] == "import"]
+        self.assertEqual([e["name"] for e in imports], [module_name])
+        self.assertGreaterEqual(imports[0]["dur"], 10_000)
+        self.assertIs(builtins.__import__, self.original_import)
+
+    def test_chrome_trace_export(self):
+        with self.profiler.span("QApplication()", "phase"):
+            pass
+        self.profiler.instant("window_shown")
+        path = Path(self.tmp.name, "sub", "trace.json")
+        self.profiler.export_chrome_trace(str(path))
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(data["displayTimeUnit"], "ms")
+        phases = {e["ph"] for e in data["traceEvents"]}
+        self.assertTrue({"M", "X", "i"} <= phases)
+        for event in data["traceEvents"]:
+            self.assertIn("pid", event)
+            self.assertIn("tid", event)
+            if event["ph"] == "X":
+                self.assertIn("ts", event)
+                self.assertIn("dur", event)
+
+    def test_finish_exports_reports_and_stops_recording(self):
+        trace = Path(self.tmp.name, "trace.json")
+        self.profiler.enable(str(trace), track_imports=False)
+        results = []
+        self.profiler.on_finished(results.append)
+
+        with self.profiler.span("build_ui", "phase"):
+            pass
+        self.profiler.finish(ok=False, reason="init_incomplete")
+        self.profiler.finish(ok=True)  # second call is ignored
+
+        self.assertEqual(results, [False])
+        self.assertTrue(trace.exists())
+        names = [e["name"] for e in self.profiler.events()]
+        self.assertIn("init_incomplete", names)
+        self.assertTrue(any("build_ui" in msg for _, msg in self.log_stub.messages))
+
+        count = len(self.profiler.events())
+        with self.profiler.span("late", "phase"):
+            pass
+        self.assertEqual(len(self.profiler.events()), count)
+
+    def test_report_groups_by_category(self):
+        t = self.profiler.now()
+        self.profiler.record("ui.pages.hosts_page", "import", t, t + 0.020)
+        self.profiler.record("HOME", "page", t, t + 0.005)
+        self.profiler.record("HOME", "page", t, t + 0.005)
+        report = self.profiler.format_report()
+        self.assertIn("импорты", report)
+        self.assertIn("ui.pages.hosts_page", report)
+        self.assertAlmostEqual(self.profiler.totals("page")["HOME"], 10.0, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
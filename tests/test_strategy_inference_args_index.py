@@ -0,0 +1,101 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class StrategyInferenceArgsIndexTests(unittest.TestCase):
+    def setUp(self):
+        repo_root = Path(__file__).resolve().parents[1]
+        pkg_dir = repo_root / "preset_zapret2"
+
+        pkg = types.ModuleType("preset_zapret2")
+        pkg.__path__ = [str(pkg_dir)]
+        sys.modules["preset_zapret2"] = pkg
+
+        self._tmp = tempfile.TemporaryDirectory()
+        indexjson = Path(self._tmp.name) / "json"
+        self.builtin_dir = indexjson / "strategies" / "builtin"
+        self.builtin_dir.mkdir(parents=True, exist_ok=True)
+        (self.builtin_dir / "categories.txt").write_text(
+            "[youtube]\nstrategy_type = tcp\n\n[discord]\nstrategy_type = tcp\n\n[quic]\nstrategy_type = udp\n",
+            encoding="utf-8",
+        )
+        (self.builtin_dir / "tcp.txt").write_text(
+            "[split]\n--lua-desync=multisplit:pos=1\n--lua-desync=fake:blob=tls7\n\n"
+            "[split_dup]\n--lua-desync=fake:blob=tls7\n--lua-desync=multisplit:pos=1\n\n"
+            "[disorder]\n--lua-desync=disorder:pos=1\n",
+            encoding="utf-8",
+        )
+        (self.builtin_dir / "udp.txt").write_text(
+            "[quic_fake]\n--lua-desync=fake:blob=quic1\n",
+            encoding="utf-8",
+        )
+
+        self._prev_index = os.environ.get("ZAPRET_INDEXJSON_FOLDER")
+        os.environ["ZAPRET_INDEXJSON_FOLDER"] = str(indexjson)
+
+        _load_module("utils.ini_catalog", repo_root / "utils" / "ini_catalog.py")
+        self.catalog = _load_module("preset_zapret2.catalog", pkg_dir / "catalog.py")
+        self.inference = _load_module("preset_zapret2.strategy_inference", pkg_dir / "strategy_inference.py")
+
+    def tearDown(self):
+        if self._prev_index is None:
+            os.environ.pop("ZAPRET_INDEXJSON_FOLDER", None)
+        else:
+            os.environ["ZAPRET_INDEXJSON_FOLDER"] = self._prev_index
+        self._tmp.cleanup()
+
+    def test_batch_uses_index_built_once(self):
+        inference = self.inference
+        calls = []
+        original = inference.normalize_args
+
+        def counting(args):
+            calls.append(args)
+            return original(args)
+
+        inference.normalize_args = counting
+
+        presets = {
+            "youtube": {"tcp_args": "--LUA-desync=fake:blob=tls7\n  --lua-desync=multisplit:pos=1"},
+            "discord": {"tcp_args": "--lua-desync=disorder:pos=1"},
+            "quic": {"udp_args": "--lua-desync=fake:blob=quic1"},
+            "unknown": {},
+        }
+        result = inference.infer_strategy_ids_batch(presets)
+        # Первая стратегия с одинаковыми args побеждает
+        self.assertEqual(result, {"youtube": "split", "discord": "disorder", "quic": "quic_fake", "unknown": "none"})
+
+        indexed = len(calls)
+        inference.infer_strategy_ids_batch(presets)
+        # Повторный вызов нормализует только входные args (3 категории)
+        self.assertEqual(len(calls) - indexed, 3)
+
+    def test_index_rebuilt_when_catalog_changes(self):
+        inference = self.inference
+        self.assertEqual(inference.infer_strategy_id_from_args("youtube", "--lua-desync=new:pos=2"), "custom")
+
+        tcp = self.builtin_dir / "tcp.txt"
+        tcp.write_text(tcp.read_text(encoding="utf-8") + "\n[new_one]\n--lua-desync=new:pos=2\n", encoding="utf-8")
+        stat = tcp.stat()
+        os.utime(tcp, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(inference.infer_strategy_id_from_args("youtube", "--lua-desync=new:pos=2"), "new_one")
+
+
+if __name__ == "__main__":
+    unittest.main()
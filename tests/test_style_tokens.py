@@ -0,0 +1,112 @@
+import importlib.util
+import re
+import sys
+import unittest
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeStyle:
+    def __init__(self):
+        self.calls = []
+
+    def unpolish(self, widget):
+        self.calls.append(("unpolish", widget))
+
+    def polish(self, widget):
+        self.calls.append(("polish", widget))
+
+
+class _FakeWidget:
+    def __init__(self):
+        self._props = {}
+        self._style = _FakeStyle()
+        self.updates = 0
+
+    def property(self, name):
+        return self._props.get(name)
+
+    def setProperty(self, name, value):
+        self._props[name] = value
+
+    def style(self):
+        return self._style
+
+    def update(self):
+        self.updates += 1
+
+
+class StyleTokensTests(unittest.TestCase):
+    def setUp(self):
+        repo_root = Path(__file__).resolve().parents[1]
+        self.mod = _load_module("_style_tokens_under_test", repo_root / "ui" / "style_tokens.py")
+
+    def test_every_component_compiles(self):
+        for name in self.mod.COMPONENT_STYLES:
+            css = self.mod.component_stylesheet(name)
+            self.assertNotIn("$", css, name)
+            self.assertEqual(css.count("{"), css.count("}"), name)
+            self.assertIn(f"#{self.mod.OBJECT_NAMES[name]}", css, name)
+
+    def test_state_selectors_follow_hover(self):
+        # Equal specificity: the state rule must come after :hover to win.
+        css = self.mod.component_stylesheet("nav_button")
+        self.assertLess(css.index("#navButton:hover"), css.index('#navButton[selected="true"]'))
+        css = self.mod.component_stylesheet("list_editor")
+        self.assertLess(css.index("#listEditor:focus"), css.index('#listEditor[invalid="true"]'))
+
+    def test_compiled_css_is_cached_and_overridable(self):
+        first = self.mod.component_stylesheet("preset_card")
+        self.assertIs(first, self.mod.component_stylesheet("preset_card"))
+
+        custom = self.mod.component_stylesheet("preset_card", {"accent_rgb": "1, 2, 3"})
+        self.assertIn("rgba(1, 2, 3, 0.08)", custom)
+        self.assertNotIn("rgba(1, 2, 3", first)
+
+        full = self.mod.build_component_stylesheet()
+        for name in self.mod.COMPONENT_STYLES:
+            self.assertIn(self.mod.component_stylesheet(name), full)
+
+    def test_unknown_token_fails_fast(self):
+        self.mod.COMPONENT_STYLES["_broken"] = "QWidget#x { color: $no_such_token; }"
+        try:
+            with self.assertRaises(KeyError):
+                self.mod.component_stylesheet("_broken")
+        finally:
+            del self.mod.COMPONENT_STYLES["_broken"]
+
+    def test_set_style_state_repolishes_only_on_change(self):
+        widget = _FakeWidget()
+        self.assertTrue(self.mod.set_style_state(widget, selected=True))
+        self.assertEqual([c for c, _ in widget.style().calls], ["unpolish", "polish"])
+        self.assertEqual(widget.updates, 1)
+
+        self.assertFalse(self.mod.set_style_state(widget, selected=True))
+        self.assertEqual(len(widget.style().calls), 2)
+
+        self.assertTrue(self.mod.set_style_state(widget, selected=True, collapsed=True))
+        self.assertEqual(len(widget.style().calls), 4)
+        self.assertEqual(self.mod.stats["repolish"], 2)
+
+    def test_migrated_widgets_use_known_components(self):
+        repo_root = Path(__file__).resolve().parents[1]
+        for rel in ("ui/sidebar.py", "ui/pages/dpi_settings_page.py", "ui/pages/appearance_page.py",
+                    "ui/pages/presets_page.py", "ui/pages/custom_ipset_page.py"):
+            source = (repo_root / rel).read_text(encoding="utf-8")
+            for component in re.findall(r'apply_component_style\([^,]+, "(\w+)"', source):
+                self.assertIn(component, self.mod.COMPONENT_STYLES, rel)
+        ipset = (repo_root / "ui/pages/custom_ipset_page.py").read_text(encoding="utf-8")
+        self.assertNotIn("_error_style", ipset)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot create spec for {name} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def _load_tgram(test: unittest.TestCase, *names: str):
+    """Loads tgram submodules by path; sys.modules is restored after the test."""
+    repo_root = Path(__file__).resolve().parents[1]
+
+    keys = ["tgram"] + [f"tgram.{name}" for name in names]
+    saved = {key: sys.modules.get(key) for key in keys}
+
+    def _restore():
+        for key, module in saved.items():
+            if module is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = module
+
+    test.addCleanup(_restore)
+
+    # Stub package so the import works without tgram/__init__ (Qt/winreg deps).
+    pkg = types.ModuleType("tgram")
+    pkg.__path__ = [str(repo_root / "tgram")]
+    sys.modules["tgram"] = pkg
+
+    return [_load_module(f"tgram.{name}", repo_root / "tgram" / f"{name}.py") for name in names]
+
+
+class _UploadStandIn(BaseHTTPRequestHandler):
+    """Local stand-in for the Bot API sendDocument endpoint."""
+
+    uploads = []
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        type(self).uploads.append((self.path, body))
+        payload = b'{"ok": true, "result": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args):
+        pass
+
+
+def _append(path: Path, text: str):
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+class LogTailSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        (self.log_tail,) = _load_tgram(self, "log_tail")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "zapret_log.txt"
+        self.path.write_text("\ufeff" + "".join(f"[INFO] line {i}\n" for i in range(5000)), encoding="utf-8")
+
+    def test_partial_line_is_completed_on_next_tick(self):
+        snapshot = self.log_tail.LogTailSnapshot(self.path)
+        snapshot.update(first_time=True)
+
+        _append(self.path, "[INFO] half")
+        # No complete line yet: nothing to upload ("+0 lines" caption)
+        self.assertEqual(snapshot.update(), (False, 0, []))
+        _append(self.path, " done\n")
+        self.assertEqual(snapshot.update(), (True, 1, ["[INFO] half done"]))
+
+    def test_truncated_file_is_read_from_start(self):
+        snapshot = self.log_tail.LogTailSnapshot(self.path)
+        snapshot.update(first_time=True)
+
+        self.path.write_text("[INFO] after truncate\n", encoding="utf-8")
+
+        self.assertEqual(snapshot.update(), (True, 1, ["[INFO] after truncate"]))
+        self.assertEqual(snapshot.rotations, 1)
+
+    def test_truncated_and_regrown_file_is_detected_by_anchor(self):
+        self.path.write_text("[INFO] a\n[INFO] b\n", encoding="utf-8")
+        snapshot = self.log_tail.LogTailSnapshot(self.path)
+        snapshot.update(first_time=True)
+
+        # Same inode, rewritten with different content longer than the old offset.
+        self.path.write_text("[WARNING] x\n[WARNING] y\n[WARNING] z\n", encoding="utf-8")
+
+        changed, added, lines = snapshot.update()
+        self.assertTrue(changed)
+        self.assertEqual(lines, ["[WARNING] x", "[WARNING] y", "[WARNING] z"])
+        self.assertEqual(snapshot.rotations, 1)
+
+
+@unittest.skipUnless(_has_module("requests"), "requests is not installed")
+class LogTailUploadTests(unittest.TestCase):
+    """Snapshot + the real tgram sendDocument upload, sent to a local stand-in server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _UploadStandIn)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.api = f"http://127.0.0.1:{cls.server.server_address[1]}/botTEST"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.log_tail, self.tg_log_bot = _load_tgram(self, "log_tail", "tg_log_bot")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "zapret_log.txt"
+        self.path.write_text("\ufeff" + "".join(f"[INFO] line {i}\n" for i in range(5000)), encoding="utf-8")
+        _UploadStandIn.uploads = []
+
+        # Point the bot API at the stand-in; the HTTP request itself goes through requests.
+        for patcher in (
+            mock.patch.object(self.tg_log_bot, "_get_log_api", return_value=self.api),
+            mock.patch.object(self.tg_log_bot, "_token_cache", "TEST"),
+            mock.patch.dict(os.environ, {"NO_PROXY": "127.0.0.1", "no_proxy": "127.0.0.1"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _tick(self, snapshot):
+        """Same flow as FullLogDaemon._tick: snapshot, then upload only when changed."""
+        changed, added, added_lines = snapshot.update()
+        if changed:
+            errors = [ln for ln in added_lines if "[ERROR]" in ln]
+            caption = f"added {added}\n" + "\n".join(errors[-3:])
+            self.assertEqual(self.tg_log_bot.send_log_file(self.path, caption, topic_id=1), (True, None))
+        return changed, added, added_lines
+
+    def test_only_appended_tail_is_read(self):
+        snapshot = self.log_tail.LogTailSnapshot(self.path)
+        snapshot.update(first_time=True)
+        size = self.path.stat().st_size
+        self.assertLessEqual(snapshot.bytes_read, self.log_tail.TAIL_PROBE_SIZE)
+
+        self.assertEqual(self._tick(snapshot), (False, 0, []))
+        self.assertEqual(_UploadStandIn.uploads, [])
+
+        before = snapshot.bytes_read
+        _append(self.path, "[INFO] next\n[ERROR] boom\n")
+        changed, added, lines = self._tick(snapshot)
+
+        self.assertTrue(changed)
+        self.assertEqual(added, 2)
+        self.assertEqual(lines, ["[INFO] next", "[ERROR] boom"])
+        # Appended bytes plus the small anchor probe, not the whole file.
+        self.assertLess(snapshot.bytes_read - before, 200)
+        self.assertLess(snapshot.bytes_read, size)
+
+        self.assertEqual(len(_UploadStandIn.uploads), 1)
+        path, body = _UploadStandIn.uploads[0]
+        self.assertEqual(path, "/botTEST/sendDocument")
+        self.assertIn(b"added 2\n[ERROR] boom", body)
+        self.assertIn(b'filename="zapret_log.txt"', body)
+        self.assertIn(b"[INFO] next\n[ERROR] boom\n", body)
+
+    def test_partial_line_is_not_uploaded(self):
+        snapshot = self.log_tail.LogTailSnapshot(self.path)
+        snapshot.update(first_time=True)
+
+        _append(self.path, "[INFO] half")
+        self.assertEqual(self._tick(snapshot), (False, 0, []))
+        self.assertEqual(_UploadStandIn.uploads, [])
+
+    def test_replaced_file_is_read_from_start(self):
+        snapshot = self.log_tail.LogTailSnapshot(self.path)
+        snapshot.update(first_time=True)
+
+        rotated = Path(self.tmp.name) / "new_log.txt"
+        rotated.write_text("\ufeff[INFO] fresh 1\n[INFO] fresh 2\n", encoding="utf-8")
+        os.replace(rotated, self.path)
+
+        changed, added, lines = self._tick(snapshot)
+        self.assertTrue(changed)
+        self.assertEqual(lines, ["[INFO] fresh 1", "[INFO] fresh 2"])
+        self.assertEqual(snapshot.rotations, 1)
+        self.assertEqual(len(_UploadStandIn.uploads), 1)
+
+    def test_unchanged_file_is_not_uploaded(self):
+        snapshot = self.log_tail.LogTailSnapshot(self.path)
+        snapshot.update(first_time=True)
+        before = snapshot.bytes_read
+
+        # Same identity, size and mtime: the file is not even opened
+        with mock.patch.object(Path, "open", side_effect=AssertionError("file opened")):
+            for _ in range(3):
+                self.assertFalse(self._tick(snapshot)[0])
+
+        self.assertEqual(snapshot.bytes_read, before)
+        self.assertEqual(_UploadStandIn.uploads, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
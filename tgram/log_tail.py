@@ -0,0 +1,147 @@
+"""
+tgram/log_tail.py
+─────────────────
+Инкрементальный снимок растущего лог-файла для FullLogDaemon.
+
+Вместо полного перечитывания и хэширования файла на каждом тике хранится
+байтовое смещение уже прочитанной части и идентичность файла
+(st_dev, st_ino). Читается только дописанный хвост; если идентичность,
+размер и mtime не изменились, файл даже не открывается.
+
+Ротация / усечение определяются без хэша всего файла:
+    • другая идентичность (файл заменён новым);
+    • размер меньше смещения (файл усечён);
+    • не совпадает «якорь» – последние байты перед смещением (файл усечён
+      и успел дорасти до прежнего размера между тиками).
+В этих случаях файл читается с начала.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+# сколько байт перед смещением сверяем для обнаружения подмены содержимого
+ANCHOR_SIZE = 64
+# сколько байт с конца читаем при начальном снимке (поиск последнего '\n')
+TAIL_PROBE_SIZE = 64 * 1024
+
+
+class LogTailSnapshot:
+    """
+    Снимок состояния лог-файла.
+
+    update() возвращает: changed?, added_count, added_lines_list
+    (как раньше FullLogDaemon._snapshot). Незавершённая последняя строка
+    (без '\\n') не считается – она будет прочитана целиком на следующем тике;
+    если завершённых строк не добавилось, changed = False.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.offset = 0              # байт прочитано (до последнего '\n')
+        self.size = 0                # размер файла на момент снимка
+        self.mtime_ns = 0            # mtime файла на момент снимка
+        self.identity: tuple[int, int] | None = None
+        self.anchor = b""            # байты [offset - ANCHOR_SIZE, offset)
+
+        # статистика: сколько байт прочитано с диска за всё время
+        self.bytes_read = 0
+        self.rotations = 0
+
+    # ───────────────────────────────────────────────────────────
+    def reset(self) -> None:
+        self.offset = 0
+        self.size = 0
+        self.mtime_ns = 0
+        self.identity = None
+        self.anchor = b""
+
+    # ───────────────────────────────────────────────────────────
+    def update(self, *, first_time: bool = False) -> tuple[bool, int, list[str]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            # файла нет (удалён при ротации) – начнём сначала, когда появится
+            self.reset()
+            return False, 0, []
+
+        identity = (st.st_dev, st.st_ino)
+        size = st.st_size
+        mtime_ns = st.st_mtime_ns
+
+        if (not first_time and identity == self.identity
+                and size == self.size and mtime_ns == self.mtime_ns):
+            return False, 0, []
+
+        with self.path.open("rb") as f:
+            if first_time:
+                self._seek_to_end(f, identity, size)
+                self.mtime_ns = mtime_ns
+                return False, 0, []
+
+            rotated = self._is_rotated(f, identity, size)
+            self.mtime_ns = mtime_ns
+            if rotated:
+                self.rotations += 1
+                self.offset = 0
+                self.anchor = b""
+            elif size == self.size:
+                return False, 0, []
+
+            self.identity = identity
+            self.size = size
+
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+            self.bytes_read += len(chunk)
+
+        # только завершённые строки; хвост без '\n' дочитаем позже
+        end = chunk.rfind(b"\n") + 1
+        complete = chunk[:end]
+        start_offset = self.offset
+        if end:
+            self.offset += end
+            self.anchor = (self.anchor + complete)[-ANCHOR_SIZE:]
+
+        text = complete.decode("utf-8", errors="replace")
+        if start_offset == 0 and text.startswith("\ufeff"):
+            text = text[1:]
+        added_lines = text.splitlines()
+        if not added_lines:
+            # только незавершённая строка – отправлять нечего
+            return False, 0, []
+        return True, len(added_lines), added_lines
+
+    # ───────────────────────────────────────────────────────────
+    def _seek_to_end(self, f, identity: tuple[int, int], size: int) -> None:
+        """Начальный снимок: содержимое уже «отправлено», читаем только хвост."""
+        tail_start = max(0, size - TAIL_PROBE_SIZE)
+        f.seek(tail_start)
+        tail = f.read(size - tail_start)
+        self.bytes_read += len(tail)
+
+        end = tail.rfind(b"\n") + 1
+        if not end and tail_start:
+            # очень длинная незавершённая строка – считаем её прочитанной
+            end = len(tail)
+        self.identity = identity
+        self.size = size
+        self.offset = tail_start + end
+        self.anchor = tail[:end][-ANCHOR_SIZE:]
+
+    # ───────────────────────────────────────────────────────────
+    def _is_rotated(self, f, identity: tuple[int, int], size: int) -> bool:
+        if self.identity is None:
+            # предыдущего снимка нет – читаем с начала
+            return False
+        if identity != self.identity or size < self.offset:
+            return True
+        if self.anchor:
+            # размер тот же, но mtime другой – файл мог быть переписан
+            f.seek(self.offset - len(self.anchor))
+            probe = f.read(len(self.anchor))
+            self.bytes_read += len(probe)
+            if probe != self.anchor:
+                return True
+        return False
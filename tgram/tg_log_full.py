@@ -6,13 +6,13 @@ tgram/tg_log_full.py
 Новое:
     • отправка выполняется в отдельном QThread (не блокирует GUI);
     • Flood-wait (429) обрабатывается в tgram/tg_sender.send_file_to_tg →
-      если был 429 – демон делает паузу ещё на 60 с поверх ответа сервера.
+      если был 429 – демон делает паузу ещё на 60 с поверх ответа сервера;
+    • на тике читается только дописанный хвост лога (tgram/log_tail.py),
+      без полного перечитывания и хэширования файла.
 """
 
 from __future__ import annotations
 
-import hashlib
-import io
 import os
 import platform
 import time
@@ -23,27 +23,7 @@ from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
 from config import APP_VERSION # build_info moved to config/__init__.py
 from tgram import get_client_id            # UUID устройства
 from .tg_log_bot import send_log_file as send_log_via_bot
-
-
-# ──────────────────────────────────────────────────────────────────
-def _file_hash(path: str) -> str:
-    """
-    MD5 из первых и последних 64 КБ – быстро, но надёжно,
-    достаточно для проверки «файл изменился?».
-    """
-    h = hashlib.md5()
-    with open(path, "rb") as f:
-        first = f.read(64 * 1024)
-        if len(first) < 64 * 1024:          # маленький файл
-            h.update(first)
-            return h.hexdigest()
-
-        f.seek(-64 * 1024, io.SEEK_END)
-        last = f.read(64 * 1024)
-
-    h.update(first)
-    h.update(last)
-    return h.hexdigest()
+from .log_tail import LogTailSnapshot
 
 
 # ──────────────────────────────────────────────────────────────────
@@ -101,9 +81,8 @@ class FullLogDaemon(QObject):
         if not os.path.exists(self.log_path):
             return
         
-        # снимок предыдущего состояния
-        self.last_hash = None
-        self.last_line_count = 0
+        # снимок предыдущего состояния (байтовое смещение + идентичность файла)
+        self._tail = LogTailSnapshot(self.log_path)
 
         # если был Flood-wait – ждём до этого времени
         self._suspend_until = 0.0
@@ -177,39 +156,8 @@ class FullLogDaemon(QObject):
     def _snapshot(self, *, first_time=False):
         """
         Возвращает: changed?, added_count, added_lines_list
+
+        Читается только дописанный с прошлого снимка хвост файла;
+        ротация/усечение определяются по размеру и идентичности файла.
         """
-        added_lines: list[str] = []
-        line_count = 0
-
-        with self.log_path.open("r", encoding="utf-8-sig", errors="replace") as f:
-            for idx, line in enumerate(f, 1):
-                if idx > self.last_line_count:
-                    added_lines.append(line.rstrip("\n"))
-                line_count = idx
-
-        file_hash = _file_hash(str(self.log_path))
-
-        if first_time:
-            self.last_hash = file_hash
-            self.last_line_count = line_count
-            return False, 0, []
-
-        # ротация? строк стало меньше
-        if line_count < self.last_line_count:
-            added_lines = self._read_all_lines()
-            added = line_count
-            changed = True
-        else:
-            added = line_count - self.last_line_count
-            changed = (file_hash != self.last_hash)
-
-        if changed:
-            self.last_hash = file_hash
-            self.last_line_count = line_count
-
-        return changed, added, added_lines
-
-    # ----------------------------------------------------------------
-    def _read_all_lines(self) -> list[str]:
-        with self.log_path.open("r", encoding="utf-8-sig", errors="replace") as f:
-            return [ln.rstrip("\n") for ln in f]
\ No newline at end of file
+        return self._tail.update(first_time=first_time)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк загрузки TXT каталогов стратегий (utils.ini_catalog).
+
+Загружает все *.txt каталога builtin:
+- legacy - прежний разбор (чтение файла целиком + splitlines + разбор) на каждый вызов
+- cold   - ini_catalog.load_catalog() с пустым кэшем
+- warm   - повторная загрузка из кэша (только stat файлов)
+
+Usage:
+  python tools/bench_ini_catalog.py --dir C:/ProgramData/ZapretTwo/json/strategies/builtin
+  python tools/bench_ini_catalog.py --synthetic 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_ini_catalog():
+    spec = importlib.util.spec_from_file_location("utils.ini_catalog", REPO_ROOT / "utils" / "ini_catalog.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["utils.ini_catalog"] = module  # нужно для dataclasses
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_load(path: Path) -> list[dict]:
+    """Прежний strategy_loader.load_txt_file (без логирования)"""
+    content = path.read_text(encoding="utf-8", errors="replace")
+    strategies = []
+    current = None
+    args: list[str] = []
+    for line in content.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            if current is not None:
+                current["args"] = "\n".join(args)
+                strategies.append(current)
+            sid = line[1:-1].strip()
+            current = {"id": sid, "name": sid, "description": "", "author": "unknown",
+                       "label": None, "blobs": [], "args": ""}
+            args = []
+            continue
+        if current is None:
+            continue
+        if line.startswith("--"):
+            args.append(line)
+            continue
+        if "=" in line:
+            key, _, value = line.partition("=")
+            key = key.strip().lower()
+            value = value.strip()
+            if key in ("name", "author", "description"):
+                current[key] = value
+            elif key == "label":
+                current["label"] = value or None
+            elif key == "blobs":
+                current["blobs"] = [b.strip() for b in value.split(",") if b.strip()]
+    if current is not None:
+        current["args"] = "\n".join(args)
+        strategies.append(current)
+    return strategies
+
+
+def write_synthetic(folder: Path, files: int, per_file: int = 300, seed: int = 1) -> None:
+    rnd = random.Random(seed)
+    for n in range(files):
+        lines = [f"# synthetic catalog {n}"]
+        for i in range(per_file):
+            lines.append(f"[strategy_{n}_{i}]")
+            lines.append(f"name = Strategy {i}")
+            lines.append("author = bench")
+            lines.append(f"label = {rnd.choice(['recommended', 'experimental', 'game'])}")
+            lines.append("blobs = tls7, tls_google")
+            for _ in range(rnd.randint(1, 4)):
+                lines.append(f"--lua-desync=multisplit:pos={rnd.randint(1, 9)},midsld:repeats={rnd.randint(1, 6)}")
+            lines.append("")
+        (folder / f"cat_{n}.txt").write_text("\n".join(lines), encoding="utf-8")
+
+
+def _timed(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", help="Папка strategies/builtin")
+    parser.add_argument("--synthetic", type=int, default=0, help="Сгенерировать N файлов по 300 стратегий")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ini_catalog = _load_ini_catalog()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dir:
+            folder = Path(args.dir)
+        else:
+            folder = Path(tmp)
+            write_synthetic(folder, args.synthetic or 20)
+
+        files = sorted(folder.glob("*.txt"))
+        if not files:
+            print(f"Нет *.txt в {folder}")
+            return 1
+
+        def legacy():
+            for path in files:
+                legacy_load(path)
+
+        def cold():
+            ini_catalog.invalidate_catalog_cache()
+            for path in files:
+                ini_catalog.strategies_from_catalog(ini_catalog.load_catalog(path))
+
+        def warm():
+            for path in files:
+                ini_catalog.load_catalog(path)
+
+        mismatches = sum(
+            legacy_load(path) != ini_catalog.strategies_from_catalog(ini_catalog.load_catalog(path))
+            for path in files
+            if path.name != "categories.txt"
+        )
+
+        t_legacy = _timed(legacy, args.repeat)
+        t_cold = _timed(cold, args.repeat)
+        cold()
+        t_warm = _timed(warm, args.repeat)
+
+    print(f"files:      {len(files)}")
+    print(f"legacy:     {t_legacy * 1000:.2f} ms")
+    print(f"cold:       {t_cold * 1000:.2f} ms")
+    print(f"warm:       {t_warm * 1000:.3f} ms  ({t_legacy / t_warm:.0f}x vs legacy)")
+    print(f"mismatches: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
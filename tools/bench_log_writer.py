@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк записи основного лога (log.log.Logger).
+
+Сравнивает прежнюю запись (open/append/close на каждую строку) с
+log.buffered_writer.BufferedLogWriter (один дескриптор + фоновая запись пачками)
+и печатает строк/сек. Время буферизованного варианта включает flush().
+
+Usage:
+  python tools/bench_log_writer.py
+  python tools/bench_log_writer.py --lines 200000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_buffered_writer():
+    # Загружаем модуль напрямую: log/__init__.py тянет PyQt6.
+    spec = importlib.util.spec_from_file_location("log_buffered_writer", REPO_ROOT / "log" / "buffered_writer.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_write(path: str, message: str):
+    """Прежний Logger.write (без вывода в консоль)"""
+    with open(path, "a", encoding="utf-8-sig") as f:
+        f.write(f"[{datetime.now():%H:%M:%S}] {message}")
+
+
+def bench_legacy(path: str, messages: list[str]) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        legacy_write(path, message)
+    return time.perf_counter() - started
+
+
+def bench_buffered(module, path: str, messages: list[str]) -> float:
+    writer = module.BufferedLogWriter(path)
+    started = time.perf_counter()
+    for message in messages:
+        writer.write(f"[{datetime.now():%H:%M:%S}] {message}")
+    writer.flush(timeout=None)
+    elapsed = time.perf_counter() - started
+    writer.close()
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=50000, help="Количество строк (по умолчанию 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество прогонов (берётся лучший)")
+    args = parser.parse_args()
+
+    module = _load_buffered_writer()
+    messages = [f"[DEBUG] orchestra: line {i} youtube.com strat={i % 20}\n" for i in range(args.lines)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_best = buffered_best = None
+        for run in range(args.repeat):
+            legacy_path = os.path.join(tmp, f"legacy_{run}.txt")
+            buffered_path = os.path.join(tmp, f"buffered_{run}.txt")
+            for path in (legacy_path, buffered_path):
+                with open(path, "w", encoding="utf-8-sig") as f:
+                    f.write("=== bench ===\n")
+
+            legacy = bench_legacy(legacy_path, messages)
+            buffered = bench_buffered(module, buffered_path, messages)
+            legacy_best = legacy if legacy_best is None else min(legacy_best, legacy)
+            buffered_best = buffered if buffered_best is None else min(buffered_best, buffered)
+
+            if os.path.getsize(legacy_path) != os.path.getsize(buffered_path):
+                print(f"WARNING: размеры файлов отличаются (run {run})")
+
+    print(f"lines:     {args.lines}")
+    print(f"legacy:    {args.lines / legacy_best:,.0f} lines/sec")
+    print(f"buffered:  {args.lines / buffered_best:,.0f} lines/sec")
+    print(f"speedup:   {legacy_best / buffered_best:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Replay-бенчмарк orchestra.log_parser.LogParser.
+
+Прогоняет записанный debug лог оркестратора (logs/orchestra_*.log) через
+последовательный парсер (dispatch=False) и парсер с диспетчеризацией по
+ключевым словам (dispatch=True), сверяет события и печатает строк/сек.
+
+Usage:
+  python tools/bench_orchestra_log_parser.py logs/orchestra_20250101_120000.log
+  python tools/bench_orchestra_log_parser.py --synthetic 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_log_parser():
+    # Загружаем модуль напрямую: orchestra/__init__.py тянет runner с Windows/GUI зависимостями.
+    spec = importlib.util.spec_from_file_location("orchestra_log_parser", REPO_ROOT / "orchestra" / "log_parser.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_lines(count: int, seed: int = 1) -> list[str]:
+    """Генерирует лог, похожий на вывод winws2 --debug=1 (в основном packet:/IP4: шум)."""
+    rnd = random.Random(seed)
+    hosts = ["youtube.com", "rr1---sn-abc.googlevideo.com", "discord.com", "github.com", "x.com", "dns.sb"]
+    protos = ["tls", "quic", "unknown"]
+    lines: list[str] = []
+    while len(lines) < count:
+        host = rnd.choice(hosts)
+        ip = f"{rnd.randint(1, 223)}.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}"
+        strat = rnd.randint(1, 20)
+        proto = rnd.choice(protos)
+        lines.append(f"packet: id={rnd.randint(1, 99999)} len={rnd.randint(40, 1500)} outbound IPv6=0 IPv4=1 TCP=1 UDP=0")
+        lines.append(f"IP4: 192.168.1.100 => {ip} proto=tcp ttl=128 sport={rnd.randint(1024, 65535)} dport=443 flags=AP")
+        lines.append("TCP: len=517 seq=1 ack=1 win=512")
+        roll = rnd.random()
+        if roll < 0.15:
+            lines.append(f"desync profile search for tcp ip={ip} port=443 l7proto=tls ssid='' hostname='{host}'")
+            lines.append("desync profile 1 (noname) matches")
+            lines.append(f"dpi desync src=192.168.1.100:50000 dst={ip}:443 track_direction=out connection_proto=tls")
+        elif roll < 0.20:
+            lines.append(f"IP4: {ip} => 192.168.1.100 proto=udp ttl=55 sport=443 dport=64028")
+            lines.append("using cached desync profile 3 (noname)")
+            lines.append("packet contains QUIC initial")
+        elif roll < 0.24:
+            lines.append(f"LUA: automate: host record key 'autostate.circular_quality_1_1.{host}'")
+            lines.append(f"LUA: strategy-stats: APPLIED {host} = strategy {strat} [circular_quality_1_1]")
+        elif roll < 0.27:
+            lines.append(f"LUA: slm_quality: [{proto}] {host} strat={strat} SUCCESS 1/1")
+        elif roll < 0.29:
+            lines.append(f"LUA: slm_quality: [{proto}] {host} strat={strat} FAIL 0/1")
+        elif roll < 0.30:
+            lines.append("LUA: standard_failure_detector: incoming RST s1 in range s4096")
+        elif roll < 0.305:
+            lines.append(f"LUA: slm_quality: [{proto}] LOCK: {host} -> strat={strat}")
+        elif roll < 0.31:
+            lines.append(f"LUA: slm_quality: [{proto}] UNLOCK: {host} strat={strat} (now blocked)")
+        elif roll < 0.315:
+            lines.append(f"LUA: strategy-stats: HISTORY {host} s{strat} successes=10 failures=2 rate=83%")
+        elif roll < 0.32:
+            lines.append(f"LUA: circular: rotate strategy to {strat}")
+    return lines[:count]
+
+
+def run(parser, lines: list[str]) -> tuple[list, float]:
+    parse_line = parser.parse_line
+    started = time.perf_counter()
+    events = [parse_line(line) for line in lines]
+    return events, time.perf_counter() - started
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser(description="Replay orchestra debug log through LogParser")
+    ap.add_argument("log", nargs="?", help="Path to recorded orchestra_*.log")
+    ap.add_argument("--synthetic", type=int, default=0, help="Generate N synthetic lines instead of reading a log")
+    ap.add_argument("--repeat", type=int, default=3, help="Best-of-N timing runs (default: 3)")
+    args = ap.parse_args(argv)
+
+    if args.log:
+        with open(args.log, "r", encoding="utf-8", errors="replace") as f:
+            lines = [line.rstrip() for line in f]
+        lines = [line for line in lines if line]
+    elif args.synthetic > 0:
+        lines = synthetic_lines(args.synthetic)
+    else:
+        ap.error("specify a log file or --synthetic N")
+        return 2
+
+    lp = _load_log_parser()
+    results = {}
+    for name, dispatch in (("sequential", False), ("dispatch", True)):
+        best = None
+        events = None
+        for _ in range(max(1, args.repeat)):
+            events, elapsed = run(lp.LogParser(dispatch=dispatch), lines)
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (events, best)
+        print(f"{name:>10}: {len(lines) / best:>12,.0f} lines/sec ({best:.3f}s, {len(lines)} lines)")
+
+    seq_events, seq_time = results["sequential"]
+    disp_events, disp_time = results["dispatch"]
+    mismatches = sum(1 for a, b in zip(seq_events, disp_events) if a != b)
+    print(f"   speedup: x{seq_time / disp_time:.2f}")
+    print(f"    events: {sum(1 for e in disp_events if e)} ({mismatches} mismatches)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
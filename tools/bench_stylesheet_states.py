@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк смены состояний виджетов: setStyleSheet() против свойств.
+
+Строит окно с карточками (QFrame + дочерние QLabel/QPushButton, как
+PresetCard) и кнопками навигации (как NavButton) в двух вариантах:
+
+- legacy - прежний код: setStyleSheet() с новым CSS на каждое наведение/выбор
+- tokens - ui/style_tokens.py: CSS назначается один раз, состояние -
+           динамическим свойством (set_style_state), наведение - :hover
+
+Для каждого варианта считает события Polish/StyleChange (фильтр событий
+на QApplication) и время: серии смен состояния (hover/select) и
+переключения темы (QApplication.setStyleSheet с другим CSS).
+
+Usage:
+  python tools/bench_stylesheet_states.py
+  python tools/bench_stylesheet_states.py --cards 60 --steps 400 --offscreen
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_style_tokens():
+    # Загружаем модуль напрямую: ui/__init__.py тянет всё окно.
+    spec = importlib.util.spec_from_file_location("ui_style_tokens", REPO_ROOT / "ui" / "style_tokens.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _legacy_card_css(active: bool, hovered: bool) -> str:
+    """Прежний PresetCard._update_style"""
+    if active:
+        bg = "rgba(96, 205, 255, 0.08)"
+    elif hovered:
+        bg = "rgba(255, 255, 255, 0.08)"
+    else:
+        bg = "rgba(255, 255, 255, 0.04)"
+    return f"""
+        QFrame#presetCard {{
+            background-color: {bg};
+            border: none;
+            border-radius: 8px;
+        }}
+    """
+
+
+def _legacy_nav_css(selected: bool, hovered: bool) -> str:
+    """Прежний NavButton._update_style"""
+    if selected:
+        bg, border, color = "rgba(255, 255, 255, 0.1)", "3px solid #60cdff", "#ffffff"
+    elif hovered:
+        bg, border, color = "rgba(255, 255, 255, 0.05)", "3px solid transparent", "#e0e0e0"
+    else:
+        bg, border, color = "transparent", "3px solid transparent", "#9e9e9e"
+    return f"""
+        QPushButton {{
+            background-color: {bg};
+            border: none;
+            border-left: {border};
+            border-radius: 4px;
+            color: {color};
+            text-align: left;
+            padding-left: 22px;
+            font-size: 13px;
+            font-weight: {'600' if selected else '400'};
+        }}
+    """
+
+
+def _theme_css(accent: str) -> str:
+    return f"""
+        QWidget {{ color: #ffffff; }}
+        QPushButton {{ background-color: #2d2d2d; border: 1px solid {accent}; padding: 4px; }}
+        QPushButton:hover {{ background-color: #3d3d3d; }}
+        QLabel {{ color: #e0e0e0; }}
+        QScrollBar:vertical {{ background: {accent}; width: 8px; }}
+    """
+
+
+def run(mode: str, cards: int, navs: int, steps: int, themes: int) -> dict:
+    from PyQt6.QtCore import QEvent, QObject
+    from PyQt6.QtWidgets import QApplication, QFrame, QLabel, QPushButton, QVBoxLayout, QWidget
+
+    tokens = _load_style_tokens()
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    class PolishCounter(QObject):
+        def __init__(self):
+            super().__init__()
+            self.polish = 0
+            self.style_change = 0
+
+        def eventFilter(self, obj, event):
+            t = event.type()
+            if t == QEvent.Type.Polish:
+                self.polish += 1
+            elif t == QEvent.Type.StyleChange:
+                self.style_change += 1
+            return False
+
+    app.setStyleSheet(_theme_css("#60cdff"))
+    root = QWidget()
+    layout = QVBoxLayout(root)
+
+    card_widgets = []
+    for i in range(cards):
+        card = QFrame()
+        card_layout = QVBoxLayout(card)
+        card_layout.addWidget(QLabel(f"Пресет {i}"))
+        card_layout.addWidget(QLabel("описание"))
+        for text in ("Активировать", "Переименовать", "Удалить"):
+            card_layout.addWidget(QPushButton(text))
+        if mode == "legacy":
+            card.setObjectName("presetCard")
+            card.setStyleSheet(_legacy_card_css(False, False))
+        else:
+            tokens.apply_component_style(card, "preset_card", active=False)
+        layout.addWidget(card)
+        card_widgets.append(card)
+
+    nav_widgets = []
+    for i in range(navs):
+        nav = QPushButton(f"Раздел {i}")
+        if mode == "legacy":
+            nav.setStyleSheet(_legacy_nav_css(False, False))
+        else:
+            tokens.apply_component_style(nav, "nav_button", selected=False, collapsed=False)
+        layout.addWidget(nav)
+        nav_widgets.append(nav)
+
+    root.show()
+    app.processEvents()
+
+    counter = PolishCounter()
+    app.installEventFilter(counter)
+
+    # Смены состояния: наведение на карточку (вход/выход) и выбор раздела
+    t0 = time.perf_counter()
+    for step in range(steps):
+        card = card_widgets[step % cards]
+        nav = nav_widgets[step % navs]
+        selected = step % 2 == 0
+        if mode == "legacy":
+            card.setStyleSheet(_legacy_card_css(False, True))
+            card.setStyleSheet(_legacy_card_css(False, False))
+            nav.setStyleSheet(_legacy_nav_css(selected, False))
+        else:
+            # Наведение обрабатывает :hover без кода; меняется только выбор
+            tokens.set_style_state(nav, selected=selected)
+        app.processEvents()
+    states_ms = (time.perf_counter() - t0) * 1000
+    states_polish = counter.polish
+    states_style_change = counter.style_change
+
+    # Переключение темы
+    counter.polish = counter.style_change = 0
+    t0 = time.perf_counter()
+    for i in range(themes):
+        app.setStyleSheet(_theme_css("#60cdff" if i % 2 else "#ff9800"))
+        app.processEvents()
+    theme_ms = (time.perf_counter() - t0) * 1000 / max(1, themes)
+
+    app.removeEventFilter(counter)
+    root.close()
+    root.deleteLater()
+    app.processEvents()
+
+    return {
+        "states_ms": states_ms,
+        "states_polish": states_polish,
+        "states_style_change": states_style_change,
+        "theme_ms": theme_ms,
+        "theme_polish": counter.polish,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=40, help="Количество карточек (по умолчанию 40)")
+    parser.add_argument("--navs", type=int, default=30, help="Количество кнопок навигации (по умолчанию 30)")
+    parser.add_argument("--steps", type=int, default=300, help="Количество смен состояния (по умолчанию 300)")
+    parser.add_argument("--themes", type=int, default=6, help="Количество переключений темы (по умолчанию 6)")
+    parser.add_argument("--offscreen", action="store_true", help="QT_QPA_PLATFORM=offscreen (без окна)")
+    args = parser.parse_args()
+
+    if args.offscreen:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    try:
+        import PyQt6  # noqa: F401
+    except ImportError:
+        print("PyQt6 не установлен")
+        return 1
+
+    print(f"Карточек: {args.cards}, кнопок: {args.navs}, смен состояния: {args.steps}, тем: {args.themes}")
+    results = {mode: run(mode, args.cards, args.navs, args.steps, args.themes) for mode in ("legacy", "tokens")}
+
+    print(f"{'':8} {'состояния, мс':>14} {'Polish':>8} {'StyleChange':>12} {'тема, мс':>10} {'Polish (тема)':>14}")
+    for mode, r in results.items():
+        print(f"{mode:8} {r['states_ms']:14.1f} {r['states_polish']:8d} {r['states_style_change']:12d} "
+              f"{r['theme_ms']:10.1f} {r['theme_polish']:14d}")
+
+    legacy, new = results["legacy"], results["tokens"]
+    if new["states_ms"] > 0:
+        print(f"Смены состояния: x{legacy['states_ms'] / new['states_ms']:.1f} быстрее, "
+              f"Polish {legacy['states_polish']} -> {new['states_polish']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
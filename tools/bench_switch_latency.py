@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк задержки переключения стратегии (остановка старого процесса + запуск нового).
+
+Вместо winws используется фиктивный дочерний процесс Python, который
+завершается через --exit-delay секунд после SIGTERM/terminate(). Сравниваются:
+
+- legacy: прежняя схема DPIStartWorker - terminate, опрос каждые 0.5с,
+  пауза 0.5с "для освобождения WinDivert", запуск и sleep(0.2) + poll();
+- event:  utils.process_wait - Popen.wait по дескриптору и wait_startup().
+
+Работает на Linux/Windows без winws и прав администратора.
+
+Usage:
+  python tools/bench_switch_latency.py
+  python tools/bench_switch_latency.py --switches 5 --exit-delay 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import statistics
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+DUMMY_CHILD = """
+import signal, sys, time
+delay = float(sys.argv[1])
+def _stop(*_args):
+    time.sleep(delay)
+    sys.exit(0)
+signal.signal(signal.SIGTERM, _stop)
+while True:
+    time.sleep(1)
+"""
+
+
+def _load_process_wait():
+    # Загружаем модуль напрямую: log/__init__.py тянет PyQt6.
+    if "log" not in sys.modules:
+        log_stub = types.ModuleType("log")
+        log_stub.log = lambda *_a, **_kw: None
+        sys.modules["log"] = log_stub
+    spec = importlib.util.spec_from_file_location("process_wait", REPO_ROOT / "utils" / "process_wait.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def spawn_dummy(exit_delay: float) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, "-c", DUMMY_CHILD, str(exit_delay)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.1)  # даём интерпретатору установить обработчик SIGTERM
+    return proc
+
+
+def switch_legacy(module, proc: subprocess.Popen, exit_delay: float) -> tuple:
+    latency = module.SwitchLatency("legacy")
+    proc.terminate()
+    latency.mark("остановка")
+    for _attempt in range(10):
+        time.sleep(0.5)
+        if proc.poll() is not None:
+            break
+    time.sleep(0.5)
+    latency.mark("ожидание завершения")
+    new_proc = subprocess.Popen([sys.executable, "-c", DUMMY_CHILD, str(exit_delay)],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.2)
+    new_proc.poll()
+    latency.mark("запуск")
+    return latency, new_proc
+
+
+def switch_event(module, proc: subprocess.Popen, exit_delay: float) -> tuple:
+    latency = module.SwitchLatency("event")
+    proc.terminate()
+    latency.mark("остановка")
+    if not module.wait_popen_exit(proc, timeout=module.EXIT_TIMEOUT):
+        proc.kill()
+        proc.wait()
+    latency.mark("ожидание завершения")
+    new_proc = subprocess.Popen([sys.executable, "-c", DUMMY_CHILD, str(exit_delay)],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    module.wait_startup(new_proc)
+    latency.mark("запуск")
+    return latency, new_proc
+
+
+def run(module, switch, switches: int, exit_delay: float) -> list:
+    proc = spawn_dummy(exit_delay)
+    results = []
+    try:
+        for _ in range(switches):
+            time.sleep(0.1)  # обработчик SIGTERM в новом процессе
+            latency, proc = switch(module, proc, exit_delay)
+            results.append(latency.total_ms)
+    finally:
+        proc.kill()
+        proc.wait()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--switches", type=int, default=3, help="Количество переключений (по умолчанию 3)")
+    parser.add_argument("--exit-delay", type=float, default=0.1,
+                        help="Сколько фиктивный процесс завершается после terminate (секунды)")
+    args = parser.parse_args()
+
+    module = _load_process_wait()
+    legacy = run(module, switch_legacy, args.switches, args.exit_delay)
+    event = run(module, switch_event, args.switches, args.exit_delay)
+
+    legacy_median = statistics.median(legacy)
+    event_median = statistics.median(event)
+    print(f"switches:  {args.switches}, exit delay {args.exit_delay * 1000:.0f} ms")
+    print(f"legacy:    median {legacy_median:.0f} ms  (min {min(legacy):.0f}, max {max(legacy):.0f})")
+    print(f"event:     median {event_median:.0f} ms  (min {min(event):.0f}, max {max(event):.0f})")
+    print(f"speedup:   {legacy_median / event_median:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
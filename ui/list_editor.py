@@ -0,0 +1,193 @@
+# ui/list_editor.py
+"""
+Контроллер редактора списка: QPlainTextEdit + ListEditorModel.
+
+- Модель обновляется по QTextDocument.contentsChange только для изменённых
+  строк; большие вставки проверяются порциями через QTimer.
+- Через delay_ms после последнего изменения снимок строк нормализуется и
+  сохраняется в фоновом потоке (ListSaveWorker).
+- Нормализованный текст возвращается в редактор одной минимальной правкой
+  и только если он отличается и документ не менялся с момента снимка
+  (история Ctrl+Z сохраняется).
+
+Использование на странице:
+
+    self._editor = ListEditorController(self.text_edit, split_ip_entries,
+                                        self.normalize_ip_entry, self._write_entries, parent=self)
+    self._editor.status_changed.connect(self._update_status)
+    self._editor.saved.connect(self._on_saved)
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QTextCursor
+
+from log import log
+from ui.list_editor_model import (
+    ListEditorModel,
+    NormalizeFunc,
+    SaveResult,
+    SplitFunc,
+    line_edit_span,
+    save_snapshot,
+)
+
+
+class ListSaveWorker(QThread):
+    """Нормализация, удаление дубликатов и запись файла в фоне"""
+
+    done = pyqtSignal(object)  # SaveResult
+
+    def __init__(self, lines: List[str], revision: int, split: SplitFunc,
+                 normalize: NormalizeFunc, save: Callable[[List[str]], bool], parent=None):
+        super().__init__(parent)
+        self._lines = lines
+        self._revision = revision
+        self._split = split
+        self._normalize = normalize
+        self._save = save
+
+    def run(self):
+        self.done.emit(save_snapshot(self._lines, self._revision, self._split, self._normalize, self._save))
+
+
+class ListEditorController(QObject):
+    """Связывает QPlainTextEdit со страницей списка"""
+
+    status_changed = pyqtSignal()  # изменились счётчики модели
+    saved = pyqtSignal(object)     # SaveResult
+
+    def __init__(self, text_edit, split: SplitFunc, normalize: NormalizeFunc,
+                 save: Callable[[List[str]], bool], delay_ms: int = 500, parent=None):
+        super().__init__(parent)
+        self._text_edit = text_edit
+        self._doc = text_edit.document()
+        self._split = split
+        self._normalize = normalize
+        self._save = save
+        self._delay_ms = delay_ms
+
+        self.model = ListEditorModel(split, normalize)
+        self.model.reset(self._doc.toPlainText())
+
+        self._applying = False  # правка из кода: не запускает автосохранение
+        self._worker: Optional[ListSaveWorker] = None
+        self._save_again = False
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._start_save)
+
+        self._validate_timer = QTimer(self)
+        self._validate_timer.setSingleShot(True)
+        self._validate_timer.timeout.connect(self._process_pending)
+
+        self._doc.contentsChange.connect(self._on_contents_change)
+
+    # ---------- текст ----------
+
+    def set_text(self, text: str) -> None:
+        """Загружает текст без автосохранения"""
+        self._applying = True
+        try:
+            self._text_edit.setPlainText(text)
+        finally:
+            self._applying = False
+
+    def append_lines(self, lines: List[str]) -> None:
+        """Добавляет строки в конец одной правкой (с автосохранением)"""
+        if not lines:
+            return
+        cursor = QTextCursor(self._doc)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        prefix = "\n" if cursor.block().text() else ""
+        cursor.insertText(prefix + "\n".join(lines))
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        doc = self._doc
+        block = doc.findBlock(position)
+        if not block.isValid():
+            block = doc.firstBlock()
+        first = block.blockNumber()
+        end_block = doc.findBlock(position + added)
+        last = end_block.blockNumber() if end_block.isValid() else doc.blockCount() - 1
+
+        old_count = (last - first + 1) - (doc.blockCount() - self.model.line_count)
+        if old_count < 0 or first + old_count > self.model.line_count:
+            self.model.reset(doc.toPlainText())
+        else:
+            new_lines = []
+            while block.isValid() and block.blockNumber() <= last:
+                new_lines.append(block.text())
+                block = block.next()
+            self.model.replace_lines(first, old_count, new_lines)
+            if self.model.line_count != doc.blockCount():
+                self.model.reset(doc.toPlainText())
+
+        if self.model.pending:
+            self._validate_timer.start(0)
+        self.status_changed.emit()
+
+        if not self._applying:
+            self._save_timer.start(self._delay_ms)
+
+    def _process_pending(self):
+        if self.model.process_pending():
+            self._validate_timer.start(0)
+        self.status_changed.emit()
+
+    # ---------- сохранение ----------
+
+    def _start_save(self):
+        if self._worker is not None:
+            self._save_again = True
+            return
+        worker = ListSaveWorker(self.model.lines(), self._doc.revision(),
+                                self._split, self._normalize, self._save, self)
+        worker.done.connect(self._on_worker_done)
+        worker.finished.connect(worker.deleteLater)
+        self._worker = worker
+        worker.start()
+
+    def _on_worker_done(self, result: SaveResult):
+        self._worker = None
+        self._finish_save(result)
+        if self._save_again:
+            self._save_again = False
+            self._start_save()
+
+    def save_now(self) -> SaveResult:
+        """Синхронное сохранение (перед открытием файла и т.п.)"""
+        self._save_timer.stop()
+        if self._worker is not None:
+            # Дожидаемся фоновой записи, чтобы файл не перезаписался старым снимком
+            self._worker.wait()
+        result = save_snapshot(self.model.lines(), self._doc.revision(),
+                               self._split, self._normalize, self._save)
+        self._finish_save(result)
+        return result
+
+    def _finish_save(self, result: SaveResult):
+        if result.error:
+            log(f"Ошибка сохранения списка: {result.error}", "ERROR")
+        # Пока шло сохранение, пользователь мог продолжить ввод - тогда не трогаем текст
+        if result.ok and result.revision == self._doc.revision():
+            self._apply_normalized(result.normalized_lines)
+        self.saved.emit(result)
+
+    def _apply_normalized(self, normalized_lines: List[str]):
+        span = line_edit_span(self.model.lines(), normalized_lines)
+        if span is None:
+            return
+        position, removed, inserted = span
+        cursor = QTextCursor(self._doc)
+        cursor.setPosition(position)
+        cursor.setPosition(position + removed, QTextCursor.MoveMode.KeepAnchor)
+        self._applying = True
+        try:
+            cursor.insertText(inserted)
+        finally:
+            self._applying = False
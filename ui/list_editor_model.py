@@ -0,0 +1,293 @@
+# ui/list_editor_model.py
+"""
+Построчная модель редакторов списков (my-ipset.txt, other2.txt, netrogat.txt).
+
+Раньше страницы на каждое изменение текста заново разбирали и проверяли
+весь QPlainTextEdit, а при сохранении убирали дубликаты через
+`if norm not in entries` по списку (O(n²)) - вставка 50 тыс. строк
+подвешивала интерфейс на секунды.
+
+ListEditorModel хранит строки документа и результат их проверки и
+обновляется только по изменённому диапазону строк (replace_lines вызывается
+из обработчика QTextDocument.contentsChange). Счётчики (записи, ошибки,
+нормализованные значения для проверки дубликатов) ведутся инкрементально.
+Большие вставки проверяются порциями через process_pending(), чтобы не
+блокировать GUI.
+
+normalize_lines() - нормализация и удаление дубликатов (set) для
+сохранения, выполняется в фоновом потоке. line_edit_span() находит
+минимальную правку, которой текст редактора приводится к нормализованному
+виду (вместо setPlainText целиком).
+
+Модуль не импортирует Qt.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Вставки не больше этого числа строк проверяются сразу, остальные - порциями
+INLINE_VALIDATE_LINES = 500
+
+# Размер порции отложенной проверки (строк за один проход event loop)
+PENDING_BATCH_LINES = 2000
+
+# Ограничение кеша результатов проверки строк
+ANALYSIS_CACHE_LIMIT = 200_000
+
+SplitFunc = Callable[[str], List[str]]
+NormalizeFunc = Callable[[str], Optional[str]]
+
+# Результат проверки строки: ((элемент, нормализованное значение или None), ...)
+# Для пустых строк и комментариев - пустой кортеж.
+LineInfo = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def _is_entry(line: str) -> bool:
+    stripped = line.strip()
+    return bool(stripped) and not stripped.startswith("#")
+
+
+class ListEditorModel:
+    """Строки редактора списка и инкрементальная проверка"""
+
+    def __init__(self, split: SplitFunc, normalize: NormalizeFunc):
+        self._split = split
+        self._normalize = normalize
+        self._lines: List[str] = []
+        self._info: List[Optional[LineInfo]] = []  # None - ещё не проверена
+        self._cache: Dict[str, LineInfo] = {}
+        self._norm_counts: Dict[str, int] = {}
+        self._scan_pos = 0
+
+        self.entry_lines = 0     # непустые строки без комментариев
+        self.invalid_total = 0   # нераспознанные элементы
+        self.pending = 0         # строки, ожидающие проверки
+        self.validated = 0       # сколько строк проверено всего (статистика)
+
+    # ---------- изменения ----------
+
+    @property
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    def reset(self, text: str) -> None:
+        self.replace_lines(0, len(self._lines), text.split("\n"))
+
+    def replace_lines(self, start: int, old_count: int, new_lines: Sequence[str]) -> None:
+        """Заменяет old_count строк начиная со start на new_lines"""
+        end = start + old_count
+        for line, info in zip(self._lines[start:end], self._info[start:end]):
+            if _is_entry(line):
+                self.entry_lines -= 1
+            if info is None:
+                self.pending -= 1
+            else:
+                self._forget(info)
+
+        validate_now = len(new_lines) <= INLINE_VALIDATE_LINES
+        infos: List[Optional[LineInfo]] = []
+        for line in new_lines:
+            if _is_entry(line):
+                self.entry_lines += 1
+            if validate_now:
+                info = self._analyze(line)
+                self._remember(info)
+                infos.append(info)
+            else:
+                infos.append(None)
+
+        self._lines[start:end] = list(new_lines)
+        self._info[start:end] = infos
+        if not validate_now:
+            self.pending += len(new_lines)
+            self._scan_pos = min(self._scan_pos, start)
+
+    def process_pending(self, budget: int = PENDING_BATCH_LINES) -> int:
+        """Проверяет до budget отложенных строк. Возвращает сколько осталось."""
+        if not self.pending:
+            return 0
+        info_list = self._info
+        i = self._scan_pos
+        done = 0
+        while done < budget and i < len(info_list):
+            if info_list[i] is None:
+                info = self._analyze(self._lines[i])
+                self._remember(info)
+                info_list[i] = info
+                self.pending -= 1
+                done += 1
+            i += 1
+        self._scan_pos = 0 if i >= len(info_list) else i
+        return self.pending
+
+    # ---------- запросы ----------
+
+    def lines(self) -> List[str]:
+        return list(self._lines)
+
+    def text(self) -> str:
+        return "\n".join(self._lines)
+
+    def contains(self, norm: str) -> bool:
+        """Есть ли уже такое нормализованное значение (O(1))"""
+        return self._norm_counts.get(norm, 0) > 0
+
+    def first_invalid(self, limit: int = 5) -> List[Tuple[int, str]]:
+        """Первые нераспознанные элементы: [(номер строки с 1, элемент)]"""
+        result: List[Tuple[int, str]] = []
+        if not self.invalid_total:
+            return result
+        for number, info in enumerate(self._info, 1):
+            if not info:
+                continue
+            for item, norm in info:
+                if norm is None:
+                    result.append((number, item))
+                    if len(result) >= limit:
+                        return result
+        return result
+
+    # ---------- внутреннее ----------
+
+    def _analyze(self, line: str) -> LineInfo:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            return ()
+        cached = self._cache.get(stripped)
+        if cached is not None:
+            return cached
+        info = tuple((item, self._normalize(item) or None) for item in self._split(stripped))
+        if len(self._cache) >= ANALYSIS_CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[stripped] = info
+        self.validated += 1
+        return info
+
+    def _remember(self, info: LineInfo) -> None:
+        counts = self._norm_counts
+        for _item, norm in info:
+            if norm is None:
+                self.invalid_total += 1
+            else:
+                counts[norm] = counts.get(norm, 0) + 1
+
+    def _forget(self, info: LineInfo) -> None:
+        counts = self._norm_counts
+        for _item, norm in info:
+            if norm is None:
+                self.invalid_total -= 1
+            else:
+                left = counts.get(norm, 0) - 1
+                if left > 0:
+                    counts[norm] = left
+                else:
+                    counts.pop(norm, None)
+
+
+class SaveResult(NamedTuple):
+    """Результат нормализации и сохранения снимка редактора"""
+    entries: List[str]           # что записано в файл (комментарии + уникальные значения)
+    normalized_lines: List[str]  # новый текст редактора
+    revision: int                # ревизия документа на момент снимка
+    ok: bool
+    error: str = ""
+
+
+def normalize_lines(
+    lines: Sequence[str], split: SplitFunc, normalize: NormalizeFunc
+) -> Tuple[List[str], List[str]]:
+    """
+    Нормализует строки редактора.
+
+    Комментарии сохраняются как есть, строки разбиваются на элементы,
+    каждый нормализуется; дубликаты отбрасываются (set), нераспознанные
+    элементы остаются в тексте редактора, но не попадают в файл.
+
+    Returns:
+        (entries, normalized_lines)
+    """
+    entries: List[str] = []
+    normalized_lines: List[str] = []
+    seen: set[str] = set()
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            entries.append(line)
+            normalized_lines.append(line)
+            continue
+
+        for item in split(line):
+            norm = normalize(item)
+            if norm:
+                if norm not in seen:
+                    seen.add(norm)
+                    entries.append(norm)
+                    normalized_lines.append(norm)
+            else:
+                normalized_lines.append(item)
+
+    return entries, normalized_lines
+
+
+def save_snapshot(
+    lines: Sequence[str],
+    revision: int,
+    split: SplitFunc,
+    normalize: NormalizeFunc,
+    save: Callable[[List[str]], bool],
+) -> SaveResult:
+    """Нормализует снимок строк и сохраняет через save(entries) (для фонового потока)"""
+    try:
+        entries, normalized_lines = normalize_lines(lines, split, normalize)
+        ok = bool(save(entries))
+        return SaveResult(entries, normalized_lines, revision, ok)
+    except Exception as e:
+        return SaveResult([], [], revision, False, str(e))
+
+
+def line_edit_span(old: Sequence[str], new: Sequence[str]) -> Optional[Tuple[int, int, str]]:
+    """
+    Минимальная правка, превращающая "\\n".join(old) в "\\n".join(new).
+
+    Returns:
+        (позиция, сколько символов удалить, что вставить) или None, если
+        текст не изменился.
+    """
+    if list(old) == list(new):
+        return None
+
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    suffix = 0
+    while suffix < limit - start and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]:
+        suffix += 1
+
+    old_mid = old[start:len(old) - suffix]
+    new_mid = new[start:len(new) - suffix]
+    pos = sum(len(line) + 1 for line in old[:start])
+
+    if old_mid and new_mid:
+        return pos, len("\n".join(old_mid)), "\n".join(new_mid)
+
+    if old_mid:
+        # Удаление целых строк вместе с одним разделителем
+        removed = len("\n".join(old_mid))
+        if start + len(old_mid) < len(old):
+            return pos, removed + 1, ""
+        if start > 0:
+            return pos - 1, removed + 1, ""
+        return pos, removed, ""
+
+    # Вставка целых строк
+    inserted = "\n".join(new_mid)
+    if start < len(old):
+        return pos, 0, inserted + "\n"
+    if old:
+        return pos - 1, 0, "\n" + inserted
+    return 0, 0, inserted
@@ -2,7 +2,7 @@
 """
 Главное окно приложения в стиле Windows 11 Settings
 """
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QCoreApplication, QThread
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QComboBox, QFrame, QStackedWidget, QSizePolicy
@@ -12,14 +12,7 @@ from PyQt6.QtGui import QIcon, QFont
 from ui.theme import THEMES, BUTTON_STYLE, COMMON_STYLE, BUTTON_HEIGHT
 from ui.sidebar import SideNavBar, SettingsCard, ActionButton
 from ui.custom_titlebar import DraggableWidget
-from ui.pages import (
-    HomePage, ControlPage, HostlistPage, NetrogatPage, CustomDomainsPage, IpsetPage, BlobsPage, CustomIpSetPage, EditorPage, DpiSettingsPage,
-    AutostartPage, NetworkPage, HostsPage, BlockcheckPage, AppearancePage, AboutPage, LogsPage, PremiumPage,
-    HelpPage, ServersPage, ConnectionTestPage, DNSCheckPage, OrchestraPage, OrchestraLockedPage, OrchestraBlockedPage, OrchestraWhitelistPage, OrchestraRatingsPage,
-    PresetConfigPage, StrategySortPage, Zapret2OrchestraStrategiesPage,
-    Zapret2DirectControlPage, Zapret2StrategiesPageNew, StrategyDetailPage,
-    Zapret1DirectStrategiesPage, BatStrategiesPage, PresetsPage, MyCategoriesPage
-)
+from ui.page_registry import PAGE_SPECS_BY_ATTR, PageRegistry
 
 import qtawesome as qta
 import sys, os
@@ -106,6 +99,15 @@ class MainWindowUI:
         # Подключаем сигналы
         self._connect_page_signals()
 
+        self._page_registry.finish_startup()
+        try:
+            from log import log
+            log(self.get_page_timing_report(), "DEBUG")
+        except Exception:
+            pass
+        if self.preload_pages_in_idle:
+            self.schedule_idle_page_preload()
+
         # Session memory: remember last opened direct_zapret2 category detail page.
         # (Used to restore context when re-opening the Strategies section.)
         if not hasattr(self, "_direct_zapret2_last_opened_category_key"):
@@ -113,203 +115,103 @@ class MainWindowUI:
         if not hasattr(self, "_direct_zapret2_restore_detail_on_open"):
             self._direct_zapret2_restore_detail_on_open = False  # type: ignore[attr-defined]
         
+    # Страницы, которые создаются в фоне после запуска (если включено preload_pages_in_idle)
+    preload_pages_in_idle: bool = False
+    # Задержка перед фоновым созданием страниц и пауза между страницами (мс)
+    PAGE_PRELOAD_DELAY_MS = 3000
+    PAGE_PRELOAD_STEP_MS = 50
+
+    # Страницы, показывающие текущую стратегию (update_current_strategy)
+    _STRATEGY_DISPLAY_PAGES = (
+        PageName.ZAPRET2_DIRECT_CONTROL,
+        PageName.ZAPRET2_DIRECT,
+        PageName.ZAPRET2_ORCHESTRA,
+        PageName.ZAPRET1_DIRECT,
+        PageName.BAT_STRATEGIES,
+    )
+
     def _create_pages(self):
-        """Создает все страницы контента"""
+        """
+        Создает реестр страниц.
 
-        # Главная страница
-        self.home_page = HomePage(self)
-        self.pages_stack.addWidget(self.home_page)
-        
-        # Управление
-        self.control_page = ControlPage(self)
-        self.pages_stack.addWidget(self.control_page)
-
-        # Zapret 2 Direct: управление (главная вкладка "Стратегии" для direct_zapret2)
-        self.zapret2_direct_control_page = Zapret2DirectControlPage(self)
-        self.pages_stack.addWidget(self.zapret2_direct_control_page)
-
-        # Zapret 2 Direct стратегии (NEW UI)
-        self.zapret2_strategies_page = Zapret2StrategiesPageNew(self)
-        self.pages_stack.addWidget(self.zapret2_strategies_page)
-
-        # Strategy Detail Page (for category drill-down)
-        self.strategy_detail_page = StrategyDetailPage(self)
-        self.pages_stack.addWidget(self.strategy_detail_page)
-
-        # Zapret 2 Orchestra стратегии
-        self.zapret2_orchestra_strategies_page = Zapret2OrchestraStrategiesPage(self)
-        self.pages_stack.addWidget(self.zapret2_orchestra_strategies_page)
-
-        # Zapret 1 Direct стратегии
-        self.zapret1_strategies_page = Zapret1DirectStrategiesPage(self)
-        self.pages_stack.addWidget(self.zapret1_strategies_page)
-
-        # BAT стратегии
-        self.bat_strategies_page = BatStrategiesPage(self)
-        self.pages_stack.addWidget(self.bat_strategies_page)
-
-        # Сортировка стратегий
-        self.strategy_sort_page = StrategySortPage(self)
-        self.pages_stack.addWidget(self.strategy_sort_page)
-
-        # Конфиг preset-zapret2.txt
-        self.preset_config_page = PresetConfigPage(self)
-        self.pages_stack.addWidget(self.preset_config_page)
-
-        # Мои категории (общий файл для direct режимов)
-        self.my_categories_page = MyCategoriesPage(self)
-        self.pages_stack.addWidget(self.my_categories_page)
-
-        # Hostlist
-        self.hostlist_page = HostlistPage(self)
-        self.pages_stack.addWidget(self.hostlist_page)
-
-        # IPset
-        self.ipset_page = IpsetPage(self)
-        self.pages_stack.addWidget(self.ipset_page)
-
-        # Блобы - управление бинарными данными для Zapret 2
-        self.blobs_page = BlobsPage(self)
-        self.pages_stack.addWidget(self.blobs_page)
-
-        # Редактор стратегий
-        self.editor_page = EditorPage(self)
-        self.pages_stack.addWidget(self.editor_page)
-
-        # Настройки DPI
-        self.dpi_settings_page = DpiSettingsPage(self)
-        self.pages_stack.addWidget(self.dpi_settings_page)
-
-        # Пресеты настроек (только direct_zapret2)
-        self.presets_page = PresetsPage(self)
-        self.pages_stack.addWidget(self.presets_page)
-
-        # === МОИ СПИСКИ ===
-        # Исключения netrogat.txt
-        self.netrogat_page = NetrogatPage(self)
-        self.pages_stack.addWidget(self.netrogat_page)
-
-        # Мои домены - управление other2.txt
-        self.custom_domains_page = CustomDomainsPage(self)
-        self.pages_stack.addWidget(self.custom_domains_page)
-
-        # Мои IP - управление my-ipset.txt
-        self.custom_ipset_page = CustomIpSetPage(self)
-        self.pages_stack.addWidget(self.custom_ipset_page)
-        # === КОНЕЦ МОИ СПИСКИ ===
-
-        # Автозапуск
-        self.autostart_page = AutostartPage(self)
-        self.pages_stack.addWidget(self.autostart_page)
-
-        # Сеть
-        self.network_page = NetworkPage(self)
-        self.pages_stack.addWidget(self.network_page)
-
-        # Диагностика соединения
-        self.connection_page = ConnectionTestPage(self)
-        self.pages_stack.addWidget(self.connection_page)
-
-        # DNS подмена - подпункт диагностики
-        self.dns_check_page = DNSCheckPage(self)
-        self.pages_stack.addWidget(self.dns_check_page)
-
-        # Hosts - разблокировка сервисов
-        self.hosts_page = HostsPage(self)
-        self.pages_stack.addWidget(self.hosts_page)
-
-        # BlockCheck
-        self.blockcheck_page = BlockcheckPage(self)
-        self.pages_stack.addWidget(self.blockcheck_page)
-
-        # Оформление
-        self.appearance_page = AppearancePage(self)
-        self.pages_stack.addWidget(self.appearance_page)
-
-        # Premium
-        self.premium_page = PremiumPage(self)
-        self.pages_stack.addWidget(self.premium_page)
-
-        # Логи
-        self.logs_page = LogsPage(self)
-        self.pages_stack.addWidget(self.logs_page)
-
-        # Серверы обновлений
-        self.servers_page = ServersPage(self)
-        self.pages_stack.addWidget(self.servers_page)
-
-        # О программе
-        self.about_page = AboutPage(self)
-        self.pages_stack.addWidget(self.about_page)
-
-        # Справка (подпункт "О программе")
-        self.help_page = HelpPage(self)
-        self.pages_stack.addWidget(self.help_page)
-
-        # Оркестр - автообучение (скрытая вкладка)
-        self.orchestra_page = OrchestraPage(self)
-        self.pages_stack.addWidget(self.orchestra_page)
-
-        # Залоченные стратегии оркестратора (вместо Hostlist при оркестраторе)
-        self.orchestra_locked_page = OrchestraLockedPage(self)
-        self.pages_stack.addWidget(self.orchestra_locked_page)
-
-        # Заблокированные стратегии оркестратора (вместо IPset при оркестраторе)
-        self.orchestra_blocked_page = OrchestraBlockedPage(self)
-        self.pages_stack.addWidget(self.orchestra_blocked_page)
-
-        # Белый список оркестратора (вместо Исключений при оркестраторе)
-        self.orchestra_whitelist_page = OrchestraWhitelistPage(self)
-        self.pages_stack.addWidget(self.orchestra_whitelist_page)
-
-        # История стратегий с рейтингами
-        self.orchestra_ratings_page = OrchestraRatingsPage(self)
-        self.pages_stack.addWidget(self.orchestra_ratings_page)
-
-        # Реестр страниц по имени (для навигации без индексов)
-        self.pages: dict[PageName, QWidget] = {
-            PageName.HOME: self.home_page,
-            PageName.CONTROL: self.control_page,
-            PageName.ZAPRET2_DIRECT_CONTROL: self.zapret2_direct_control_page,
-            PageName.ZAPRET2_DIRECT: self.zapret2_strategies_page,
-            PageName.STRATEGY_DETAIL: self.strategy_detail_page,
-            PageName.ZAPRET2_ORCHESTRA: self.zapret2_orchestra_strategies_page,
-            PageName.ZAPRET1_DIRECT: self.zapret1_strategies_page,
-            PageName.BAT_STRATEGIES: self.bat_strategies_page,
-            PageName.STRATEGY_SORT: self.strategy_sort_page,
-            PageName.PRESET_CONFIG: self.preset_config_page,
-            PageName.MY_CATEGORIES: self.my_categories_page,
-            PageName.HOSTLIST: self.hostlist_page,
-            PageName.IPSET: self.ipset_page,
-            PageName.BLOBS: self.blobs_page,
-            PageName.EDITOR: self.editor_page,
-            PageName.DPI_SETTINGS: self.dpi_settings_page,
-            PageName.PRESETS: self.presets_page,
-            PageName.NETROGAT: self.netrogat_page,
-            PageName.CUSTOM_DOMAINS: self.custom_domains_page,
-            PageName.CUSTOM_IPSET: self.custom_ipset_page,
-            PageName.AUTOSTART: self.autostart_page,
-            PageName.NETWORK: self.network_page,
-            PageName.CONNECTION_TEST: self.connection_page,
-            PageName.DNS_CHECK: self.dns_check_page,
-            PageName.HOSTS: self.hosts_page,
-            PageName.BLOCKCHECK: self.blockcheck_page,
-            PageName.APPEARANCE: self.appearance_page,
-            PageName.PREMIUM: self.premium_page,
-            PageName.LOGS: self.logs_page,
-            PageName.SERVERS: self.servers_page,
-            PageName.ABOUT: self.about_page,
-            PageName.HELP: self.help_page,
-            PageName.ORCHESTRA: self.orchestra_page,
-            PageName.ORCHESTRA_LOCKED: self.orchestra_locked_page,
-            PageName.ORCHESTRA_BLOCKED: self.orchestra_blocked_page,
-            PageName.ORCHESTRA_WHITELIST: self.orchestra_whitelist_page,
-            PageName.ORCHESTRA_RATINGS: self.orchestra_ratings_page,
-        }
+        При запуске создаются только страницы с eager=True (см. ui/page_registry.py),
+        остальные - при первом show_page()/get_page() или обращении к атрибуту
+        окна (self.hostlist_page и т.п.).
+        """
+        # Реестр страниц по имени (для навигации без индексов): только созданные страницы
+        self.pages: dict[PageName, QWidget] = {}
+        self._last_strategy_display = None
+        self._page_registry = PageRegistry(
+            construct=lambda page_cls: page_cls(self),
+            add_page=self._add_created_page,
+            on_created=self._on_page_created,
+            can_create=self._in_gui_thread,
+        )
+        self._page_registry.create_eager()
+
+    @staticmethod
+    def _in_gui_thread() -> bool:
+        """Страницы создаются только в GUI-потоке (рабочие потоки получают None/AttributeError)"""
+        app = QCoreApplication.instance()
+        return app is None or QThread.currentThread() is app.thread()
+
+    def _add_created_page(self, spec, page: QWidget) -> None:
+        self.pages_stack.addWidget(page)
+        setattr(self, spec.attr, page)
+        self.pages[spec.name] = page
+
+    def __getattr__(self, name: str):
+        # Вызывается только если обычный поиск атрибута не нашёл его:
+        # self.hostlist_page и т.п. создают страницу при первом обращении.
+        spec = PAGE_SPECS_BY_ATTR.get(name)
+        registry = self.__dict__.get("_page_registry") if spec is not None else None
+        if registry is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        try:
+            return registry.get(spec.name)
+        except Exception as e:
+            from log import log
+            log(f"Ошибка создания страницы {spec.name.name}: {e}", "ERROR")
+            raise AttributeError(name) from e
 
     def get_page(self, name: PageName) -> QWidget:
-        """Возвращает виджет страницы по имени"""
-        return self.pages.get(name)
+        """Возвращает виджет страницы по имени (создаёт при первом обращении)"""
+        try:
+            return self._page_registry.get(name)
+        except Exception as e:
+            from log import log
+            log(f"Ошибка создания страницы {name}: {e}", "ERROR")
+            return None
+
+    def get_loaded_page(self, name: PageName) -> QWidget:
+        """Возвращает страницу только если она уже создана (без создания)"""
+        registry = self.__dict__.get("_page_registry")
+        return registry.get_loaded(name) if registry is not None else None
+
+    def get_page_timing_report(self) -> str:
+        """Отчёт о времени создания страниц (импорт / конструктор / сигналы)"""
+        return self._page_registry.format_report()
+
+    def schedule_idle_page_preload(self, names=None, delay_ms: int = None) -> None:
+        """
+        Создаёт ещё не созданные страницы в фоне, по одной за итерацию
+        цикла событий, чтобы первое открытие было мгновенным.
+        """
+        from PyQt6.QtCore import QTimer
+
+        queue = list(names) if names is not None else self._page_registry.pending_names()
+
+        def _step():
+            while queue:
+                name = queue.pop(0)
+                if self._page_registry.is_loaded(name):
+                    continue
+                self.get_page(name)
+                break
+            if queue:
+                QTimer.singleShot(self.PAGE_PRELOAD_STEP_MS, _step)
+
+        QTimer.singleShot(self.PAGE_PRELOAD_DELAY_MS if delay_ms is None else delay_ms, _step)
 
     def _dismiss_transient_ui(self, *, reason: str = "") -> None:
         """
@@ -357,8 +259,9 @@ class MainWindowUI:
         except Exception:
             pass
         try:
-            if hasattr(self, "strategy_detail_page"):
-                self.strategy_detail_page._close_preview_dialog(force=True)  # type: ignore[attr-defined]
+            detail = self.get_loaded_page(PageName.STRATEGY_DETAIL)
+            if detail is not None:
+                detail._close_preview_dialog(force=True)  # type: ignore[attr-defined]
         except Exception:
             pass
 
@@ -482,7 +385,7 @@ class MainWindowUI:
         except Exception:
             pass
 
-        page = self.pages.get(name)
+        page = self.get_page(name)
         if page:
             self.pages_stack.setCurrentWidget(page)
             return True
@@ -512,42 +415,18 @@ class MainWindowUI:
         self.subscription_btn = self.about_page.premium_btn
         
     def _connect_page_signals(self):
-        """Подключает сигналы от страниц"""
+        """
+        Подключает сигналы страниц, создаваемых при запуске.
+
+        Сигналы страниц, создаваемых по требованию, подключаются в
+        _on_page_created() - в момент создания страницы.
+        """
         
         # Сигналы-прокси для основного класса
         self.start_clicked = self.home_page.start_btn.clicked
         self.stop_clicked = self.home_page.stop_btn.clicked
         self.theme_changed = self.appearance_page.theme_changed
 
-        # Zapret 1 Direct сигналы
-        if hasattr(self, 'zapret1_strategies_page') and hasattr(self.zapret1_strategies_page, 'strategy_selected'):
-            self.zapret1_strategies_page.strategy_selected.connect(self._on_strategy_selected_from_page)
-
-        # Zapret 2 Direct сигналы
-        if hasattr(self, 'zapret2_strategies_page') and hasattr(self.zapret2_strategies_page, 'strategy_selected'):
-            self.zapret2_strategies_page.strategy_selected.connect(self._on_strategy_selected_from_page)
-
-        # Zapret 2 NEW UI - navigation signals
-        if hasattr(self, 'zapret2_strategies_page') and hasattr(self.zapret2_strategies_page, 'open_category_detail'):
-            self.zapret2_strategies_page.open_category_detail.connect(self._on_open_category_detail)
-
-        # Strategy Detail Page signals
-        if hasattr(self, 'strategy_detail_page'):
-            if hasattr(self.strategy_detail_page, 'back_clicked'):
-                self.strategy_detail_page.back_clicked.connect(self._on_strategy_detail_back)
-            if hasattr(self.strategy_detail_page, 'strategy_selected'):
-                self.strategy_detail_page.strategy_selected.connect(self._on_strategy_detail_selected)
-            if hasattr(self.strategy_detail_page, 'filter_mode_changed'):
-                self.strategy_detail_page.filter_mode_changed.connect(self._on_strategy_detail_filter_mode_changed)
-
-        # Zapret 2 Orchestra сигналы
-        if hasattr(self, 'zapret2_orchestra_strategies_page') and hasattr(self.zapret2_orchestra_strategies_page, 'strategy_selected'):
-            self.zapret2_orchestra_strategies_page.strategy_selected.connect(self._on_strategy_selected_from_page)
-
-        # BAT страница сигналы
-        if hasattr(self, 'bat_strategies_page') and hasattr(self.bat_strategies_page, 'strategy_selected'):
-            self.bat_strategies_page.strategy_selected.connect(self._on_strategy_selected_from_page)
-
         # Сигналы от страницы автозапуска
         self.autostart_page.autostart_enabled.connect(self._on_autostart_enabled)
         self.autostart_page.autostart_disabled.connect(self._on_autostart_disabled)
@@ -565,13 +444,12 @@ class MainWindowUI:
 
         # Direct-zapret2: дублируем кнопки на главную вкладку "Стратегии".
         try:
-            page = getattr(self, "zapret2_direct_control_page", None)
-            if page is not None:
-                page.start_btn.clicked.connect(self._proxy_start_click)
-                page.stop_winws_btn.clicked.connect(self._proxy_stop_click)
-                page.stop_and_exit_btn.clicked.connect(self._proxy_stop_and_exit)
-                page.test_btn.clicked.connect(self._proxy_test_click)
-                page.folder_btn.clicked.connect(self._proxy_folder_click)
+            page = self.zapret2_direct_control_page
+            page.start_btn.clicked.connect(self._proxy_start_click)
+            page.stop_winws_btn.clicked.connect(self._proxy_stop_click)
+            page.stop_and_exit_btn.clicked.connect(self._proxy_stop_and_exit)
+            page.test_btn.clicked.connect(self._proxy_test_click)
+            page.folder_btn.clicked.connect(self._proxy_folder_click)
         except Exception:
             pass
         
@@ -593,33 +471,67 @@ class MainWindowUI:
         if hasattr(self.about_page, 'premium_btn'):
             self.about_page.premium_btn.clicked.connect(self._open_subscription_dialog)
         
-        # Подключаем сигнал обновления подписки от PremiumPage
-        if hasattr(self.premium_page, 'subscription_updated'):
-            self.premium_page.subscription_updated.connect(self._on_subscription_updated)
-        
         # Подключаем смену метода запуска стратегий (от страницы настроек DPI)
         self.dpi_settings_page.launch_method_changed.connect(self._on_launch_method_changed)
 
-        # Подключаем обновление PresetConfigPage при смене метода запуска
-        self.dpi_settings_page.launch_method_changed.connect(self.preset_config_page.refresh_for_current_mode)
+    def _on_page_created(self, spec, page: QWidget) -> None:
+        """Подключает сигналы страницы сразу после её создания (при запуске или по требованию)"""
+        name = spec.name
+
+        # Страницы, испускающие strategy_selected(strategy_id, strategy_name)
+        if name in (
+            PageName.ZAPRET1_DIRECT,
+            PageName.ZAPRET2_DIRECT,
+            PageName.ZAPRET2_ORCHESTRA,
+            PageName.BAT_STRATEGIES,
+        ) and hasattr(page, 'strategy_selected'):
+            page.strategy_selected.connect(self._on_strategy_selected_from_page)
+
+        if name == PageName.ZAPRET2_DIRECT:
+            # Zapret 2 NEW UI - navigation signals
+            if hasattr(page, 'open_category_detail'):
+                page.open_category_detail.connect(self._on_open_category_detail)
+
+            # Связываем страницу сортировки со страницей стратегий (асинхронное обновление фильтров)
+            def _link_sort_page(sort_page):
+                if hasattr(page, 'on_external_filters_changed'):
+                    sort_page.filters_changed.connect(page.on_external_filters_changed)
+                if hasattr(page, 'on_external_sort_changed'):
+                    sort_page.sort_changed.connect(page.on_external_sort_changed)
+
+            self._page_registry.when_created(PageName.STRATEGY_SORT, _link_sort_page)
+
+        elif name == PageName.STRATEGY_DETAIL:
+            if hasattr(page, 'back_clicked'):
+                page.back_clicked.connect(self._on_strategy_detail_back)
+            if hasattr(page, 'strategy_selected'):
+                page.strategy_selected.connect(self._on_strategy_detail_selected)
+            if hasattr(page, 'filter_mode_changed'):
+                page.filter_mode_changed.connect(self._on_strategy_detail_filter_mode_changed)
+
+        elif name == PageName.PREMIUM:
+            # Сигнал обновления подписки от PremiumPage
+            if hasattr(page, 'subscription_updated'):
+                page.subscription_updated.connect(self._on_subscription_updated)
+
+        elif name == PageName.PRESET_CONFIG:
+            # Обновление PresetConfigPage при смене метода запуска
+            self._page_registry.when_created(
+                PageName.DPI_SETTINGS,
+                lambda dpi_page: dpi_page.launch_method_changed.connect(page.refresh_for_current_mode),
+            )
 
-        # Подключаем сигналы от OrchestraPage
-        if hasattr(self, 'orchestra_page'):
-            self.orchestra_page.clear_learned_requested.connect(self._on_clear_learned_requested)
+        elif name == PageName.ORCHESTRA:
+            page.clear_learned_requested.connect(self._on_clear_learned_requested)
 
-        # Связываем страницу сортировки со страницей стратегий (асинхронное обновление фильтров)
-        if hasattr(self.zapret2_strategies_page, 'on_external_filters_changed'):
-            self.strategy_sort_page.filters_changed.connect(
-                self.zapret2_strategies_page.on_external_filters_changed
-            )
-        if hasattr(self.zapret2_strategies_page, 'on_external_sort_changed'):
-            self.strategy_sort_page.sort_changed.connect(
-                self.zapret2_strategies_page.on_external_sort_changed
-            )
+        elif name == PageName.PRESETS:
+            if hasattr(page, 'preset_switched'):
+                page.preset_switched.connect(self._on_preset_switched)
 
-        # Подключаем сигналы от PresetsPage
-        if hasattr(self, 'presets_page') and hasattr(self.presets_page, 'preset_switched'):
-            self.presets_page.preset_switched.connect(self._on_preset_switched)
+        # Страница стратегий, созданная после выбора стратегии, показывает актуальное имя
+        if self._last_strategy_display and name in self._STRATEGY_DISPLAY_PAGES:
+            if hasattr(page, 'update_current_strategy'):
+                page.update_current_strategy(self._last_strategy_display)
 
     def _on_preset_switched(self, preset_name: str):
         """Обработчик переключения пресета - перезапускает DPI если запущен"""
@@ -653,7 +565,7 @@ class MainWindowUI:
 
         # Стратегии (direct_zapret2) — обновить выборы/бейджи без перестроения реестра
         try:
-            page = getattr(self, "zapret2_strategies_page", None)
+            page = self.get_loaded_page(PageName.ZAPRET2_DIRECT)
             if page and hasattr(page, "refresh_from_preset_switch"):
                 page.refresh_from_preset_switch()
         except Exception as e:
@@ -661,7 +573,7 @@ class MainWindowUI:
 
         # Детальная страница категории — если открыта, перечитать настройки/выбор из пресета
         try:
-            detail = getattr(self, "strategy_detail_page", None)
+            detail = self.get_loaded_page(PageName.STRATEGY_DETAIL)
             if detail and hasattr(detail, "refresh_from_preset_switch"):
                 detail.refresh_from_preset_switch()
         except Exception as e:
@@ -760,14 +672,16 @@ class MainWindowUI:
         # NOTE: Другие режимы (orchestra, zapret1, bat) НЕ используют preset-zapret2.txt
         
         # Перезагружаем страницы стратегий для нового режима
-        if hasattr(self, 'zapret2_strategies_page') and hasattr(self.zapret2_strategies_page, 'reload_for_mode_change'):
-            self.zapret2_strategies_page.reload_for_mode_change()
-        if hasattr(self, 'zapret2_orchestra_strategies_page') and hasattr(self.zapret2_orchestra_strategies_page, 'reload_for_mode_change'):
-            self.zapret2_orchestra_strategies_page.reload_for_mode_change()
-        if hasattr(self, 'zapret1_strategies_page') and hasattr(self.zapret1_strategies_page, 'reload_for_mode_change'):
-            self.zapret1_strategies_page.reload_for_mode_change()
-        if hasattr(self, 'bat_strategies_page') and hasattr(self.bat_strategies_page, 'reload_for_mode_change'):
-            self.bat_strategies_page.reload_for_mode_change()
+        # (ещё не созданные страницы загрузятся для нового режима при создании)
+        for page_name in (
+            PageName.ZAPRET2_DIRECT,
+            PageName.ZAPRET2_ORCHESTRA,
+            PageName.ZAPRET1_DIRECT,
+            PageName.BAT_STRATEGIES,
+        ):
+            page = self.get_loaded_page(page_name)
+            if page is not None and hasattr(page, 'reload_for_mode_change'):
+                page.reload_for_mode_change()
         
         # Обновляем видимость подпунктов в группе "Стратегии" в сайдбаре
         if hasattr(self, 'side_nav') and hasattr(self.side_nav, 'update_strategies_submenu_visibility'):
@@ -809,16 +723,16 @@ class MainWindowUI:
             current = None
 
         strategies_context_pages = set()
-        for attr in (
-            "dpi_settings_page",
-            "zapret2_strategies_page",
-            "zapret2_orchestra_strategies_page",
-            "zapret1_strategies_page",
-            "bat_strategies_page",
-            "strategy_detail_page",
-            "strategy_sort_page",
+        for page_name in (
+            PageName.DPI_SETTINGS,
+            PageName.ZAPRET2_DIRECT,
+            PageName.ZAPRET2_ORCHESTRA,
+            PageName.ZAPRET1_DIRECT,
+            PageName.BAT_STRATEGIES,
+            PageName.STRATEGY_DETAIL,
+            PageName.STRATEGY_SORT,
         ):
-            page = getattr(self, attr, None)
+            page = self.get_loaded_page(page_name)
             if page is not None:
                 strategies_context_pages.add(page)
 
@@ -916,15 +830,17 @@ class MainWindowUI:
                         self.current_strategy_name = last_strategy
                     
                     # Обновляем отображение на странице BAT стратегий
-                    if hasattr(self, 'bat_strategies_page') and hasattr(self.bat_strategies_page, 'current_strategy_label'):
-                        self.bat_strategies_page.current_strategy_label.setText(f"🎯 {last_strategy}")
+                    bat_page = self.get_loaded_page(PageName.BAT_STRATEGIES)
+                    if bat_page is not None and hasattr(bat_page, 'current_strategy_label'):
+                        bat_page.current_strategy_label.setText(f"🎯 {last_strategy}")
                 else:
                     log("⏸️ BAT режим: нет сохранённой стратегии для автозапуска", "INFO")
-                    if hasattr(self, 'bat_strategies_page'):
-                        if hasattr(self.bat_strategies_page, 'show_success'):
-                            self.bat_strategies_page.show_success()
-                        if hasattr(self.bat_strategies_page, 'current_strategy_label'):
-                            self.bat_strategies_page.current_strategy_label.setText("Не выбрана")
+                    bat_page = self.get_loaded_page(PageName.BAT_STRATEGIES)
+                    if bat_page is not None:
+                        if hasattr(bat_page, 'show_success'):
+                            bat_page.show_success()
+                        if hasattr(bat_page, 'current_strategy_label'):
+                            bat_page.current_strategy_label.setText("Не выбрана")
 
             # Запускаем мониторинг процесса на соответствующей странице
             # (каждая страница стратегий имеет свой мониторинг)
@@ -1068,15 +984,11 @@ class MainWindowUI:
         except Exception:
             pass
 
-        # Обновляем на активных страницах стратегий (если метод есть)
-        for page_attr in (
-            'zapret2_direct_control_page',
-            'zapret2_strategies_page',
-            'zapret2_orchestra_strategies_page',
-            'zapret1_strategies_page',
-            'bat_strategies_page',
-        ):
-            page = getattr(self, page_attr, None)
+        # Обновляем на активных страницах стратегий (если метод есть);
+        # страницы, созданные позже, получат имя в _on_page_created()
+        self._last_strategy_display = strategy_name
+        for page_name in self._STRATEGY_DISPLAY_PAGES:
+            page = self.get_loaded_page(page_name)
             if page and hasattr(page, 'update_current_strategy'):
                 page.update_current_strategy(strategy_name)
 
@@ -1163,7 +1075,7 @@ class MainWindowUI:
 
         # direct_zapret2: Zapret2StrategiesPageNew emits (category_key, strategy_id).
         # Do NOT treat it as a single global "strategy", otherwise UI shows a phantom name.
-        if launch_method == "direct_zapret2" and sender is getattr(self, "zapret2_strategies_page", None):
+        if launch_method == "direct_zapret2" and sender is not None and sender is self.get_loaded_page(PageName.ZAPRET2_DIRECT):
             category_key = strategy_id
             category_strategy_id = strategy_name
             log(f"Direct Zapret2 selection: {category_key} = {category_strategy_id}", "DEBUG")
@@ -1253,14 +1165,17 @@ class MainWindowUI:
         log(f"Strategy selected from detail: {category_key} = {strategy_id}", "INFO")
 
         # Update the parent StrategiesPage to reflect the selection
-        if hasattr(self, 'zapret2_strategies_page') and hasattr(self.zapret2_strategies_page, 'apply_strategy_selection'):
-            self.zapret2_strategies_page.apply_strategy_selection(category_key, strategy_id)
+        # (a page that is not created yet reads the selection from the preset on creation)
+        page = self.get_loaded_page(PageName.ZAPRET2_DIRECT)
+        if page is not None and hasattr(page, 'apply_strategy_selection'):
+            page.apply_strategy_selection(category_key, strategy_id)
 
     def _on_strategy_detail_filter_mode_changed(self, category_key: str, filter_mode: str):
         """Keep main strategies page in sync with Hostlist/IPset toggle."""
         try:
-            if hasattr(self, 'zapret2_strategies_page') and hasattr(self.zapret2_strategies_page, 'apply_filter_mode_change'):
-                self.zapret2_strategies_page.apply_filter_mode_change(category_key, filter_mode)
+            page = self.get_loaded_page(PageName.ZAPRET2_DIRECT)
+            if page is not None and hasattr(page, 'apply_filter_mode_change'):
+                page.apply_filter_mode_change(category_key, filter_mode)
         except Exception as e:
             from log import log
             log(f"Ошибка обновления filter_mode из StrategyDetailPage: {e}", "DEBUG")
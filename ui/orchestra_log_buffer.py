@@ -0,0 +1,117 @@
+# ui/orchestra_log_buffer.py
+"""
+Кольцевой буфер строк лога оркестратора с готовым индексом для фильтров.
+
+Раньше OrchestraPage хранила строки в списке и пересоздавала срез при
+переполнении, а при каждой смене фильтра заново проверяла каждую строку
+(text.lower()/text.upper() на строку) и добавляла их в QTextEdit по одной.
+
+LogRingBuffer - deque(maxlen): старые строки вытесняются за O(1). Для каждой
+строки один раз при добавлении считаются текст в нижнем регистре (поиск по
+домену) и битовая маска протокола/статуса, поэтому фильтр - это сравнение
+маски и поиск подстроки без повторного разбора.
+
+Модуль не импортирует Qt.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Iterator, List, NamedTuple
+
+# Максимум строк лога в памяти (и блоков в виджете)
+LOG_MAX_LINES = 5000
+
+# Флаги протокола/статуса строки
+FLAG_TLS = 1
+FLAG_HTTP = 2
+FLAG_UDP = 4
+FLAG_SUCCESS = 8
+FLAG_FAIL = 16
+
+# Пункты комбобокса фильтра -> флаг (0 - без фильтра)
+PROTOCOL_FILTER_FLAGS = {
+    "Все": 0,
+    "TLS": FLAG_TLS,
+    "HTTP": FLAG_HTTP,
+    "UDP": FLAG_UDP,
+    "SUCCESS": FLAG_SUCCESS,
+    "FAIL": FLAG_FAIL,
+}
+
+
+def classify_line(text: str) -> int:
+    """Маска протокола/статуса строки (те же правила, что у прежнего фильтра)"""
+    upper = text.upper()
+    flags = 0
+    if "TLS" in upper:
+        flags |= FLAG_TLS
+    if "HTTP" in upper:
+        flags |= FLAG_HTTP
+    if "UDP" in upper:
+        flags |= FLAG_UDP
+    if "SUCCESS" in upper or "✓" in text:
+        flags |= FLAG_SUCCESS
+    if "FAIL" in upper or "✗" in text or "X " in text:
+        flags |= FLAG_FAIL
+    return flags
+
+
+class LogEntry(NamedTuple):
+    """Строка лога с индексом для фильтра"""
+    text: str
+    lower: str  # для поиска по домену
+    flags: int
+
+
+class LogFilter(NamedTuple):
+    """Текущий фильтр: подстрока (в нижнем регистре) и флаг протокола/статуса"""
+    needle: str = ""
+    flag: int = 0
+
+    @classmethod
+    def from_ui(cls, domain_text: str, protocol_text: str) -> "LogFilter":
+        return cls(domain_text.strip().lower(), PROTOCOL_FILTER_FLAGS.get(protocol_text, 0))
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.needle and not self.flag
+
+    def matches(self, entry: LogEntry) -> bool:
+        if self.flag and not entry.flags & self.flag:
+            return False
+        return not self.needle or self.needle in entry.lower
+
+
+class LogRingBuffer:
+    """Последние maxlen строк лога"""
+
+    def __init__(self, maxlen: int = LOG_MAX_LINES):
+        self._entries: deque = deque(maxlen=maxlen)
+
+    @property
+    def maxlen(self) -> int:
+        return self._entries.maxlen
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(self._entries)
+
+    def append(self, text: str) -> LogEntry:
+        entry = LogEntry(text, text.lower(), classify_line(text))
+        self._entries.append(entry)
+        return entry
+
+    def extend(self, lines: Iterable[str]) -> List[LogEntry]:
+        return [self.append(text) for text in lines]
+
+    def clear(self):
+        self._entries.clear()
+
+    def filtered(self, log_filter: LogFilter) -> List[str]:
+        """Строки, проходящие фильтр, в порядке поступления"""
+        if log_filter.is_empty:
+            return [entry.text for entry in self._entries]
+        return [entry.text for entry in self._entries if log_filter.matches(entry)]
@@ -0,0 +1,163 @@
+# ui/orchestra_rows_model.py
+"""
+Хранилище строк для таблиц залоченных и заблокированных стратегий оркестратора.
+
+Раньше OrchestraLockedPage/OrchestraBlockedPage на каждое обновление удаляли
+и заново создавали виджет-ряд (QFrame + QSpinBox + кнопки) для каждого хоста -
+после недели обучения это тысячи виджетов, секунды на открытие страницы и
+сотни МБ памяти.
+
+Теперь страницы показывают QTableView поверх модели (ui/widgets/strategy_rows_view.py),
+а данные лежат в SortedRows: отсортированный список строк с индексом по ключу.
+Позиция строки ищется бинарным поиском, поэтому LOCK/UNLOCK от оркестратора
+превращаются в одну вставку/удаление строки модели вместо полной перестройки.
+
+Модуль не импортирует Qt.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class StrategyRow(NamedTuple):
+    """Одна строка таблицы: стратегия для хоста в askey-профиле"""
+    host: str
+    askey: str
+    strategy: int
+    is_default: bool = False  # системная блокировка (только для чёрного списка)
+
+
+KeyFunc = Callable[[StrategyRow], Hashable]
+SortKeyFunc = Callable[[StrategyRow], Tuple]
+
+
+# ═══════════════════════════════════════════════════════════════
+# КЛЮЧИ
+# ═══════════════════════════════════════════════════════════════
+# Ключ сортировки обязан однозначно определять строку (включает сам ключ),
+# иначе бинарный поиск может найти соседнюю строку.
+
+def locked_row_key(row: StrategyRow) -> Tuple[str, str]:
+    """Залоченная стратегия: одна на (хост, askey)"""
+    return row.host, row.askey
+
+
+def locked_sort_key(row: StrategyRow) -> Tuple:
+    """По алфавиту хостов"""
+    return row.host.lower(), row.host, row.askey
+
+
+def blocked_row_key(row: StrategyRow) -> Tuple[str, str, int]:
+    """Заблокированных стратегий у хоста может быть несколько"""
+    return row.host, row.askey, row.strategy
+
+
+def blocked_sort_key(row: StrategyRow) -> Tuple:
+    """Сначала пользовательские, потом системные, внутри групп по алфавиту"""
+    return row.is_default, row.host.lower(), row.host, row.askey, row.strategy
+
+
+# ═══════════════════════════════════════════════════════════════
+# ХРАНИЛИЩЕ
+# ═══════════════════════════════════════════════════════════════
+
+class SortedRows:
+    """
+    Отсортированный список строк с индексом ключ -> строка.
+
+    Индексы позиций не хранятся (они сдвигаются при каждой вставке):
+    позиция строки находится бинарным поиском по её ключу сортировки.
+    """
+
+    def __init__(self, key_func: KeyFunc, sort_key_func: SortKeyFunc):
+        self.key_func = key_func
+        self.sort_key_func = sort_key_func
+        self._rows: List[StrategyRow] = []
+        self._sort_keys: List[Tuple] = []
+        self._by_key: Dict[Hashable, StrategyRow] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index: int) -> StrategyRow:
+        return self._rows[index]
+
+    def __iter__(self) -> Iterator[StrategyRow]:
+        return iter(self._rows)
+
+    def reset(self, rows: Iterable[StrategyRow]):
+        """Полная замена содержимого (загрузка из реестра)"""
+        self._by_key = {self.key_func(row): row for row in rows}
+        self._rows = sorted(self._by_key.values(), key=self.sort_key_func)
+        self._sort_keys = [self.sort_key_func(row) for row in self._rows]
+
+    def get(self, key: Hashable) -> Optional[StrategyRow]:
+        return self._by_key.get(key)
+
+    def find(self, key: Hashable) -> Optional[int]:
+        """Позиция строки с ключом key или None"""
+        row = self._by_key.get(key)
+        if row is None:
+            return None
+        return bisect_left(self._sort_keys, self.sort_key_func(row))
+
+    def insert_position(self, row: StrategyRow) -> int:
+        """Позиция, на которую встанет новая строка"""
+        return bisect_left(self._sort_keys, self.sort_key_func(row))
+
+    def insert(self, row: StrategyRow) -> int:
+        """Вставляет строку с новым ключом, возвращает её позицию"""
+        key = self.key_func(row)
+        if key in self._by_key:
+            raise KeyError(f"Строка {key!r} уже есть")
+        sort_key = self.sort_key_func(row)
+        index = bisect_left(self._sort_keys, sort_key)
+        self._rows.insert(index, row)
+        self._sort_keys.insert(index, sort_key)
+        self._by_key[key] = row
+        return index
+
+    def replace(self, index: int, row: StrategyRow):
+        """Заменяет строку на месте (ключ и ключ сортировки не меняются)"""
+        if self.sort_key_func(row) != self._sort_keys[index]:
+            raise ValueError("Замена на месте меняет порядок строк")
+        self._rows[index] = row
+        self._by_key[self.key_func(row)] = row
+
+    def pop(self, index: int) -> StrategyRow:
+        row = self._rows.pop(index)
+        del self._sort_keys[index]
+        del self._by_key[self.key_func(row)]
+        return row
+
+    def can_replace(self, index: int, row: StrategyRow) -> bool:
+        """Можно ли заменить строку на месте без изменения порядка"""
+        return self.sort_key_func(row) == self._sort_keys[index]
+
+
+# ═══════════════════════════════════════════════════════════════
+# СБОР СТРОК ИЗ ДАННЫХ МЕНЕДЖЕРОВ
+# ═══════════════════════════════════════════════════════════════
+
+def locked_rows(locked_by_askey: Mapping[str, Mapping[str, int]]) -> List[StrategyRow]:
+    """{askey: {host: strategy}} -> строки"""
+    return [
+        StrategyRow(host, askey, strategy)
+        for askey, hosts in locked_by_askey.items()
+        for host, strategy in hosts.items()
+    ]
+
+
+def blocked_rows(
+    blocked_by_askey: Mapping[str, Mapping[str, Iterable[int]]],
+    is_default: Callable[[str, int, str], bool],
+) -> List[StrategyRow]:
+    """{askey: {host: [strategy, ...]}} -> строки; is_default(host, strategy, askey)"""
+    return [
+        StrategyRow(host, askey, strategy, is_default(host, strategy, askey))
+        for askey, hosts in blocked_by_askey.items()
+        for host, strategies in hosts.items()
+        for strategy in strategies
+    ]
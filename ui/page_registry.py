@@ -0,0 +1,264 @@
+# ui/page_registry.py
+"""
+Реестр страниц главного окна с ленивым созданием.
+
+Раньше MainWindowUI._create_pages создавал все ~35 страниц при запуске, а
+ui/pages/__init__.py импортировал все их модули. Большинство пользователей
+открывают 3-4 страницы, поэтому теперь при запуске создаются только
+страницы с eager=True (на них ссылается код совместимости и менеджеры),
+остальные - при первом обращении: show_page(), get_page() или атрибут
+окна (self.hostlist_page и т.п.).
+
+Для каждой страницы замеряется время импорта модуля, конструктора и
+подключения сигналов - format_report() выводит разбивку по страницам.
+
+Модуль не импортирует Qt: фабрика страниц и добавление в стек передаются
+снаружи.
+"""
+
+from __future__ import annotations
+
+import importlib
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from startup.profiler import startup_profiler
+from ui.page_names import PageName
+
+try:
+    from log import log
+except ImportError:
+    def log(msg, level="INFO"):
+        print(f"[{level}] {msg}")
+
+
+class PageSpec(NamedTuple):
+    """Описание страницы: имя, атрибут окна, модуль и класс"""
+    name: PageName
+    attr: str
+    module: str
+    class_name: str
+    eager: bool = False  # создаётся при запуске
+
+
+# Порядок совпадает с прежним порядком добавления в pages_stack
+PAGE_SPECS: tuple[PageSpec, ...] = (
+    PageSpec(PageName.HOME, "home_page", "ui.pages.home_page", "HomePage", eager=True),
+    PageSpec(PageName.CONTROL, "control_page", "ui.pages.control_page", "ControlPage", eager=True),
+    PageSpec(PageName.ZAPRET2_DIRECT_CONTROL, "zapret2_direct_control_page",
+             "ui.pages.zapret2.direct_control_page", "Zapret2DirectControlPage", eager=True),
+    PageSpec(PageName.ZAPRET2_DIRECT, "zapret2_strategies_page",
+             "ui.pages.zapret2.direct_zapret2_page", "Zapret2StrategiesPageNew"),
+    PageSpec(PageName.STRATEGY_DETAIL, "strategy_detail_page",
+             "ui.pages.zapret2.strategy_detail_page", "StrategyDetailPage"),
+    PageSpec(PageName.ZAPRET2_ORCHESTRA, "zapret2_orchestra_strategies_page",
+             "ui.pages.zapret2_orchestra_strategies_page", "Zapret2OrchestraStrategiesPage"),
+    PageSpec(PageName.ZAPRET1_DIRECT, "zapret1_strategies_page",
+             "ui.pages.zapret1_direct_strategies_page", "Zapret1DirectStrategiesPage"),
+    PageSpec(PageName.BAT_STRATEGIES, "bat_strategies_page", "ui.pages.bat_strategies_page", "BatStrategiesPage"),
+    PageSpec(PageName.STRATEGY_SORT, "strategy_sort_page", "ui.pages.strategy_sort_page", "StrategySortPage"),
+    PageSpec(PageName.PRESET_CONFIG, "preset_config_page", "ui.pages.preset_config_page", "PresetConfigPage"),
+    PageSpec(PageName.MY_CATEGORIES, "my_categories_page", "ui.pages.my_categories_page", "MyCategoriesPage"),
+    PageSpec(PageName.HOSTLIST, "hostlist_page", "ui.pages.hostlist_page", "HostlistPage"),
+    PageSpec(PageName.IPSET, "ipset_page", "ui.pages.ipset_page", "IpsetPage"),
+    PageSpec(PageName.BLOBS, "blobs_page", "ui.pages.blobs_page", "BlobsPage"),
+    PageSpec(PageName.EDITOR, "editor_page", "ui.pages.editor_page", "EditorPage"),
+    PageSpec(PageName.DPI_SETTINGS, "dpi_settings_page", "ui.pages.dpi_settings_page", "DpiSettingsPage", eager=True),
+    PageSpec(PageName.PRESETS, "presets_page", "ui.pages.presets_page", "PresetsPage"),
+    PageSpec(PageName.NETROGAT, "netrogat_page", "ui.pages.netrogat_page", "NetrogatPage"),
+    PageSpec(PageName.CUSTOM_DOMAINS, "custom_domains_page", "ui.pages.custom_domains_page", "CustomDomainsPage"),
+    PageSpec(PageName.CUSTOM_IPSET, "custom_ipset_page", "ui.pages.custom_ipset_page", "CustomIpSetPage"),
+    PageSpec(PageName.AUTOSTART, "autostart_page", "ui.pages.autostart_page", "AutostartPage", eager=True),
+    PageSpec(PageName.NETWORK, "network_page", "ui.pages.network_page", "NetworkPage"),
+    PageSpec(PageName.CONNECTION_TEST, "connection_page", "ui.pages.connection_page", "ConnectionTestPage"),
+    PageSpec(PageName.DNS_CHECK, "dns_check_page", "ui.pages.dns_check_page", "DNSCheckPage"),
+    PageSpec(PageName.HOSTS, "hosts_page", "ui.pages.hosts_page", "HostsPage"),
+    PageSpec(PageName.BLOCKCHECK, "blockcheck_page", "ui.pages.blockcheck_page", "BlockcheckPage"),
+    PageSpec(PageName.APPEARANCE, "appearance_page", "ui.pages.appearance_page", "AppearancePage", eager=True),
+    PageSpec(PageName.PREMIUM, "premium_page", "ui.pages.premium_page", "PremiumPage"),
+    PageSpec(PageName.LOGS, "logs_page", "ui.pages.logs_page", "LogsPage"),
+    PageSpec(PageName.SERVERS, "servers_page", "ui.pages.servers_page", "ServersPage"),
+    PageSpec(PageName.ABOUT, "about_page", "ui.pages.about_page", "AboutPage", eager=True),
+    PageSpec(PageName.HELP, "help_page", "ui.pages.help_page", "HelpPage"),
+    PageSpec(PageName.ORCHESTRA, "orchestra_page", "ui.pages.orchestra_page", "OrchestraPage"),
+    PageSpec(PageName.ORCHESTRA_LOCKED, "orchestra_locked_page", "ui.pages.orchestra_locked_page", "OrchestraLockedPage"),
+    PageSpec(PageName.ORCHESTRA_BLOCKED, "orchestra_blocked_page",
+             "ui.pages.orchestra_blocked_page", "OrchestraBlockedPage"),
+    PageSpec(PageName.ORCHESTRA_WHITELIST, "orchestra_whitelist_page",
+             "ui.pages.orchestra_whitelist_page", "OrchestraWhitelistPage"),
+    PageSpec(PageName.ORCHESTRA_RATINGS, "orchestra_ratings_page",
+             "ui.pages.orchestra_ratings_page", "OrchestraRatingsPage"),
+)
+
+PAGE_SPECS_BY_ATTR: Dict[str, PageSpec] = {spec.attr: spec for spec in PAGE_SPECS}
+
+
+@dataclass
+class PageTiming:
+    """Время создания одной страницы (мс)"""
+    name: PageName
+    import_ms: float
+    init_ms: float
+    wire_ms: float
+    at_startup: bool
+
+    @property
+    def total_ms(self) -> float:
+        return self.import_ms + self.init_ms + self.wire_ms
+
+
+class PageRegistry:
+    """
+    Создаёт страницы по требованию.
+
+    Args:
+        construct: фабрика (класс страницы) -> виджет
+        add_page: вызывается для новой страницы (добавление в стек, атрибут окна)
+        on_created: подключение сигналов новой страницы (spec, page)
+        can_create: можно ли создавать страницы сейчас (False вне GUI-потока -
+            виджеты нельзя создавать и добавлять в стек из рабочих потоков)
+    """
+
+    def __init__(
+        self,
+        construct: Callable[[type], object],
+        add_page: Callable[[PageSpec, object], None],
+        on_created: Optional[Callable[[PageSpec, object], None]] = None,
+        specs: Iterable[PageSpec] = PAGE_SPECS,
+        can_create: Optional[Callable[[], bool]] = None,
+    ):
+        self._construct = construct
+        self._can_create = can_create
+        self._add_page = add_page
+        self._on_created = on_created
+        self._specs: Dict[PageName, PageSpec] = {spec.name: spec for spec in specs}
+        self._pages: Dict[PageName, object] = {}
+        self._creating: set[PageName] = set()
+        self._waiters: Dict[PageName, List[Callable[[object], None]]] = {}
+        self._startup = True
+        self._startup_started = time.perf_counter()
+        self._startup_ms = 0.0
+        self.timings: List[PageTiming] = []
+
+    # ---------- доступ ----------
+
+    def spec(self, name: PageName) -> Optional[PageSpec]:
+        return self._specs.get(name)
+
+    def is_loaded(self, name: PageName) -> bool:
+        return name in self._pages
+
+    def get_loaded(self, name: PageName):
+        """Страница, если она уже создана (без создания)"""
+        return self._pages.get(name)
+
+    def loaded_pages(self) -> Dict[PageName, object]:
+        return dict(self._pages)
+
+    def pending_names(self) -> List[PageName]:
+        """Ещё не созданные страницы в порядке реестра"""
+        return [name for name in self._specs if name not in self._pages]
+
+    def get(self, name: PageName):
+        """Страница по имени (создаётся при первом обращении), None для неизвестного имени"""
+        page = self._pages.get(name)
+        if page is not None:
+            return page
+        spec = self._specs.get(name)
+        if spec is None:
+            return None
+        if name in self._creating:
+            # Конструктор страницы обратился к самой себе
+            raise RuntimeError(f"Страница {name} ещё создаётся")
+        if self._can_create is not None and not self._can_create():
+            raise RuntimeError(f"Страница {name} не создана: обращение не из GUI-потока")
+        return self._create(spec)
+
+    def create_eager(self) -> None:
+        for spec in self._specs.values():
+            if spec.eager:
+                self.get(spec.name)
+
+    def finish_startup(self) -> None:
+        """Отмечает конец запуска: страницы, созданные позже, считаются созданными по требованию"""
+        if self._startup:
+            self._startup = False
+            self._startup_ms = (time.perf_counter() - self._startup_started) * 1000
+
+    def when_created(self, name: PageName, callback: Callable[[object], None]) -> None:
+        """Вызывает callback(page) сразу, если страница создана, иначе - после её создания"""
+        page = self._pages.get(name)
+        if page is not None:
+            callback(page)
+        else:
+            self._waiters.setdefault(name, []).append(callback)
+
+    # ---------- создание ----------
+
+    def _create(self, spec: PageSpec):
+        self._creating.add(spec.name)
+        try:
+            t0 = time.perf_counter()
+            page_cls = getattr(importlib.import_module(spec.module), spec.class_name)
+            t1 = time.perf_counter()
+            page = self._construct(page_cls)
+            t2 = time.perf_counter()
+            self._pages[spec.name] = page
+            self._add_page(spec, page)
+        finally:
+            self._creating.discard(spec.name)
+
+        if self._on_created is not None:
+            try:
+                self._on_created(spec, page)
+            except Exception as e:
+                log(f"Ошибка подключения сигналов страницы {spec.name.name}: {e}", "ERROR")
+        for callback in self._waiters.pop(spec.name, []):
+            try:
+                callback(page)
+            except Exception as e:
+                log(f"Ошибка обработчика создания страницы {spec.name.name}: {e}", "ERROR")
+        t3 = time.perf_counter()
+
+        timing = PageTiming(
+            name=spec.name,
+            import_ms=(t1 - t0) * 1000,
+            init_ms=(t2 - t1) * 1000,
+            wire_ms=(t3 - t2) * 1000,
+            at_startup=self._startup,
+        )
+        self.timings.append(timing)
+        startup_profiler.record(spec.name.name, "page", t0, t3,
+                                import_ms=round(timing.import_ms, 2),
+                                init_ms=round(timing.init_ms, 2),
+                                at_startup=timing.at_startup)
+        if not self._startup:
+            log(f"Страница {spec.name.name} создана по требованию за {timing.total_ms:.1f} мс "
+                f"(импорт {timing.import_ms:.1f}, конструктор {timing.init_ms:.1f})", "DEBUG")
+        return page
+
+    # ---------- отчёт ----------
+
+    def format_report(self) -> str:
+        """Разбивка времени создания страниц (при запуске и по требованию)"""
+        startup = [t for t in self.timings if t.at_startup]
+        lazy = [t for t in self.timings if not t.at_startup]
+        lines = [
+            f"Страницы: при запуске создано {len(startup)} из {len(self._specs)} "
+            f"за {sum(t.total_ms for t in startup):.1f} мс"
+            + (f" (build_ui {self._startup_ms:.1f} мс)" if self._startup_ms else ""),
+        ]
+        for title, items in (("при запуске", startup), ("по требованию", lazy)):
+            if not items:
+                continue
+            lines.append(f"  {title}:")
+            for t in sorted(items, key=lambda t: t.total_ms, reverse=True):
+                lines.append(
+                    f"    {t.name.name:<22} {t.total_ms:8.1f} мс "
+                    f"(импорт {t.import_ms:.1f}, конструктор {t.init_ms:.1f}, сигналы {t.wire_ms:.1f})"
+                )
+        pending = self.pending_names()
+        if pending:
+            lines.append(f"  не созданы: {len(pending)}")
+        return "\n".join(lines)
@@ -1,42 +1,68 @@
 # ui/pages/__init__.py
-"""Страницы контента для главного окна"""
+"""
+Страницы контента для главного окна.
 
-from .home_page import HomePage
-from .control_page import ControlPage
-from .strategies_page_base import StrategiesPageBase
-from .zapret2_orchestra_strategies_page import Zapret2OrchestraStrategiesPage
-from .zapret1_direct_strategies_page import Zapret1DirectStrategiesPage
-from .bat_strategies_page import BatStrategiesPage
-from .zapret2 import Zapret2DirectControlPage, Zapret2StrategiesPageNew, StrategyDetailPage
-from .strategy_sort_page import StrategySortPage
-from .hostlist_page import HostlistPage
-from .ipset_page import IpsetPage
-from .blobs_page import BlobsPage
-from .editor_page import EditorPage
-from .dpi_settings_page import DpiSettingsPage
-from .autostart_page import AutostartPage
-from .network_page import NetworkPage
-from .hosts_page import HostsPage
-from .appearance_page import AppearancePage
-from .about_page import AboutPage
-from .help_page import HelpPage
-from .logs_page import LogsPage
-from .premium_page import PremiumPage
-from .blockcheck_page import BlockcheckPage
-from .servers_page import ServersPage  # ✅ НОВАЯ СТРАНИЦА
-from .custom_domains_page import CustomDomainsPage  # Страница управления other2.txt
-from .custom_ipset_page import CustomIpSetPage  # Страница управления my-ipset.txt
-from .netrogat_page import NetrogatPage  # Страница управления netrogat.txt
-from .connection_page import ConnectionTestPage
-from .dns_check_page import DNSCheckPage
-from .orchestra_page import OrchestraPage
-from .orchestra_locked_page import OrchestraLockedPage
-from .orchestra_blocked_page import OrchestraBlockedPage
-from .orchestra_whitelist_page import OrchestraWhitelistPage
-from .orchestra_ratings_page import OrchestraRatingsPage
-from .preset_config_page import PresetConfigPage
-from .presets_page import PresetsPage
-from .my_categories_page import MyCategoriesPage
+Модули страниц импортируются лениво (PEP 562): `from ui.pages import HomePage`
+загружает только home_page. Главное окно создаёт страницы по требованию
+(см. ui/page_registry.py), поэтому импорт пакета не тянет все ~35 модулей.
+"""
+
+import importlib
+
+# {имя класса: модуль}
+_PAGE_MODULES = {
+    'HomePage': '.home_page',
+    'ControlPage': '.control_page',
+    'StrategiesPageBase': '.strategies_page_base',
+    'Zapret2OrchestraStrategiesPage': '.zapret2_orchestra_strategies_page',
+    'Zapret1DirectStrategiesPage': '.zapret1_direct_strategies_page',
+    'BatStrategiesPage': '.bat_strategies_page',
+    'Zapret2DirectControlPage': '.zapret2.direct_control_page',
+    'Zapret2StrategiesPageNew': '.zapret2.direct_zapret2_page',
+    'StrategyDetailPage': '.zapret2.strategy_detail_page',
+    'StrategySortPage': '.strategy_sort_page',
+    'HostlistPage': '.hostlist_page',
+    'IpsetPage': '.ipset_page',
+    'BlobsPage': '.blobs_page',
+    'EditorPage': '.editor_page',
+    'DpiSettingsPage': '.dpi_settings_page',
+    'AutostartPage': '.autostart_page',
+    'NetworkPage': '.network_page',
+    'HostsPage': '.hosts_page',
+    'AppearancePage': '.appearance_page',
+    'AboutPage': '.about_page',
+    'HelpPage': '.help_page',
+    'LogsPage': '.logs_page',
+    'PremiumPage': '.premium_page',
+    'BlockcheckPage': '.blockcheck_page',
+    'ServersPage': '.servers_page',  # ✅ НОВАЯ СТРАНИЦА
+    'CustomDomainsPage': '.custom_domains_page',  # Страница управления other2.txt
+    'CustomIpSetPage': '.custom_ipset_page',  # Страница управления my-ipset.txt
+    'NetrogatPage': '.netrogat_page',  # Страница управления netrogat.txt
+    'ConnectionTestPage': '.connection_page',
+    'DNSCheckPage': '.dns_check_page',
+    'OrchestraPage': '.orchestra_page',
+    'OrchestraLockedPage': '.orchestra_locked_page',
+    'OrchestraBlockedPage': '.orchestra_blocked_page',
+    'OrchestraWhitelistPage': '.orchestra_whitelist_page',
+    'OrchestraRatingsPage': '.orchestra_ratings_page',
+    'PresetConfigPage': '.preset_config_page',
+    'PresetsPage': '.presets_page',
+    'MyCategoriesPage': '.my_categories_page',
+}
+
+
+def __getattr__(name):
+    module_name = _PAGE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PAGE_MODULES))
 
 __all__ = [
     'HomePage',
@@ -12,6 +12,7 @@ import qtawesome as qta
 
 from .base_page import BasePage
 from ui.sidebar import SettingsCard, ActionButton
+from ui.style_tokens import OBJECT_NAMES, apply_component_style, set_style_state
 
 
 class PreciseSlider(QSlider):
@@ -223,15 +224,15 @@ class ThemeCard(QFrame):
         self.color = color
         self.is_premium = is_premium
         self._selected = False
-        self._hovered = False
         self._enabled = True
         
         self.setFixedSize(100, 80)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.setObjectName("themeCard")
         # Нужно для корректной отрисовки background/border из stylesheet
         # в кастомных paintEvent/на некоторых стилях Windows.
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        # Фон/рамка - стиль компонента (ui/style_tokens.py), наведение - через :hover
+        apply_component_style(self, "theme_card", selected=False, locked=False)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(8, 8, 8, 8)
@@ -256,10 +257,8 @@ class ThemeCard(QFrame):
             display_name = name[:11] + "…"
         
         self.name_label = QLabel(display_name)
-        self.name_label.setStyleSheet("""
-            color: rgba(255, 255, 255, 0.9);
-            font-size: 10px;
-        """)
+        self.name_label.setObjectName(OBJECT_NAMES["theme_card_name"])
+        self.name_label.setProperty("locked", False)
         self.name_label.setToolTip(name)
         name_layout.addWidget(self.name_label)
         
@@ -288,48 +287,10 @@ class ThemeCard(QFrame):
         self.style().drawPrimitive(QStyle.PrimitiveElement.PE_Widget, opt, painter, self)
         
     def _update_style(self):
-        if not self._enabled:
-            # Disabled состояние - затемнённый вид
-            border = "1px solid rgba(255, 255, 255, 0.05)"
-            bg = "rgba(255, 255, 255, 0.02)"
-            text_color = "rgba(255, 255, 255, 0.3)"
-        elif self._selected:
-            border = "2px solid #60cdff"
-            bg = "rgba(96, 205, 255, 0.15)"
-            text_color = "rgba(255, 255, 255, 0.9)"
-        elif self._hovered:
-            border = "1px solid rgba(255, 255, 255, 0.3)"
-            bg = "rgba(255, 255, 255, 0.1)"
-            text_color = "rgba(255, 255, 255, 0.9)"
-        else:
-            border = "1px solid rgba(255, 255, 255, 0.1)"
-            bg = "rgba(255, 255, 255, 0.04)"
-            text_color = "rgba(255, 255, 255, 0.9)"
-            
-        self.setStyleSheet(f"""
-            QFrame#themeCard {{
-                background-color: {bg};
-                border: {border};
-                border-radius: 6px;
-            }}
-        """)
-        
-        # Обновляем цвет текста
-        self.name_label.setStyleSheet(f"color: {text_color}; font-size: 10px;")
-        
-        # Затемняем превью цвета если disabled
-        if hasattr(self, 'color_widget'):
-            if self._enabled:
-                self.color_widget.setStyleSheet(f"""
-                    background-color: {self.color};
-                    border-radius: 4px;
-                """)
-            else:
-                self.color_widget.setStyleSheet(f"""
-                    background-color: {self.color};
-                    border-radius: 4px;
-                    opacity: 0.3;
-                """)
+        locked = not self._enabled
+        set_style_state(self, selected=self._selected, locked=locked)
+        # Disabled состояние - затемнённый текст
+        set_style_state(self.name_label, locked=locked)
         
     def set_selected(self, selected: bool):
         self._selected = selected
@@ -340,16 +301,6 @@ class ThemeCard(QFrame):
         self.setCursor(Qt.CursorShape.PointingHandCursor if enabled else Qt.CursorShape.ForbiddenCursor)
         self._update_style()
         
-    def enterEvent(self, event):
-        self._hovered = True
-        self._update_style()
-        super().enterEvent(event)
-        
-    def leaveEvent(self, event):
-        self._hovered = False
-        self._update_style()
-        super().leaveEvent(event)
-        
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self._enabled:
             self.clicked.emit(self.name)
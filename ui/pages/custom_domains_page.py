@@ -11,7 +11,9 @@ import re
 import os
 
 from .base_page import BasePage, ScrollBlockingPlainTextEdit
+from ui.list_editor import ListEditorController
 from ui.sidebar import SettingsCard, ActionButton
+from ui.style_tokens import apply_component_style
 from log import log
 
 def split_domains(text: str) -> list[str]:
@@ -173,27 +175,15 @@ class CustomDomainsPage(BasePage):
             "subdomain.site.org\n\n"
             "Комментарии начинаются с #"
         )
-        self.text_edit.setStyleSheet("""
-            QPlainTextEdit {
-                background: rgba(255, 255, 255, 0.06);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 12px;
-                color: #ffffff;
-                font-family: Consolas, 'Courier New', monospace;
-                font-size: 13px;
-            }
-            QPlainTextEdit:focus {
-                border: 1px solid #60cdff;
-            }
-        """)
+        apply_component_style(self.text_edit, "list_editor")
         self.text_edit.setMinimumHeight(350)
         
-        # Автосохранение
-        self._save_timer = QTimer()
-        self._save_timer.setSingleShot(True)
-        self._save_timer.timeout.connect(self._auto_save)
-        self.text_edit.textChanged.connect(self._on_text_changed)
+        # Проверка изменённых строк и автосохранение в фоне
+        self._editor = ListEditorController(
+            self.text_edit, split_domains, self._extract_domain, self._write_domains, parent=self
+        )
+        self._editor.status_changed.connect(self._update_status)
+        self._editor.saved.connect(self._on_saved)
         
         editor_layout.addWidget(self.text_edit)
         
@@ -224,92 +214,46 @@ class CustomDomainsPage(BasePage):
                         if line:
                             domains.append(line)
             
-            # Блокируем сигнал чтобы не срабатывало автосохранение
-            self.text_edit.blockSignals(True)
-            self.text_edit.setPlainText('\n'.join(domains))
-            self.text_edit.blockSignals(False)
-            
-            self._update_status()
+            # Без автосохранения
+            self._editor.set_text('\n'.join(domains))
             log(f"Загружено {len(domains)} строк из other2.txt", "INFO")
             
         except Exception as e:
             log(f"Ошибка загрузки доменов: {e}", "ERROR")
             self.status_label.setText(f"❌ Ошибка: {e}")
             
-    def _on_text_changed(self):
-        """Запускает таймер автосохранения"""
-        self._save_timer.start(500)
+    def _on_saved(self, result):
+        """Автосохранение завершено"""
+        if not result.ok:
+            return
         self._update_status()
-        
-    def _auto_save(self):
-        """Автосохранение"""
-        self._save_domains()
         self.status_label.setText(self.status_label.text() + " • ✅ Сохранено")
+        self.domains_changed.emit()
         
     def _save_domains(self):
-        """Сохраняет домены в файл"""
+        """Сохраняет домены в файл (синхронно)"""
+        self._editor.save_now()
+        
+    def _write_domains(self, domains: list[str]) -> bool:
+        """Записывает other2.txt (вызывается из фонового потока)"""
         try:
             from config import OTHER2_PATH
             os.makedirs(os.path.dirname(OTHER2_PATH), exist_ok=True)
             
-            text = self.text_edit.toPlainText()
-            domains = []
-            normalized_lines = []  # Для обновления UI
-            
-            for line in text.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                if line.startswith('#'):
-                    # Сохраняем комментарии как есть
-                    domains.append(line)
-                    normalized_lines.append(line)
-                    continue
-                
-                # Разделяем склеенные домены (vk.comyoutube.com -> vk.com, youtube.com)
-                separated = split_domains(line)
-                
-                for item in separated:
-                    # Нормализуем каждый домен
-                    domain = self._extract_domain(item)
-                    if domain:
-                        if domain not in domains:
-                            domains.append(domain)
-                            normalized_lines.append(domain)
-                    else:
-                        # Невалидная строка - оставляем как есть
-                        normalized_lines.append(item)
-            
             with open(OTHER2_PATH, 'w', encoding='utf-8') as f:
                 for domain in domains:
                     f.write(f"{domain}\n")
             
-            # Обновляем UI - заменяем URL на домены
-            new_text = '\n'.join(normalized_lines)
-            if new_text != text:
-                cursor = self.text_edit.textCursor()
-                pos = cursor.position()
-                
-                self.text_edit.blockSignals(True)
-                self.text_edit.setPlainText(new_text)
-                
-                # Восстанавливаем позицию курсора
-                cursor = self.text_edit.textCursor()
-                cursor.setPosition(min(pos, len(new_text)))
-                self.text_edit.setTextCursor(cursor)
-                self.text_edit.blockSignals(False)
-            
             log(f"Сохранено {len(domains)} строк в other2.txt", "SUCCESS")
-            self.domains_changed.emit()
+            return True
             
         except Exception as e:
             log(f"Ошибка сохранения доменов: {e}", "ERROR")
+            return False
             
     def _update_status(self):
         """Обновляет статус"""
-        text = self.text_edit.toPlainText()
-        lines = [l.strip() for l in text.split('\n') if l.strip() and not l.strip().startswith('#')]
-        self.status_label.setText(f"📊 Доменов: {len(lines)}")
+        self.status_label.setText(f"📊 Доменов: {self._editor.model.entry_lines}")
         
     def _extract_domain(self, text: str) -> str:
         """Извлекает домен из URL или текста"""
@@ -370,11 +314,8 @@ class CustomDomainsPage(BasePage):
             )
             return
         
-        # Проверяем дубликат
-        current = self.text_edit.toPlainText()
-        current_domains = [l.strip().lower() for l in current.split('\n') if l.strip() and not l.strip().startswith('#')]
-        
-        if domain.lower() in current_domains:
+        # Проверяем дубликат (множество нормализованных доменов модели)
+        if self._editor.model.contains(domain):
             QMessageBox.information(
                 self.window(), 
                 "Информация", 
@@ -383,11 +324,7 @@ class CustomDomainsPage(BasePage):
             return
         
         # Добавляем в конец
-        if current and not current.endswith('\n'):
-            current += '\n'
-        current += domain
-        
-        self.text_edit.setPlainText(current)
+        self._editor.append_lines([domain])
         self.domain_input.clear()
         
         log(f"Добавлен домен: {domain}", "SUCCESS")
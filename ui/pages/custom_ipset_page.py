@@ -10,7 +10,9 @@ import ipaddress
 import os
 
 from .base_page import BasePage, ScrollBlockingPlainTextEdit
+from ui.list_editor import ListEditorController
 from ui.sidebar import SettingsCard, ActionButton
+from ui.style_tokens import apply_component_style, set_style_state
 from log import log
 import re
 
@@ -149,27 +151,16 @@ class CustomIpSetPage(BasePage):
             "10.0.0.0/8\n\n"
             "Комментарии начинаются с #"
         )
-        self.text_edit.setStyleSheet("""
-            QPlainTextEdit {
-                background: rgba(255, 255, 255, 0.06);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 12px;
-                color: #ffffff;
-                font-family: Consolas, 'Courier New', monospace;
-                font-size: 13px;
-            }
-            QPlainTextEdit:focus {
-                border: 1px solid #60cdff;
-            }
-        """)
+        # Стиль редактора (и состояние ошибки) - ui/style_tokens.py
+        apply_component_style(self.text_edit, "list_editor", invalid=False)
         self.text_edit.setMinimumHeight(350)
 
-        # Автосохранение
-        self._save_timer = QTimer()
-        self._save_timer.setSingleShot(True)
-        self._save_timer.timeout.connect(self._auto_save)
-        self.text_edit.textChanged.connect(self._on_text_changed)
+        # Проверка изменённых строк и автосохранение в фоне
+        self._editor = ListEditorController(
+            self.text_edit, split_ip_entries, self.normalize_ip_entry, self._write_entries, parent=self
+        )
+        self._editor.status_changed.connect(self._update_status)
+        self._editor.saved.connect(self._on_saved)
 
         editor_layout.addWidget(self.text_edit)
 
@@ -190,33 +181,6 @@ class CustomIpSetPage(BasePage):
         self.status_label = QLabel()
         self.status_label.setStyleSheet("color: rgba(255, 255, 255, 0.5); font-size: 11px;")
         self.layout.addWidget(self.status_label)
-        
-        # Стили для валидации
-        self._normal_style = """
-            QPlainTextEdit {
-                background: rgba(255, 255, 255, 0.06);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 12px;
-                color: #ffffff;
-                font-family: Consolas, 'Courier New', monospace;
-                font-size: 13px;
-            }
-            QPlainTextEdit:focus {
-                border: 1px solid #60cdff;
-            }
-        """
-        self._error_style = """
-            QPlainTextEdit {
-                background: rgba(255, 100, 100, 0.08);
-                border: 2px solid #ff6b6b;
-                border-radius: 8px;
-                padding: 12px;
-                color: #ffffff;
-                font-family: Consolas, 'Courier New', monospace;
-                font-size: 13px;
-            }
-        """
 
     def _load_entries(self):
         """Загружает список из my-ipset.txt"""
@@ -231,112 +195,61 @@ class CustomIpSetPage(BasePage):
                         if line:
                             entries.append(line)
 
-            # Блокируем сигнал чтобы не срабатывало автосохранение
-            self.text_edit.blockSignals(True)
-            self.text_edit.setPlainText('\n'.join(entries))
-            self.text_edit.blockSignals(False)
-            
-            self._update_status()
+            # Без автосохранения
+            self._editor.set_text('\n'.join(entries))
             log(f"Загружено {len(entries)} строк из my-ipset.txt", "INFO")
         except Exception as e:
             log(f"Ошибка загрузки my-ipset.txt: {e}", "ERROR")
             self.status_label.setText(f"❌ Ошибка: {e}")
 
-    def _on_text_changed(self):
-        self._save_timer.start(500)
+    def _on_saved(self, result):
+        if not result.ok:
+            return
         self._update_status()
-
-    def _auto_save(self):
-        self._save_entries()
         self.status_label.setText(self.status_label.text() + " • ✅ Сохранено")
+        self.ipset_changed.emit()
 
     def _save_entries(self):
-        """Сохраняет список в my-ipset.txt"""
+        """Сохраняет список в my-ipset.txt (синхронно)"""
+        self._editor.save_now()
+
+    def _write_entries(self, entries: list[str]) -> bool:
+        """Записывает my-ipset.txt (вызывается из фонового потока)"""
         try:
             from utils.ipsets_manager import MY_IPSET_PATH
 
             os.makedirs(os.path.dirname(MY_IPSET_PATH), exist_ok=True)
-            
-            text = self.text_edit.toPlainText()
-            entries = []
-            normalized_lines = []  # Для обновления UI
-            
-            for line in text.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                # Сохраняем комментарии как есть
-                if line.startswith('#'):
-                    entries.append(line)
-                    normalized_lines.append(line)
-                    continue
-                
-                # Разделяем по пробелам/запятым (1.1.1.1 2.2.2.2 -> отдельные строки)
-                separated = split_ip_entries(line)
-                
-                for item in separated:
-                    # Нормализуем каждый IP/подсеть
-                    norm = self.normalize_ip_entry(item)
-                    if norm:
-                        if norm not in entries:
-                            entries.append(norm)
-                            normalized_lines.append(norm)
-                    else:
-                        # Невалидная строка - оставляем как есть
-                        normalized_lines.append(item)
-
             with open(MY_IPSET_PATH, "w", encoding="utf-8") as f:
                 for entry in entries:
                     f.write(f"{entry}\n")
 
-            # Обновляем UI - заменяем URL на IP
-            new_text = '\n'.join(normalized_lines)
-            if new_text != text:
-                cursor = self.text_edit.textCursor()
-                pos = cursor.position()
-                
-                self.text_edit.blockSignals(True)
-                self.text_edit.setPlainText(new_text)
-                
-                # Восстанавливаем позицию курсора
-                cursor = self.text_edit.textCursor()
-                cursor.setPosition(min(pos, len(new_text)))
-                self.text_edit.setTextCursor(cursor)
-                self.text_edit.blockSignals(False)
-
             log(f"Сохранено {len(entries)} строк в my-ipset.txt", "SUCCESS")
-            self.ipset_changed.emit()
+            return True
         except Exception as e:
             log(f"Ошибка сохранения my-ipset.txt: {e}", "ERROR")
+            return False
 
     def _update_status(self):
-        text = self.text_edit.toPlainText()
-        lines = [l.strip() for l in text.split('\n') if l.strip() and not l.strip().startswith('#')]
-        
-        # Валидируем строки
-        invalid_lines = []
-        for i, line in enumerate(text.split('\n'), 1):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            
-            # Разделяем по пробелам
-            for item in split_ip_entries(line):
-                if not self.normalize_ip_entry(item):
-                    invalid_lines.append(f"Строка {i}: {item}")
-        
-        # Обновляем UI
-        if invalid_lines:
-            self.text_edit.setStyleSheet(self._error_style)
-            self.error_label.setText("❌ Неверный формат:\n" + "\n".join(invalid_lines[:5]))
-            if len(invalid_lines) > 5:
-                self.error_label.setText(self.error_label.text() + f"\n... и ещё {len(invalid_lines) - 5}")
+        # Счётчики ведёт модель редактора - текст целиком не перепроверяется
+        model = self._editor.model
+        invalid_total = model.invalid_total
+
+        # Обновляем UI (repolish редактора только при смене состояния)
+        set_style_state(self.text_edit, invalid=bool(invalid_total))
+        if invalid_total:
+            invalid_lines = [f"Строка {i}: {item}" for i, item in model.first_invalid(5)]
+            text = "❌ Неверный формат:\n" + "\n".join(invalid_lines)
+            if invalid_total > 5:
+                text += f"\n... и ещё {invalid_total - 5}"
+            self.error_label.setText(text)
             self.error_label.show()
         else:
-            self.text_edit.setStyleSheet(self._normal_style)
             self.error_label.hide()
-        
-        self.status_label.setText(f"📊 Записей: {len(lines)}")
+
+        status = f"📊 Записей: {model.entry_lines}"
+        if model.pending:
+            status += f" • проверка... ({model.pending})"
+        self.status_label.setText(status)
 
     def _add_entry(self):
         text = self.input.text().strip()
@@ -353,20 +266,13 @@ class CustomIpSetPage(BasePage):
             )
             return
 
-        # Проверяем дубликат
-        current = self.text_edit.toPlainText()
-        current_entries = [l.strip().lower() for l in current.split('\n') if l.strip() and not l.strip().startswith('#')]
-        
-        if norm.lower() in current_entries:
+        # Проверяем дубликат (множество нормализованных записей модели)
+        if self._editor.model.contains(norm):
             QMessageBox.information(self.window(), "Информация", f"Запись уже есть:\n{norm}")
             return
 
         # Добавляем в конец
-        if current and not current.endswith('\n'):
-            current += '\n'
-        current += norm
-        
-        self.text_edit.setPlainText(current)
+        self._editor.append_lines([norm])
         self.input.clear()
 
     def _clear_all(self):
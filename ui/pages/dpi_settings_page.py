@@ -9,6 +9,7 @@ import qtawesome as qta
 
 from .base_page import BasePage
 from ui.sidebar import SettingsCard, ActionButton
+from ui.style_tokens import apply_component_style, set_style_state
 from log import log
 
 
@@ -164,9 +165,11 @@ class Win11RadioOption(QWidget):
                  icon_color: str = "#60cdff", recommended: bool = False, parent=None):
         super().__init__(parent)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
+        # Фон/рамка - стиль компонента (ui/style_tokens.py), наведение - через :hover
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        apply_component_style(self, "radio_option", selected=False)
         
         self._selected = False
-        self._hover = False
         self._recommended = recommended
         
         layout = QHBoxLayout(self)
@@ -246,34 +249,8 @@ class Win11RadioOption(QWidget):
         return self._selected
         
     def _update_style(self):
-        if self._selected:
-            bg = "rgba(96, 205, 255, 0.15)"
-            border = "rgba(96, 205, 255, 0.6)"
-        elif self._hover:
-            bg = "rgba(255, 255, 255, 0.06)"
-            border = "rgba(255, 255, 255, 0.15)"
-        else:
-            bg = "rgba(255, 255, 255, 0.03)"
-            border = "rgba(255, 255, 255, 0.08)"
-            
-        self.setStyleSheet(f"""
-            Win11RadioOption {{
-                background-color: {bg};
-                border: 1px solid {border};
-                border-radius: 8px;
-            }}
-        """)
-        self.update()
-        
-    def enterEvent(self, event):
-        self._hover = True
-        self._update_style()
-        super().enterEvent(event)
-        
-    def leaveEvent(self, event):
-        self._hover = False
-        self._update_style()
-        super().leaveEvent(event)
+        if not set_style_state(self, selected=self._selected):
+            self.update()
         
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -11,7 +11,9 @@ from PyQt6.QtWidgets import (
 )
 
 from .base_page import BasePage, ScrollBlockingPlainTextEdit
+from ui.list_editor import ListEditorController
 from ui.sidebar import SettingsCard, ActionButton
+from ui.style_tokens import apply_component_style
 from log import log
 from utils.netrogat_manager import (
     load_netrogat,
@@ -154,27 +156,15 @@ class NetrogatPage(BasePage):
             "vk.com\n\n"
             "Комментарии начинаются с #"
         )
-        self.text_edit.setStyleSheet("""
-            QPlainTextEdit {
-                background: rgba(255, 255, 255, 0.06);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 12px;
-                color: #ffffff;
-                font-family: Consolas, 'Courier New', monospace;
-                font-size: 13px;
-            }
-            QPlainTextEdit:focus {
-                border: 1px solid #60cdff;
-            }
-        """)
+        apply_component_style(self.text_edit, "list_editor")
         self.text_edit.setMinimumHeight(350)
 
-        # Автосохранение
-        self._save_timer = QTimer()
-        self._save_timer.setSingleShot(True)
-        self._save_timer.timeout.connect(self._auto_save)
-        self.text_edit.textChanged.connect(self._on_text_changed)
+        # Проверка изменённых строк и автосохранение в фоне
+        self._editor = ListEditorController(
+            self.text_edit, split_domains, _normalize_domain, save_netrogat, parent=self
+        )
+        self._editor.status_changed.connect(self._update_status)
+        self._editor.saved.connect(self._on_saved)
 
         editor_layout.addWidget(self.text_edit)
 
@@ -191,72 +181,23 @@ class NetrogatPage(BasePage):
 
     def _load(self):
         domains = load_netrogat()
-        # Блокируем сигнал чтобы не срабатывало автосохранение
-        self.text_edit.blockSignals(True)
-        self.text_edit.setPlainText('\n'.join(domains))
-        self.text_edit.blockSignals(False)
-        self._update_status()
+        # Без автосохранения
+        self._editor.set_text('\n'.join(domains))
         log(f"Загружено {len(domains)} доменов netrogat", "INFO")
 
-    def _on_text_changed(self):
-        self._save_timer.start(500)
+    def _on_saved(self, result):
+        if not result.ok:
+            return
         self._update_status()
-
-    def _auto_save(self):
-        self._save()
         self.status_label.setText(self.status_label.text() + " • ✅ Сохранено")
+        self.data_changed.emit()
 
     def _save(self):
-        text = self.text_edit.toPlainText()
-        domains = []
-        normalized_lines = []  # Для обновления UI
-        
-        for line in text.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            # Сохраняем комментарии как есть
-            if line.startswith('#'):
-                domains.append(line)
-                normalized_lines.append(line)
-                continue
-            
-            # Разделяем склеенные домены (vk.comyoutube.com -> vk.com, youtube.com)
-            separated = split_domains(line)
-            
-            for item in separated:
-                # Нормализуем каждый домен
-                norm = _normalize_domain(item)
-                if norm:
-                    if norm not in domains:
-                        domains.append(norm)
-                        normalized_lines.append(norm)
-                else:
-                    # Невалидная строка - оставляем как есть
-                    normalized_lines.append(item)
-        
-        if save_netrogat(domains):
-            # Обновляем UI - заменяем URL на домены
-            new_text = '\n'.join(normalized_lines)
-            if new_text != text:
-                cursor = self.text_edit.textCursor()
-                pos = cursor.position()
-                
-                self.text_edit.blockSignals(True)
-                self.text_edit.setPlainText(new_text)
-                
-                # Восстанавливаем позицию курсора
-                cursor = self.text_edit.textCursor()
-                cursor.setPosition(min(pos, len(new_text)))
-                self.text_edit.setTextCursor(cursor)
-                self.text_edit.blockSignals(False)
-            
-            self.data_changed.emit()
+        """Сохраняет netrogat.txt (синхронно)"""
+        self._editor.save_now()
 
     def _update_status(self):
-        text = self.text_edit.toPlainText()
-        lines = [l.strip() for l in text.split('\n') if l.strip() and not l.strip().startswith('#')]
-        self.status_label.setText(f"📊 Доменов: {len(lines)}")
+        self.status_label.setText(f"📊 Доменов: {self._editor.model.entry_lines}")
 
     def _add(self):
         raw = self.input.text().strip()
@@ -269,11 +210,10 @@ class NetrogatPage(BasePage):
             QMessageBox.warning(self.window(), "Ошибка", "Не удалось распознать домен.")
             return
 
-        # Проверяем дубликаты
-        current = self.text_edit.toPlainText()
-        current_domains = [l.strip().lower() for l in current.split('\n') if l.strip() and not l.strip().startswith('#')]
-
+        # Проверяем дубликаты (множество нормализованных доменов модели)
+        model = self._editor.model
         added = []
+        added_set = set()
         skipped = []
         invalid = []
 
@@ -284,10 +224,11 @@ class NetrogatPage(BasePage):
             if not norm:
                 invalid.append(part)
                 continue
-            if norm.lower() in current_domains or norm.lower() in [a.lower() for a in added]:
+            if model.contains(norm) or norm in added_set:
                 skipped.append(norm)
                 continue
             added.append(norm)
+            added_set.add(norm)
 
         if not added and not skipped and invalid:
             QMessageBox.warning(self.window(), "Ошибка", "Не удалось распознать домены.")
@@ -301,11 +242,7 @@ class NetrogatPage(BasePage):
             return
 
         # Добавляем в конец
-        if current and not current.endswith('\n'):
-            current += '\n'
-        current += '\n'.join(added)
-
-        self.text_edit.setPlainText(current)
+        self._editor.append_lines(added)
         self.input.clear()
 
         # Показываем результат если были пропущенные
@@ -365,10 +302,6 @@ class NetrogatPage(BasePage):
             return
         
         # Обновляем редактор
-        self.text_edit.blockSignals(True)
-        self.text_edit.setPlainText('\n'.join(new_domains))
-        self.text_edit.blockSignals(False)
-        
+        self._editor.set_text('\n'.join(new_domains))
         self._save()
-        self._update_status()
         QMessageBox.information(self.window(), "Готово", f"Добавлено доменов: {added}")
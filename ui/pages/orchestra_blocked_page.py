@@ -1,13 +1,13 @@
 # ui/pages/orchestra_blocked_page.py
 """
 Страница управления заблокированными стратегиями оркестратора (чёрный список).
-Каждая блокировка отображается в виде ряда с редактируемым номером стратегии.
+Блокировки отображаются в таблице (модель + делегаты) с редактируемым номером стратегии.
 Изменения автоматически сохраняются в реестр.
 """
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QHBoxLayout, QLabel, QWidget,
-    QPushButton, QLineEdit, QSpinBox, QFrame, QMessageBox, QApplication,
+    QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QLineEdit, QSpinBox, QMessageBox, QApplication,
     QComboBox
 )
 import qtawesome as qta
@@ -15,183 +15,23 @@ import qtawesome as qta
 from .base_page import BasePage
 from ui.sidebar import SettingsCard
 from ui.widgets.line_edit_icons import set_line_edit_clear_button_icon
+from ui.widgets.strategy_rows_view import StrategyRowsModel, StrategyRowsView
+from ui.orchestra_rows_model import StrategyRow, blocked_row_key, blocked_sort_key, blocked_rows
 from log import log
 from orchestra.blocked_strategies_manager import ASKEY_ALL
 
+# Задержка применения поиска (мс) - фильтр не пересчитывается на каждую букву
+SEARCH_DEBOUNCE_MS = 150
 
-class BlockedDomainRow(QFrame):
-    """Виджет-ряд для одной заблокированной стратегии с редактируемым номером"""
-
-    def __init__(self, hostname: str, strategy: int, askey: str, is_default: bool = False, parent=None):
-        super().__init__(parent)
-        self.hostname = hostname
-        self.original_strategy = strategy  # Сохраняем оригинальную стратегию для изменений
-        self.askey = askey
-        self.is_default = is_default
-        self._setup_ui(hostname, strategy, askey, is_default)
-
-    def _setup_ui(self, hostname: str, strategy: int, askey: str, is_default: bool):
-        self.setFixedHeight(40)
-
-        if is_default:
-            # Системные блокировки - тёмный стиль, без hover
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: rgba(255, 255, 255, 0.02);
-                    border: 1px solid rgba(255, 255, 255, 0.04);
-                    border-radius: 6px;
-                }
-            """)
-        else:
-            # Пользовательские - интерактивные
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: rgba(255, 255, 255, 0.04);
-                    border: 1px solid rgba(255, 255, 255, 0.06);
-                    border-radius: 6px;
-                }
-                QFrame:hover {
-                    background-color: rgba(255, 255, 255, 0.06);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                }
-            """)
-
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(12, 0, 8, 0)
-        layout.setSpacing(8)
-
-        # Иконка замка для дефолтных
-        if is_default:
-            lock_icon = QLabel()
-            lock_icon.setPixmap(qta.icon("mdi.lock", color="#666666").pixmap(14, 14))
-            lock_icon.setToolTip("Системная блокировка (нельзя изменить)")
-            lock_icon.setStyleSheet("background: transparent; border: none;")
-            layout.addWidget(lock_icon)
-
-        # Домен
-        domain_label = QLabel(hostname)
-        if is_default:
-            domain_label.setStyleSheet("color: rgba(255, 255, 255, 0.6); font-size: 13px; border: none; background: transparent;")
-        else:
-            domain_label.setStyleSheet("color: white; font-size: 13px; border: none; background: transparent;")
-        layout.addWidget(domain_label, 1)
 
-        # Протокол
-        proto_label = QLabel(f"[{askey.upper()}]")
-        if is_default:
-            proto_label.setStyleSheet("color: rgba(255,255,255,0.3); font-size: 11px; border: none; background: transparent;")
-        else:
-            proto_label.setStyleSheet("color: rgba(255,255,255,0.5); font-size: 11px; border: none; background: transparent;")
-        proto_label.setFixedWidth(60)
-        layout.addWidget(proto_label)
-
-        if is_default:
-            # Для системных - только текст стратегии
-            strat_label = QLabel(f"#{strategy}")
-            strat_label.setStyleSheet("color: rgba(255, 255, 255, 0.5); font-size: 13px; border: none; background: transparent;")
-            strat_label.setFixedWidth(50)
-            layout.addWidget(strat_label)
-        else:
-            # Для пользовательских - редактируемый SpinBox
-            self.strat_spin = QSpinBox()
-            self.strat_spin.setRange(1, 999)
-            self.strat_spin.setValue(strategy)
-            self.strat_spin.setFixedWidth(70)
-            self.strat_spin.setStyleSheet("""
-                QSpinBox {
-                    background-color: rgba(255, 255, 255, 0.08);
-                    color: #ff6b6b;
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                    font-size: 13px;
-                    font-weight: 600;
-                }
-                QSpinBox:hover {
-                    background-color: rgba(255, 255, 255, 0.12);
-                    border: 1px solid rgba(255, 107, 107, 0.3);
-                }
-                QSpinBox:focus {
-                    border: 1px solid #ff6b6b;
-                }
-                QSpinBox::up-button, QSpinBox::down-button {
-                    width: 0px;
-                    border: none;
-                }
-            """)
-            self.strat_spin.valueChanged.connect(self._on_strategy_changed)
-            layout.addWidget(self.strat_spin)
-
-            # Кнопка добавления ещё одной блокировки для этого домена
-            add_btn = QPushButton()
-            add_btn.setIcon(qta.icon("mdi.plus", color="white"))
-            add_btn.setIconSize(QSize(14, 14))
-            add_btn.setFixedSize(24, 24)
-            add_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            add_btn.setToolTip("Добавить ещё одну заблокированную стратегию для этого домена")
-            add_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: transparent;
-                    border: none;
-                    border-radius: 4px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(255, 107, 107, 0.2);
-                }
-                QPushButton:pressed {
-                    background-color: rgba(255, 107, 107, 0.3);
-                }
-            """)
-            add_btn.clicked.connect(self._on_add_clicked)
-            layout.addWidget(add_btn)
-
-            # Кнопка удаления (разблокировать)
-            delete_btn = QPushButton()
-            delete_btn.setIcon(qta.icon("mdi.close-circle-outline", color="white"))
-            delete_btn.setIconSize(QSize(16, 16))
-            delete_btn.setFixedSize(28, 28)
-            delete_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            delete_btn.setToolTip("Разблокировать")
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: transparent;
-                    border: none;
-                    border-radius: 4px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(76, 175, 80, 0.2);
-                }
-                QPushButton:pressed {
-                    background-color: rgba(76, 175, 80, 0.3);
-                }
-            """)
-            delete_btn.clicked.connect(self._on_delete_clicked)
-            layout.addWidget(delete_btn)
-
-    def _on_strategy_changed(self, new_value: int):
-        """При изменении номера стратегии - уведомляем родителя для автосохранения"""
-        parent = self.parent()
-        while parent and not isinstance(parent, OrchestraBlockedPage):
-            parent = parent.parent()
-        if parent:
-            parent._on_row_strategy_changed(self.hostname, self.original_strategy, new_value, self.askey)
-            self.original_strategy = new_value  # Обновляем для следующих изменений
-
-    def _on_add_clicked(self):
-        """При клике на + - заполняем форму для добавления новой блокировки этого домена"""
-        parent = self.parent()
-        while parent and not isinstance(parent, OrchestraBlockedPage):
-            parent = parent.parent()
-        if parent:
-            parent._prefill_domain(self.hostname)
-
-    def _on_delete_clicked(self):
-        """При клике на удаление - уведомляем родителя"""
-        parent = self.parent()
-        while parent and not isinstance(parent, OrchestraBlockedPage):
-            parent = parent.parent()
-        if parent:
-            parent._on_row_delete_requested(self.hostname, self.original_strategy, self.askey)
+def _row_actions(row: StrategyRow):
+    """Иконки действий строки: системные блокировки только для просмотра"""
+    if row.is_default:
+        return [(None, "mdi.lock", "Системная блокировка (нельзя изменить)")]
+    return [
+        ("add", "mdi.plus", "Добавить ещё одну заблокированную стратегию для этого домена"),
+        ("delete", "mdi.close-circle-outline", "Разблокировать"),
+    ]
 
 
 class OrchestraBlockedPage(BasePage):
@@ -411,20 +251,23 @@ class OrchestraBlockedPage(BasePage):
         list_layout.addWidget(self.count_label)
 
         # Подсказка
-        hint_label = QLabel("Измените номер стратегии и она автоматически сохранится • Системные блокировки неизменяемы")
+        hint_label = QLabel("Дважды щёлкните по номеру стратегии, чтобы изменить его - изменение сохранится автоматически • Системные блокировки неизменяемы")
         hint_label.setStyleSheet("color: rgba(255,255,255,0.3); font-size: 10px; font-style: italic;")
         list_layout.addWidget(hint_label)
 
-        # Контейнер для рядов (без скролла - страница сама прокручивается)
-        self.rows_container = QWidget()
-        self.rows_container.setStyleSheet("background: transparent;")
-        self.rows_layout = QVBoxLayout(self.rows_container)
-        self.rows_layout.setContentsMargins(0, 8, 0, 0)
-        self.rows_layout.setSpacing(4)
-        list_layout.addWidget(self.rows_container)
+        # Таблица: сначала пользовательские, потом системные (приглушены, с замком)
+        self.rows_model = StrategyRowsModel(blocked_row_key, blocked_sort_key, "#ff6b6b", self)
+        self.rows_model.strategy_edited.connect(
+            lambda row, value: self._on_row_strategy_changed(row.host, row.strategy, value, row.askey)
+        )
+        self.rows_view = StrategyRowsView(self.rows_model, _row_actions, "#ff6b6b")
+        self.rows_view.actions_delegate.triggered.connect(self._on_row_action)
+        list_layout.addWidget(self.rows_view)
 
-        # Храним ссылки на ряды для быстрого доступа
-        self._blocked_rows: list[BlockedDomainRow] = []
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_filter)
 
         list_card.add_layout(list_layout)
         self.layout.addWidget(list_card)
@@ -485,15 +328,16 @@ class OrchestraBlockedPage(BasePage):
         total = sum(len(strategies) for askey_data in temp_manager.blocked_by_askey.values() for strategies in askey_data.values())
         log(f"Загружено напрямую из реестра: {total} заблокированных стратегий", "INFO")
 
+    def _is_default(self, blocked_manager, hostname: str, strategy: int, askey: str) -> bool:
+        """Системная ли блокировка (с менеджером или без него)"""
+        if blocked_manager:
+            return blocked_manager.is_default_blocked(hostname, strategy)
+        # Без менеджера - проверяем только strategy=1 для TLS
+        from orchestra.blocked_strategies_manager import is_default_blocked_pass_domain
+        return strategy == 1 and askey == "tls" and is_default_blocked_pass_domain(hostname)
+
     def _refresh_blocked_list(self):
         """Обновляет список заблокированных стратегий"""
-        # Очищаем старые ряды
-        self._blocked_rows.clear()
-        while self.rows_layout.count():
-            item = self.rows_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
         runner = self._get_runner()
 
         # Источник данных: runner или напрямую загруженные из реестра
@@ -509,75 +353,43 @@ class OrchestraBlockedPage(BasePage):
             blocked_data = getattr(self, '_direct_blocked_by_askey', {askey: {} for askey in ASKEY_ALL})
             blocked_manager = None
 
-        # Собираем все блокировки с флагом is_default по всем askey
-        all_blocked = []
-        for askey in ASKEY_ALL:
-            for hostname, strategies in blocked_data.get(askey, {}).items():
-                for strategy in strategies:
-                    if blocked_manager:
-                        is_default = blocked_manager.is_default_blocked(hostname, strategy)
-                    else:
-                        # Без менеджера - проверяем только strategy=1 для TLS
-                        from orchestra.blocked_strategies_manager import is_default_blocked_pass_domain
-                        is_default = (strategy == 1 and askey == "tls" and is_default_blocked_pass_domain(hostname))
-                    all_blocked.append((hostname, strategy, askey, is_default))
-
-        # Сортируем: сначала пользовательские, потом дефолтные, внутри групп по алфавиту
-        all_blocked.sort(key=lambda x: (x[3], x[0].lower(), x[2], x[1]))
-
-        # Добавляем разделитель если есть оба типа
-        user_items = [x for x in all_blocked if not x[3]]
-        default_items = [x for x in all_blocked if x[3]]
-
-        if user_items:
-            user_header = QLabel(f"Пользовательские ({len(user_items)})")
-            user_header.setStyleSheet("color: #ff6b6b; font-size: 11px; font-weight: 600; padding: 4px 0;")
-            self.rows_layout.addWidget(user_header)
-
-            for hostname, strategy, askey, is_default in user_items:
-                row = BlockedDomainRow(hostname, strategy, askey, is_default=False)
-                self.rows_layout.addWidget(row)
-                self._blocked_rows.append(row)
-
-        if default_items:
-            if user_items:
-                # Разделитель
-                spacer = QWidget()
-                spacer.setFixedHeight(12)
-                spacer.setStyleSheet("background: transparent;")
-                self.rows_layout.addWidget(spacer)
-
-            default_header = QLabel(f"Системные ({len(default_items)}) - заблокированные РКН сайты")
-            default_header.setStyleSheet("color: rgba(255,255,255,0.4); font-size: 11px; font-weight: 600; padding: 4px 0;")
-            self.rows_layout.addWidget(default_header)
-
-            for hostname, strategy, askey, is_default in default_items:
-                row = BlockedDomainRow(hostname, strategy, askey, is_default=True)
-                self.rows_layout.addWidget(row)
-                self._blocked_rows.append(row)
-
+        # Собираем все блокировки с флагом is_default по всем askey (сортирует модель)
+        self.rows_model.reset_rows(blocked_rows(
+            {askey: blocked_data.get(askey, {}) for askey in ASKEY_ALL},
+            lambda hostname, strategy, askey: self._is_default(blocked_manager, hostname, strategy, askey),
+        ))
         self._update_count()
-        self._apply_filter()
 
     def _filter_list(self, text: str):
         """Фильтрует список по введённому тексту"""
-        self._apply_filter()
+        self._search_timer.start()
 
     def _apply_filter(self):
-        """Применяет текущий фильтр к рядам"""
-        search = self.search_input.text().lower().strip()
-        for row in self._blocked_rows:
-            hostname = row.hostname.lower()
-            row.setVisible(search in hostname if search else True)
+        """Применяет текущий фильтр к таблице (через proxy-модель)"""
+        self.rows_view.set_search(self.search_input.text())
+
+    def _on_row_action(self, row: StrategyRow, action: str):
+        """Клик по иконке действия в строке"""
+        if action == "add":
+            self._prefill_domain(row.host)
+        elif action == "delete":
+            self._on_row_delete_requested(row.host, row.strategy, row.askey)
 
     def _on_row_strategy_changed(self, hostname: str, old_strategy: int, new_strategy: int, askey: str):
         """Автосохранение при изменении стратегии в SpinBox"""
         runner = self._get_runner()
         if runner and hasattr(runner, 'blocked_manager'):
             # Удаляем старую блокировку и добавляем новую
-            runner.blocked_manager.unblock(hostname, old_strategy, askey)
-            runner.blocked_manager.block(hostname, new_strategy, askey)
+            blocked_manager = runner.blocked_manager
+            blocked_manager.unblock(hostname, old_strategy, askey)
+            blocked_manager.block(hostname, new_strategy, askey)
             log(f"Изменена блокировка: {hostname} [{askey.upper()}] #{old_strategy} -> #{new_strategy}", "INFO")
+            self.rows_model.remove((hostname, askey, old_strategy))
+            self.rows_model.upsert(StrategyRow(
+                hostname, askey, new_strategy,
+                self._is_default(blocked_manager, hostname, new_strategy, askey)
+            ))
+            self._update_count()
         else:
             log(f"Не удалось изменить блокировку: оркестратор не запущен", "WARNING")
 
@@ -590,6 +402,8 @@ class OrchestraBlockedPage(BasePage):
         success = runner.blocked_manager.unblock(hostname, strategy, askey)
         if success:
             log(f"Разблокирована стратегия #{strategy} для {hostname} [{askey.upper()}]", "INFO")
+            self.rows_model.remove((hostname, askey, strategy))
+            self._update_count()
             # Перезапускаем оркестратор чтобы применить изменения
             if runner.is_running():
                 QMessageBox.information(
@@ -598,7 +412,6 @@ class OrchestraBlockedPage(BasePage):
                     f"Стратегия #{strategy} разблокирована для {hostname}.\n\nОркестратор будет перезапущен для применения изменений."
                 )
                 runner.restart()
-        self._refresh_data()
 
     def _prefill_domain(self, hostname: str):
         """Заполняет форму добавления указанным доменом и фокусируется на SpinBox"""
@@ -607,35 +420,10 @@ class OrchestraBlockedPage(BasePage):
         self.strat_spin.selectAll()
 
     def _update_count(self):
-        """Обновляет счётчик"""
-        runner = self._get_runner()
-
-        # Источник данных
-        if runner:
-            blocked_data = runner.blocked_manager.blocked_by_askey
-            blocked_manager = runner.blocked_manager
-        elif hasattr(self, '_direct_blocked_by_askey'):
-            blocked_data = self._direct_blocked_by_askey
-            blocked_manager = None
-        else:
-            self.count_label.setText("Нажмите 'Обновить' для загрузки данных")
-            return
-
-        user_count = 0
-        default_count = 0
-        for askey in ASKEY_ALL:
-            for hostname, strategies in blocked_data.get(askey, {}).items():
-                for strategy in strategies:
-                    if blocked_manager:
-                        is_default = blocked_manager.is_default_blocked(hostname, strategy)
-                    else:
-                        from orchestra.blocked_strategies_manager import is_default_blocked_pass_domain
-                        is_default = (strategy == 1 and askey == "tls" and is_default_blocked_pass_domain(hostname))
-                    if is_default:
-                        default_count += 1
-                    else:
-                        user_count += 1
-        total = user_count + default_count
+        """Обновляет счётчик (по строкам модели - is_default уже посчитан при загрузке)"""
+        total = self.rows_model.rowCount()
+        default_count = sum(1 for row in self.rows_model.rows() if row.is_default)
+        user_count = total - default_count
         self.count_label.setText(f"Всего: {total} ({user_count} пользовательских + {default_count} системных)")
 
     def _block_strategy(self):
@@ -656,7 +444,11 @@ class OrchestraBlockedPage(BasePage):
 
         runner.blocked_manager.block(domain, strategy, askey, user_block=True)
         log(f"Заблокирована стратегия #{strategy} для {domain} [{askey.upper()}]", "INFO")
-        self._refresh_data()
+        self.rows_model.upsert(StrategyRow(
+            domain, askey, strategy,
+            self._is_default(runner.blocked_manager, domain, strategy, askey)
+        ))
+        self._update_count()
 
         # Перезапускаем оркестратор чтобы применить изменения
         if runner.is_running():
@@ -1,14 +1,14 @@
 # ui/pages/orchestra_locked_page.py
 """
 Страница управления залоченными стратегиями оркестратора.
-Каждый домен отображается в виде редактируемого ряда с QSpinBox для номера стратегии.
+Домены отображаются в таблице (модель + делегаты) с редактируемым номером стратегии.
 Изменения автоматически сохраняются в реестр.
 """
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QComboBox, QWidget,
-    QLineEdit, QSpinBox, QFrame, QMessageBox, QApplication
+    QPushButton, QComboBox,
+    QLineEdit, QSpinBox, QMessageBox, QApplication
 )
 import qtawesome as qta
 
@@ -16,121 +16,21 @@ from .base_page import BasePage
 from ui.sidebar import SettingsCard
 from ui.widgets import NotificationBanner
 from ui.widgets.line_edit_icons import set_line_edit_clear_button_icon
+from ui.widgets.strategy_rows_view import StrategyRowsModel, StrategyRowsView
+from ui.orchestra_rows_model import StrategyRow, locked_row_key, locked_sort_key, locked_rows
 from log import log
 from orchestra.locked_strategies_manager import ASKEY_ALL
 
-
-class LockedDomainRow(QFrame):
-    """Виджет-ряд для одного залоченного домена с редактируемой стратегией"""
-
-    def __init__(self, domain: str, strategy: int, proto: str, parent=None):
-        super().__init__(parent)
-        self.domain = domain
-        self.proto = proto
-        self._setup_ui(domain, strategy, proto)
-
-    def _setup_ui(self, domain: str, strategy: int, proto: str):
-        self.setFixedHeight(40)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: rgba(255, 255, 255, 0.04);
-                border: 1px solid rgba(255, 255, 255, 0.06);
-                border-radius: 6px;
-            }
-            QFrame:hover {
-                background-color: rgba(255, 255, 255, 0.06);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-            }
-        """)
-
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(12, 0, 8, 0)
-        layout.setSpacing(8)
-
-        # Домен
-        domain_label = QLabel(domain)
-        domain_label.setStyleSheet("color: white; font-size: 13px; border: none; background: transparent;")
-        layout.addWidget(domain_label, 1)
-
-        # Протокол
-        proto_label = QLabel(f"[{proto.upper()}]")
-        proto_label.setStyleSheet("color: rgba(255,255,255,0.5); font-size: 11px; border: none; background: transparent;")
-        proto_label.setFixedWidth(45)
-        layout.addWidget(proto_label)
-
-        # Стратегия SpinBox
-        self.strat_spin = QSpinBox()
-        self.strat_spin.setRange(1, 999)
-        self.strat_spin.setValue(strategy)
-        self.strat_spin.setFixedWidth(70)
-        self.strat_spin.setStyleSheet("""
-            QSpinBox {
-                background-color: rgba(255, 255, 255, 0.08);
-                color: #60cdff;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 4px;
-                padding: 4px 8px;
-                font-size: 13px;
-                font-weight: 600;
-            }
-            QSpinBox:hover {
-                background-color: rgba(255, 255, 255, 0.12);
-                border: 1px solid rgba(96, 205, 255, 0.3);
-            }
-            QSpinBox:focus {
-                border: 1px solid #60cdff;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                width: 0px;
-                border: none;
-            }
-        """)
-        self.strat_spin.valueChanged.connect(self._on_strategy_changed)
-        layout.addWidget(self.strat_spin)
-
-        # Кнопка удаления (разлочить)
-        delete_btn = QPushButton()
-        delete_btn.setIcon(qta.icon("mdi.lock-open-variant-outline", color="white"))
-        delete_btn.setIconSize(QSize(16, 16))
-        delete_btn.setFixedSize(28, 28)
-        delete_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        delete_btn.setToolTip("Разлочить")
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 152, 0, 0.2);
-            }
-            QPushButton:pressed {
-                background-color: rgba(255, 152, 0, 0.3);
-            }
-        """)
-        delete_btn.clicked.connect(self._on_delete_clicked)
-        layout.addWidget(delete_btn)
-
-    def _on_strategy_changed(self, value: int):
-        """При изменении стратегии - уведомляем родителя для автосохранения"""
-        parent = self.parent()
-        while parent and not isinstance(parent, OrchestraLockedPage):
-            parent = parent.parent()
-        if parent:
-            parent._on_row_strategy_changed(self.domain, value, self.proto)
-
-    def _on_delete_clicked(self):
-        """При клике на удаление - уведомляем родителя"""
-        parent = self.parent()
-        while parent and not isinstance(parent, OrchestraLockedPage):
-            parent = parent.parent()
-        if parent:
-            parent._on_row_delete_requested(self.domain, self.proto)
+# Задержка применения поиска (мс) - фильтр не пересчитывается на каждую букву
+SEARCH_DEBOUNCE_MS = 150
 
 
 class OrchestraLockedPage(BasePage):
     """Страница управления залоченными стратегиями"""
 
+    # LOCK/UNLOCK от оркестратора (callback приходит из потока runner)
+    _runner_host_changed = pyqtSignal(str)
+
     def __init__(self, parent=None):
         super().__init__(
             "Залоченные стратегии",
@@ -138,11 +38,13 @@ class OrchestraLockedPage(BasePage):
             parent
         )
         self.setObjectName("orchestraLockedPage")
-        self._all_locked_data = []  # Кэш данных для фильтрации
+        self._hooked_runner = None  # runner, на callbacks которого подписана страница
+        self._bulk_update = False   # массовое изменение - строки обновятся одним сбросом модели
         # Инициализируем пустые данные (будут загружены при первом showEvent)
         self._direct_locked_by_askey = {askey: {} for askey in ASKEY_ALL}
         self._initial_load_done = False
         self._setup_ui()
+        self._runner_host_changed.connect(self._sync_host)
 
     def _setup_ui(self):
         # === Уведомление (баннер) ===
@@ -349,20 +251,29 @@ class OrchestraLockedPage(BasePage):
         list_layout.addWidget(self.count_label)
 
         # Подсказка
-        hint_label = QLabel("Измените номер стратегии и она автоматически сохранится")
+        hint_label = QLabel("Дважды щёлкните по номеру стратегии, чтобы изменить его - изменение сохранится автоматически")
         hint_label.setStyleSheet("color: rgba(255,255,255,0.3); font-size: 10px; font-style: italic;")
         list_layout.addWidget(hint_label)
 
-        # Контейнер для рядов (без скролла - страница сама прокручивается)
-        self.rows_container = QWidget()
-        self.rows_container.setStyleSheet("background: transparent;")
-        self.rows_layout = QVBoxLayout(self.rows_container)
-        self.rows_layout.setContentsMargins(0, 8, 0, 0)
-        self.rows_layout.setSpacing(4)
-        list_layout.addWidget(self.rows_container)
+        # Таблица: строки рисуются по требованию, виджеты на каждый домен не создаются
+        self.rows_model = StrategyRowsModel(locked_row_key, locked_sort_key, "#60cdff", self)
+        self.rows_model.strategy_edited.connect(
+            lambda row, value: self._on_row_strategy_changed(row.host, value, row.askey)
+        )
+        self.rows_view = StrategyRowsView(
+            self.rows_model,
+            lambda row: [("unlock", "mdi.lock-open-variant-outline", "Разлочить")],
+            "#60cdff",
+        )
+        self.rows_view.actions_delegate.triggered.connect(
+            lambda row, _action: self._on_row_delete_requested(row.host, row.askey)
+        )
+        list_layout.addWidget(self.rows_view)
 
-        # Храним ссылки на ряды для быстрого доступа
-        self._domain_rows = {}
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_filter)
 
         list_card.add_layout(list_layout)
         self.layout.addWidget(list_card)
@@ -447,18 +358,61 @@ class OrchestraLockedPage(BasePage):
         total = sum(len(strategies) for strategies in self._direct_locked_by_askey.values())
         log(f"Загружено напрямую из реестра: {total} залоченных стратегий", "INFO")
 
-    def _refresh_locked_list(self):
-        """Обновляет список залоченных стратегий"""
-        # Очищаем старые ряды
-        self._domain_rows.clear()
-        while self.rows_layout.count():
-            item = self.rows_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+    def _get_locked_data(self):
+        """Источник данных: runner или напрямую загруженные из реестра"""
+        runner = self._get_runner()
+        if runner:
+            return runner.locked_manager.locked_by_askey
+        return self._direct_locked_by_askey
 
-        self._all_locked_data = []
+    def _hook_runner_callbacks(self, runner):
+        """
+        Подписывается на LOCK/UNLOCK оркестратора, чтобы обновлять только
+        изменившиеся строки. Уже установленные callbacks продолжают вызываться.
+        """
+        if runner is None or runner is self._hooked_runner:
+            return
+        self._hooked_runner = runner
+        prev_lock = runner.lock_callback
+        prev_unlock = runner.unlock_callback
+        signal = self._runner_host_changed
+
+        def on_lock(hostname: str, strategy: int):
+            if prev_lock:
+                prev_lock(hostname, strategy)
+            try:
+                signal.emit(hostname)
+            except RuntimeError:
+                pass  # страница уже удалена
+
+        def on_unlock(hostname: str):
+            if prev_unlock:
+                prev_unlock(hostname)
+            try:
+                signal.emit(hostname)
+            except RuntimeError:
+                pass
+
+        runner.set_lock_callback(on_lock)
+        runner.set_unlock_callback(on_unlock)
+
+    def _sync_host(self, hostname: str):
+        """Приводит строки хоста (по всем askey) к данным менеджера"""
+        if self._bulk_update:
+            return
+        locked_data = self._get_locked_data()
+        for askey in ASKEY_ALL:
+            strategy = locked_data.get(askey, {}).get(hostname)
+            if strategy is None:
+                self.rows_model.remove((hostname, askey))
+            else:
+                self.rows_model.upsert(StrategyRow(hostname, askey, strategy))
+        self._update_count()
 
+    def _refresh_locked_list(self):
+        """Обновляет список залоченных стратегий"""
         runner = self._get_runner()
+        self._hook_runner_callbacks(runner)
 
         # Источник данных: runner или напрямую загруженные из реестра
         if runner:
@@ -470,33 +424,16 @@ class OrchestraLockedPage(BasePage):
             self._load_directly_from_registry()
             locked_data = getattr(self, '_direct_locked_by_askey', {askey: {} for askey in ASKEY_ALL})
 
-        # Собираем все данные по всем askey
-        for askey in ASKEY_ALL:
-            for hostname, strategy in locked_data.get(askey, {}).items():
-                self._all_locked_data.append((hostname, strategy, askey))
-
-        self._all_locked_data.sort(key=lambda x: x[0].lower())
-
-        # Создаём ряды для каждого домена
-        for domain, strategy, proto in self._all_locked_data:
-            row = LockedDomainRow(domain, strategy, proto)
-            key = f"{domain}:{proto}"
-            self._domain_rows[key] = row
-            self.rows_layout.addWidget(row)
-
+        self.rows_model.reset_rows(locked_rows({askey: locked_data.get(askey, {}) for askey in ASKEY_ALL}))
         self._update_count()
-        self._apply_filter()
 
     def _filter_list(self, text: str):
         """Фильтрует список по введённому тексту"""
-        self._apply_filter()
+        self._search_timer.start()
 
     def _apply_filter(self):
-        """Применяет текущий фильтр к рядам"""
-        search = self.search_input.text().lower().strip()
-        for key, row in self._domain_rows.items():
-            domain = row.domain.lower()
-            row.setVisible(search in domain if search else True)
+        """Применяет текущий фильтр к таблице (через proxy-модель)"""
+        self.rows_view.set_search(self.search_input.text())
 
     def _on_row_strategy_changed(self, domain: str, new_strategy: int, askey: str):
         """Автосохранение при изменении стратегии в SpinBox"""
@@ -505,21 +442,7 @@ class OrchestraLockedPage(BasePage):
         if blocked_manager.is_blocked(domain, new_strategy):
             self._show_blocked_warning(domain, new_strategy)
             log(f"[USER] Попытка изменить на заблокированную стратегию #{new_strategy} для {domain}", "WARNING")
-            # Восстанавливаем предыдущее значение в SpinBox
-            key = f"{domain}:{askey}"
-            if key in self._domain_rows:
-                row = self._domain_rows[key]
-                # Получаем текущее значение из менеджера
-                runner = self._get_runner()
-                if runner and hasattr(runner, 'locked_manager'):
-                    current = runner.locked_manager.locked_by_askey.get(askey, {}).get(domain, 1)
-                elif askey in self._direct_locked_by_askey:
-                    current = self._direct_locked_by_askey[askey].get(domain, 1)
-                else:
-                    current = 1
-                row.strat_spin.blockSignals(True)
-                row.strat_spin.setValue(current)
-                row.strat_spin.blockSignals(False)
+            # Модель не меняется до сохранения - в таблице остаётся прежний номер
             return  # Не сохраняем заблокированную стратегию
 
         runner = self._get_runner()
@@ -539,10 +462,13 @@ class OrchestraLockedPage(BasePage):
             temp_manager = LockedStrategiesManager()
             temp_manager.load()
             temp_manager.lock(domain, new_strategy, askey, user_lock=True)
+            # Без runner некому сбросить очередь - пишем в реестр сразу
+            temp_manager.writer.flush()
             # Обновляем локальный кэш
             if askey in self._direct_locked_by_askey:
                 self._direct_locked_by_askey[askey][domain] = new_strategy
             log(f"[USER] Изменена стратегия (direct): {domain} [{askey.upper()}] -> #{new_strategy}", "INFO")
+        self._sync_host(domain)
 
     def _on_row_delete_requested(self, domain: str, askey: str):
         """Разлочивание при нажатии кнопки удаления"""
@@ -550,7 +476,7 @@ class OrchestraLockedPage(BasePage):
         if runner and hasattr(runner, 'locked_manager'):
             runner.locked_manager.unlock(domain, askey)
             log(f"Разлочена стратегия для {domain} [{askey.upper()}]", "INFO")
-            self._refresh_data()
+            self._sync_host(domain)
             # Перезапускаем оркестратор
             if runner.is_running():
                 QMessageBox.information(
@@ -565,11 +491,12 @@ class OrchestraLockedPage(BasePage):
             temp_manager = LockedStrategiesManager()
             temp_manager.load()
             temp_manager.unlock(domain, askey)
+            temp_manager.writer.flush()
             # Обновляем локальный кэш
             if askey in self._direct_locked_by_askey and domain in self._direct_locked_by_askey[askey]:
                 del self._direct_locked_by_askey[askey][domain]
             log(f"Разлочена стратегия (direct) для {domain} [{askey.upper()}]", "INFO")
-            self._refresh_data()
+            self._sync_host(domain)
 
     def _update_count(self):
         """Обновляет счётчик"""
@@ -626,14 +553,15 @@ class OrchestraLockedPage(BasePage):
             temp_manager = LockedStrategiesManager()
             temp_manager.load()
             temp_manager.lock(domain, strategy, askey, user_lock=True)
+            temp_manager.writer.flush()
             # Обновляем локальный кэш
             if askey in self._direct_locked_by_askey:
                 self._direct_locked_by_askey[askey][domain] = strategy
             log(f"[USER] Залочена стратегия (direct) #{strategy} для {domain} [{askey.upper()}]", "INFO")
 
-        # Очищаем поле и обновляем список
+        # Очищаем поле и обновляем строки домена
         self.domain_input.clear()
-        self._refresh_data()
+        self._sync_host(domain)
 
     def _unlock_all(self):
         """Разлочивает все стратегии"""
@@ -653,9 +581,13 @@ class OrchestraLockedPage(BasePage):
         )
         if reply == QMessageBox.StandardButton.Yes:
             # Разлочиваем все домены по всем askey
-            for askey in ASKEY_ALL:
-                for domain in list(runner.locked_manager.locked_by_askey.get(askey, {}).keys()):
-                    runner.locked_manager.unlock(domain, askey)
+            self._bulk_update = True
+            try:
+                for askey in ASKEY_ALL:
+                    for domain in list(runner.locked_manager.locked_by_askey.get(askey, {}).keys()):
+                        runner.locked_manager.unlock(domain, askey)
+            finally:
+                self._bulk_update = False
             log(f"Разлочены все {total} стратегий", "INFO")
             self._refresh_data()
             # Перезапускаем оркестратор чтобы сбросить все hrec.nstrategy
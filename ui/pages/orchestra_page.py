@@ -2,14 +2,15 @@
 """Страница оркестратора автоматического обучения (circular)"""
 
 import os
+from collections import deque
 from queue import Queue, Empty
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, pyqtSlot, QSize
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QTextEdit, QFrame, QCheckBox,
+    QPushButton, QPlainTextEdit, QFrame, QCheckBox,
     QLineEdit, QListWidget, QListWidgetItem, QComboBox
 )
-from PyQt6.QtGui import QFont, QTextCursor, QAction, QPainter, QColor
+from PyQt6.QtGui import QFont, QAction, QPainter, QColor
 import qtawesome as qta
 
 from .base_page import BasePage
@@ -76,6 +77,19 @@ class StyledCheckBox(QCheckBox):
 from ui.sidebar import SettingsCard, ActionButton
 from log import log
 from orchestra import MAX_ORCHESTRA_LOGS
+from ui.orchestra_log_buffer import LOG_MAX_LINES, LogFilter, LogRingBuffer
+
+# Период вывода накопленных строк в виджет лога (мс, ~кадр)
+LOG_FLUSH_INTERVAL_MS = 16
+
+# Максимум строк, добавляемых в виджет за один проход (перерисовка после смены фильтра идёт порциями)
+LOG_RENDER_CHUNK_LINES = 500
+
+# Максимум сообщений, забираемых из очереди runner'а за один тик
+LOG_QUEUE_DRAIN_LIMIT = 2000
+
+# Задержка применения фильтра по домену (мс)
+LOG_FILTER_DEBOUNCE_MS = 150
 
 
 class DangerResetButton(QPushButton):
@@ -236,9 +250,19 @@ class OrchestraPage(BasePage):
         self._last_log_position = 0  # Позиция в файле для инкрементального чтения
         self._current_state = self.STATE_IDLE  # Текущее состояние
 
-        # Хранилище всех строк лога для фильтрации
-        self._full_log_lines = []
-        self._max_log_lines = 1000  # Максимум строк в памяти
+        # Кольцевой буфер строк лога (с индексом для фильтров)
+        self._log_buffer = LogRingBuffer(LOG_MAX_LINES)
+        self._log_filter = LogFilter()
+        # Строки, ожидающие вывода в виджет (добавляются пачками раз в кадр)
+        self._pending_log_lines = deque(maxlen=LOG_MAX_LINES)
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_pending_log_lines)
+        self._log_filter_timer = QTimer(self)
+        self._log_filter_timer.setSingleShot(True)
+        self._log_filter_timer.setInterval(LOG_FILTER_DEBOUNCE_MS)
+        self._log_filter_timer.timeout.connect(self._rerender_log)
 
         # Таймер для обновления статуса и логов
         self.update_timer = QTimer(self)
@@ -290,12 +314,14 @@ class OrchestraPage(BasePage):
         log_card = SettingsCard("Лог обучения")
         log_layout = QVBoxLayout()
 
-        # Текстовое поле для логов
-        self.log_text = QTextEdit()
+        # Текстовое поле для логов (старые строки удаляет сам виджет)
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.setMaximumBlockCount(LOG_MAX_LINES)
         self.log_text.setMinimumHeight(300)
         self.log_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: rgba(0, 0, 0, 0.3);
                 border: 1px solid rgba(255, 255, 255, 0.1);
                 border-radius: 8px;
@@ -515,6 +541,8 @@ class OrchestraPage(BasePage):
 
     def _update_status(self, state: str):
         """Обновляет статус на основе состояния"""
+        if state == getattr(self, "_current_state", None):
+            return  # Иконку и текст не пересоздаём на каждую строку лога
         self._current_state = state
 
         if state == self.STATE_RUNNING:
@@ -545,7 +573,8 @@ class OrchestraPage(BasePage):
     def _clear_log(self):
         """Очищает лог"""
         self.log_text.clear()
-        self._full_log_lines = []  # Очищаем хранилище
+        self._log_buffer.clear()  # Очищаем хранилище
+        self._pending_log_lines.clear()
         # Сбрасываем позицию чтобы перечитать файл с начала
         self._last_log_position = 0
 
@@ -577,7 +606,6 @@ class OrchestraPage(BasePage):
 
     def _on_log_received(self, text: str):
         """Обработчик сигнала - добавляет лог и определяет состояние"""
-        print(f"[DEBUG _on_log_received] {text[:80]}...")  # DEBUG
         self.append_log(text)
         self._detect_state_from_line(text)
 
@@ -588,15 +616,23 @@ class OrchestraPage(BasePage):
         # Кладём в очередь - это thread-safe операция
         self._log_queue.put(text)
 
+    def emit_log_batch(self, lines: list):
+        """Пачка логов за тик конвейера runner'а (thread-safe, одна операция с очередью)"""
+        self._log_queue.put(list(lines))
+
     def _process_log_queue(self):
         """Обрабатывает очередь логов из main thread (вызывается таймером)"""
-        # Обрабатываем до 20 сообщений за раз чтобы не блокировать UI
-        for _ in range(20):
+        # Строки только попадают в буфер - в виджет они выводятся пачкой в _flush_pending_log_lines
+        taken = 0
+        while taken < LOG_QUEUE_DRAIN_LIMIT:
             try:
-                text = self._log_queue.get_nowait()
-                self.log_received.emit(text)
+                item = self._log_queue.get_nowait()
             except Empty:
                 break
+            lines = item if isinstance(item, list) else (item,)
+            for text in lines:
+                self._on_log_received(text)
+            taken += len(lines)
 
     def _get_current_log_path(self) -> str:
         """Получает путь к текущему лог-файлу из runner'а"""
@@ -622,6 +658,10 @@ class OrchestraPage(BasePage):
             if not self._log_file_path or not os.path.exists(self._log_file_path):
                 return
 
+            # Активный сегмент лога сменился при ротации - читаем новый с начала
+            if os.path.getsize(self._log_file_path) < self._last_log_position:
+                self._last_log_position = 0
+
             with open(self._log_file_path, 'r', encoding='utf-8', errors='replace') as f:
                 # Переходим к последней прочитанной позиции
                 f.seek(self._last_log_position)
@@ -693,65 +733,51 @@ class OrchestraPage(BasePage):
         pass  # Виджет перемещён в orchestra_locked_page.py
 
     def append_log(self, text: str):
-        """Добавляет строку в лог"""
-        # Сохраняем в полный лог
-        self._full_log_lines.append(text)
-        # Ограничиваем размер
-        if len(self._full_log_lines) > self._max_log_lines:
-            self._full_log_lines = self._full_log_lines[-self._max_log_lines:]
-
-        # Проверяем фильтр
-        if self._matches_filter(text):
-            self.log_text.append(text)
-            # Прокручиваем вниз
-            cursor = self.log_text.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-            self.log_text.setTextCursor(cursor)
-
-    def _matches_filter(self, text: str) -> bool:
-        """Проверяет, соответствует ли строка текущему фильтру"""
-        # Фильтр по домену
-        domain_filter = self.log_filter_input.text().strip().lower()
-        if domain_filter and domain_filter not in text.lower():
-            return False
-
-        # Фильтр по протоколу/статусу
-        protocol_filter = self.log_protocol_filter.currentText()
-        if protocol_filter != "Все":
-            text_upper = text.upper()
-            if protocol_filter == "TLS" and "[TLS]" not in text_upper and "TLS" not in text_upper:
-                return False
-            elif protocol_filter == "HTTP" and "[HTTP]" not in text_upper and "HTTP" not in text_upper:
-                return False
-            elif protocol_filter == "UDP" and "UDP" not in text_upper:
-                return False
-            elif protocol_filter == "SUCCESS" and "SUCCESS" not in text_upper and "✓" not in text:
-                return False
-            elif protocol_filter == "FAIL" and "FAIL" not in text_upper and "✗" not in text and "X " not in text:
-                return False
-
-        return True
+        """Добавляет строку в лог (в виджет попадёт со следующей пачкой)"""
+        entry = self._log_buffer.append(text)
+        if self._log_filter.matches(entry):
+            self._pending_log_lines.append(text)
+            if not self._log_flush_timer.isActive():
+                self._log_flush_timer.start()
+
+    def _flush_pending_log_lines(self):
+        """Добавляет накопленные строки в виджет одной вставкой"""
+        pending = self._pending_log_lines
+        if not pending:
+            return
+        count = min(len(pending), LOG_RENDER_CHUNK_LINES)
+        chunk = [pending.popleft() for _ in range(count)]
+
+        scrollbar = self.log_text.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        self.log_text.appendPlainText("\n".join(chunk))
+        # Прокручиваем вниз, если пользователь не листает историю
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+        if pending:
+            self._log_flush_timer.start()
 
     def _apply_log_filter(self):
-        """Применяет фильтр к логу"""
-        # Фильтруем все сохранённые строки
-        filtered_lines = [line for line in self._full_log_lines if self._matches_filter(line)]
+        """Применяет фильтр к логу (с задержкой - ввод в поле не перерисовывает лог на каждую букву)"""
+        self._log_filter_timer.start()
 
-        # Обновляем виджет лога
+    def _rerender_log(self):
+        """Перерисовывает лог по текущему фильтру; вывод идёт порциями через _flush_pending_log_lines"""
+        self._log_filter = LogFilter.from_ui(
+            self.log_filter_input.text(), self.log_protocol_filter.currentText()
+        )
         self.log_text.clear()
-        for line in filtered_lines:
-            self.log_text.append(line)
-
-        # Прокручиваем вниз
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.log_text.setTextCursor(cursor)
+        self._pending_log_lines.clear()
+        self._pending_log_lines.extend(self._log_buffer.filtered(self._log_filter))
+        self._flush_pending_log_lines()
 
     def _clear_log_filter(self):
         """Сбрасывает фильтр"""
         self.log_filter_input.clear()
         self.log_protocol_filter.setCurrentIndex(0)
-        self._apply_log_filter()
+        self._log_filter_timer.stop()
+        self._rerender_log()
 
     @pyqtSlot()
     def start_monitoring(self):
@@ -764,6 +790,9 @@ class OrchestraPage(BasePage):
                 if runner.output_callback is None:
                     print("[DEBUG start_monitoring] Устанавливаем callback на запущенный runner")  # DEBUG
                     runner.set_output_callback(self.emit_log)
+                if runner.batch_output_callback is None:
+                    # Пачка сообщений за тик конвейера - одна операция с очередью вместо одной на строку
+                    runner.set_batch_output_callback(self.emit_log_batch)
         except Exception as e:
             print(f"[DEBUG start_monitoring] Ошибка установки callback: {e}")  # DEBUG
 
@@ -772,6 +801,7 @@ class OrchestraPage(BasePage):
         self.update_timer.start(5000)  # Обновляем каждые 5 секунд (было 500мс)
         self._update_all()  # Сразу обновляем
 
+    @pyqtSlot()
     def stop_monitoring(self):
         """Останавливает мониторинг"""
         self.update_timer.stop()
@@ -840,6 +870,7 @@ class OrchestraPage(BasePage):
                 content = app.orchestra_runner.get_log_content(log_id)
                 if content:
                     # Очищаем текущий лог и показываем содержимое выбранного
+                    self._pending_log_lines.clear()
                     self.log_text.clear()
                     self.log_text.setPlainText(content)
                     self.append_log(f"\n[INFO] === Загружен лог: {log_id} ===")
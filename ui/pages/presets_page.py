@@ -16,6 +16,7 @@ import qtawesome as qta
 
 from .base_page import BasePage
 from ui.sidebar import ActionButton, SettingsCard
+from ui.style_tokens import apply_component_style, set_style_state
 from log import log
 
 
@@ -117,9 +118,9 @@ class PresetCard(QFrame):
         self.preset_name = name
         self._is_active = is_active
         self._is_builtin = is_builtin
-        self._hovered = False
 
-        self.setObjectName("presetCard")
+        # Фон - стиль компонента (ui/style_tokens.py), наведение - через :hover
+        apply_component_style(self, "preset_card", active=False)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
 
@@ -334,30 +335,7 @@ class PresetCard(QFrame):
 
     def _update_style(self):
         """Обновляет стиль карточки"""
-        if self._is_active:
-            bg = "rgba(96, 205, 255, 0.08)"
-        elif self._hovered:
-            bg = "rgba(255, 255, 255, 0.08)"
-        else:
-            bg = "rgba(255, 255, 255, 0.04)"
-
-        self.setStyleSheet(f"""
-            QFrame#presetCard {{
-                background-color: {bg};
-                border: none;
-                border-radius: 8px;
-            }}
-        """)
-
-    def enterEvent(self, event):
-        self._hovered = True
-        self._update_style()
-        super().enterEvent(event)
-
-    def leaveEvent(self, event):
-        self._hovered = False
-        self._update_style()
-        super().leaveEvent(event)
+        set_style_state(self, active=self._is_active)
 
     def mousePressEvent(self, event):
         """Двойной клик для активации"""
@@ -1129,7 +1107,8 @@ class PresetsPage(BasePage):
         """Загружает и отображает список пресетов"""
         try:
             manager = self._get_manager()
-            preset_names = manager.list_presets()
+            # Только заголовки файлов (без полного разбора), неизменённые - из кэша
+            preset_headers = manager.list_preset_headers()
             active_name = manager.get_active_preset_name()
 
             # Обновляем лейбл активного пресета
@@ -1157,29 +1136,28 @@ class PresetsPage(BasePage):
             official_items = []
             user_items = []
 
-            for name in preset_names:
-                preset = manager.load_preset(name)
-                if preset:
-                    target = official_items if preset.is_builtin else user_items
-                    card = PresetCard(
-                        name=name,
-                        description=preset.description,
-                        modified=preset.modified,
-                        is_active=(name == active_name),
-                        is_builtin=preset.is_builtin,
-                        parent=self
-                    )
+            for header in preset_headers:
+                name = header.file_name
+                target = official_items if header.is_builtin else user_items
+                card = PresetCard(
+                    name=name,
+                    description=header.description,
+                    modified=header.modified,
+                    is_active=(name == active_name),
+                    is_builtin=header.is_builtin,
+                    parent=self
+                )
 
-                    # Подключаем сигналы
-                    card.activate_clicked.connect(self._on_activate_preset)
-                    card.rename_clicked.connect(self._on_rename_preset)
-                    card.duplicate_clicked.connect(self._on_duplicate_preset)
-                    card.reset_clicked.connect(self._on_reset_preset)
-                    card.delete_clicked.connect(self._on_delete_preset)
-                    card.export_clicked.connect(self._on_export_preset)
+                # Подключаем сигналы
+                card.activate_clicked.connect(self._on_activate_preset)
+                card.rename_clicked.connect(self._on_rename_preset)
+                card.duplicate_clicked.connect(self._on_duplicate_preset)
+                card.reset_clicked.connect(self._on_reset_preset)
+                card.delete_clicked.connect(self._on_delete_preset)
+                card.export_clicked.connect(self._on_export_preset)
 
-                    target.append(card)
-                    self._preset_cards.append(card)
+                target.append(card)
+                self._preset_cards.append(card)
 
             # Порядок: официальные (сверху) и пользовательские (ниже)
             for card in official_items:
@@ -503,14 +503,42 @@ class ServerCheckWorker(QThread):
         self._first_online_server_id = None
     
     def run(self):
+        from concurrent.futures import ThreadPoolExecutor
         from updater.github_release import check_rate_limit
         from updater.server_pool import get_server_pool
-        import requests
+        from updater.server_probe import fetch_all_versions, probe_servers
         import time as _time
 
         pool = get_server_pool()
         self._first_online_server_id = None
-        
+
+        # VPS серверы (2) и GitHub API (3) проверяются параллельно: запросы
+        # уходят сразу и идут, пока опрашивается Telegram (1)
+        blocked_statuses = []
+        vps_results = iter(())
+        github_executor = None
+        github_future = None
+        if not self._telegram_only:
+            available = []
+            current_time = _time.time()
+            for server in pool.servers:
+                stats = pool.stats.get(server['id'], {})
+                blocked_until = stats.get('blocked_until')
+                if blocked_until and current_time < blocked_until:
+                    until_dt = datetime.fromtimestamp(blocked_until)
+                    blocked_statuses.append((server['name'], {
+                        'status': 'blocked',
+                        'response_time': 0,
+                        'error': f"Заблокирован до {until_dt.strftime('%H:%M:%S')}",
+                        'is_current': False,  # Заблокированный не может быть активным
+                    }))
+                else:
+                    available.append(server)
+
+            vps_results = probe_servers(available, fetch_all_versions)
+            github_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="GitHubRateLimit")
+            github_future = github_executor.submit(check_rate_limit)
+
         # 1. Telegram Bot (основной источник) — опрашиваем только текущий канал
         try:
             from updater.telegram_updater import is_telegram_available, get_telegram_version_info
@@ -563,7 +591,6 @@ class ServerCheckWorker(QThread):
                 }
             
             self.server_checked.emit('Telegram Bot', tg_status)
-            _time.sleep(0.1)
         except Exception as e:
             self.server_checked.emit('Telegram Bot', {
                 'status': 'error',
@@ -575,96 +602,60 @@ class ServerCheckWorker(QThread):
         if self._telegram_only:
             self.all_complete.emit()
             return
-        
+
         # 2. VPS серверы
-        for server in pool.servers:
+        for server_name, status in blocked_statuses:
+            self.server_checked.emit(server_name, status)
+
+        # Результаты VPS приходят по мере ответов: первый онлайн-сервер - самый быстрый
+        first_vps_online = True
+        for result in vps_results:
+            server = result.server
             server_id = server['id']
             server_name = f"{server['name']}"
-            
-            stats = pool.stats.get(server_id, {})
-            blocked_until = stats.get('blocked_until')
-            current_time = _time.time()
-            
-            if blocked_until and current_time < blocked_until:
-                until_dt = datetime.fromtimestamp(blocked_until)
+
+            if result.ok:
+                data = result.data or {}
+
+                # Первый работающий сервер становится активным
+                is_first_online = self._first_online_server_id is None
+                if is_first_online:
+                    self._first_online_server_id = server_id
+
                 status = {
-                    'status': 'blocked',
-                    'response_time': 0,
-                    'error': f"Заблокирован до {until_dt.strftime('%H:%M:%S')}",
-                    'is_current': False,  # Заблокированный не может быть активным
+                    'status': 'online',
+                    'response_time': result.response_time,
+                    'stable_version': data.get('stable', {}).get('version', '—'),
+                    'test_version': data.get('test', {}).get('version', '—'),
+                    'stable_notes': data.get('stable', {}).get('release_notes', ''),
+                    'test_notes': data.get('test', {}).get('release_notes', ''),
+                    'is_current': is_first_online,  # Звёздочка первому работающему
                 }
-                self.server_checked.emit(server_name, status)
-                _time.sleep(0.1)
-                continue
-            
-            start_time = _time.time()
-            try:
-                https_url = f"https://{server['host']}:{server['https_port']}/api/all_versions.json"
-                
-                from updater.server_config import should_verify_ssl
-                verify_ssl = should_verify_ssl()
-                
-                if not verify_ssl:
-                    import urllib3
-                    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-                
-                response = requests.get(https_url, timeout=10, verify=verify_ssl,
-                    headers={"Accept": "application/json", "User-Agent": "Zapret-Updater/3.1"})
-                
-                response_time = _time.time() - start_time
-                
-                if response.status_code == 200:
-                    data = response.json()
 
-                    stable_notes = data.get('stable', {}).get('release_notes', '')
-                    test_notes = data.get('test', {}).get('release_notes', '')
-                    
-                    # Первый работающий сервер становится активным
-                    is_first_online = self._first_online_server_id is None
-                    if is_first_online:
-                        self._first_online_server_id = server_id
-                    
-                    status = {
-                        'status': 'online',
-                        'response_time': response_time,
-                        'stable_version': data.get('stable', {}).get('version', '—'),
-                        'test_version': data.get('test', {}).get('version', '—'),
-                        'stable_notes': stable_notes,
-                        'test_notes': test_notes,
-                        'is_current': is_first_online,  # Звёздочка первому работающему
-                    }
-                    
+                # В кэш - данные самого быстрого VPS
+                if first_vps_online:
+                    first_vps_online = False
                     from updater.update_cache import set_cached_all_versions
                     set_cached_all_versions(data, f"{server_name} (HTTPS)")
-                    
-                    if self._update_pool_stats:
-                        pool.record_success(server_id, response_time)
-                else:
-                    status = {
-                        'status': 'error',
-                        'response_time': response_time,
-                        'error': f'HTTP {response.status_code}',
-                        'is_current': False,  # Ошибка - не активный
-                    }
-                    if self._update_pool_stats:
-                        pool.record_failure(server_id, f"HTTP {response.status_code}")
-                    
-            except Exception as e:
+
+                # Замеры времени отклика идут в статистику пула (выбор более быстрого сервера)
+                if self._update_pool_stats:
+                    pool.record_success(server_id, result.response_time)
+            else:
                 status = {
                     'status': 'error',
-                    'response_time': _time.time() - start_time,
-                    'error': str(e)[:40],
+                    'response_time': result.response_time,
+                    'error': result.error,
                     'is_current': False,  # Ошибка - не активный
                 }
                 if self._update_pool_stats:
-                    pool.record_failure(server_id, str(e)[:40])
-            
+                    pool.record_failure(server_id, result.error)
+
             self.server_checked.emit(server_name, status)
-            _time.sleep(0.15)
-        
+
         # 3. GitHub API
         try:
-            rate_info = check_rate_limit()
+            rate_info = github_future.result()
             github_status = {
                 'status': 'online',
                 'response_time': 0.5,
@@ -676,6 +667,8 @@ class ServerCheckWorker(QThread):
                 'status': 'error',
                 'error': str(e)[:50],
             }
+        finally:
+            github_executor.shutdown(wait=False)
         
         self.server_checked.emit('GitHub API', github_status)
         self.all_complete.emit()
@@ -1,6 +1,20 @@
-"""Zapret2 UI pages - new interface."""
-from .direct_control_page import Zapret2DirectControlPage
-from .direct_zapret2_page import Zapret2StrategiesPageNew
-from .strategy_detail_page import StrategyDetailPage
+"""Zapret2 UI pages - new interface (modules are imported on first access)."""
+import importlib
+
+_PAGE_MODULES = {
+    'Zapret2DirectControlPage': '.direct_control_page',
+    'Zapret2StrategiesPageNew': '.direct_zapret2_page',
+    'StrategyDetailPage': '.strategy_detail_page',
+}
+
+
+def __getattr__(name):
+    module_name = _PAGE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = ['Zapret2DirectControlPage', 'Zapret2StrategiesPageNew', 'StrategyDetailPage']
@@ -11,6 +11,7 @@ from PyQt6.QtGui import QFont, QIcon, QColor, QPainter, QPainterPath, QTransform
 import qtawesome as qta
 
 from ui.page_names import PageName, SectionName, SECTION_TO_PAGE, SECTION_CHILDREN, ORCHESTRA_ONLY_SECTIONS
+from ui.style_tokens import apply_component_style, set_style_state
 
 
 class ShimmerMixin:
@@ -128,6 +129,9 @@ class NavButton(QPushButton, ShimmerMixin, ShakeMixin):
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setText(f"   {text}")
         self.setIconSize(QSize(20, 20))
+
+        # Вид задаётся стилем компонента (ui/style_tokens.py), наведение - через :hover
+        apply_component_style(self, "nav_button", selected=False, collapsed=False)
         
         self._update_style()
     
@@ -141,36 +145,7 @@ class NavButton(QPushButton, ShimmerMixin, ShakeMixin):
         self._update_style()
         
     def _update_style(self):
-        if self._selected:
-            bg_color = "rgba(255, 255, 255, 0.1)"
-            border_left = "3px solid #60cdff"
-            text_color = "#ffffff"
-        elif self._hovered:
-            bg_color = "rgba(255, 255, 255, 0.05)"
-            border_left = "3px solid transparent"
-            text_color = "#e0e0e0"
-        else:
-            bg_color = "transparent"
-            border_left = "3px solid transparent"
-            text_color = "#9e9e9e"  # Светло-серый для неактивных
-        
-        padding = "22px" if not self._collapsed else "0px"
-        text_align = "left" if not self._collapsed else "center"
-            
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_color};
-                border: none;
-                border-left: {border_left};
-                border-radius: 4px;
-                color: {text_color};
-                text-align: {text_align};
-                padding-left: {padding};
-                font-family: 'Segoe UI Variable', 'Segoe UI', sans-serif;
-                font-size: 13px;
-                font-weight: {'600' if self._selected else '400'};
-            }}
-        """)
+        set_style_state(self, selected=self._selected, collapsed=self._collapsed)
         
         # Обновляем иконку - объёмная с градиентом для выбранного, светло-серая для остальных
         self._set_icon_with_brightness()
@@ -233,15 +208,13 @@ class NavButton(QPushButton, ShimmerMixin, ShakeMixin):
         
     def enterEvent(self, event):
         self._hovered = True
-        self._update_style()
-        # Запускаем подсветку при наведении
+        # Фон при наведении - :hover в стиле компонентов, здесь только подсветка иконки
         self.start_shimmer()
         super().enterEvent(event)
         
     def leaveEvent(self, event):
         self._hovered = False
         self.stop_shimmer()  # Останавливаем и сбрасываем
-        self._update_style()
         super().leaveEvent(event)
 
 
@@ -265,6 +238,8 @@ class SubNavButton(QPushButton, ShimmerMixin, ShakeMixin):
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setText(f"  {text}")
         self.setIconSize(QSize(14, 14))
+
+        apply_component_style(self, "sub_nav_button", selected=False, collapsed=False)
         
         self._update_style()
     
@@ -278,36 +253,7 @@ class SubNavButton(QPushButton, ShimmerMixin, ShakeMixin):
         self._update_style()
         
     def _update_style(self):
-        if self._selected:
-            bg_color = "rgba(255, 255, 255, 0.08)"
-            border_left = "2px solid #60cdff"
-            text_color = "#60cdff"
-        elif self._hovered:
-            bg_color = "rgba(255, 255, 255, 0.04)"
-            border_left = "2px solid transparent"
-            text_color = "#c0c0c0"
-        else:
-            bg_color = "transparent"
-            border_left = "2px solid transparent"
-            text_color = "#808080"  # Более тёмный серый для подпунктов
-        
-        padding = "28px" if not self._collapsed else "0px"
-        text_align = "left" if not self._collapsed else "center"
-            
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_color};
-                border: none;
-                border-left: {border_left};
-                border-radius: 3px;
-                color: {text_color};
-                text-align: {text_align};
-                padding-left: {padding};
-                font-family: 'Segoe UI Variable', 'Segoe UI', sans-serif;
-                font-size: 11px;
-                font-weight: {'500' if self._selected else '400'};
-            }}
-        """)
+        set_style_state(self, selected=self._selected, collapsed=self._collapsed)
         
         # Иконка меньшего размера
         self._set_icon_with_brightness()
@@ -364,15 +310,13 @@ class SubNavButton(QPushButton, ShimmerMixin, ShakeMixin):
         
     def enterEvent(self, event):
         self._hovered = True
-        self._update_style()
-        # Запускаем подсветку при наведении
+        # Фон при наведении - :hover в стиле компонентов, здесь только подсветка иконки
         self.start_shimmer()
         super().enterEvent(event)
         
     def leaveEvent(self, event):
         self._hovered = False
         self.stop_shimmer()  # Останавливаем и сбрасываем
-        self._update_style()
         super().leaveEvent(event)
 
 
@@ -0,0 +1,285 @@
+# ui/style_tokens.py
+"""
+Дизайн-токены и общий стиль компонентов.
+
+Раньше виджеты меняли вид через setStyleSheet() на каждое наведение,
+выбор или ошибку валидации. Каждый такой вызов разбирает CSS заново и
+переполирует (polish) виджет вместе со всеми дочерними виджетами.
+
+Теперь стили всех состояний компонента описаны заранее (токены +
+селекторы по objectName и динамическим свойствам), CSS собирается один раз
+(с кешем) и назначается виджету один раз в конструкторе. Дальше состояние
+переключается только свойствами:
+
+    apply_component_style(self, "nav_button", selected=False)
+    set_style_state(self, selected=True)   # только при изменении значения
+
+Наведение описано через :hover и вообще не требует кода.
+
+CSS назначается виджету, а не добавляется в CSS приложения: страницы и
+сайдбар задают контейнерам "background: transparent;" без селектора, а
+такой stylesheet предка по правилам Qt перекрывает правила приложения
+независимо от специфичности - фон компонентов бы пропал.
+
+Модуль не импортирует Qt на уровне модуля.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from string import Template
+from typing import Dict
+
+# ═══════════════════════════════════════════════════════════════
+# Токены
+# ═══════════════════════════════════════════════════════════════
+
+TOKENS: Dict[str, str] = {
+    "font_family": "'Segoe UI Variable', 'Segoe UI', sans-serif",
+    "font_mono": "Consolas, 'Courier New', monospace",
+
+    "accent": "#60cdff",
+    "accent_rgb": "96, 205, 255",
+    "danger": "#ff6b6b",
+    "danger_rgb": "255, 100, 100",
+
+    "text": "#ffffff",
+    "text_strong": "rgba(255, 255, 255, 0.9)",
+    "text_disabled": "rgba(255, 255, 255, 0.3)",
+
+    "nav_text": "#9e9e9e",
+    "nav_text_hover": "#e0e0e0",
+    "subnav_text": "#808080",
+    "subnav_text_hover": "#c0c0c0",
+
+    "surface_faint": "rgba(255, 255, 255, 0.02)",
+    "surface": "rgba(255, 255, 255, 0.03)",
+    "surface_card": "rgba(255, 255, 255, 0.04)",
+    "surface_input": "rgba(255, 255, 255, 0.06)",
+    "surface_hover": "rgba(255, 255, 255, 0.08)",
+    "surface_selected": "rgba(255, 255, 255, 0.1)",
+
+    "border_faint": "rgba(255, 255, 255, 0.05)",
+    "border": "rgba(255, 255, 255, 0.08)",
+    "border_input": "rgba(255, 255, 255, 0.1)",
+    "border_hover": "rgba(255, 255, 255, 0.15)",
+    "border_strong": "rgba(255, 255, 255, 0.3)",
+}
+
+# objectName компонентов, на которые ссылаются селекторы
+OBJECT_NAMES: Dict[str, str] = {
+    "nav_button": "navButton",
+    "sub_nav_button": "subNavButton",
+    "radio_option": "win11RadioOption",
+    "theme_card": "themeCard",
+    "theme_card_name": "themeCardName",
+    "preset_card": "presetCard",
+    "list_editor": "listEditor",
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Стили компонентов (string.Template: $token)
+# Порядок правил важен: при равной специфичности побеждает последнее,
+# поэтому [selected]/[invalid] идут после :hover.
+# ═══════════════════════════════════════════════════════════════
+
+COMPONENT_STYLES: Dict[str, str] = {
+    # ui/sidebar.py NavButton
+    "nav_button": """
+QPushButton#navButton {
+    background-color: transparent;
+    border: none;
+    border-left: 3px solid transparent;
+    border-radius: 4px;
+    color: $nav_text;
+    text-align: left;
+    padding-left: 22px;
+    font-family: $font_family;
+    font-size: 13px;
+    font-weight: 400;
+}
+QPushButton#navButton:hover {
+    background-color: rgba(255, 255, 255, 0.05);
+    color: $nav_text_hover;
+}
+QPushButton#navButton[selected="true"] {
+    background-color: $surface_selected;
+    border-left: 3px solid $accent;
+    color: $text;
+    font-weight: 600;
+}
+QPushButton#navButton[collapsed="true"] {
+    text-align: center;
+    padding-left: 0px;
+}
+""",
+    # ui/sidebar.py SubNavButton
+    "sub_nav_button": """
+QPushButton#subNavButton {
+    background-color: transparent;
+    border: none;
+    border-left: 2px solid transparent;
+    border-radius: 3px;
+    color: $subnav_text;
+    text-align: left;
+    padding-left: 28px;
+    font-family: $font_family;
+    font-size: 11px;
+    font-weight: 400;
+}
+QPushButton#subNavButton:hover {
+    background-color: rgba(255, 255, 255, 0.04);
+    color: $subnav_text_hover;
+}
+QPushButton#subNavButton[selected="true"] {
+    background-color: $surface_hover;
+    border-left: 2px solid $accent;
+    color: $accent;
+    font-weight: 500;
+}
+QPushButton#subNavButton[collapsed="true"] {
+    text-align: center;
+    padding-left: 0px;
+}
+""",
+    # ui/pages/dpi_settings_page.py Win11RadioOption
+    "radio_option": """
+QWidget#win11RadioOption {
+    background-color: $surface;
+    border: 1px solid $border;
+    border-radius: 8px;
+}
+QWidget#win11RadioOption:hover {
+    background-color: rgba(255, 255, 255, 0.06);
+    border: 1px solid $border_hover;
+}
+QWidget#win11RadioOption[selected="true"] {
+    background-color: rgba($accent_rgb, 0.15);
+    border: 1px solid rgba($accent_rgb, 0.6);
+}
+""",
+    # ui/pages/appearance_page.py ThemeCard
+    "theme_card": """
+QFrame#themeCard {
+    background-color: $surface_card;
+    border: 1px solid $border_input;
+    border-radius: 6px;
+}
+QFrame#themeCard:hover {
+    background-color: $surface_selected;
+    border: 1px solid $border_strong;
+}
+QFrame#themeCard[selected="true"] {
+    background-color: rgba($accent_rgb, 0.15);
+    border: 2px solid $accent;
+}
+QFrame#themeCard[locked="true"] {
+    background-color: $surface_faint;
+    border: 1px solid $border_faint;
+}
+QLabel#themeCardName {
+    color: $text_strong;
+    font-size: 10px;
+}
+QLabel#themeCardName[locked="true"] {
+    color: $text_disabled;
+}
+""",
+    # ui/pages/presets_page.py PresetCard
+    "preset_card": """
+QFrame#presetCard {
+    background-color: $surface_card;
+    border: none;
+    border-radius: 8px;
+}
+QFrame#presetCard:hover {
+    background-color: $surface_hover;
+}
+QFrame#presetCard[active="true"] {
+    background-color: rgba($accent_rgb, 0.08);
+}
+""",
+    # Редакторы списков (custom_ipset_page, custom_domains_page, netrogat_page)
+    "list_editor": """
+QPlainTextEdit#listEditor {
+    background: $surface_input;
+    border: 1px solid $border_input;
+    border-radius: 8px;
+    padding: 12px;
+    color: $text;
+    font-family: $font_mono;
+    font-size: 13px;
+}
+QPlainTextEdit#listEditor:focus {
+    border: 1px solid $accent;
+}
+QPlainTextEdit#listEditor[invalid="true"] {
+    background: rgba($danger_rgb, 0.08);
+    border: 2px solid $danger;
+}
+""",
+}
+
+
+@lru_cache(maxsize=None)
+def _compile(name: str, frozen_overrides: tuple) -> str:
+    tokens = dict(TOKENS)
+    tokens.update(frozen_overrides)
+    # substitute (не safe_substitute): опечатка в токене - ошибка сразу
+    return Template(COMPONENT_STYLES[name]).substitute(tokens).strip() + "\n"
+
+
+def component_stylesheet(name: str, overrides: Dict[str, str] | None = None) -> str:
+    """CSS компонента с подставленными токенами (собирается один раз)"""
+    return _compile(name, tuple(sorted((overrides or {}).items())))
+
+
+def build_component_stylesheet(overrides: Dict[str, str] | None = None) -> str:
+    """CSS всех компонентов одной строкой"""
+    return "\n".join(component_stylesheet(name, overrides) for name in COMPONENT_STYLES)
+
+
+def apply_component_style(widget, name: str, **states) -> None:
+    """
+    Подключает стиль компонента к виджету: objectName, готовый CSS и
+    начальные значения свойств состояния. Вызывается один раз в конструкторе.
+    """
+    from PyQt6.QtCore import Qt
+
+    widget.setObjectName(OBJECT_NAMES[name])
+    widget.setAttribute(Qt.WidgetAttribute.WA_Hover, True)
+    for prop, value in states.items():
+        widget.setProperty(prop, value)
+    widget.setStyleSheet(component_stylesheet(name))
+
+
+# ═══════════════════════════════════════════════════════════════
+# Переключение состояний
+# ═══════════════════════════════════════════════════════════════
+
+# Счётчики для бенчмарка и отладки
+stats: Dict[str, int] = {"updates": 0, "repolish": 0}
+
+
+def set_style_state(widget, **states) -> bool:
+    """
+    Выставляет динамические свойства виджета и переполирует только его
+    (без разбора CSS и без дочерних виджетов). Если ни одно значение не
+    изменилось, ничего не делает. Возвращает True, если был repolish.
+    """
+    stats["updates"] += 1
+    changed = False
+    for name, value in states.items():
+        if widget.property(name) != value:
+            widget.setProperty(name, value)
+            changed = True
+    if not changed:
+        return False
+
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    stats["repolish"] += 1
+    return True
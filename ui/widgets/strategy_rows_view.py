@@ -0,0 +1,396 @@
+# ui/widgets/strategy_rows_view.py
+"""
+Таблица стратегий для страниц залоченных/заблокированных стратегий оркестратора.
+
+StrategyRowsModel - QAbstractTableModel поверх SortedRows (ui/orchestra_rows_model.py):
+изменения применяются вставкой/удалением отдельных строк (upsert/remove).
+HostFilterProxyModel - поиск по домену без перестройки модели.
+StrategySpinDelegate - редактор номера стратегии (QSpinBox создаётся только
+для редактируемой ячейки). RowActionsDelegate - рисует иконки действий
+и обрабатывает клики по ним (вместо отдельных QPushButton в каждом ряду).
+
+Модель не меняет данные сама: правка номера и клики по действиям уходят
+сигналами на страницу, а страница после сохранения вызывает upsert/remove.
+"""
+
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QEvent, QModelIndex, QRect, QSize,
+    QSortFilterProxyModel, pyqtSignal
+)
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QHeaderView, QSpinBox, QStyledItemDelegate, QTableView, QToolTip
+)
+import qtawesome as qta
+
+from ui.orchestra_rows_model import SortedRows, StrategyRow
+
+COL_HOST = 0
+COL_PROTO = 1
+COL_STRATEGY = 2
+COL_ACTIONS = 3
+
+# Роль с самим StrategyRow
+ROW_ROLE = Qt.ItemDataRole.UserRole + 1
+
+ROW_HEIGHT = 36
+
+# Максимум видимых строк (дальше - своя прокрутка таблицы внутри страницы)
+MAX_VISIBLE_ROWS = 14
+
+ACTION_ICON_SIZE = 16
+ACTION_CELL_SIZE = 28
+
+# (action_id, иконка, подсказка); action_id=None - декоративная иконка без клика
+RowAction = Tuple[Optional[str], str, str]
+
+
+class StrategyRowsModel(QAbstractTableModel):
+    """Модель строк (хост, askey, стратегия) с инкрементальными изменениями"""
+
+    # Пользователь ввёл новый номер стратегии (row, new_strategy)
+    strategy_edited = pyqtSignal(object, int)
+
+    def __init__(self, key_func, sort_key_func, accent_color: str = "#60cdff", parent=None):
+        super().__init__(parent)
+        self._rows = SortedRows(key_func, sort_key_func)
+        self._accent = QColor(accent_color)
+        self._text = QColor(255, 255, 255)
+        self._proto = QColor(255, 255, 255, 128)
+        self._dim_text = QColor(255, 255, 255, 153)
+        self._dim = QColor(255, 255, 255, 77)
+
+    # ==================== ДАННЫЕ ====================
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 4
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == ROW_ROLE:
+            return row
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COL_HOST:
+                return row.host
+            if column == COL_PROTO:
+                return f"[{row.askey.upper()}]"
+            if column == COL_STRATEGY:
+                return f"#{row.strategy}"
+            return None
+        if role == Qt.ItemDataRole.EditRole and column == COL_STRATEGY:
+            return row.strategy
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if column == COL_HOST:
+                return self._dim_text if row.is_default else self._text
+            if column == COL_PROTO:
+                return self._dim if row.is_default else self._proto
+            if column == COL_STRATEGY:
+                return self._proto if row.is_default else self._accent
+        if role == Qt.ItemDataRole.TextAlignmentRole and column != COL_HOST:
+            return int(Qt.AlignmentFlag.AlignCenter)
+        if role == Qt.ItemDataRole.ToolTipRole and column == COL_STRATEGY:
+            if row.is_default:
+                return "Системная блокировка (нельзя изменить)"
+            return "Дважды щёлкните, чтобы изменить номер стратегии"
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == COL_STRATEGY and not self._rows[index.row()].is_default:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Правка номера не применяется сразу - страница сохраняет и вызывает upsert"""
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() != COL_STRATEGY:
+            return False
+        row = self._rows[index.row()]
+        value = int(value)
+        if value != row.strategy:
+            self.strategy_edited.emit(row, value)
+        return True
+
+    # ==================== ИЗМЕНЕНИЯ ====================
+
+    def row_at(self, position: int) -> StrategyRow:
+        return self._rows[position]
+
+    def rows(self) -> Iterable[StrategyRow]:
+        return iter(self._rows)
+
+    def get(self, key: Hashable) -> Optional[StrategyRow]:
+        return self._rows.get(key)
+
+    def reset_rows(self, rows: Iterable[StrategyRow]):
+        """Полная замена (загрузка из реестра)"""
+        self.beginResetModel()
+        self._rows.reset(rows)
+        self.endResetModel()
+
+    def upsert(self, row: StrategyRow):
+        """Добавляет строку или обновляет существующую с тем же ключом"""
+        position = self._rows.find(self._rows.key_func(row))
+        if position is not None:
+            if self._rows[position] == row:
+                return
+            if self._rows.can_replace(position, row):
+                self._rows.replace(position, row)
+                self.dataChanged.emit(self.index(position, 0), self.index(position, COL_ACTIONS))
+                return
+            self._remove_at(position)
+
+        position = self._rows.insert_position(row)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(row)
+        self.endInsertRows()
+
+    def remove(self, key: Hashable) -> bool:
+        """Удаляет строку по ключу"""
+        position = self._rows.find(key)
+        if position is None:
+            return False
+        self._remove_at(position)
+        return True
+
+    def _remove_at(self, position: int):
+        self.beginRemoveRows(QModelIndex(), position, position)
+        self._rows.pop(position)
+        self.endRemoveRows()
+
+
+class HostFilterProxyModel(QSortFilterProxyModel):
+    """Фильтр по подстроке домена (без учёта регистра)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_search(self, text: str):
+        needle = text.lower().strip()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        return self._needle in self.sourceModel().row_at(source_row).host.lower()
+
+
+class StrategySpinDelegate(QStyledItemDelegate):
+    """QSpinBox для редактирования номера стратегии"""
+
+    def __init__(self, accent_color: str = "#60cdff", parent=None):
+        super().__init__(parent)
+        self._accent = accent_color
+
+    def createEditor(self, parent, option, index):
+        spin = QSpinBox(parent)
+        spin.setRange(1, 999)
+        spin.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        spin.setStyleSheet(f"""
+            QSpinBox {{
+                background-color: #2d2d2d;
+                color: {self._accent};
+                border: 1px solid {self._accent};
+                border-radius: 4px;
+                font-size: 13px;
+                font-weight: 600;
+            }}
+            QSpinBox::up-button, QSpinBox::down-button {{
+                width: 0px;
+                border: none;
+            }}
+        """)
+        return spin
+
+    def setEditorData(self, editor, index):
+        editor.setValue(int(index.data(Qt.ItemDataRole.EditRole) or 1))
+        editor.selectAll()
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect.adjusted(4, 4, -4, -4))
+
+
+class RowActionsDelegate(QStyledItemDelegate):
+    """Иконки действий в последней колонке; клик -> triggered(row, action_id)"""
+
+    triggered = pyqtSignal(object, str)
+
+    def __init__(self, actions_for: Callable[[StrategyRow], List[RowAction]], parent=None):
+        super().__init__(parent)
+        self._actions_for = actions_for
+        self._icons: Dict[Tuple[str, bool], object] = {}
+
+    def _icon(self, name: str, decorative: bool):
+        key = (name, decorative)
+        icon = self._icons.get(key)
+        if icon is None:
+            icon = qta.icon(name, color="#666666" if decorative else "white")
+            self._icons[key] = icon
+        return icon
+
+    def _action_rects(self, rect: QRect, row: StrategyRow):
+        """Раскладка иконок справа налево"""
+        actions = self._actions_for(row)
+        result = []
+        right = rect.right() - 4
+        top = rect.top() + (rect.height() - ACTION_CELL_SIZE) // 2
+        for action in reversed(actions):
+            cell = QRect(right - ACTION_CELL_SIZE + 1, top, ACTION_CELL_SIZE, ACTION_CELL_SIZE)
+            result.append((cell, action))
+            right -= ACTION_CELL_SIZE
+        return result
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        row = index.data(ROW_ROLE)
+        if row is None:
+            return
+        for cell, (action_id, icon_name, _tooltip) in self._action_rects(option.rect, row):
+            icon_rect = QRect(0, 0, ACTION_ICON_SIZE, ACTION_ICON_SIZE)
+            icon_rect.moveCenter(cell.center())
+            self._icon(icon_name, action_id is None).paint(painter, icon_rect)
+
+    def _hit(self, pos, option, index):
+        row = index.data(ROW_ROLE)
+        if row is None:
+            return None, None
+        for cell, action in self._action_rects(option.rect, row):
+            if cell.contains(pos):
+                return row, action
+        return row, None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            row, action = self._hit(event.position().toPoint(), option, index)
+            if action is not None and action[0] is not None:
+                self.triggered.emit(row, action[0])
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.Type.ToolTip:
+            _row, action = self._hit(event.pos(), option, index)
+            if action is not None:
+                QToolTip.showText(event.globalPos(), action[2], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+    def sizeHint(self, option, index):
+        row = index.data(ROW_ROLE)
+        count = len(self._actions_for(row)) if row is not None else 1
+        return QSize(count * ACTION_CELL_SIZE + 8, ROW_HEIGHT)
+
+
+class StrategyRowsView(QTableView):
+    """
+    Таблица строк стратегий с фиксированной высотой строк: рисуются только
+    видимые строки, поэтому размер списка не влияет на время открытия страницы.
+    """
+
+    def __init__(self, model: StrategyRowsModel, actions_for: Callable[[StrategyRow], List[RowAction]],
+                 accent_color: str = "#60cdff", parent=None):
+        super().__init__(parent)
+        # Запрещаем перетаскивание окна при взаимодействии с таблицей
+        self.setProperty("noDrag", True)
+
+        self.rows_model = model
+        self.proxy_model = HostFilterProxyModel(self)
+        self.proxy_model.setSourceModel(model)
+        self.setModel(self.proxy_model)
+
+        self.strategy_delegate = StrategySpinDelegate(accent_color, self)
+        self.actions_delegate = RowActionsDelegate(actions_for, self)
+        self.setItemDelegateForColumn(COL_STRATEGY, self.strategy_delegate)
+        self.setItemDelegateForColumn(COL_ACTIONS, self.actions_delegate)
+
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setMouseTracking(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked
+            | QAbstractItemView.EditTrigger.SelectedClicked
+            | QAbstractItemView.EditTrigger.EditKeyPressed
+        )
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+
+        vertical = self.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(ROW_HEIGHT)
+
+        horizontal = self.horizontalHeader()
+        horizontal.setVisible(False)
+        horizontal.setSectionResizeMode(COL_HOST, QHeaderView.ResizeMode.Stretch)
+        for column, width in ((COL_PROTO, 70), (COL_STRATEGY, 70), (COL_ACTIONS, 2 * ACTION_CELL_SIZE + 8)):
+            horizontal.setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
+            self.setColumnWidth(column, width)
+
+        self.setStyleSheet("""
+            QTableView {
+                background: transparent;
+                border: none;
+                outline: none;
+                font-size: 13px;
+            }
+            QTableView::item {
+                background-color: rgba(255, 255, 255, 0.04);
+                border-bottom: 1px solid rgba(255, 255, 255, 0.06);
+                padding-left: 8px;
+            }
+            QTableView::item:hover {
+                background-color: rgba(255, 255, 255, 0.06);
+            }
+            QTableView::item:selected {
+                background-color: rgba(255, 255, 255, 0.09);
+            }
+        """)
+
+        # Высота по числу видимых строк (страница сама прокручивается)
+        for signal in (self.proxy_model.rowsInserted, self.proxy_model.rowsRemoved,
+                       self.proxy_model.modelReset, self.proxy_model.layoutChanged):
+            signal.connect(self._update_height)
+        self._update_height()
+
+    def set_search(self, text: str):
+        self.proxy_model.set_search(text)
+
+    def _update_height(self, *_args):
+        visible = min(max(self.proxy_model.rowCount(), 1), MAX_VISIBLE_ROWS)
+        self.setFixedHeight(visible * ROW_HEIGHT + 2 * self.frameWidth())
+
+    def wheelEvent(self, event):
+        # Как ScrollBlockingPlainTextEdit: на краях списка не прокручиваем страницу
+        scrollbar = self.verticalScrollBar()
+        delta = event.angleDelta().y()
+        if scrollbar.maximum() == scrollbar.minimum():
+            event.ignore()
+            return
+        if delta > 0 and scrollbar.value() == scrollbar.minimum():
+            event.accept()
+            return
+        if delta < 0 and scrollbar.value() == scrollbar.maximum():
+            event.accept()
+            return
+        super().wheelEvent(event)
+        event.accept()
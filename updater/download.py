@@ -0,0 +1,565 @@
+"""
+updater/download.py
+────────────────────────────────────────────────────────────────
+Докачиваемое скачивание установщика (HTTP Range) с проверкой SHA-256
+
+Раньше каждая повторная попытка качала 60+ МБ с нуля (новый Session на
+попытку), а "уже скачано" определялось по mtime за последние 30 секунд.
+
+Теперь:
+- данные пишутся в <dest>.part, прогресс сегментов - в <dest>.download.json;
+  обрыв соединения, повторная попытка или повторный запуск обновления
+  продолжают с места обрыва (Range: bytes=N-);
+- при segments > 1 и поддержке Range файл делится на сегменты, которые
+  качаются параллельно; каждый ответ проверяется по полному размеру из
+  Content-Range;
+- сегменты расходятся по разным зеркалам только при известном SHA-256:
+  совпадение размера не гарантирует тот же файл (зеркало может отдавать
+  другую сборку того же размера), и смешанный результат поймает только
+  сверка хэша. Без SHA-256 все диапазоны качаются с одного зеркала - того,
+  что ответило первым (оно же сохраняется для докачки);
+- SHA-256 считается по мере записи (непрерывный префикс файла) и
+  сверяется с ожидаемым, если он известен;
+- готовый файл отмечается в <dest>.download.json (размер + SHA-256),
+  поэтому повторный вызов не качает его заново.
+
+Модуль не импортирует Qt; requests импортируется лениво.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from log import log
+
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".download.json"
+
+CHUNK_SIZE = 1024 * 1024          # 1 МБ
+MAX_SEGMENTS = 4
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024  # сегменты не меньше 8 МБ
+TIMEOUT = (10, 90)                # connect, read
+PROGRESS_INTERVAL = 2.0           # секунды между on_progress
+STATE_SAVE_INTERVAL = 1.0         # секунды между записью .download.json
+
+Mirror = Tuple[str, bool]  # (url, verify_ssl)
+
+
+class DownloadError(Exception):
+    """Скачивание не удалось (частичный файл сохранён для докачки)"""
+
+
+class ChecksumMismatch(DownloadError):
+    """SHA-256 скачанного файла не совпал с ожидаемым (частичный файл удалён)"""
+
+
+class _Aborted(DownloadError):
+    """Сегмент остановлен из-за ошибки в другом сегменте"""
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """'bytes 100-199/1000' -> (100, 199, 1000); total '*' -> None"""
+    if not value:
+        return None
+    try:
+        unit, _, spec = value.strip().partition(" ")
+        if unit.lower() != "bytes":
+            return None
+        span, _, total = spec.partition("/")
+        start, _, end = span.partition("-")
+        return int(start), int(end), (None if total.strip() == "*" else int(total))
+    except ValueError:
+        return None
+
+
+def plan_segments(total: Optional[int], count: int, min_size: Optional[int] = None) -> List[List[Optional[int]]]:
+    """Делит [0, total) на сегменты [start, end, done]; без размера - один сегмент до конца"""
+    if not total:
+        return [[0, None, 0]]
+    min_size = SEGMENT_MIN_SIZE if min_size is None else min_size
+    count = max(1, min(count, total // max(1, min_size)))
+    size = -(-total // count)
+    return [[start, min(start + size, total), 0] for start in range(0, total, size)]
+
+
+class _HashCursor:
+    """SHA-256 по мере записи: хешируется непрерывный готовый префикс файла"""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._sha = hashlib.sha256()
+        self.position = 0
+
+    def advance(self, frontier: int, offset: int = -1, chunk: bytes = b""):
+        with self._lock:
+            # Чанк сразу за хешированным префиксом берём из памяти,
+            # остальное (другие сегменты, докачка) дочитываем из файла
+            if chunk and offset == self.position and offset + len(chunk) <= frontier:
+                self._sha.update(chunk)
+                self.position += len(chunk)
+            if self.position >= frontier:
+                return
+            with open(self._path, "rb") as f:
+                f.seek(self.position)
+                while self.position < frontier:
+                    block = f.read(min(CHUNK_SIZE, frontier - self.position))
+                    if not block:
+                        break
+                    self._sha.update(block)
+                    self.position += len(block)
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+
+class ResumableDownload:
+    """Одно скачивание файла с зеркал (см. download_resumable)"""
+
+    def __init__(
+        self,
+        mirrors: Sequence[Mirror],
+        dest: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        segments: int = 1,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        timeout=TIMEOUT,
+        session=None,
+    ):
+        if not mirrors:
+            raise ValueError("Нет URL для скачивания")
+        self.mirrors = list(mirrors)
+        self.dest = dest
+        self.part_path = dest + PART_SUFFIX
+        self.state_path = dest + STATE_SUFFIX
+        self.on_progress = on_progress
+        self.expected_size = expected_size or None
+        self.expected_sha256 = (expected_sha256 or "").lower() or None
+        self.segments_wanted = max(1, min(segments, MAX_SEGMENTS))
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self._session = session
+
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self._hash = _HashCursor(self.part_path)
+        self._segments: List[List[Optional[int]]] = []
+        self._total: Optional[int] = None
+        # Единственное зеркало для всех диапазонов, если SHA-256 неизвестен
+        self._pinned: Optional[Mirror] = None
+        self._done_bytes = 0
+        self._last_progress = 0.0
+        self._last_state_save = 0.0
+
+        self.resumed_from = 0  # сколько байт было на диске до начала (статистика)
+
+    # ---------- публичное ----------
+
+    def run(self) -> str:
+        """Скачивает файл в dest, возвращает SHA-256 (hex)"""
+        cached = self._completed_digest()
+        if cached:
+            log(f"⏭️ Файл уже скачан и проверен: {os.path.basename(self.dest)}", "🔄 DOWNLOAD")
+            return cached
+
+        started = time.monotonic()
+        initial = None
+        if not self._load_state():
+            initial = self._start()
+        self.resumed_from = self._done_bytes
+        if self.resumed_from:
+            log(f"📥 Докачка с {self.resumed_from / 1024 / 1024:.1f} МБ", "🔄 DOWNLOAD")
+
+        try:
+            self._run_segments(initial)
+        finally:
+            self._save_state()
+
+        digest = self._finish()
+        elapsed = time.monotonic() - started
+        fetched = (self._total or 0) - self.resumed_from
+        if elapsed > 0 and self._total:
+            log(f"✅ Скачано {self._total / 1024 / 1024:.1f} MB за {elapsed:.1f}с "
+                f"({fetched / elapsed / 1024 / 1024:.2f} MB/s, сегментов: {len(self._segments)})", "🔄 DOWNLOAD")
+        return digest
+
+    # ---------- состояние ----------
+
+    def _read_state(self) -> Optional[dict]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _completed_digest(self) -> Optional[str]:
+        state = self._read_state()
+        if not state or not state.get("complete") or not os.path.exists(self.dest):
+            return None
+        if os.path.getsize(self.dest) != state.get("total"):
+            return None
+        if self.expected_size and state.get("total") != self.expected_size:
+            return None
+        digest = state.get("sha256")
+        if self.expected_sha256 and digest != self.expected_sha256:
+            return None
+        return digest
+
+    def _load_state(self) -> bool:
+        """Подхватывает частичное скачивание, если оно от того же файла"""
+        state = self._read_state()
+        if (not state or state.get("complete") or not os.path.exists(self.part_path)
+                or state.get("expected_sha256") != self.expected_sha256
+                or (self.expected_size and state.get("total") != self.expected_size)):
+            self._discard()
+            return False
+        segments = state.get("segments") or []
+        if not segments:
+            self._discard()
+            return False
+        if not self.expected_sha256:
+            # Докачка без хэша - только с того же зеркала
+            pinned = next((m for m in self.mirrors if m[0] == state.get("mirror")), None)
+            if pinned is None:
+                self._discard()
+                return False
+            self._pinned = pinned
+        self._segments = [list(s) for s in segments]
+        self._total = state.get("total")
+        self._done_bytes = sum(s[2] for s in self._segments)
+        return True
+
+    def _save_state(self, complete: bool = False, digest: Optional[str] = None):
+        with self._lock:
+            state = {
+                "complete": complete,
+                "total": self._total,
+                "expected_sha256": self.expected_sha256,
+                "sha256": digest,
+                "mirror": self._pinned[0] if self._pinned else None,
+                "segments": [] if complete else [list(s) for s in self._segments],
+            }
+            self._last_state_save = time.monotonic()
+        tmp = self.state_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_path)
+        except Exception as e:
+            log(f"Не удалось сохранить состояние скачивания: {e}", "⚠️ DOWNLOAD")
+
+    def _discard(self):
+        for path in (self.part_path, self.state_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log(f"Не удалось удалить {path}: {e}", "⚠️ DOWNLOAD")
+
+    # ---------- HTTP ----------
+
+    def _get_session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers.update({
+                "User-Agent": "Zapret-Updater/3.1",
+                "Accept": "application/octet-stream",
+                "Accept-Encoding": "identity",
+            })
+            adapter = HTTPAdapter(pool_connections=len(self.mirrors), pool_maxsize=MAX_SEGMENTS, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if not all(verify for _, verify in self.mirrors):
+                try:
+                    import urllib3
+                    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+                except Exception:
+                    pass
+            self._session = session
+        return self._session
+
+    def _request(self, mirror: Mirror, start: int, end: Optional[int]):
+        url, verify = mirror
+        headers = {"Range": f"bytes={start}-{'' if end is None else end - 1}"}
+        return self._get_session().get(url, headers=headers, stream=True, timeout=self.timeout, verify=verify)
+
+    def _start(self):
+        """Первый запрос: узнаёт размер и поддержку Range, планирует сегменты"""
+        last_error = "нет ответа"
+        for attempt in range(self.max_retries):
+            mirror = self.mirrors[attempt % len(self.mirrors)]
+            self._sleep_before(attempt)
+            try:
+                resp = self._request(mirror, 0, None)
+            except Exception as e:
+                last_error = str(e)
+                log(f"❌ {mirror[0]}: {last_error}", "🔄 DOWNLOAD")
+                continue
+
+            if resp.status_code == 206:
+                content_range = parse_content_range(resp.headers.get("Content-Range"))
+                total = content_range[2] if content_range else None
+                ranges = True
+            elif resp.status_code == 200:
+                total = int(resp.headers.get("Content-Length") or 0) or None
+                ranges = False
+            else:
+                resp.close()
+                last_error = f"HTTP {resp.status_code}"
+                log(f"❌ {mirror[0]}: {last_error}", "🔄 DOWNLOAD")
+                continue
+
+            if self.expected_size and total and total != self.expected_size:
+                resp.close()
+                last_error = f"Размер не совпадает: {total} != {self.expected_size}"
+                log(f"❌ {mirror[0]}: {last_error}", "🔄 DOWNLOAD")
+                continue
+
+            self._total = total
+            if not self.expected_sha256:
+                self._pinned = mirror
+            self._segments = plan_segments(total, self.segments_wanted if ranges else 1)
+            self._done_bytes = 0
+            with open(self.part_path, "wb") as f:
+                if total:
+                    f.truncate(total)  # место под все сегменты
+            self._save_state()
+            if total:
+                log(f"📦 Размер: {total / (1024 * 1024):.1f} MB, сегментов: {len(self._segments)}", "🔄 DOWNLOAD")
+            # Уже открытый ответ продолжает первый сегмент
+            return resp, attempt
+        raise DownloadError(f"Не удалось начать скачивание: {last_error}")
+
+    def _sleep_before(self, attempt: int):
+        # Первый круг по зеркалам - без паузы, дальше экспоненциально
+        if attempt >= len(self.mirrors) and self.retry_delay > 0:
+            time.sleep(min(self.retry_delay * 2 ** (attempt - len(self.mirrors)), 30))
+
+    # ---------- сегменты ----------
+
+    def _run_segments(self, initial):
+        pending = [i for i, s in enumerate(self._segments) if not self._segment_finished(s)]
+        if not pending:
+            return
+        if len(pending) == 1:
+            self._run_segment(pending[0], initial if pending[0] == 0 else None)
+            return
+
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="UpdateSegment") as pool:
+            futures = [pool.submit(self._run_segment, i, initial if i == 0 else None) for i in pending]
+            errors = []
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(e)
+                    self._abort.set()
+        if errors:
+            # Первопричина, а не остановленные из-за неё сегменты
+            errors.sort(key=lambda e: isinstance(e, _Aborted))
+            raise errors[0]
+
+    @staticmethod
+    def _segment_finished(segment) -> bool:
+        start, end, done = segment
+        return end is not None and start + done >= end
+
+    def _run_segment(self, index: int, initial=None):
+        segment = self._segments[index]
+        attempt = initial[1] if initial else index  # при известном SHA-256 сегменты расходятся по зеркалам
+        failures = 0
+        last_error = ""
+
+        while not self._segment_finished(segment):
+            if self._abort.is_set():
+                raise _Aborted("Скачивание прервано")
+            if initial:
+                resp, _ = initial
+                initial = None
+                mirror = self._mirror_for(attempt)
+            else:
+                if failures >= self.max_retries:
+                    raise DownloadError(f"Сегмент {index + 1}: {last_error}")
+                self._sleep_before(failures)
+                mirror = self._mirror_for(attempt)
+                try:
+                    resp = self._request(mirror, segment[0] + segment[2], segment[1])
+                    self._check_response(segment, resp)
+                except Exception as e:
+                    last_error = str(e)
+                    log(f"❌ Сегмент {index + 1}, {mirror[0]}: {last_error}", "🔄 DOWNLOAD")
+                    failures += 1
+                    attempt += 1
+                    continue
+
+            before = segment[2]
+            try:
+                self._stream(segment, resp)
+            except Exception as e:
+                last_error = str(e)
+                log(f"❌ Сегмент {index + 1}, {mirror[0]}: обрыв на "
+                    f"{(segment[0] + segment[2]) / 1024 / 1024:.1f} МБ: {last_error}", "🔄 DOWNLOAD")
+                if segment[2] == before:
+                    # Без прогресса - следующее зеркало; с прогрессом - докачка с того же
+                    failures += 1
+                    attempt += 1
+            finally:
+                resp.close()
+
+    def _mirror_for(self, attempt: int) -> Mirror:
+        """Зеркало для очередной попытки сегмента"""
+        if self._pinned is not None:
+            return self._pinned
+        return self.mirrors[attempt % len(self.mirrors)]
+
+    def _check_response(self, segment, resp):
+        offset = segment[0] + segment[2]
+        if resp.status_code == 206:
+            content_range = parse_content_range(resp.headers.get("Content-Range"))
+            if not content_range or content_range[0] != offset:
+                resp.close()
+                raise DownloadError(f"Неверный Content-Range: {resp.headers.get('Content-Range')}")
+            if self._total is not None and content_range[2] not in (None, self._total):
+                resp.close()
+                raise DownloadError(f"Другой файл на зеркале: {content_range[2]} != {self._total}")
+            return
+
+        if resp.status_code == 200 and segment[0] == 0 and len(self._segments) == 1:
+            # Сервер без Range - качаем заново целиком
+            length = int(resp.headers.get("Content-Length") or 0) or None
+            if self._total is not None and length not in (None, self._total):
+                resp.close()
+                raise DownloadError(f"Другой файл на зеркале: {length} != {self._total}")
+            if offset:
+                log("⚠️ Сервер не поддерживает докачку, скачивание с начала", "🔄 DOWNLOAD")
+            with self._lock:
+                self._done_bytes -= segment[2]
+                segment[2] = 0
+                segment[1] = length
+                self._total = length
+            self._hash.reset()
+            with open(self.part_path, "r+b") as f:
+                f.truncate(0)
+            return
+
+        resp.close()
+        if resp.status_code == 200:
+            raise DownloadError("Сервер не поддерживает Range")
+        raise DownloadError(f"HTTP {resp.status_code}")
+
+    def _stream(self, segment, resp):
+        start, end = segment[0], segment[1]
+        offset = start + segment[2]
+        with open(self.part_path, "r+b", buffering=0) as fp:
+            fp.seek(offset)
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                if self._abort.is_set():
+                    raise _Aborted("Скачивание прервано")
+                if not chunk:
+                    continue
+                if end is not None and offset + len(chunk) > end:
+                    chunk = chunk[:end - offset]
+                fp.write(chunk)
+                with self._lock:
+                    segment[2] += len(chunk)
+                    self._done_bytes += len(chunk)
+                self._hash.advance(self._frontier(), offset, chunk)
+                offset += len(chunk)
+                self._tick()
+                if end is not None and offset >= end:
+                    return
+
+        if end is None:
+            # Размер неизвестен: нормальный конец потока - конец файла
+            with self._lock:
+                segment[1] = offset
+                self._total = offset
+            return
+        raise DownloadError(f"Соединение закрыто на {offset} из {end} байт")
+
+    def _frontier(self) -> int:
+        """Конец непрерывного скачанного префикса файла"""
+        with self._lock:
+            for start, end, done in self._segments:
+                if end is None or start + done < end:
+                    return start + done
+            return self._segments[-1][1] or 0
+
+    def _tick(self):
+        now = time.monotonic()
+        report = None
+        save = False
+        with self._lock:
+            if self.on_progress and self._total and now - self._last_progress >= PROGRESS_INTERVAL:
+                self._last_progress = now
+                report = (self._done_bytes, self._total)
+            if now - self._last_state_save >= STATE_SAVE_INTERVAL:
+                self._last_state_save = now
+                save = True
+        if save:
+            self._save_state()
+        if report:
+            self.on_progress(*report)
+
+    # ---------- завершение ----------
+
+    def _finish(self) -> str:
+        total = self._total or 0
+        self._hash.advance(total)
+        if self._hash.position != total:
+            raise DownloadError(f"Размер не совпадает: {self._hash.position} != {total}")
+        digest = self._hash.hexdigest()
+
+        if self.expected_sha256 and digest != self.expected_sha256:
+            self._discard()
+            raise ChecksumMismatch(f"SHA-256 не совпадает: {digest} != {self.expected_sha256}")
+
+        os.replace(self.part_path, self.dest)
+        self._save_state(complete=True, digest=digest)
+        if self.on_progress and total:
+            self.on_progress(total, total)
+        log(f"🔐 SHA-256: {digest}", "🔄 DOWNLOAD")
+        return digest
+
+
+def download_resumable(
+    mirrors: Sequence[Mirror],
+    dest: str,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    **kwargs,
+) -> str:
+    """
+    Скачивает файл с зеркал в dest с докачкой и проверкой SHA-256.
+
+    Args:
+        mirrors: [(url, verify_ssl), ...] - один и тот же файл; первый - основной
+        dest: итоговый путь (рядом создаются .part и .download.json)
+        on_progress: callback(done_bytes, total_bytes), может вызываться из потоков сегментов
+        **kwargs: expected_size, expected_sha256, segments, max_retries,
+                  retry_delay, timeout, session (см. ResumableDownload)
+
+    Returns:
+        SHA-256 скачанного файла (hex)
+
+    Raises:
+        ChecksumMismatch: хеш не совпал (частичный файл удалён)
+        DownloadError: не удалось скачать (частичный файл оставлен для докачки)
+    """
+    return ResumableDownload(mirrors, dest, on_progress, **kwargs).run()
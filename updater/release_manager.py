@@ -483,6 +483,7 @@ class ReleaseManager:
             "source": server_name,
             "verify_ssl": verify_ssl,
             "file_size": data.get("file_size"),
+            "sha256": data.get("sha256"),  # если сервер публикует - проверяется при скачивании
             "mtime": data.get("mtime"),
             "modified_at": data.get("modified_at")
         }
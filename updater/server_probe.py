@@ -0,0 +1,166 @@
+"""
+server_probe.py
+────────────────────────────────────────────────────────────────
+Параллельная проверка VPS серверов обновлений (all_versions.json)
+
+Раньше ServersPage проверяла серверы по очереди: новый requests.get()
+с timeout=10 на каждый сервер плюс паузы между ними, поэтому несколько
+недоступных зеркал задерживали проверку на десятки секунд.
+
+Теперь все серверы опрашиваются одновременно (ограниченный пул потоков)
+через общий keep-alive Session, у каждого сервера свой дедлайн, а
+результаты отдаются по мере готовности - первый успешный результат
+приходит от самого быстрого сервера.
+
+Использование:
+
+    results = probe_servers(servers, fetch_all_versions)   # запросы уже идут
+    ...                                                     # другая работа
+    for result in results:                                  # по мере ответов
+        ...
+
+Модуль не импортирует Qt; requests импортируется лениво.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+# Максимум одновременных проверок
+PROBE_MAX_WORKERS = 8
+
+# Дедлайн на один сервер (секунды с начала его проверки)
+PROBE_DEADLINE = 8.0
+
+# Таймаут установки соединения (не больше дедлайна)
+PROBE_CONNECT_TIMEOUT = 3.0
+
+ALL_VERSIONS_PATH = "/api/all_versions.json"
+
+
+class ProbeResult(NamedTuple):
+    """Результат проверки одного сервера"""
+    server: Dict[str, Any]
+    ok: bool
+    response_time: float                  # секунды
+    data: Optional[Dict[str, Any]] = None  # all_versions.json при ok
+    error: str = ""
+
+
+# ═══════════════════════════════════════════════════════════════
+# HTTP
+# ═══════════════════════════════════════════════════════════════
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_probe_session():
+    """Общий Session с пулом keep-alive соединений (повторные проверки без нового TLS)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers.update({"Accept": "application/json", "User-Agent": "Zapret-Updater/3.1"})
+            adapter = HTTPAdapter(pool_connections=PROBE_MAX_WORKERS, pool_maxsize=PROBE_MAX_WORKERS,
+                                  max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def all_versions_url(server: Dict[str, Any]) -> str:
+    return f"https://{server['host']}:{server['https_port']}{ALL_VERSIONS_PATH}"
+
+
+def fetch_all_versions(server: Dict[str, Any], session=None, deadline: float = PROBE_DEADLINE,
+                       verify: Optional[bool] = None) -> ProbeResult:
+    """Запрашивает all_versions.json с сервера и измеряет время ответа"""
+    if verify is None:
+        from .server_config import should_verify_ssl
+        verify = should_verify_ssl()
+    if not verify:
+        try:
+            import urllib3
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        except Exception:
+            pass
+
+    start = time.perf_counter()
+    try:
+        session = session or get_probe_session()
+        response = session.get(all_versions_url(server), verify=verify,
+                               timeout=(min(PROBE_CONNECT_TIMEOUT, deadline), deadline))
+        if response.status_code != 200:
+            return ProbeResult(server, False, time.perf_counter() - start,
+                               error=f"HTTP {response.status_code}")
+        data = response.json()
+        return ProbeResult(server, True, time.perf_counter() - start, data=data)
+    except Exception as e:
+        return ProbeResult(server, False, time.perf_counter() - start, error=str(e)[:40])
+
+
+# ═══════════════════════════════════════════════════════════════
+# ПАРАЛЛЕЛЬНАЯ ПРОВЕРКА
+# ═══════════════════════════════════════════════════════════════
+
+def probe_servers(
+    servers: List[Dict[str, Any]],
+    probe: Callable[[Dict[str, Any]], ProbeResult],
+    max_workers: int = PROBE_MAX_WORKERS,
+    deadline: float = PROBE_DEADLINE,
+) -> Iterator[ProbeResult]:
+    """
+    Запускает probe(server) для всех серверов сразу и возвращает итератор
+    результатов в порядке готовности.
+
+    Сервер, не ответивший за deadline секунд с начала своей проверки,
+    отдаётся как ошибка "Таймаут"; его поток завершится сам по таймауту
+    запроса, а поздний результат игнорируется.
+    """
+    if not servers:
+        return iter(())
+
+    started: Dict[int, float] = {}
+
+    def run(index: int, server: Dict[str, Any]) -> ProbeResult:
+        started[index] = time.monotonic()
+        return probe(server)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(servers))),
+                                  thread_name_prefix="ServerProbe")
+    futures = {executor.submit(run, index, server): index for index, server in enumerate(servers)}
+    return _iter_results(executor, futures, servers, started, deadline)
+
+
+def _iter_results(executor, futures, servers, started, deadline) -> Iterator[ProbeResult]:
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            left = [started[futures[f]] + deadline - now for f in pending if futures[f] in started]
+            timeout = max(0.0, min(left)) if left else deadline
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    begun = started.get(index, now)
+                    yield ProbeResult(servers[index], False, time.monotonic() - begun, error=str(e)[:40])
+
+            now = time.monotonic()
+            for future in list(pending):
+                index = futures[future]
+                begun = started.get(index)
+                if begun is not None and now - begun >= deadline:
+                    pending.discard(future)
+                    yield ProbeResult(servers[index], False, now - begun, error="Таймаут")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
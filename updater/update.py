@@ -8,7 +8,7 @@ from __future__ import annotations
 import os, sys, tempfile, subprocess, shutil, time, requests
 import threading
 import ctypes
-from typing import Callable, Optional
+from typing import Optional
 from time import sleep
 
 from PyQt6.QtCore    import QObject, QThread, pyqtSignal, QTimer
@@ -21,6 +21,14 @@ from .github_release import normalize_version
 from config import CHANNEL, APP_VERSION
 from log import log
 from .rate_limiter import UpdateRateLimiter
+from .download import ChecksumMismatch, download_resumable
+
+
+# Постоянная папка загрузок: .part от оборванной загрузки переживает повторную попытку
+DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), "zapret_update")
+
+# Параллельные сегменты при скачивании с нескольких зеркал
+DOWNLOAD_SEGMENTS = 3
 
 
 TIMEOUT = 15  # Увеличен с 10 до 15 сек для медленных соединений
@@ -108,155 +116,18 @@ def _safe_set_status(parent, msg: str):
     else:
         print(msg)
 
-def _download_with_retry(url: str, dest: str, on_progress: Callable[[int, int], None] | None, 
-                         verify_ssl: bool = True, max_retries: int = 2):
-    """
-    ОПТИМИЗИРОВАННОЕ скачивание с защитой от повторных загрузок
-    """
-    import requests
-    from time import sleep, time
-    import os
-    
-    # ═══════════════════════════════════════════════════════════
-    # ✅ ЗАЩИТА ОТ ПОВТОРНОГО СКАЧИВАНИЯ (в течение 30 секунд)
-    # ═══════════════════════════════════════════════════════════
-    if os.path.exists(dest):
-        file_age = time() - os.path.getmtime(dest)
-        file_size = os.path.getsize(dest)
-        
-        # Если файл скачан недавно И имеет правильный размер (>60MB)
-        if file_age < 30 and file_size > 60000000:
-            log(
-                f"⏭️ Файл уже скачан {int(file_age)}с назад "
-                f"({file_size/1024/1024:.1f}MB), повторное скачивание пропущено",
-                "🔄 DOWNLOAD"
-            )
-            return  # НЕ СКАЧИВАЕМ ПОВТОРНО!
-    
-    last_error = None
-    
-    for attempt in range(max_retries):
-        try:
-            session = requests.Session()
-            
-            session.headers.update({
-                'User-Agent': 'Zapret-Updater/3.1',  # ✅ Обновлена версия
-                'Accept': 'application/octet-stream',
-                'Accept-Encoding': 'identity',
-                'Connection': 'keep-alive'
-            })
-            
-            # ✅ УМЕНЬШЕН пул соединений
-            adapter = requests.adapters.HTTPAdapter(
-                pool_connections=2,
-                pool_maxsize=2,
-                max_retries=requests.adapters.Retry(
-                    total=0,
-                    backoff_factor=0,
-                    status_forcelist=None
-                )
-            )
-            session.mount('https://', adapter)
-            session.mount('http://', adapter)
-            
-            if not verify_ssl:
-                session.verify = False
-                import urllib3
-                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            
-            log(f"Попытка {attempt + 1}/{max_retries} скачивания", "🔄 DOWNLOAD")
-            
-            chunk_size = 2097152  # 2MB
-            timeout = (10, 90)
-            
-            # ✅ Resume ТОЛЬКО со второй попытки
-            resume_from = 0
-            if os.path.exists(dest) and attempt > 0:
-                resume_from = os.path.getsize(dest)
-                if resume_from > 1048576:  # > 1MB
-                    log(f"📥 Возобновление с {resume_from/1024/1024:.1f} МБ", "🔄 DOWNLOAD")
-                    session.headers['Range'] = f'bytes={resume_from}-'
-                else:
-                    resume_from = 0
-            
-            with session.get(url, stream=True, timeout=timeout, verify=verify_ssl) as resp:
-                resp.raise_for_status()
-                
-                if resp.status_code == 206:
-                    content_range = resp.headers.get('Content-Range', '')
-                    if content_range:
-                        total = int(content_range.split('/')[-1])
-                    else:
-                        total = resume_from + int(resp.headers.get("content-length", 0))
-                else:
-                    total = int(resp.headers.get("content-length", 0))
-                    resume_from = 0
-                
-                done = resume_from
-                
-                if total > 0:
-                    log(f"📦 Размер: {total/(1024*1024):.1f} MB", "🔄 DOWNLOAD")
-                
-                last_update_time = 0
-                update_interval = 2.0
-                
-                mode = "ab" if resume_from > 0 else "wb"
-                
-                with open(dest, mode, buffering=4194304) as fp:
-                    start_time = time()
-                    
-                    try:
-                        for chunk in resp.iter_content(chunk_size=chunk_size):
-                            if chunk:
-                                fp.write(chunk)
-                                done += len(chunk)
-                                
-                                current_time = time()
-                                if on_progress and total:
-                                    if (current_time - last_update_time) >= update_interval:
-                                        on_progress(done, total)
-                                        last_update_time = current_time
-                        
-                        if on_progress and total:
-                            on_progress(total, total)
-                        
-                        elapsed = time() - start_time
-                        if elapsed > 0 and total > 0:
-                            avg_speed = ((done - resume_from) / elapsed) / (1024 * 1024)
-                            log(f"✅ Скачано {total/(1024*1024):.1f} MB за {elapsed:.1f}с ({avg_speed:.2f} MB/s)", "🔄 DOWNLOAD")
-                        
-                    except requests.exceptions.ChunkedEncodingError as e:
-                        raise requests.exceptions.ConnectionError(f"Incomplete download: {e}")
-            
-            # ✅ Проверяем размер файла
-            if os.path.exists(dest):
-                actual_size = os.path.getsize(dest)
-                if total > 0 and actual_size != total:
-                    raise Exception(f"Размер не совпадает: {actual_size} != {total}")
-                
-                # ✅ Устанавливаем время модификации файла для защиты
-                os.utime(dest, None)  # Обновляем mtime
-            
-            log(f"✅ Файл скачан с попытки {attempt + 1}", "🔄 DOWNLOAD")
-            return
-            
-        except Exception as e:
-            last_error = str(e)
-            log(f"❌ Попытка {attempt + 1} не удалась: {last_error}", "🔄 DOWNLOAD")
-        
-        # Удаляем файл если не resume-able ошибка
-        if os.path.exists(dest) and "Incomplete download" not in str(last_error):
-            try:
-                os.remove(dest)
-            except:
-                pass
-        
-        if attempt < max_retries - 1:
-            wait_time = min(2 ** (attempt + 1), 30)
-            log(f"⏳ Ожидание {wait_time}с перед повтором...", "🔄 DOWNLOAD")
-            sleep(wait_time)
-    
-    raise Exception(f"Не удалось скачать после {max_retries} попыток. Ошибка: {last_error}")
+
+def _cleanup_stale_downloads(folder: str, keep_name: str):
+    """Удаляет загрузки других версий (и их .part), кроме keep_name*"""
+    try:
+        for name in os.listdir(folder):
+            if not name.startswith(keep_name):
+                path = os.path.join(folder, name)
+                if os.path.isfile(path):
+                    os.remove(path)
+    except Exception as e:
+        log(f"Не удалось очистить папку загрузок: {e}", "🔁 UPDATE")
+
 
 def compare_versions(v1: str, v2: str) -> int:
     """Сравнивает две версии"""
@@ -400,14 +271,19 @@ class UpdateWorker(QObject):
         # 1. Основной URL (откуда получили информацию о версии)
         urls.append((upd_url, verify_ssl))
         
-        # 2. Добавляем все VPS серверы как fallback
+        # 2. Добавляем все VPS серверы как fallback (быстрые - первыми, заблокированные - пропускаем)
         try:
-            from .server_config import VPS_SERVERS, should_verify_ssl
+            from .server_config import should_verify_ssl
+            from .server_pool import get_server_pool
             
             # Извлекаем имя файла из URL
             filename = upd_url.split('/')[-1]  # например Zapret2Setup_TEST.exe
             
-            for server in VPS_SERVERS:
+            pool = get_server_pool()
+            servers = [s for s in pool.servers if not pool.is_server_blocked(s['id'])]
+            servers.sort(key=lambda s: pool.stats.get(s['id'], {}).get('avg_response_time') or 999)
+            
+            for server in servers:
                 # HTTPS вариант
                 https_url = f"https://{server['host']}:{server['https_port']}/download/{filename}"
                 if https_url != upd_url:  # Не дублируем основной URL
@@ -501,8 +377,10 @@ class UpdateWorker(QObject):
         else:
             log(f"UpdateWorker: retry - используем существующий диалог", "🔁 UPDATE")
         
-        tmp_dir = tempfile.mkdtemp(prefix="zapret_upd_")
-        setup_exe = os.path.join(tmp_dir, "Zapret2Setup.exe")
+        tmp_dir = DOWNLOAD_DIR
+        os.makedirs(tmp_dir, exist_ok=True)
+        setup_exe = os.path.join(tmp_dir, f"Zapret2Setup_{new_ver}.exe")
+        _cleanup_stale_downloads(tmp_dir, os.path.basename(setup_exe))
         
         def _prog(done, total):
             percent = done * 100 // total if total > 0 else 0
@@ -518,51 +396,44 @@ class UpdateWorker(QObject):
                 return self._run_installer(setup_exe, new_ver, tmp_dir)
             log("⚠️ Telegram скачивание не удалось, пробуем другие источники", "🔁 UPDATE")
         
-        download_urls = self._get_download_urls(release_info)
+        # Telegram URL обрабатываются выше; остальные - зеркала одного файла
+        mirrors = [(url, verify_ssl) for url, verify_ssl in self._get_download_urls(release_info)
+                   if not url.startswith("telegram://")]
         
         download_error = None
-        for idx, (url, verify_ssl) in enumerate(download_urls):
-            # Пропускаем telegram:// URL - они обрабатываются выше
-            if url.startswith("telegram://"):
-                continue
-                
-            try:
-                log(f"Попытка #{idx+1} с {url} (SSL={verify_ssl})", "🔁 UPDATE")
-                
-                # Для тихих автообновлений не долбим сервер — максимум 1 попытка,
-                # для ручного режима можно 2.
-                retries = 1 if self._silent else 2
-                
-                _download_with_retry(
-                    url,
-                    setup_exe,
-                    _prog,
-                    verify_ssl=verify_ssl,
-                    max_retries=retries
-                )
-                
-                download_error = None
-                self.download_complete.emit()
-                break
-                
-            except Exception as e:
-                download_error = e
-                log(f"❌ Ошибка: {e}", "🔁❌ ERROR")
-                
-                if idx < len(download_urls) - 1:
-                    self._emit("Пробуем альтернативный источник...")
-                    time.sleep(1)
+        try:
+            log(f"Скачивание с {len(mirrors)} зеркал: {mirrors[0][0]}", "🔁 UPDATE")
+            
+            # Для тихих автообновлений не долбим сервер — каждое зеркало максимум 1 раз,
+            # для ручного режима можно 2.
+            retries = 1 if self._silent else 2
+            
+            download_resumable(
+                mirrors,
+                setup_exe,
+                _prog,
+                expected_sha256=release_info.get("sha256"),
+                segments=DOWNLOAD_SEGMENTS if len(mirrors) > 1 else 1,
+                max_retries=retries * len(mirrors),
+            )
+            self.download_complete.emit()
+            
+        except Exception as e:
+            download_error = e
+            log(f"❌ Ошибка: {e}", "🔁❌ ERROR")
         
         if download_error:
             self._last_release_info = release_info
             
             error_msg = str(download_error)
-            if "ConnectionPool" in error_msg or "Connection" in error_msg:
+            if isinstance(download_error, ChecksumMismatch):
+                error_msg = "Файл повреждён (SHA-256 не совпадает). Попробуйте ещё раз."
+            elif "ConnectionPool" in error_msg or "Connection" in error_msg:
                 error_msg = "Ошибка подключения. Проверьте интернет."
             
             self.download_failed.emit(error_msg)
             self._emit(f"Ошибка: {error_msg}")
-            shutil.rmtree(tmp_dir, True)
+            # .part не удаляем: повторная попытка продолжит с места обрыва
             return False
         
         # Запуск установщика
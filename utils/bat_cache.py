@@ -0,0 +1,132 @@
+"""
+Дисковый кэш результатов разбора .bat стратегий.
+
+Ключ записи - абсолютный путь файла, запись действительна пока совпадают
+mtime и size файла. Неизменившиеся файлы при повторном сканировании папки
+не читаются вообще.
+
+Формат (JSON):
+    {"version": 1, "files": {"<path>": {"mtime_ns": ..., "size": ...,
+                                          "metadata": {...}, "exe_path": ..., "args": [...]}}}
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from log import log
+except ImportError:
+    def log(msg, level="INFO"):
+        print(f"[{level}] {msg}")
+
+
+# Версия формата кэша (при изменении кэш игнорируется)
+BAT_CACHE_VERSION = 1
+
+# Имя файла кэша по умолчанию (кладётся в папку со стратегиями)
+BAT_CACHE_FILENAME = ".bat_strategies_cache.json"
+
+Signature = Tuple[int, int]
+ParsedBat = Optional[Tuple[Optional[str], List[str]]]
+
+
+def file_signature(path: str) -> Optional[Signature]:
+    """(mtime_ns, size) файла или None если файла нет"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class BatScanCache:
+    """
+    Кэш {путь: (metadata, parsed)} с сохранением на диск.
+
+    Использование:
+        cache = BatScanCache(path)
+        hit = cache.get(file_path, signature)
+        cache.put(file_path, signature, metadata, parsed)
+        cache.prune(existing_paths)
+        cache.save()
+    """
+
+    def __init__(self, cache_path: Optional[str]):
+        self.cache_path = cache_path
+        self._files: Dict[str, dict] = {}
+        self._dirty = False
+
+        # Статистика последнего сканирования
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == BAT_CACHE_VERSION:
+                self._files = data.get("files", {})
+        except Exception as e:
+            log(f"Кэш BAT стратегий повреждён, будет пересоздан: {e}", "DEBUG")
+            self._files = {}
+
+    def get(self, path: str, signature: Signature) -> Optional[Tuple[Dict[str, str], ParsedBat]]:
+        """(metadata, parsed) из кэша или None если файл изменился/не кэширован"""
+        key = os.path.abspath(path)
+        entry = self._files.get(key)
+        if entry is None or (entry.get("mtime_ns"), entry.get("size")) != tuple(signature):
+            self.misses += 1
+            return None
+
+        exe_path = entry.get("exe_path")
+        if exe_path and not os.path.exists(exe_path):
+            # Старый формат: winws.exe перемещён - путь нужно найти заново
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return dict(entry.get("metadata", {})), (exe_path, list(entry.get("args", [])))
+
+    def put(self, path: str, signature: Signature, metadata: Dict[str, str], parsed: ParsedBat):
+        """Запоминает результат разбора (неразобранные файлы не кэшируются)"""
+        key = os.path.abspath(path)
+        if parsed is None:
+            # Причина может быть внешней (нет winws.exe) - разбираем заново в следующий раз
+            if self._files.pop(key, None) is not None:
+                self._dirty = True
+            return
+        exe_path, args = parsed
+        self._files[key] = {
+            "mtime_ns": signature[0],
+            "size": signature[1],
+            "metadata": dict(metadata),
+            "exe_path": exe_path,
+            "args": list(args),
+        }
+        self._dirty = True
+
+    def prune(self, existing_paths: Iterable[str]):
+        """Удаляет записи файлов, которых больше нет"""
+        keep = {os.path.abspath(p) for p in existing_paths}
+        for key in [k for k in self._files if k not in keep]:
+            del self._files[key]
+            self._dirty = True
+
+    def save(self):
+        """Сохраняет кэш на диск (только если он изменился)"""
+        if not self._dirty or not self.cache_path:
+            return
+        try:
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": BAT_CACHE_VERSION, "files": self._files}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except Exception as e:
+            log(f"Не удалось сохранить кэш BAT стратегий: {e}", "DEBUG")
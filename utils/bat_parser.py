@@ -28,7 +28,7 @@
 
 import os
 import re
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
 # Безопасный импорт log (для работы как в приложении, так и standalone)
 try:
@@ -38,6 +38,43 @@ except ImportError:
         print(f"[{level}] {msg}")
 
 
+# Ключи метаданных в комментариях REM KEY: VALUE / # KEY: VALUE
+BAT_METADATA_KEYS = ('NAME', 'VERSION', 'DESCRIPTION', 'LABEL', 'AUTHOR', 'COMMENT')
+
+
+def read_bat_lines(bat_file_path: str) -> List[str]:
+    """Читает файл стратегии один раз (строки с переводами строк)"""
+    with open(bat_file_path, 'r', encoding='utf-8-sig', errors='ignore') as f:
+        return f.readlines()
+
+
+def extract_bat_metadata(lines: List[str]) -> Dict[str, str]:
+    """
+    Извлекает метаданные из комментариев:
+        REM NAME: Название стратегии
+        # LABEL: recommended
+    """
+    metadata = {}
+    for line in lines:
+        line = line.strip()
+
+        if line.upper().startswith('REM '):
+            content = line[4:].strip()
+        elif line.startswith('#'):
+            content = line[1:].strip()
+        else:
+            continue
+
+        if ':' not in content:
+            continue
+        key, value = content.split(':', 1)
+        key = key.strip().upper()
+        if key in BAT_METADATA_KEYS:
+            metadata[key] = value.strip()
+
+    return metadata
+
+
 def parse_bat_args_only(bat_file_path: str, debug: bool = False) -> Optional[List[str]]:
     """
     Парсит файл стратегии в НОВОМ формате - извлекает только аргументы winws.
@@ -67,9 +104,16 @@ def parse_bat_args_only(bat_file_path: str, debug: bool = False) -> Optional[Lis
             log(f"Файл стратегии не найден: {bat_file_path}", "ERROR")
             return None
 
-        with open(bat_file_path, 'r', encoding='utf-8-sig', errors='ignore') as f:
-            lines = f.readlines()
+        return _parse_args_only_lines(read_bat_lines(bat_file_path), debug)
 
+    except Exception as e:
+        log(f"Ошибка парсинга BAT (новый формат): {e}", "ERROR")
+        return None
+
+
+def _parse_args_only_lines(lines: List[str], debug: bool = False) -> Optional[List[str]]:
+    """Разбор НОВОГО формата по уже прочитанным строкам файла"""
+    try:
         args_lines = []
 
         for line in lines:
@@ -262,21 +306,24 @@ def is_new_format_bat(bat_file_path: str) -> bool:
     Новый формат: НЕ содержит 'winws.exe', 'start ', 'set "LISTS'
     """
     try:
-        with open(bat_file_path, 'r', encoding='utf-8-sig', errors='ignore') as f:
-            content = f.read().lower()
+        return _is_new_format_lines(read_bat_lines(bat_file_path))
+    except Exception:
+        return False
 
-        # Старый формат содержит эти паттерны
-        old_format_markers = ['winws.exe', 'winws2.exe', 'start ', 'set "lists', 'set "bin', 'set "exe']
 
-        for marker in old_format_markers:
-            if marker in content:
-                return False
+def _is_new_format_lines(lines: List[str]) -> bool:
+    """Определение формата по уже прочитанным строкам файла"""
+    content = ''.join(lines).lower()
 
-        # Проверяем что есть строки с --filter или --
-        return '--filter' in content or '\n--' in content
+    # Старый формат содержит эти паттерны
+    old_format_markers = ['winws.exe', 'winws2.exe', 'start ', 'set "lists', 'set "bin', 'set "exe']
 
-    except Exception:
-        return False
+    for marker in old_format_markers:
+        if marker in content:
+            return False
+
+    # Проверяем что есть строки с --filter или --
+    return '--filter' in content or '\n--' in content
 
 
 def parse_bat_file(bat_file_path: str, debug: bool = False) -> Optional[Tuple[str, List[str]]]:
@@ -296,15 +343,53 @@ def parse_bat_file(bat_file_path: str, debug: bool = False) -> Optional[Tuple[st
         - exe_path: Полный путь к winws.exe (или None для нового формата)
         - args: Список аргументов командной строки
     """
+    if not os.path.exists(bat_file_path):
+        log(f"BAT файл не найден: {bat_file_path}", "ERROR")
+        return None
+
+    try:
+        lines = read_bat_lines(bat_file_path)
+    except Exception as e:
+        log(f"Ошибка чтения .bat файла: {e}", "ERROR")
+        return None
+
+    return parse_bat_lines(lines, bat_file_path, debug)
+
+
+def parse_bat_lines(lines: List[str], bat_file_path: str, debug: bool = False) -> Optional[Tuple[str, List[str]]]:
+    """
+    То же, что parse_bat_file(), но по уже прочитанным строкам файла
+    (bat_file_path нужен для разворачивания путей относительно папки .bat).
+    """
     # Сначала пробуем новый формат
-    if is_new_format_bat(bat_file_path):
+    if _is_new_format_lines(lines):
         log(f"Определён НОВЫЙ формат BAT: {os.path.basename(bat_file_path)}", "INFO")
-        args = parse_bat_args_only(bat_file_path, debug)
+        args = _parse_args_only_lines(lines, debug)
         if args:
             return (None, args)  # exe_path = None означает новый формат
 
     # Старый формат - ищем winws.exe в файле
-    return _parse_bat_file_old_format(bat_file_path, debug)
+    return _parse_old_format_lines(lines, bat_file_path, debug)
+
+
+def parse_bat_file_with_metadata(bat_file_path: str, debug: bool = False) -> Tuple[Dict[str, str], Optional[Tuple[str, List[str]]]]:
+    """
+    Читает файл стратегии ОДИН раз и возвращает метаданные и команду.
+
+    Returns:
+        (metadata, parsed) - metadata как в extract_bat_metadata() (NAME по умолчанию -
+        имя файла), parsed как в parse_bat_file()
+    """
+    default_name = os.path.splitext(os.path.basename(bat_file_path))[0]
+    try:
+        lines = read_bat_lines(bat_file_path)
+    except Exception as e:
+        log(f"Ошибка чтения .bat файла {bat_file_path}: {e}", "ERROR")
+        return {'NAME': default_name}, None
+
+    metadata = extract_bat_metadata(lines)
+    metadata.setdefault('NAME', default_name)
+    return metadata, parse_bat_lines(lines, bat_file_path, debug)
 
 
 def _parse_bat_file_old_format(bat_file_path: str, debug: bool = False) -> Optional[Tuple[str, List[str]]]:
@@ -324,17 +409,25 @@ def _parse_bat_file_old_format(bat_file_path: str, debug: bool = False) -> Optio
         if not os.path.exists(bat_file_path):
             log(f"BAT файл не найден: {bat_file_path}", "ERROR")
             return None
-        
+
+        return _parse_old_format_lines(read_bat_lines(bat_file_path), bat_file_path, debug)
+
+    except Exception as e:
+        log(f"Ошибка парсинга .bat файла: {e}", "ERROR")
+        return None
+
+
+def _parse_old_format_lines(all_lines: List[str], bat_file_path: str, debug: bool = False) -> Optional[Tuple[str, List[str]]]:
+    """Разбор СТАРОГО формата по уже прочитанным строкам файла"""
+    try:
         bat_dir = os.path.dirname(os.path.abspath(bat_file_path))
         if debug:
             log(f"Парсинг файла: {bat_file_path}", "INFO")
             log(f"Директория bat: {bat_dir}", "INFO")
         
-        # Читаем все строки и склеиваем многострочные команды (с ^)
+        # Склеиваем многострочные команды (с ^)
         lines = []
-        with open(bat_file_path, 'r', encoding='utf-8-sig', errors='ignore') as f:
-            all_lines = f.readlines()
-        
+
         # Склеиваем строки с продолжением (^)
         i = 0
         while i < len(all_lines):
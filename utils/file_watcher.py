@@ -0,0 +1,595 @@
+"""
+Общий сервис наблюдения за файлами (сейчас - файлы активного пресета).
+
+Вместо опроса os.path.getmtime раз в секунду в отдельном потоке на каждый
+файл используется один поток и уведомления ОС:
+
+- Linux:   inotify (через ctypes)
+- Windows: FindFirstChangeNotificationW (через ctypes)
+- иначе:   опрос (mtime_ns, size) с интервалом poll_interval
+
+Изменения сглаживаются (debounce): callback вызывается один раз, когда файл
+не менялся debounce секунд, и только если изменилось содержимое (хэш) -
+пачка сохранений из UI или запись без изменений не вызывает лишних
+перезапусков.
+
+Callbacks выполняются последовательно в отдельном потоке-диспетчере
+(долгий callback не задерживает обработку других файлов).
+
+stop() будит ожидание бэкенда сразу (pipe / событие Windows / Event), а не
+ждёт таймаута. У каждого запуска потоков своё поколение (_Generation) со
+своим флагом остановки и своей очередью диспетчера: если старый поток не
+успел завершиться за timeout, перезапуск не даёт двум диспетчерам разбирать
+одну очередь.
+
+Использование:
+    service = get_file_watcher_service()
+    handle = service.watch(path, callback, debounce=0.3)
+    ...
+    handle.cancel()
+"""
+
+import ctypes
+import hashlib
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from log import log
+except ImportError:
+    def log(msg, level="INFO"):
+        print(f"[{level}] {msg}")
+
+
+# Окно сглаживания по умолчанию (секунды)
+DEFAULT_DEBOUNCE = 0.3
+
+# Интервал опроса для fallback бэкенда (секунды)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Максимальное ожидание событий за одну итерацию (stop() будит ожидание сразу)
+_MAX_WAIT = 0.5
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) или None если файла нет"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_content_hash(path: str) -> Optional[str]:
+    """Хэш содержимого файла или None если файл недоступен"""
+    try:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+# ==================== БЭКЕНДЫ ====================
+
+class _PollingBackend:
+    """Опрос: каждые interval секунд все файлы считаются "возможно изменёнными"."""
+
+    name = "polling"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_poll = 0.0
+        self._wake = threading.Event()
+
+    def set_directories(self, directories: Set[str]):
+        pass
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """None = проверить все файлы; пустое множество = изменений нет"""
+        now = time.monotonic()
+        if now >= self._next_poll:
+            self._next_poll = now + self.interval
+            return None
+        if self._wake.wait(max(0.0, min(timeout, self._next_poll - now))):
+            self._wake.clear()
+        return set()
+
+    def wakeup(self):
+        """Прерывает wait() из другого потока"""
+        self._wake.set()
+
+    def close(self):
+        pass
+
+
+class _InotifyBackend:
+    """inotify: события по именам файлов в наблюдаемых папках."""
+
+    name = "inotify"
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wd_to_dir: Dict[int, str] = {}
+        self._dir_to_wd: Dict[str, int] = {}
+        # Pipe для пробуждения select() из stop()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._close_lock = threading.Lock()
+
+    def set_directories(self, directories: Set[str]):
+        for directory in list(self._dir_to_wd):
+            if directory not in directories:
+                self._libc.inotify_rm_watch(self._fd, self._dir_to_wd.pop(directory))
+        for directory in directories:
+            if directory in self._dir_to_wd:
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                log(f"inotify: не удалось наблюдать {directory}", "DEBUG")
+                continue
+            self._wd_to_dir = {w: d for w, d in self._wd_to_dir.items() if d != directory}
+            self._wd_to_dir[wd] = directory
+            self._dir_to_wd[directory] = wd
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in readable:
+            try:
+                os.read(self._wake_r, 4096)
+            except BlockingIOError:
+                pass
+        if self._fd not in readable:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        header = self._EVENT_HEADER
+        while offset + header.size <= len(data):
+            wd, _mask, _cookie, length = header.unpack_from(data, offset)
+            raw_name = data[offset + header.size:offset + header.size + length].rstrip(b"\0")
+            offset += header.size + length
+            directory = self._wd_to_dir.get(wd)
+            if directory is None:
+                continue
+            if raw_name:
+                changed.add(os.path.join(directory, os.fsdecode(raw_name)))
+            else:
+                changed.add(directory)
+        return changed
+
+    def wakeup(self):
+        """Прерывает wait() из другого потока"""
+        with self._close_lock:
+            if self._wake_w < 0:
+                return
+            try:
+                os.write(self._wake_w, b"\0")
+            except BlockingIOError:
+                pass  # pipe полон - пробуждение уже ожидает
+
+    def close(self):
+        with self._close_lock:
+            for fd in (self._fd, self._wake_r, self._wake_w):
+                if fd >= 0:
+                    os.close(fd)
+            self._fd = self._wake_r = self._wake_w = -1
+
+
+class _WindowsChangeBackend:
+    """FindFirstChangeNotificationW: событие "в папке что-то изменилось"."""
+
+    name = "win32"
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+    FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+    WAIT_OBJECT_0 = 0x00000000
+    WAIT_TIMEOUT = 0x00000102
+    # Один слот WaitForMultipleObjects занят событием пробуждения
+    MAXIMUM_WAIT_OBJECTS = 63
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self._find_first = kernel32.FindFirstChangeNotificationW
+        self._find_first.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self._find_first.restype = wintypes.HANDLE
+        self._find_next = kernel32.FindNextChangeNotification
+        self._find_next.argtypes = [wintypes.HANDLE]
+        self._find_next.restype = wintypes.BOOL
+        self._find_close = kernel32.FindCloseChangeNotification
+        self._find_close.argtypes = [wintypes.HANDLE]
+        self._find_close.restype = wintypes.BOOL
+        self._wait = kernel32.WaitForMultipleObjects
+        self._wait.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD]
+        self._wait.restype = wintypes.DWORD
+        create_event = kernel32.CreateEventW
+        create_event.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        create_event.restype = wintypes.HANDLE
+        self._set_event = kernel32.SetEvent
+        self._set_event.argtypes = [wintypes.HANDLE]
+        self._set_event.restype = wintypes.BOOL
+        self._close_handle = kernel32.CloseHandle
+        self._close_handle.argtypes = [wintypes.HANDLE]
+        self._close_handle.restype = wintypes.BOOL
+
+        self._handle_type = wintypes.HANDLE
+        self._invalid = ctypes.c_void_p(-1).value
+        self._dirs: List[str] = []
+        self._handles: List[int] = []
+        # Событие пробуждения WaitForMultipleObjects из stop() (auto-reset)
+        self._wake_event = create_event(None, False, False, None)
+        if not self._wake_event:
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._close_lock = threading.Lock()
+
+    def set_directories(self, directories: Set[str]):
+        if len(directories) > self.MAXIMUM_WAIT_OBJECTS:
+            raise OSError("слишком много папок для WaitForMultipleObjects")
+        self._close_directories()
+        flags = (self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE
+                 | self.FILE_NOTIFY_CHANGE_LAST_WRITE)
+        for directory in sorted(directories):
+            handle = self._find_first(directory, False, flags)
+            if not handle or handle == self._invalid:
+                log(f"FindFirstChangeNotification: не удалось наблюдать {directory}", "DEBUG")
+                continue
+            self._dirs.append(directory)
+            self._handles.append(handle)
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        handles = self._handles + [self._wake_event]
+        array = (self._handle_type * len(handles))(*handles)
+        result = self._wait(len(handles), array, False, int(timeout * 1000))
+        if result == self.WAIT_TIMEOUT:
+            return set()
+        index = result - self.WAIT_OBJECT_0
+        if index == len(self._handles):
+            return set()  # wakeup()
+        if 0 <= index < len(self._handles):
+            self._find_next(self._handles[index])
+            return {self._dirs[index]}
+        # WAIT_FAILED/abandoned - проверяем всё
+        time.sleep(timeout)
+        return None
+
+    def wakeup(self):
+        """Прерывает wait() из другого потока"""
+        with self._close_lock:
+            if self._wake_event:
+                self._set_event(self._wake_event)
+
+    def _close_directories(self):
+        for handle in self._handles:
+            self._find_close(handle)
+        self._handles = []
+        self._dirs = []
+
+    def close(self):
+        self._close_directories()
+        with self._close_lock:
+            if self._wake_event:
+                self._close_handle(self._wake_event)
+                self._wake_event = None
+
+
+def _create_backend(backend: str, poll_interval: float):
+    """Создаёт бэкенд: "auto", "inotify", "win32" или "polling" """
+    if backend == "polling":
+        return _PollingBackend(poll_interval)
+    try:
+        if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+            return _InotifyBackend()
+        if backend in ("auto", "win32") and sys.platform == "win32":
+            return _WindowsChangeBackend()
+    except Exception as e:
+        log(f"Уведомления ОС о файлах недоступны, используется опрос: {e}", "DEBUG")
+    return _PollingBackend(poll_interval)
+
+
+# ==================== СЕРВИС ====================
+
+class WatchHandle:
+    """Подписка на изменения файла (cancel() - отписаться)"""
+
+    def __init__(self, service: "FileWatcherService", path: str,
+                 callback: Callable[[], None], debounce: float):
+        self.service = service
+        self.path = path
+        self.callback = callback
+        self.debounce = debounce
+
+    def cancel(self):
+        self.service.unwatch(self)
+
+
+class _Generation:
+    """
+    Токен одного запуска потока наблюдения или диспетчера.
+
+    stop() выставляет флаг и будит ожидание бэкенда. Диспетчер разбирает
+    только свою очередь, поэтому поток прошлого поколения, не успевший
+    завершиться, не перехватывает callbacks нового.
+    """
+
+    __slots__ = ("stopped", "backend", "queue")
+
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.backend = None
+        self.queue: "queue.Queue[Optional[WatchHandle]]" = queue.Queue()
+
+    def stop(self):
+        self.stopped.set()
+        backend = self.backend
+        if backend is not None:
+            backend.wakeup()
+        self.queue.put(None)
+
+
+class _FileState:
+    __slots__ = ("signature", "content_hash", "deadline", "handles")
+
+    def __init__(self, path: str):
+        self.signature = file_signature(path)
+        self.content_hash = file_content_hash(path) if self.signature else None
+        self.deadline: Optional[float] = None
+        self.handles: List[WatchHandle] = []
+
+
+class FileWatcherService:
+    """
+    Один поток наблюдения за набором файлов.
+
+    Поток и бэкенд создаются при первой подписке и останавливаются, когда
+    подписок не остаётся.
+    """
+
+    def __init__(self, backend: str = "auto", poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self._backend_kind = backend
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._files: Dict[str, _FileState] = {}
+        self._dirs_dirty = True
+        self._thread: Optional[threading.Thread] = None
+        self._watch_gen: Optional[_Generation] = None
+        self.backend_name: Optional[str] = None
+
+        self._dispatch_pending: Set[int] = set()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        self._dispatch_gen: Optional[_Generation] = None
+
+        # Статистика
+        self.events = 0
+        self.notifications = 0
+        self.suppressed = 0
+
+    # ---------- подписки ----------
+
+    def watch(self, path: str, callback: Callable[[], None],
+              debounce: float = DEFAULT_DEBOUNCE) -> WatchHandle:
+        """Подписывает callback на изменения содержимого файла"""
+        path = os.path.abspath(path)
+        handle = WatchHandle(self, path, callback, debounce)
+        with self._lock:
+            state = self._files.get(path)
+            if state is None:
+                state = _FileState(path)
+                self._files[path] = state
+                self._dirs_dirty = True
+            state.handles.append(handle)
+            self._ensure_threads()
+        return handle
+
+    def unwatch(self, handle: WatchHandle):
+        """Отписывает callback"""
+        with self._lock:
+            state = self._files.get(handle.path)
+            if state is None or handle not in state.handles:
+                return
+            state.handles.remove(handle)
+            if not state.handles:
+                del self._files[handle.path]
+                self._dirs_dirty = True
+            stop = not self._files
+        if stop:
+            self.stop()
+
+    def watched_files(self) -> List[str]:
+        with self._lock:
+            return sorted(self._files)
+
+    # ---------- потоки ----------
+
+    def _ensure_threads(self):
+        """Запускает потоки наблюдения и диспетчера (под self._lock)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._dirs_dirty = True
+            self._watch_gen = _Generation()
+            self._thread = threading.Thread(target=self._watch_loop, args=(self._watch_gen,),
+                                            daemon=True, name="FileWatcher")
+            self._thread.start()
+        if self._dispatch_thread is None or not self._dispatch_thread.is_alive():
+            # Callbacks, оставшиеся в очереди старого диспетчера, выполнит он сам
+            self._dispatch_pending.clear()
+            self._dispatch_gen = _Generation()
+            self._dispatch_thread = threading.Thread(target=self._dispatch_loop, args=(self._dispatch_gen,),
+                                                     daemon=True, name="FileWatcherDispatch")
+            self._dispatch_thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Останавливает потоки (подписки сохраняются до следующего watch())"""
+        with self._lock:
+            thread, watch_gen = self._thread, self._watch_gen
+            dispatch_thread, dispatch_gen = self._dispatch_thread, self._dispatch_gen
+            self._thread = self._watch_gen = None
+            self._dispatch_thread = self._dispatch_gen = None
+        if watch_gen:
+            watch_gen.stop()
+        if dispatch_gen:
+            dispatch_gen.stop()
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+        if dispatch_thread and dispatch_thread is not threading.current_thread():
+            dispatch_thread.join(timeout)
+
+    def _watch_loop(self, gen: _Generation):
+        backend = _create_backend(self._backend_kind, self.poll_interval)
+        gen.backend = backend
+        self.backend_name = backend.name
+        log(f"FileWatcher: бэкенд {backend.name}", "DEBUG")
+        try:
+            while not gen.stopped.is_set():
+                with self._lock:
+                    if self._dirs_dirty:
+                        directories = {os.path.dirname(p) for p in self._files}
+                        self._dirs_dirty = False
+                    else:
+                        directories = None
+                    timeout = self._next_timeout()
+
+                if directories is not None:
+                    try:
+                        backend.set_directories(directories)
+                    except Exception as e:
+                        log(f"FileWatcher: переход на опрос: {e}", "DEBUG")
+                        backend.close()
+                        backend = _PollingBackend(self.poll_interval)
+                        gen.backend = backend
+                        self.backend_name = backend.name
+                        if gen.stopped.is_set():
+                            break
+                    # Изменения до подписки на новые папки события не дают - сверяем всё
+                    self._process_changes(None)
+
+                changed = backend.wait(timeout)
+                self._process_changes(changed)
+                self._fire_due()
+        except Exception as e:
+            log(f"FileWatcher: ошибка потока наблюдения: {e}", "ERROR")
+        finally:
+            backend.close()
+
+    def _next_timeout(self) -> float:
+        """Время ожидания до ближайшего debounce дедлайна (под self._lock)"""
+        deadlines = [s.deadline for s in self._files.values() if s.deadline is not None]
+        if not deadlines:
+            return _MAX_WAIT
+        return max(0.0, min(_MAX_WAIT, min(deadlines) - time.monotonic()))
+
+    def _process_changes(self, changed: Optional[Set[str]]):
+        """Откладывает проверку изменившихся файлов на окно debounce"""
+        if changed is not None and not changed:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for path, state in self._files.items():
+                if changed is None or os.path.dirname(path) in changed:
+                    # Опрос / событие уровня папки - сверяем (mtime, size)
+                    signature = file_signature(path)
+                    if signature == state.signature:
+                        continue
+                    state.signature = signature
+                elif path in changed:
+                    state.signature = file_signature(path)
+                else:
+                    continue
+                self.events += 1
+                # Каждое новое событие сдвигает дедлайн (trailing debounce)
+                state.deadline = now + max(h.debounce for h in state.handles)
+
+    def _fire_due(self):
+        """Проверяет содержимое файлов с истёкшим debounce и ставит callbacks в очередь"""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for path, state in self._files.items():
+                if state.deadline is not None and state.deadline <= now:
+                    state.deadline = None
+                    due.append((path, state))
+
+        for path, state in due:
+            content_hash = file_content_hash(path)
+            if content_hash is None or content_hash == state.content_hash:
+                # Файл удалён или содержимое не изменилось (пересохранение, touch)
+                self.suppressed += 1
+                continue
+            state.content_hash = content_hash
+            self.notifications += 1
+            log(f"Config file changed: {path}", "INFO")
+            with self._lock:
+                handles = list(state.handles)
+            for handle in handles:
+                self._enqueue(handle)
+
+    def _enqueue(self, handle: WatchHandle):
+        # Повторное изменение, пока callback ещё в очереди, не дублирует вызов
+        with self._lock:
+            gen = self._dispatch_gen
+            if gen is None or id(handle) in self._dispatch_pending:
+                return
+            self._dispatch_pending.add(id(handle))
+            gen.queue.put(handle)
+
+    def _dispatch_loop(self, gen: _Generation):
+        while True:
+            handle = gen.queue.get()
+            if handle is None:
+                return
+            with self._lock:
+                if gen is self._dispatch_gen:
+                    self._dispatch_pending.discard(id(handle))
+                state = self._files.get(handle.path)
+                active = state is not None and handle in state.handles
+            if not active:
+                continue
+            try:
+                handle.callback()
+            except Exception as e:
+                log(f"Error in config change callback: {e}", "ERROR")
+
+
+_service: Optional[FileWatcherService] = None
+_service_lock = threading.Lock()
+
+
+def get_file_watcher_service() -> FileWatcherService:
+    """Общий процессный экземпляр сервиса наблюдения"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = FileWatcherService()
+        return _service
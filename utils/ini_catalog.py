@@ -0,0 +1,184 @@
+# utils/ini_catalog.py
+"""
+Общий потоковый парсер INI-подобных TXT каталогов (стратегии и категории)
+с кэшем на уровне процесса.
+
+Формат:
+    # комментарий
+    version = 1.0            <- метаданные файла (до первой секции)
+
+    [section_id]
+    key = value
+    --arg1=value1            <- аргументы (строки, начинающиеся с --)
+    --arg2=value2
+
+Отступы в начале строк игнорируются. Регистр ключей сохраняется - нижний
+регистр приводят загрузчики, которым он нужен. Секция с пустым именем []
+отбрасывается вместе со своими полями и аргументами.
+
+Один и тот же файл раньше разбирался отдельно в strategy_menu.strategy_loader,
+preset_zapret2.catalog и парсерах категорий. Теперь файл читается и
+разбивается на секции один раз, результат кэшируется по (путь, mtime, size):
+изменённый файл перечитывается автоматически, принудительный сброс -
+invalidate_catalog_cache().
+
+Разобранный каталог общий для всех потребителей - его нельзя изменять.
+strategies_from_catalog() возвращает новые словари при каждом вызове.
+
+Модуль не импортирует strategy_menu/Qt: используется и в GUI, и в
+preset_zapret2 (non-GUI контекст).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class CatalogSection(NamedTuple):
+    """Секция [name]: поля key = value (регистр ключей как в файле) и строки --args"""
+    name: str
+    fields: Dict[str, str]
+    args: Tuple[str, ...]
+    index: int  # порядковый номер секции в файле (с 1)
+
+
+class ParsedCatalog(NamedTuple):
+    """Разобранный файл: метаданные до первой секции и секции по порядку"""
+    preamble: Dict[str, str]
+    sections: Tuple[CatalogSection, ...]
+
+
+def parse_catalog_lines(lines: Iterable[str]) -> ParsedCatalog:
+    """Разбирает каталог построчно (без чтения файла целиком)"""
+    preamble: Dict[str, str] = {}
+    sections: List[CatalogSection] = []
+    name: Optional[str] = None
+    fields: Dict[str, str] = {}
+    args: List[str] = []
+
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        # Диспетчеризация по первому символу: строки --args встречаются чаще всего
+        first = line[0]
+
+        if first == "-" and name is not None and line.startswith("--"):
+            args.append(line)
+            continue
+
+        if first == "#":
+            continue
+
+        if first == "[" and line.endswith("]"):
+            if name:
+                sections.append(CatalogSection(name, fields, tuple(args), len(sections) + 1))
+            # Пустое имя "" - поля и аргументы секции собираются, но не сохраняются
+            name = line[1:-1].strip()
+            fields = {}
+            args = []
+            continue
+
+        if "=" in line:
+            key, _, value = line.partition("=")
+            target = fields if name is not None else preamble
+            key = key.strip()
+            # Повторный ключ переносится в конец: порядок полей = порядок последних присваиваний
+            target.pop(key, None)
+            target[key] = value.strip()
+
+    if name:
+        sections.append(CatalogSection(name, fields, tuple(args), len(sections) + 1))
+
+    return ParsedCatalog(preamble, tuple(sections))
+
+
+@lru_cache(maxsize=8)
+def parse_catalog_text(text: str) -> ParsedCatalog:
+    """Разбирает каталог из строки (встроенные fallback-каталоги), результат кэшируется"""
+    return parse_catalog_lines(text.splitlines())
+
+
+# ==================== КЭШ ФАЙЛОВ ====================
+
+# {абсолютный путь: ((mtime_ns, size), ParsedCatalog)}
+_cache: Dict[str, Tuple[Tuple[int, int], ParsedCatalog]] = {}
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def load_catalog(path) -> Optional[ParsedCatalog]:
+    """
+    Возвращает разобранный каталог из файла (или None, если файла нет).
+    Файл перечитывается только если изменились его mtime/size.
+
+    Ошибки чтения (кроме отсутствия файла) пробрасываются вызывающему.
+    """
+    key = os.path.abspath(os.fspath(path))
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _stats["hits"] += 1
+            return cached[1]
+
+    with open(key, "r", encoding="utf-8", errors="replace") as f:
+        parsed = parse_catalog_lines(f)
+
+    with _cache_lock:
+        _cache[key] = (signature, parsed)
+        _stats["misses"] += 1
+    return parsed
+
+
+def invalidate_catalog_cache(path=None) -> None:
+    """Сбрасывает кэш одного файла или всех файлов (path=None)"""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(os.fspath(path)), None)
+
+
+def get_catalog_cache_stats() -> Dict[str, int]:
+    """Статистика кэша: hits/misses/files"""
+    with _cache_lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "files": len(_cache)}
+
+
+# ==================== СТРАТЕГИИ ====================
+
+def lowercase_fields(fields: Dict[str, str]) -> Dict[str, str]:
+    """Поля с ключами в нижнем регистре (при совпадении - последнее значение, как в файле)"""
+    return {key.lower(): value for key, value in fields.items()}
+
+
+def strategy_from_section(section: CatalogSection) -> Dict:
+    """Словарь стратегии из секции (новый объект при каждом вызове)"""
+    fields = lowercase_fields(section.fields)
+    label = fields.get("label")
+    blobs = fields.get("blobs", "")
+    return {
+        "id": section.name,
+        "name": fields.get("name", section.name),
+        "description": fields.get("description", ""),
+        "author": fields.get("author", "unknown"),
+        "label": label or None,
+        "blobs": [b.strip() for b in blobs.split(",") if b.strip()],
+        "args": "\n".join(section.args),
+    }
+
+
+def strategies_from_catalog(parsed: Optional[ParsedCatalog]) -> List[Dict]:
+    """Список стратегий каталога в порядке файла"""
+    if parsed is None:
+        return []
+    return [strategy_from_section(section) for section in parsed.sections]
@@ -178,11 +178,13 @@ def load_netrogat() -> List[str]:
     """Загружает домены из netrogat.txt (без комментариев), нормализует и уникализирует."""
     ensure_netrogat_exists()
     domains: list[str] = []
+    seen: set[str] = set()
     try:
         with open(NETROGAT_PATH, "r", encoding="utf-8") as f:
             for line in f:
                 norm = _normalize_domain(line)
-                if norm and norm not in domains:
+                if norm and norm not in seen:
+                    seen.add(norm)
                     domains.append(norm)
     except Exception as e:
         log(f"Ошибка чтения netrogat.txt: {e}", "ERROR")
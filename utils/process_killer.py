@@ -8,6 +8,7 @@ from ctypes import wintypes
 import psutil
 from log import log
 from typing import List, Optional
+from utils.process_snapshot import get_process_snapshot, invalidate_process_snapshot
 
 # Windows API константы
 PROCESS_TERMINATE = 0x0001
@@ -134,26 +135,20 @@ def kill_process_by_name(process_name: str, kill_all: bool = True) -> int:
     process_name_lower = process_name.lower()
     
     try:
-        # Ищем все процессы с указанным именем через psutil
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                proc_name = proc.info['name']
-                if proc_name and proc_name.lower() == process_name_lower:
-                    pid = proc.info['pid']
-                    
-                    if kill_process_by_pid(pid):
-                        killed_count += 1
-                        
-                        if not kill_all:
-                            break
-                            
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-                
+        # Ищем все процессы с указанным именем в свежем снимке процессов
+        for pid in get_process_snapshot(max_age=0).pids(process_name_lower):
+            if kill_process_by_pid(pid):
+                killed_count += 1
+
+                if not kill_all:
+                    break
+
     except Exception as e:
         log(f"Ошибка поиска процесса {process_name}: {e}", "WARNING")
-    
+
     if killed_count > 0:
+        # Следующие проверки должны увидеть таблицу процессов после завершения
+        invalidate_process_snapshot()
         log(f"Завершено {killed_count} процессов {process_name}", "INFO")
     else:
         log(f"Процессы {process_name} не найдены или уже завершены", "DEBUG")
@@ -230,16 +225,9 @@ def is_process_running(process_name: str) -> bool:
     Returns:
         True если процесс найден
     """
-    process_name_lower = process_name.lower()
-    
     try:
-        for proc in psutil.process_iter(['name']):
-            try:
-                proc_name = proc.info['name']
-                if proc_name and proc_name.lower() == process_name_lower:
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        # Общий снимок процессов (кеш на доли секунды)
+        return get_process_snapshot().is_running(process_name)
     except Exception as e:
         log(f"Ошибка проверки процесса {process_name}: {e}", "DEBUG")
     
@@ -257,16 +245,10 @@ def get_process_pids(process_name: str) -> List[int]:
         Список PID процессов
     """
     pids = []
-    process_name_lower = process_name.lower()
-    
+
     try:
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                proc_name = proc.info['name']
-                if proc_name and proc_name.lower() == process_name_lower:
-                    pids.append(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        # Общий снимок процессов: проверки winws.exe и winws2.exe подряд делят один обход
+        pids = get_process_snapshot().pids(process_name)
     except Exception as e:
         log(f"Ошибка получения PID {process_name}: {e}", "DEBUG")
     
@@ -0,0 +1,259 @@
+# utils/process_snapshot.py
+"""
+Общий снимок таблицы процессов с коротким кешем.
+
+Раньше ProcessMonitorThread, проверка здоровья winws, process_killer,
+поиск запущенного пресета и проверка конфликтующих программ каждый сам
+обходили psutil.process_iter(), а find_running_preset_pid ещё и читал
+cmdline у всех процессов системы. При запуске/остановке это десятки полных
+обходов в секунду.
+
+ProcessSnapshotService делает один обход и раздаёт его всем, кто спросит
+в течение TTL (по умолчанию 0.25с): индексы по имени (в нижнем регистре) и
+PID, cmdline читается лениво и только для запрошенных PID. invalidate()
+сбрасывает кеш после запуска/завершения процессов.
+
+Подписки: subscribe(names, callback) вызывает callback({имя: [pid, ...]})
+только когда набор PID для этих имён действительно изменился - независимо
+от того, какой код сделал новый снимок.
+
+Источник процессов и чтение cmdline передаются в конструктор, поэтому
+сервис тестируется с поддельной таблицей процессов без Windows.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from log import log
+
+# Сколько секунд снимок считается свежим
+SNAPSHOT_TTL = 0.25
+
+
+class ProcessInfo(NamedTuple):
+    """Процесс из таблицы: PID и имя исполняемого файла"""
+    pid: int
+    name: str
+
+
+ListProcessesFunc = Callable[[], Iterable[ProcessInfo]]
+CmdlineFunc = Callable[[int], Optional[List[str]]]
+DetailsCallback = Callable[[Dict[str, List[int]]], None]
+
+
+def _list_processes_psutil() -> List[ProcessInfo]:
+    """Обход таблицы процессов через psutil (только pid и name)"""
+    import psutil
+
+    result = []
+    for proc in psutil.process_iter(['pid', 'name']):
+        try:
+            name = proc.info.get('name')
+            pid = proc.info.get('pid')
+            if name and isinstance(pid, int):
+                result.append(ProcessInfo(pid, str(name)))
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return result
+
+
+def _cmdline_psutil(pid: int) -> Optional[List[str]]:
+    """cmdline одного процесса (None если процесс завершился или нет доступа)"""
+    import psutil
+
+    try:
+        cmdline = psutil.Process(pid).cmdline()
+        return cmdline if isinstance(cmdline, list) else None
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+    except Exception:
+        return None
+
+
+class ProcessSnapshot:
+    """Неизменяемый снимок таблицы процессов с индексами"""
+
+    def __init__(self, processes: Iterable[ProcessInfo], taken_at: float, get_cmdline: CmdlineFunc):
+        self.taken_at = taken_at
+        self._get_cmdline = get_cmdline
+        self._by_pid: Dict[int, ProcessInfo] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._cmdlines: Dict[int, Optional[List[str]]] = {}
+        self._cmdline_lock = threading.Lock()
+        for info in processes:
+            self._by_pid[info.pid] = info
+            self._by_name.setdefault(info.name.lower(), []).append(info.pid)
+        for pids in self._by_name.values():
+            pids.sort()
+
+    def __len__(self) -> int:
+        return len(self._by_pid)
+
+    def pids(self, name: str) -> List[int]:
+        """PID всех процессов с этим именем (без учёта регистра)"""
+        return list(self._by_name.get(name.lower(), ()))
+
+    def is_running(self, name: str) -> bool:
+        return name.lower() in self._by_name
+
+    def first_pid(self, name: str) -> Optional[int]:
+        pids = self._by_name.get(name.lower())
+        return pids[0] if pids else None
+
+    def pids_by_name(self, names: Iterable[str]) -> Dict[str, List[int]]:
+        """{имя: [pid, ...]} только для найденных имён (имена в нижнем регистре)"""
+        result = {}
+        for name in names:
+            pids = self._by_name.get(name.lower())
+            if pids:
+                result[name.lower()] = list(pids)
+        return result
+
+    def name_of(self, pid: int) -> Optional[str]:
+        info = self._by_pid.get(pid)
+        return info.name if info else None
+
+    def cmdline(self, pid: int) -> Optional[List[str]]:
+        """cmdline процесса - читается при первом запросе и кешируется в снимке"""
+        if pid not in self._by_pid:
+            return None
+        with self._cmdline_lock:
+            if pid in self._cmdlines:
+                return self._cmdlines[pid]
+        cmdline = self._get_cmdline(pid)
+        with self._cmdline_lock:
+            self._cmdlines.setdefault(pid, cmdline)
+            return self._cmdlines[pid]
+
+
+class _Subscription:
+    __slots__ = ("names", "callback", "last")
+
+    def __init__(self, names: frozenset, callback: DetailsCallback):
+        self.names = names
+        self.callback = callback
+        self.last: Optional[Dict[str, List[int]]] = None  # первый снимок всегда уведомляет
+
+
+class ProcessSnapshotService:
+    """Кеширующий источник снимков таблицы процессов (потокобезопасный)"""
+
+    def __init__(
+        self,
+        list_processes: Optional[ListProcessesFunc] = None,
+        get_cmdline: Optional[CmdlineFunc] = None,
+        ttl: float = SNAPSHOT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._list_processes = list_processes or _list_processes_psutil
+        self._get_cmdline = get_cmdline or _cmdline_psutil
+        self.ttl = ttl
+        self._clock = clock
+
+        self._snapshot: Optional[ProcessSnapshot] = None
+        self._refresh_lock = threading.Lock()   # один обход за раз, остальные ждут его результат
+        self._subs_lock = threading.Lock()
+        self._notify_lock = threading.RLock()   # уведомления по порядку снимков (callback может взять снимок)
+        self._notified_at: Optional[float] = None
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._next_token = 1
+        self.scan_count = 0
+
+    def _is_fresh(self, snapshot: Optional[ProcessSnapshot], max_age: float) -> bool:
+        return snapshot is not None and self._clock() - snapshot.taken_at <= max_age
+
+    def snapshot(self, max_age: Optional[float] = None) -> ProcessSnapshot:
+        """
+        Возвращает снимок не старше max_age секунд (по умолчанию TTL).
+        Если его нет - обходит таблицу процессов (одновременные вызовы делят один обход).
+        """
+        if max_age is None:
+            max_age = self.ttl
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot, max_age):
+            return snapshot
+
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot, max_age):
+                return snapshot
+            started = self._clock()
+            snapshot = ProcessSnapshot(self._list_processes(), started, self._get_cmdline)
+            self._snapshot = snapshot
+            self.scan_count += 1
+
+        self._notify(snapshot)
+        return snapshot
+
+    def refresh(self) -> ProcessSnapshot:
+        """Новый снимок без учёта кеша"""
+        return self.snapshot(max_age=-1.0)
+
+    def invalidate(self):
+        """Сбрасывает кеш (после запуска или завершения процессов)"""
+        self._snapshot = None
+
+    # ==================== ПОДПИСКИ ====================
+
+    def subscribe(self, names: Iterable[str], callback: DetailsCallback) -> int:
+        """
+        Подписка на изменения набора PID процессов с именами names.
+        callback получает {имя: [pid, ...]} (только найденные имена) из потока,
+        сделавшего снимок. Возвращает токен для unsubscribe().
+        """
+        with self._subs_lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscriptions[token] = _Subscription(frozenset(n.lower() for n in names), callback)
+        return token
+
+    def unsubscribe(self, token: int):
+        with self._subs_lock:
+            self._subscriptions.pop(token, None)
+
+    def _notify(self, snapshot: ProcessSnapshot):
+        with self._notify_lock:
+            # Более новый снимок уже разослан - этот устарел
+            if self._notified_at is not None and snapshot.taken_at < self._notified_at:
+                return
+            self._notified_at = snapshot.taken_at
+
+            with self._subs_lock:
+                subscriptions = list(self._subscriptions.values())
+
+            for sub in subscriptions:
+                details = snapshot.pids_by_name(sub.names)
+                if details == sub.last:
+                    continue
+                sub.last = details
+                try:
+                    sub.callback(details)
+                except Exception as e:
+                    log(f"Ошибка в подписчике снимка процессов: {e}", "DEBUG")
+
+
+_service: Optional[ProcessSnapshotService] = None
+_service_lock = threading.Lock()
+
+
+def get_process_snapshot_service() -> ProcessSnapshotService:
+    """Общий сервис снимков процессов для всего приложения"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ProcessSnapshotService()
+        return _service
+
+
+def get_process_snapshot(max_age: Optional[float] = None) -> ProcessSnapshot:
+    """Снимок таблицы процессов из общего сервиса"""
+    return get_process_snapshot_service().snapshot(max_age)
+
+
+def invalidate_process_snapshot():
+    """Сбрасывает кеш общего сервиса"""
+    if _service is not None:
+        _service.invalidate()
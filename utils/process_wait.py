@@ -0,0 +1,207 @@
+# utils/process_wait.py
+"""
+Ожидание завершения и запуска процессов winws без фиксированных пауз.
+
+Раньше перезапуск стратегии ждал старый процесс циклом
+time.sleep(0.5) + проверка (до 10 раз) и ещё 0.5с сверху, после запуска BAT
+проверял процесс каждые 0.4с, а hot-reload V2 всегда спал 0.3с. Переключение
+стратегии стоило 1-3 секунды простоя даже когда процесс завершался мгновенно.
+
+Здесь ожидание построено на дескрипторах процессов:
+- wait_for_exit()     - psutil.wait_procs() по PID из снимка таблицы процессов,
+                        возвращается сразу после завершения последнего процесса;
+- wait_popen_exit()   - Popen.wait(timeout) для своего процесса;
+- wait_startup()      - Popen.wait(grace): упавший при старте процесс
+                        обнаруживается сразу, а не после паузы;
+- wait_for_start()    - появление процесса, запущенного не нами (BAT/CreateProcess),
+                        частым опросом общего снимка вместо редких длинных пауз.
+
+SwitchLatency замеряет время переключения стратегии по этапам и пишет его в лог.
+
+Источники PID и ожидание передаются параметрами, поэтому логика проверяется
+на Linux с фиктивными дочерними процессами. Модуль не импортирует Qt.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from log import log
+
+WINWS_PROCESS_NAMES = ("winws.exe", "winws2.exe")
+
+# Сколько ждать завершения старого процесса перед принудительным taskkill
+EXIT_TIMEOUT = 5.0
+# Сколько процесс должен проработать после старта, чтобы считаться запущенным
+STARTUP_GRACE = 0.2
+# Интервал опроса при ожидании запуска чужого процесса
+START_POLL_INTERVAL = 0.05
+
+ListPidsFunc = Callable[[Sequence[str]], List[int]]
+WaitPidsFunc = Callable[[List[int], float], List[int]]
+
+
+def _list_pids_fresh(names: Sequence[str]) -> List[int]:
+    """PID процессов с указанными именами по свежему снимку"""
+    from utils.process_snapshot import get_process_snapshot
+
+    snapshot = get_process_snapshot(max_age=0)
+    pids: List[int] = []
+    for name in names:
+        pids.extend(snapshot.pids(name))
+    return pids
+
+
+def _wait_pids_psutil(pids: List[int], timeout: float) -> List[int]:
+    """Ждёт завершения процессов через psutil.wait_procs, возвращает PID живых"""
+    import psutil
+
+    procs = []
+    for pid in pids:
+        try:
+            procs.append(psutil.Process(pid))
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+    if not procs:
+        return []
+    _gone, alive = psutil.wait_procs(procs, timeout=max(timeout, 0))
+    return [proc.pid for proc in alive]
+
+
+def _invalidate_snapshot():
+    try:
+        from utils.process_snapshot import invalidate_process_snapshot
+        invalidate_process_snapshot()
+    except Exception:
+        pass
+
+
+def wait_for_exit(
+    names: Sequence[str] = WINWS_PROCESS_NAMES,
+    timeout: float = EXIT_TIMEOUT,
+    list_pids: Optional[ListPidsFunc] = None,
+    wait_pids: Optional[WaitPidsFunc] = None,
+) -> bool:
+    """
+    Ждёт завершения всех процессов с именами names не дольше timeout секунд.
+    Возвращает True если процессов не осталось (сразу, если их и не было).
+    """
+    list_pids = list_pids or _list_pids_fresh
+    wait_pids = wait_pids or _wait_pids_psutil
+
+    pids = list_pids(names)
+    if not pids:
+        return True
+
+    try:
+        alive = wait_pids(pids, timeout)
+    except Exception as e:
+        log(f"Ошибка ожидания завершения процессов {pids}: {e}", "DEBUG")
+        alive = pids
+    finally:
+        _invalidate_snapshot()
+
+    if alive:
+        log(f"Процессы не завершились за {timeout:.1f}с: PIDs={alive}", "DEBUG")
+        return False
+    return True
+
+
+def wait_popen_exit(process: Optional[subprocess.Popen], timeout: float) -> bool:
+    """Popen.wait с таймаутом: True если процесс завершился (или его нет)"""
+    if process is None:
+        return True
+    try:
+        process.wait(timeout=max(timeout, 0))
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+
+
+def wait_startup(process: subprocess.Popen, grace: float = STARTUP_GRACE) -> Optional[int]:
+    """
+    Проверка запуска своего процесса.
+    Возвращает код выхода, если процесс завершился в течение grace секунд
+    (возврат сразу после падения), иначе None - процесс работает.
+    """
+    try:
+        return process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        return None
+
+
+def wait_for_start(
+    names: Sequence[str] = WINWS_PROCESS_NAMES,
+    timeout: float = 2.0,
+    interval: float = START_POLL_INTERVAL,
+    list_pids: Optional[ListPidsFunc] = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> bool:
+    """
+    Ждёт появления процесса, запущенного не через Popen (BAT, CreateProcess),
+    не дольше timeout секунд. Дескриптора такого процесса у нас нет, поэтому
+    опрашиваем снимок таблицы процессов с коротким интервалом.
+    """
+    list_pids = list_pids or _list_pids_fresh
+    deadline = clock() + timeout
+    while True:
+        if list_pids(names):
+            return True
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return False
+        sleep(min(interval, remaining))
+
+
+class SwitchLatency:
+    """
+    Замер времени переключения стратегии по этапам.
+
+        latency = SwitchLatency("Переключение стратегии")
+        ... остановка ...
+        latency.mark("остановка")
+        ... запуск ...
+        latency.mark("запуск")
+        latency.report(success)
+    """
+
+    def __init__(self, label: str, clock: Callable[[], float] = time.perf_counter):
+        self.label = label
+        self._clock = clock
+        self._started = clock()
+        self._last = self._started
+        self._stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> float:
+        """Закрывает этап stage (время с предыдущей отметки), возвращает его длительность в мс"""
+        now = self._clock()
+        elapsed_ms = (now - self._last) * 1000
+        self._last = now
+        self._stages.append((stage, elapsed_ms))
+        return elapsed_ms
+
+    @property
+    def stages(self) -> List[Tuple[str, float]]:
+        return list(self._stages)
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self._started) * 1000
+
+    def summary(self) -> str:
+        text = f"{self.label}: {self.total_ms:.0f} мс"
+        if self._stages:
+            parts = ", ".join(f"{stage} {ms:.0f}" for stage, ms in self._stages)
+            text += f" ({parts})"
+        return text
+
+    def report(self, success: bool = True) -> str:
+        """Пишет замер в лог и возвращает строку"""
+        text = self.summary()
+        if not success:
+            text += " - неудачно"
+        log(f"⏱ {text}", "INFO" if success else "WARNING")
+        return text
@@ -12,14 +12,21 @@ This version:
 import os
 import subprocess
 import time
-import threading
 from typing import Optional, List, Callable
 from datetime import datetime
 
 from log import log
+from utils.file_watcher import DEFAULT_DEBOUNCE, WatchHandle, get_file_watcher_service
 from launcher_common.runner_base import StrategyRunnerBase, log_full_command
 from launcher_common.args_filters import apply_all_filters
 from launcher_common.constants import SW_HIDE, CREATE_NO_WINDOW, STARTF_USESHOWWINDOW
+from utils.process_wait import (
+    WINWS_PROCESS_NAMES,
+    SwitchLatency,
+    wait_for_exit,
+    wait_popen_exit,
+    wait_startup,
+)
 from dpi.process_health_check import (
     check_process_health,
     get_last_crash_info,
@@ -34,80 +41,49 @@ class ConfigFileWatcher:
     """
     Monitors preset file changes for hot-reload.
 
-    Watches a config file and calls callback when modification time changes.
-    Runs in a background thread with configurable polling interval.
+    Thin wrapper over the shared `utils.file_watcher` service: OS change
+    notifications (inotify / FindFirstChangeNotification, polling fallback),
+    debounce window and content-hash comparison - a burst of saves results in
+    a single callback, and rewrites without content changes are ignored.
     """
 
-    def __init__(self, file_path: str, callback: Callable[[], None], interval: float = 1.0):
+    def __init__(self, file_path: str, callback: Callable[[], None], interval: float = 1.0,
+                 debounce: float = DEFAULT_DEBOUNCE):
         """
         Initialize config file watcher.
 
         Args:
             file_path: Path to file to monitor
-            callback: Function to call when file changes
-            interval: Polling interval in seconds (default 1.0)
+            callback: Function to call when file content changes
+            interval: Polling interval of the fallback backend in seconds (default 1.0)
+            debounce: Quiet period before the callback fires, in seconds
         """
         self._file_path = file_path
         self._callback = callback
         self._interval = interval
-        self._running = False
-        self._thread: Optional[threading.Thread] = None
-        self._last_mtime: Optional[float] = None
-
-        # Get initial modification time
-        if os.path.exists(self._file_path):
-            self._last_mtime = os.path.getmtime(self._file_path)
+        self._debounce = debounce
+        self._handle: Optional[WatchHandle] = None
 
     def start(self):
-        """Start watching the file in background thread"""
-        if self._running:
+        """Start watching the file"""
+        if self._handle is not None:
             log("ConfigFileWatcher already running", "DEBUG")
             return
 
-        self._running = True
-        self._thread = threading.Thread(target=self._watch_loop, daemon=True, name="ConfigFileWatcher")
-        self._thread.start()
+        service = get_file_watcher_service()
+        service.poll_interval = min(service.poll_interval, self._interval)
+        self._handle = service.watch(self._file_path, self._callback, debounce=self._debounce)
         log(f"ConfigFileWatcher started for: {self._file_path}", "DEBUG")
 
     def stop(self):
         """Stop watching the file"""
-        if not self._running:
+        if self._handle is None:
             return
 
-        self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=2.0)
-        self._thread = None
+        self._handle.cancel()
+        self._handle = None
         log("ConfigFileWatcher stopped", "DEBUG")
 
-    def _watch_loop(self):
-        """Main watch loop - polls file for changes"""
-        while self._running:
-            try:
-                if os.path.exists(self._file_path):
-                    current_mtime = os.path.getmtime(self._file_path)
-
-                    if self._last_mtime is not None and current_mtime != self._last_mtime:
-                        log(f"Config file changed: {self._file_path}", "INFO")
-                        self._last_mtime = current_mtime
-
-                        # Call callback in try-except to prevent thread crash
-                        try:
-                            self._callback()
-                        except Exception as e:
-                            log(f"Error in config change callback: {e}", "ERROR")
-
-                    self._last_mtime = current_mtime
-
-            except Exception as e:
-                log(f"Error checking file modification: {e}", "DEBUG")
-
-            # Sleep in small intervals to allow quick stop
-            sleep_remaining = self._interval
-            while sleep_remaining > 0 and self._running:
-                time.sleep(min(0.1, sleep_remaining))
-                sleep_remaining -= 0.1
-
 
 class StrategyRunnerV2(StrategyRunnerBase):
     """
@@ -154,14 +130,21 @@ class StrategyRunnerV2(StrategyRunnerBase):
             log("Preset file not found, cannot hot-reload", "WARNING")
             return
 
+        latency = SwitchLatency("Hot-reload")
+
         # Stop process only (keep watcher running)
         self._stop_process_only()
+        latency.mark("остановка")
 
-        # Small delay to ensure clean stop
-        time.sleep(0.3)
+        # Wait on process handles instead of a fixed delay: returns as soon as
+        # the last winws/winws2 has exited
+        wait_for_exit(WINWS_PROCESS_NAMES, timeout=1.0)
+        latency.mark("ожидание завершения")
 
         # Restart from preset file
-        self._start_from_preset()
+        success = self._start_from_preset()
+        latency.mark("запуск")
+        latency.report(bool(success))
 
     def _stop_process_only(self):
         """
@@ -178,10 +161,9 @@ class StrategyRunnerV2(StrategyRunnerBase):
                 # Soft stop
                 self.running_process.terminate()
 
-                try:
-                    self.running_process.wait(timeout=3)
+                if wait_popen_exit(self.running_process, timeout=3):
                     log(f"Process stopped for hot-reload (PID: {pid})", "SUCCESS")
-                except subprocess.TimeoutExpired:
+                else:
                     log("Soft stop timeout, force killing for hot-reload", "WARNING")
                     self.running_process.kill()
                     self.running_process.wait()
@@ -220,10 +202,8 @@ class StrategyRunnerV2(StrategyRunnerBase):
                 cwd=self.work_dir
             )
 
-            # Quick startup check
-            time.sleep(0.2)
-
-            if self.running_process.poll() is None:
+            # Quick startup check: returns immediately if the process crashed
+            if wait_startup(self.running_process) is None:
                 log(f"Hot-reload successful (PID: {self.running_process.pid})", "SUCCESS")
                 self.current_strategy_args = [f"@{self._preset_file_path}"]
                 return True
@@ -332,10 +312,8 @@ class StrategyRunnerV2(StrategyRunnerBase):
             self.current_strategy_name = strategy_name
             self.current_strategy_args = [f"@{preset_path}"]
 
-            # Quick startup check
-            time.sleep(0.2)
-
-            if self.running_process.poll() is None:
+            # Quick startup check: returns immediately if the process crashed
+            if wait_startup(self.running_process) is None:
                 log(f"Strategy '{strategy_name}' started from preset (PID: {self.running_process.pid})", "SUCCESS")
 
                 # Start hot-reload watcher after successful start
@@ -377,18 +355,16 @@ class StrategyRunnerV2(StrategyRunnerBase):
     def find_running_preset_pid(self, preset_path: str) -> Optional[int]:
         """Returns PID of winws2.exe running with @preset_path, if any."""
         try:
-            import psutil
+            from utils.process_snapshot import get_process_snapshot
 
             target_exe = os.path.basename(self.winws_exe).lower()
             target_preset = os.path.normcase(os.path.normpath(os.path.abspath(preset_path)))
 
-            for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+            # cmdline читается только у процессов winws2.exe, а не у всей системы
+            snapshot = get_process_snapshot()
+            for pid in snapshot.pids(target_exe):
                 try:
-                    name = (proc.info.get("name") or "").lower()
-                    if name != target_exe:
-                        continue
-
-                    cmdline = proc.info.get("cmdline") or []
+                    cmdline = snapshot.cmdline(pid) or []
                     if not isinstance(cmdline, list):
                         continue
 
@@ -408,9 +384,7 @@ class StrategyRunnerV2(StrategyRunnerBase):
 
                         candidate_norm = os.path.normcase(os.path.normpath(os.path.abspath(candidate)))
                         if candidate_norm == target_preset:
-                            return int(proc.info.get("pid"))
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+                            return int(pid)
                 except Exception:
                     continue
 
@@ -534,10 +508,8 @@ class StrategyRunnerV2(StrategyRunnerBase):
             self.current_strategy_name = strategy_name
             self.current_strategy_args = resolved_args.copy()
 
-            # Quick startup check
-            time.sleep(0.2)
-
-            if self.running_process.poll() is None:
+            # Quick startup check: returns immediately if the process crashed
+            if wait_startup(self.running_process) is None:
                 log(f"Strategy '{strategy_name}' started (PID: {self.running_process.pid})", "SUCCESS")
 
                 # Start hot-reload watcher after successful start